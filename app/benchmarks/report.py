@@ -0,0 +1,59 @@
+"""Report helpers shared by the benchmark suites."""
+
+from __future__ import annotations
+
+import platform
+import shutil
+import subprocess
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+
+def collect_metadata(**parameters: object) -> dict[str, object]:
+    """Return run metadata (commit, time, Python, platform) plus suite parameters."""
+    return {
+        "commit": git_commit(),
+        "generated_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **parameters,
+    }
+
+
+def git_commit() -> str:
+    """Return the short commit hash of the working tree, or "unknown"."""
+    git_bin = shutil.which("git")
+    if not git_bin:
+        return "unknown"
+    try:
+        return subprocess.run(  # noqa: S603 - 実行コマンドは固定の git バイナリのみ
+            [git_bin, "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=10,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        return "unknown"
+
+
+def compare_reports(current: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Build human-readable comparison lines (current / baseline ratio) for matching results."""
+    baseline_index = {(item["operation"], item["size"]): item for item in baseline.get("results", [])}
+    baseline_commit = baseline.get("metadata", {}).get("commit", "unknown")
+    current_commit = current.get("metadata", {}).get("commit", "unknown")
+    lines = [f"baseline={baseline_commit} current={current_commit}"]
+    for item in current.get("results", []):
+        previous = baseline_index.get((item["operation"], item["size"]))
+        if previous is None:
+            continue
+        time_ratio = item["median_seconds"] / previous["median_seconds"] if previous["median_seconds"] else 0.0
+        memory_ratio = (
+            item["peak_memory_bytes"] / previous["peak_memory_bytes"] if previous["peak_memory_bytes"] else 0.0
+        )
+        lines.append(
+            f"{item['operation']:<16} size={item['size']:>6} time x{time_ratio:.2f} memory x{memory_ratio:.2f}",
+        )
+    return lines
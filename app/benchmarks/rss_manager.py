@@ -0,0 +1,221 @@
+"""Benchmark suite for services.rss_manager.PodcastRssManager.
+
+`data/rss_feed.xml` をチャンネルテンプレートとして 10 / 100 / 1,000 / 10,000 件の
+合成フィードを生成し、パース(構築)・add_episode・update_episode・delete_episode・
+get_rss_xml の所要時間とピークメモリを計測する。
+
+結果は JSON で出力し、`--baseline` に以前の結果を渡すとコミット間の比較表を表示する。
+
+Usage (app/ から実行):
+    PYTHONPATH=src uv run python -m benchmarks.rss_manager --output .benchmarks/rss_manager.json
+    PYTHONPATH=src uv run python -m benchmarks.rss_manager --sizes 10 100 --baseline .benchmarks/rss_manager.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from benchmarks.report import collect_metadata, compare_reports
+from services.rss_manager import PodcastRssManager
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+DEFAULT_SIZES: tuple[int, ...] = (10, 100, 1_000, 10_000)
+DEFAULT_REPEAT = 3
+TEMPLATE_PATH = Path(__file__).resolve().parents[1] / "data" / "rss_feed.xml"
+OPERATIONS: tuple[str, ...] = ("parse", "get_rss_xml", "update_episode", "add_episode", "delete_episode")
+
+_ITEM_RE = re.compile(r"<item>.*?</item>", re.DOTALL)
+_GUID_RE = re.compile(r"(<guid[^>]*>)(.*?)(</guid>)", re.DOTALL)
+_TITLE_RE = re.compile(r"<title><!\[CDATA\[(.*?)\]\]></title>", re.DOTALL)
+_ENCLOSURE_URL_RE = re.compile(r'(<enclosure url=")([^"]*)(")')
+_EMPTY_OWNER_EMAIL = "<itunes:email></itunes:email>"
+_PLACEHOLDER_OWNER_EMAIL = "<itunes:email>bench@example.com</itunes:email>"
+
+
+@dataclass(frozen=True)
+class OperationResult:
+    """Timing and memory result for one operation at one catalogue size."""
+
+    operation: str
+    size: int
+    runs: int
+    median_seconds: float
+    min_seconds: float
+    peak_memory_bytes: int
+
+
+def build_synthetic_feed(item_count: int, template_xml: str | None = None) -> str:
+    """Build a feed with `item_count` unique items from the channel template.
+
+    Args:
+        item_count: 生成するエピソード数。
+        template_xml: テンプレート RSS。None の場合は data/rss_feed.xml を使用する。
+
+    Returns:
+        合成された RSS XML 文字列。
+    """
+    if template_xml is None:
+        template_xml = TEMPLATE_PATH.read_text(encoding="utf-8")
+
+    items = _ITEM_RE.findall(template_xml)
+    if not items:
+        raise ValueError("Template RSS must contain at least one <item>.")
+
+    head = template_xml[: template_xml.index("<item>")]
+    tail = template_xml[template_xml.rindex("</item>") + len("</item>") :]
+    # PodcastRssManager は itunes:owner の email を必須とするため、空ならプレースホルダーで埋める
+    head = head.replace(_EMPTY_OWNER_EMAIL, _PLACEHOLDER_OWNER_EMAIL)
+
+    body = "\n\t\t".join(_synthetic_item(items[index % len(items)], index) for index in range(item_count))
+    return f"{head}{body}{tail}"
+
+
+def _synthetic_item(item_template: str, index: int) -> str:
+    """Give a template item a unique guid, title and enclosure URL."""
+    item = _GUID_RE.sub(lambda match: f"{match.group(1)}{_bench_guid(index)}{match.group(3)}", item_template, count=1)
+    item = _TITLE_RE.sub(lambda match: f"<title><![CDATA[#{index + 1} {match.group(1)}]]></title>", item, count=1)
+    return _ENCLOSURE_URL_RE.sub(
+        lambda match: f"{match.group(1)}https://bench.example.com/ep/{index + 1}/audio.mp3{match.group(3)}",
+        item,
+        count=1,
+    )
+
+
+def _bench_guid(index: int) -> str:
+    return f"bench-{index:08d}"
+
+
+def _new_episode(index: int) -> dict[str, object]:
+    return {
+        "guid": _bench_guid(index),
+        "title": f"#{index + 1} Benchmark episode",
+        "description": "<p>Benchmark description</p>",
+        "audio_url": f"https://bench.example.com/ep/{index + 1}/audio.mp3",
+        "file_size": 12_345_678,
+        "mime_type": "audio/mpeg",
+        "itunes_duration": "00:42:00",
+        "itunes_episode_number": index + 1,
+    }
+
+
+def _parse(feed_xml: str) -> PodcastRssManager:
+    # _extract_episode_data が print するため、計測中の stdout を捨てる
+    with contextlib.redirect_stdout(io.StringIO()):
+        return PodcastRssManager(rss_xml=feed_xml)
+
+
+def _operation_factory(operation: str, manager: PodcastRssManager, feed_xml: str, size: int) -> Callable[[int], object]:
+    """Return a callable that runs `operation` once for the given run number."""
+    if operation == "parse":
+        return lambda _run: _parse(feed_xml)
+    if operation == "get_rss_xml":
+        return lambda _run: manager.get_rss_xml()
+    if operation == "update_episode":
+        target_guid = _bench_guid(size // 2)
+        return lambda run: manager.update_episode(target_guid, {"title": f"Updated title {run}"})
+    if operation == "add_episode":
+        return lambda run: manager.add_episode(_new_episode(size + run))  # type: ignore[arg-type]
+    if operation == "delete_episode":
+        # add_episode で追加した分を末尾から順に削除する
+        return lambda run: manager.delete_episode(_bench_guid(size + run))
+    msg = f"Unknown operation: {operation}"
+    raise ValueError(msg)
+
+
+def measure_operation(
+    operation: str,
+    *,
+    manager: PodcastRssManager,
+    feed_xml: str,
+    size: int,
+    repeat: int,
+) -> OperationResult:
+    """Time `operation` `repeat` times, then record its peak memory in one traced run."""
+    run = _operation_factory(operation, manager, feed_xml, size)
+    timings: list[float] = []
+    for index in range(repeat):
+        started = time.perf_counter()
+        run(index)
+        timings.append(time.perf_counter() - started)
+
+    # tracemalloc は実行速度を落とすため、時間計測とは別の 1 回で計測する
+    tracemalloc.start()
+    try:
+        run(repeat)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return OperationResult(
+        operation=operation,
+        size=size,
+        runs=repeat,
+        median_seconds=statistics.median(timings),
+        min_seconds=min(timings),
+        peak_memory_bytes=peak,
+    )
+
+
+def run_suite(sizes: Sequence[int] = DEFAULT_SIZES, repeat: int = DEFAULT_REPEAT) -> dict[str, Any]:
+    """Run every operation for every catalogue size and return a JSON-serializable report."""
+    template_xml = TEMPLATE_PATH.read_text(encoding="utf-8")
+    results: list[OperationResult] = []
+    for size in sizes:
+        feed_xml = build_synthetic_feed(size, template_xml)
+        manager = _parse(feed_xml)
+        for operation in OPERATIONS:
+            result = measure_operation(operation, manager=manager, feed_xml=feed_xml, size=size, repeat=repeat)
+            results.append(result)
+            print(
+                f"{operation:<16} size={size:>6} median={result.median_seconds * 1000:>10.2f} ms "
+                f"peak={result.peak_memory_bytes / 1024:>10.1f} KiB",
+                file=sys.stderr,
+            )
+
+    return {
+        "benchmark": "rss_manager",
+        "metadata": collect_metadata(sizes=list(sizes), repeat=repeat),
+        "results": [asdict(result) for result in results],
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="catalogue sizes")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per operation")
+    parser.add_argument("--output", type=Path, help="write the JSON report to this path")
+    parser.add_argument("--baseline", type=Path, help="previous JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.repeat)
+    serialized = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(serialized, encoding="utf-8")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(serialized)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        for line in compare_reports(report, baseline):
+            print(line, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,428 @@
+"""Offline benchmark of usecases.ProcessPodcastWorkflow.
+
+Gemini の呼び出しを ReplayTranscriptProvider で記録済みフィクスチャに置き換え、R2・GCS・
+Postgres・Firestore・Discord をメモリ上の実装に差し替えて、ワークフロー全体をネットワークなしで
+実行する。RSS は `benchmarks.rss_manager` の合成フィードを使った実際の PodcastRssManager で処理する。
+
+`--fixtures` を省略すると、指定した文字数の合成議事録を RecordingTranscriptProvider で
+一時ディレクトリに記録してから再生する。`TRANSCRIPT_RECORD_DIR` を指定して本番ジョブを
+実行すれば、実際のレスポンスをフィクスチャとして保存できる。
+
+Usage (app/ から実行):
+    PYTHONPATH=src uv run python -m benchmarks.workflow --output .benchmarks/workflow.json
+    PYTHONPATH=src uv run python -m benchmarks.workflow --fixtures .fixtures/ai --latency-scale 1.0
+    PYTHONPATH=src uv run python -m benchmarks.workflow --sizes 200000 --profile .benchmarks/workflow.prof
+    PYTHONPATH=src uv run python -m benchmarks.workflow --latency-scale 1.0 --audio-latency 5
+
+`workflow_sequential` は同じワークフローをステップの並行実行なしで実行する。`--audio-latency` で
+音声変換に待ち時間を与えると、文字起こし系統との並行実行による短縮を比較できる。
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import cProfile
+import io
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from benchmarks.report import collect_metadata, compare_reports
+from benchmarks.rss_manager import build_synthetic_feed
+from domain.models import SnsPromotionContent, SnsPromotionsResponse, Summary, SummaryWithPromotions
+from infrastructure.transcript_recording import RecordingTranscriptProvider, ReplayTranscriptProvider
+from services.rss_manager import PodcastRssManager
+from usecases import ProcessPodcastWorkflow, ProcessPodcastWorkflowInput
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from domain.interfaces import TranscriptProvider
+
+# 30 分・60 分・3 時間程度の配信の議事録に相当する文字数
+DEFAULT_SIZES: tuple[int, ...] = (20_000, 60_000, 200_000)
+DEFAULT_REPEAT = 3
+DEFAULT_FEED_EPISODES = 100
+MODES: tuple[str, ...] = ("workflow", "workflow_combined", "workflow_sequential")
+AUDIO_BYTES = 8 * 1024 * 1024
+
+_SAMPLE_LINE = "スピーカーA: 今週は Cloud Run Jobs の並列実行とリトライ設計について話しました。\n"
+
+
+@dataclass(frozen=True)
+class WorkflowResult:
+    """Timing and memory result for one workflow mode at one transcript size."""
+
+    operation: str
+    size: int
+    runs: int
+    median_seconds: float
+    min_seconds: float
+    peak_memory_bytes: int
+    simulated_latency_seconds: float
+
+
+class _SyntheticTranscriptProvider:
+    """Deterministic provider used to record fixtures when no real recordings are given."""
+
+    def __init__(self, transcript_chars: int) -> None:
+        self._transcript = (_SAMPLE_LINE * (transcript_chars // len(_SAMPLE_LINE) + 1))[:transcript_chars]
+
+    def generate_transcript(self, source_uri: str, model_id: str | None = None) -> str:  # noqa: ARG002
+        return self._transcript
+
+    def summarize_transcript(
+        self,
+        transcript: str,
+        prompt: str | None = None,  # noqa: ARG002
+        model_id: str | None = None,  # noqa: ARG002
+    ) -> Summary:
+        return Summary(title="ベンチマーク回", description=transcript[:1_500])
+
+    def generate_sns_promotions(
+        self,
+        summary_description: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,  # noqa: ARG002
+    ) -> SnsPromotionsResponse:
+        return SnsPromotionsResponse(promotions=_promotions(summary_description, num_promotions))
+
+    def generate_summary_and_promotions(
+        self,
+        transcript: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,  # noqa: ARG002
+    ) -> SummaryWithPromotions:
+        summary = Summary(title="ベンチマーク回", description=transcript[:1_500])
+        return SummaryWithPromotions(summary=summary, promotions=_promotions(summary.description, num_promotions))
+
+    def release_transcript(self, transcript: str) -> None:
+        pass
+
+
+def _promotions(description: str, count: int) -> list[SnsPromotionContent]:
+    return [
+        SnsPromotionContent(message=f"{description[:100]} ({index})", hashtags=["#sunabalog"]) for index in range(count)
+    ]
+
+
+class _InMemoryObjectStorage:
+    def __init__(self, feed_xml: str) -> None:
+        self.objects: dict[str, bytes] = {"bench/feed.xml": feed_xml.encode("utf-8")}
+
+    def download_file(self, remote_key: str) -> bytes:
+        return self.objects[remote_key]
+
+    def upload_file(self, file_content: bytes, remote_key: str, content_type: str, *, public: bool = True) -> None:  # noqa: ARG002
+        self.objects[remote_key] = file_content
+
+    def generate_public_url(self, remote_key: str, custom_domain: str | None = None) -> str:
+        return f"https://{custom_domain}/{remote_key}"
+
+
+class _InMemoryBlobSource:
+    def __init__(self) -> None:
+        self._audio = bytes(AUDIO_BYTES)
+
+    def download_blob_as_bytes(self, bucket_name: str, blob_name: str) -> bytes:  # noqa: ARG002
+        return self._audio
+
+
+class _NullNotifier:
+    def send_discord_message(self, message: str) -> None:
+        pass
+
+
+class _InMemoryEpisodeRepository:
+    def __init__(self) -> None:
+        self.states: dict[tuple[str, str], str] = {}
+
+    def mark_processing(self, *, podcast_id: str, episode_id: str, source_audio_path: str) -> None:  # noqa: ARG002
+        self.states[podcast_id, episode_id] = "processing"
+
+    def claim_processing(self, *, podcast_id: str, episode_id: str, source_audio_path: str, **_: object) -> bool:
+        if self.states.get((podcast_id, episode_id)) == "processing":
+            return False
+        self.mark_processing(podcast_id=podcast_id, episode_id=episode_id, source_audio_path=source_audio_path)
+        return True
+
+    def renew_lease(self, **_: object) -> bool:
+        return True
+
+    def mark_completed(  # noqa: PLR0913
+        self,
+        *,
+        podcast_id: str,
+        episode_id: str,
+        owner: str,  # noqa: ARG002
+        title: str,  # noqa: ARG002
+        description: str,  # noqa: ARG002
+        audio_url: str,  # noqa: ARG002
+        duration_seconds: int | None,  # noqa: ARG002
+    ) -> None:
+        self.states[podcast_id, episode_id] = "completed"
+
+    def mark_failed(self, *, podcast_id: str, episode_id: str, owner: str, error_message: str) -> None:  # noqa: ARG002
+        self.states[podcast_id, episode_id] = "failed"
+
+
+class _InMemoryFirestoreManager:
+    def __init__(self) -> None:
+        self.documents: list[dict[str, Any]] = []
+
+    def save_episode_content(self, **fields: Any) -> str:  # noqa: ANN401
+        self.documents.append(fields)
+        return fields["episode_id"]
+
+    def save_transcript_chunks(self, *, podcast_id: str, episode_id: str, transcript: str) -> list[str]:  # noqa: ARG002
+        self.documents.append({"transcript_chars": len(transcript)})
+        return [episode_id]
+
+    def create_sns_promotion(self, **fields: Any) -> str:  # noqa: ANN401
+        self.documents.append(fields)
+        return str(len(self.documents))
+
+
+def record_synthetic_fixtures(fixture_dir: Path, transcript_chars: int) -> None:
+    """Record one workflow's worth of synthetic fixtures for the given transcript size."""
+    provider = RecordingTranscriptProvider(
+        inner=_SyntheticTranscriptProvider(transcript_chars), fixture_dir=fixture_dir
+    )
+    transcript = provider.generate_transcript(_source_uri(), model_id="bench-model") or ""
+    summary = provider.summarize_transcript(transcript, model_id="bench-model")
+    provider.generate_sns_promotions(summary.description, model_id="bench-model")
+    provider.generate_summary_and_promotions(transcript, model_id="bench-model")
+
+
+def _source_uri() -> str:
+    return "gs://bench-bucket/podcasts/bench/episodes/1/source/recording.m4a"
+
+
+def _request() -> ProcessPodcastWorkflowInput:
+    return ProcessPodcastWorkflowInput(
+        project_id="bench-project",
+        sns_schedule_offset_hours=1,
+        gcs_bucket="bench-bucket",
+        gcs_trigger_object_name="podcasts/bench/episodes/1/source/recording.m4a",
+        r2_bucket="bench-r2",
+        r2_key_prefix="bench",
+        ai_model_id="bench-model",
+        r2_custom_domain="bench.example.com",
+    )
+
+
+def _build_workflow(
+    transcript_provider: TranscriptProvider,
+    feed_xml: str,
+    *,
+    combined: bool,
+    sequential: bool = False,
+    audio_latency_seconds: float = 0.0,
+) -> ProcessPodcastWorkflow:
+    silent_logger = logging.getLogger("benchmarks.workflow.run")
+    silent_logger.disabled = True
+
+    def convert(audio_bytes: bytes, _suffix: str) -> bytes:
+        if audio_latency_seconds > 0:
+            time.sleep(audio_latency_seconds)
+        return audio_bytes
+
+    return ProcessPodcastWorkflow(
+        transcript_provider=transcript_provider,
+        object_storage=_InMemoryObjectStorage(feed_xml),
+        blob_source=_InMemoryBlobSource(),
+        notifier=_NullNotifier(),
+        rss_manager_factory=PodcastRssManager,
+        audio_converter=convert,
+        audio_info_reader=lambda file_buffer, audio_format: [len(file_buffer.getvalue()), "01:02:03"],  # noqa: ARG005
+        firestore_manager=_InMemoryFirestoreManager(),  # type: ignore[arg-type]
+        episode_repository=_InMemoryEpisodeRepository(),
+        logger=silent_logger,
+        combine_summary_and_promotions=combined,
+        max_parallel_steps=1 if sequential else 4,
+    )
+
+
+def measure_workflow(
+    mode: str,
+    *,
+    fixture_dir: Path,
+    size: int,
+    feed_xml: str,
+    repeat: int,
+    latency_scale: float = 0.0,
+    audio_latency_seconds: float = 0.0,
+    profiler: cProfile.Profile | None = None,
+) -> WorkflowResult:
+    """Run the workflow `repeat` times against replayed fixtures, then trace its peak memory once.
+
+    プロファイラは呼び出し元スレッドだけを計測するため、並行実行されるステップは含まれない。
+    """
+    replay = ReplayTranscriptProvider(fixture_dir=fixture_dir, latency_scale=latency_scale, strict=False)
+
+    def run() -> None:
+        workflow = _build_workflow(
+            replay,
+            feed_xml,
+            combined=mode == "workflow_combined",
+            sequential=mode == "workflow_sequential",
+            audio_latency_seconds=audio_latency_seconds,
+        )
+        # PodcastRssManager が print するため、計測中の stdout を捨てる
+        with contextlib.redirect_stdout(io.StringIO()):
+            workflow.run(_request())
+
+    timings: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if profiler is None:
+            run()
+        else:
+            profiler.runcall(run)
+        timings.append(time.perf_counter() - started)
+    simulated_latency = replay.simulated_latency_seconds / repeat
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return WorkflowResult(
+        operation=mode,
+        size=size,
+        runs=repeat,
+        median_seconds=statistics.median(timings),
+        min_seconds=min(timings),
+        peak_memory_bytes=peak,
+        simulated_latency_seconds=round(simulated_latency, 3),
+    )
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    *,
+    fixture_dir: Path | None = None,
+    latency_scale: float = 0.0,
+    audio_latency_seconds: float = 0.0,
+    feed_episodes: int = DEFAULT_FEED_EPISODES,
+    profiler: cProfile.Profile | None = None,
+) -> dict[str, Any]:
+    """Run every workflow mode and return a JSON-serializable report.
+
+    fixture_dir を指定した場合は記録済みフィクスチャを 1 セットだけ再生し、size は議事録の文字数として
+    フィクスチャから求める。指定しない場合は sizes ごとに合成フィクスチャを記録する。
+    """
+    feed_xml = build_synthetic_feed(feed_episodes)
+    results: list[WorkflowResult] = []
+    with tempfile.TemporaryDirectory(prefix="workflow-bench-") as temp_dir:
+        fixture_sets: list[tuple[int, Path]]
+        if fixture_dir is not None:
+            fixture_sets = [(_recorded_transcript_chars(fixture_dir), fixture_dir)]
+        else:
+            fixture_sets = []
+            for size in sizes:
+                size_dir = Path(temp_dir) / str(size)
+                record_synthetic_fixtures(size_dir, size)
+                fixture_sets.append((size, size_dir))
+
+        for size, directory in fixture_sets:
+            for mode in MODES:
+                result = measure_workflow(
+                    mode,
+                    fixture_dir=directory,
+                    size=size,
+                    feed_xml=feed_xml,
+                    repeat=repeat,
+                    latency_scale=latency_scale,
+                    audio_latency_seconds=audio_latency_seconds,
+                    profiler=profiler,
+                )
+                results.append(result)
+                print(
+                    f"{mode:<20} chars={size:>7} median={result.median_seconds * 1000:>10.2f} ms "
+                    f"peak={result.peak_memory_bytes / 1024:>10.1f} KiB "
+                    f"simulated_latency={result.simulated_latency_seconds:.2f}s",
+                    file=sys.stderr,
+                )
+
+    return {
+        "benchmark": "workflow",
+        "metadata": collect_metadata(
+            sizes=[size for size, _ in fixture_sets],
+            repeat=repeat,
+            fixtures=str(fixture_dir) if fixture_dir else "synthetic",
+            latency_scale=latency_scale,
+            audio_latency_seconds=audio_latency_seconds,
+            feed_episodes=feed_episodes,
+        ),
+        "results": [asdict(result) for result in results],
+    }
+
+
+def _recorded_transcript_chars(fixture_dir: Path) -> int:
+    """Return the length of the first recorded transcript in a fixture directory."""
+    for path in sorted((fixture_dir / "generate_transcript").glob("*.json")):
+        response = json.loads(path.read_text(encoding="utf-8")).get("response")
+        if isinstance(response, str):
+            return len(response)
+    msg = f"No generate_transcript fixture found in {fixture_dir}"
+    raise ValueError(msg)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="synthetic transcript chars")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per mode")
+    parser.add_argument("--fixtures", type=Path, help="directory recorded with TRANSCRIPT_RECORD_DIR")
+    parser.add_argument("--latency-scale", type=float, default=0.0, help="multiplier for recorded model latency")
+    parser.add_argument("--audio-latency", type=float, default=0.0, help="seconds added to each audio conversion")
+    parser.add_argument("--feed-episodes", type=int, default=DEFAULT_FEED_EPISODES, help="episodes in the RSS feed")
+    parser.add_argument("--profile", type=Path, help="write cProfile stats of the timed runs to this path")
+    parser.add_argument("--output", type=Path, help="write the JSON report to this path")
+    parser.add_argument("--baseline", type=Path, help="previous JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    profiler = cProfile.Profile() if args.profile else None
+    report = run_suite(
+        args.sizes,
+        args.repeat,
+        fixture_dir=args.fixtures,
+        latency_scale=args.latency_scale,
+        audio_latency_seconds=args.audio_latency,
+        feed_episodes=args.feed_episodes,
+        profiler=profiler,
+    )
+    if profiler is not None:
+        args.profile.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(args.profile)
+        print(f"Profile written to {args.profile}", file=sys.stderr)
+
+    serialized = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(serialized, encoding="utf-8")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(serialized)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        for line in compare_reports(report, baseline):
+            print(line, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,26 +2,46 @@
 
 from .gateways import (
     AgendaSerializer,
+    BatchPredictionGateway,
     BlobSource,
     DiscordTranscriptSource,
+    EpisodeLeaseLostError,
     EpisodeRepository,
+    EpisodeTranscriptCache,
+    EpisodeWorkQueue,
+    MemoryMonitor,
+    MemoryWindow,
     NewsResearcher,
     NewsSource,
     NotificationGateway,
     ObjectStorage,
     SecretProvider,
+    Tracer,
+    TraceSpan,
+    TranscriptCache,
     TranscriptProvider,
+    WorkflowCheckpointStore,
 )
 
 __all__ = [
     "AgendaSerializer",
+    "BatchPredictionGateway",
     "BlobSource",
     "DiscordTranscriptSource",
+    "EpisodeLeaseLostError",
     "EpisodeRepository",
+    "EpisodeTranscriptCache",
+    "EpisodeWorkQueue",
+    "MemoryMonitor",
+    "MemoryWindow",
     "NewsResearcher",
     "NewsSource",
     "NotificationGateway",
     "ObjectStorage",
     "SecretProvider",
+    "TraceSpan",
+    "Tracer",
+    "TranscriptCache",
     "TranscriptProvider",
+    "WorkflowCheckpointStore",
 ]
@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Protocol
+from typing import TYPE_CHECKING, Any, Protocol
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
-
-    from domain.models import AgendaResult, DiscordMessage, NewsItem, SnsPromotionsResponse, Summary, TopicMatch
+    from collections.abc import Mapping, Sequence
+    from contextlib import AbstractContextManager
+
+    from domain.models import (
+        AgendaResult,
+        BatchPredictionRequest,
+        BatchPredictionResult,
+        DiscordMessage,
+        EpisodeWorkItem,
+        NewsItem,
+        SnsPromotionsResponse,
+        Summary,
+        SummaryWithPromotions,
+        TopicMatch,
+    )
 
 
 class TranscriptProvider(Protocol):
@@ -32,6 +44,40 @@ class TranscriptProvider(Protocol):
     ) -> SnsPromotionsResponse:
         """Generate multiple SNS promotions from episode summary description."""
 
+    def generate_summary_and_promotions(
+        self,
+        transcript: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SummaryWithPromotions:
+        """Generate the summary and SNS promotions together in one model call."""
+
+    def release_transcript(self, transcript: str) -> None:
+        """Free what was kept for the transcript (e.g. model-side context caches) once its episode is summarized."""
+
+
+class TranscriptCache(Protocol):
+    """Stores generated AI output keyed by source, model and prompt version."""
+
+    def get(self, key: str) -> str | None:
+        """Return the cached payload for a key, or None on a miss."""
+
+    def put(self, key: str, value: str, *, source_fingerprint: str) -> None:
+        """Store a payload and associate it with its source fingerprint."""
+
+    def invalidate(self, source_fingerprint: str) -> int:
+        """Delete every entry derived from a source and return the deleted count."""
+
+
+class EpisodeTranscriptCache(Protocol):
+    """Stores episode transcripts read from Firestore, validated by the episode's updated_at."""
+
+    def get_many(self, podcast_id: str, versions: Mapping[str, str]) -> dict[str, str]:
+        """Return cached transcripts whose updated_at matches versions (episode_id -> updated_at)."""
+
+    def put_many(self, podcast_id: str, entries: Mapping[str, tuple[str, str]]) -> None:
+        """Store transcripts (episode_id -> (updated_at, transcript))."""
+
 
 class ObjectStorage(Protocol):
     """Abstraction for object storage operations."""
@@ -49,6 +95,16 @@ class ObjectStorage(Protocol):
     ) -> None:
         """Upload object bytes by key."""
 
+    def upload_file_from_path(
+        self,
+        file_path: str,
+        remote_key: str,
+        content_type: str,
+        *,
+        public: bool = True,
+    ) -> None:
+        """Upload a local file by key without reading it into memory."""
+
     def generate_public_url(self, remote_key: str, custom_domain: str | None = None) -> str:
         """Generate a public URL for an object key."""
 
@@ -59,6 +115,9 @@ class BlobSource(Protocol):
     def download_blob_as_bytes(self, bucket_name: str, blob_name: str) -> bytes:
         """Read raw bytes from blob storage."""
 
+    def download_blob(self, bucket_name: str, blob_name: str, destination_file_path: str) -> None:
+        """Write a blob to a local file without holding it in memory."""
+
 
 class SecretProvider(Protocol):
     """Abstraction for secret resolution."""
@@ -70,6 +129,19 @@ class SecretProvider(Protocol):
         """Return webhook URL when configured."""
 
 
+class BatchPredictionGateway(Protocol):
+    """Submits many model requests as one asynchronous batch job."""
+
+    def submit(self, requests: Sequence[BatchPredictionRequest], *, model_id: str, display_name: str) -> str:
+        """Create a batch job for the requests and return its job name."""
+
+    def wait(self, job_name: str) -> None:
+        """Block until the job finishes; raise if it failed, was cancelled or timed out."""
+
+    def fetch_results(self, job_name: str) -> list[BatchPredictionResult]:
+        """Return one result per request of a finished job."""
+
+
 class NotificationGateway(Protocol):
     """Abstraction for outbound notifications."""
 
@@ -77,26 +149,125 @@ class NotificationGateway(Protocol):
         """Send a message and return whether the message was accepted."""
 
 
+class EpisodeLeaseLostError(RuntimeError):
+    """Raised when another run took over the episode's processing lease while this run was working on it."""
+
+
 class EpisodeRepository(Protocol):
     """Persist processing state for a Cloud SQL episode."""
 
     def mark_processing(self, *, podcast_id: str, episode_id: str, source_audio_path: str) -> None:
         """Mark an uploaded episode as processing."""
 
+    def claim_processing(
+        self,
+        *,
+        podcast_id: str,
+        episode_id: str,
+        source_audio_path: str,
+        owner: str,
+        lease_seconds: float,
+    ) -> bool:
+        """Mark the episode as processing and return whether it was claimed.
+
+        別の実行が期限内のリースを保持している場合と、同じ source_audio_path で完了済みの場合は取得しない。
+        """
+
+    def renew_lease(self, *, podcast_id: str, episode_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the processing lease held by owner; return False when the lease was lost."""
+
     def mark_completed(
         self,
         *,
         podcast_id: str,
         episode_id: str,
+        owner: str,
         title: str,
         description: str,
         audio_url: str,
         duration_seconds: int | None,
     ) -> None:
-        """Store published episode metadata and mark processing complete."""
+        """Store published episode metadata and mark processing complete.
+
+        Raises:
+            EpisodeLeaseLostError: owner がリースを保持していない (別の実行に奪われた) 場合。
+        """
+
+    def mark_failed(self, *, podcast_id: str, episode_id: str, owner: str, error_message: str) -> None:
+        """Record a processing failure.
+
+        Raises:
+            EpisodeLeaseLostError: owner がリースを保持していない (別の実行に奪われた) 場合。
+        """
+
+
+class WorkflowCheckpointStore(Protocol):
+    """Persist step outputs of an episode workflow so a retry can resume from the first incomplete step."""
+
+    def load(self, *, podcast_id: str, episode_id: str, source_audio_path: str) -> dict[str, Any]:
+        """Return saved outputs by step name (empty when none exist or they belong to another source file)."""
+
+    def save(self, *, podcast_id: str, episode_id: str, source_audio_path: str, step: str, value: Any) -> None:  # noqa: ANN401
+        """Save the JSON-serializable output of a completed step."""
+
+    def clear(self, *, podcast_id: str, episode_id: str) -> None:
+        """Delete every checkpoint of the episode."""
+
+
+class EpisodeWorkQueue(Protocol):
+    """Queue of uploaded source objects waiting for a long-lived worker."""
+
+    def enqueue(self, object_name: str) -> str:
+        """Add a work item and return its ID."""
+
+    def claim(
+        self, *, worker_id: str, limit: int, visibility_seconds: float, max_attempts: int
+    ) -> list[EpisodeWorkItem]:
+        """Take up to limit items that are queued or whose previous claim has expired.
+
+        取得の期限が切れた項目のうち、すでに max_attempts 回取得されたものは再取得せずに failed にする。
+        """
+
+    def complete(self, item_id: str) -> None:
+        """Mark a claimed item as done."""
+
+    def fail(self, item_id: str, *, error_message: str, retry: bool) -> None:
+        """Record a failure and either requeue the item or mark it as failed."""
+
+
+class TraceSpan(Protocol):
+    """A timed unit of work inside a traced workflow run."""
+
+    def set_attribute(self, key: str, value: str | float | bool) -> None:  # noqa: FBT001
+        """Attach an attribute (e.g. model ID or object key) to the span."""
+
+    def add_bytes(self, size: int) -> None:
+        """Add to the number of bytes read or written by the span."""
+
+
+class Tracer(Protocol):
+    """Records nested spans (duration, bytes and outcome) for workflow steps."""
+
+    def span(self, name: str, **attributes: str | float | bool) -> AbstractContextManager[TraceSpan]:
+        """Open a span that is a child of the current span and ends when the block exits."""
+
+    def flush(self) -> None:
+        """Write buffered spans to the exporters."""
+
+
+class MemoryWindow(Protocol):
+    """Peak resident memory observed while a MemoryMonitor.track() block is open."""
+
+    @property
+    def peak_bytes(self) -> int:
+        """Return the highest resident set size seen so far, in bytes."""
+
+
+class MemoryMonitor(Protocol):
+    """Samples the process resident set size (RSS) while blocks of work run."""
 
-    def mark_failed(self, *, podcast_id: str, episode_id: str, error_message: str) -> None:
-        """Record a processing failure."""
+    def track(self) -> AbstractContextManager[MemoryWindow]:
+        """Record the peak RSS until the block exits."""
 
 
 class DiscordTranscriptSource(Protocol):
@@ -12,26 +12,42 @@ from .agenda import (
     SortPolicy,
     TopicMatch,
 )
-from .common import DiscordMessage, NewsItem, SnsPromotionContent, SnsPromotionsResponse, Summary
-from .episode import EpisodeObjectReference
-from .sns_post import SnsPost
+from .audio import AudioChunk
+from .batch import BatchPredictionRequest, BatchPredictionResult, BatchRequestKind
+from .common import (
+    DiscordMessage,
+    NewsItem,
+    SnsPromotionContent,
+    SnsPromotionsResponse,
+    Summary,
+    SummaryWithPromotions,
+)
+from .episode import EpisodeObjectReference, EpisodeWorkItem
+from .sns_post import SnsPost, SnsPromotionRecord
 
 __all__ = [
     "ActionItem",
     "AgendaMetadata",
     "AgendaResult",
+    "AudioChunk",
+    "BatchPredictionRequest",
+    "BatchPredictionResult",
+    "BatchRequestKind",
     "DiscordMessage",
     "DiscussionPrompt",
     "Episode",
     "EpisodeObjectReference",
+    "EpisodeWorkItem",
     "MentionEvidence",
     "NewsItem",
     "PromptType",
     "SeedTopic",
     "SnsPost",
     "SnsPromotionContent",
+    "SnsPromotionRecord",
     "SnsPromotionsResponse",
     "SortPolicy",
     "Summary",
+    "SummaryWithPromotions",
     "TopicMatch",
 ]
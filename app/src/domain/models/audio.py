@@ -0,0 +1,24 @@
+"""Audio segments exchanged between the converter and the transcript provider."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class AudioChunk:
+    """One segment of a longer recording, encoded as a standalone audio file.
+
+    Attributes:
+        index: 0 始まりのセグメント番号。
+        start_ms: 元音声におけるセグメント開始位置(ミリ秒)。
+        end_ms: 元音声におけるセグメント終了位置(ミリ秒)。
+        data: セグメント単体のエンコード済み音声データ。
+        mime_type: data の MIME タイプ。
+    """
+
+    index: int
+    start_ms: int
+    end_ms: int
+    data: bytes
+    mime_type: str = "audio/mp3"
@@ -0,0 +1,44 @@
+"""Requests and results exchanged with a batch prediction backend."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+class BatchRequestKind(StrEnum):
+    """What a batch request asks the model to generate."""
+
+    TRANSCRIPT = "transcript"
+    SUMMARY = "summary"
+
+
+@dataclass(frozen=True)
+class BatchPredictionRequest:
+    """One model request in a batch job.
+
+    Attributes:
+        key: ジョブ内で結果と対応付けるための一意なキー。
+        kind: 生成する内容 (文字起こしまたは要約)。
+        source_uri: 文字起こし対象の音声の gs:// URI (kind=TRANSCRIPT の場合)。
+        transcript: 要約対象の議事録 (kind=SUMMARY の場合)。
+    """
+
+    key: str
+    kind: BatchRequestKind
+    source_uri: str | None = None
+    transcript: str | None = None
+
+
+@dataclass(frozen=True)
+class BatchPredictionResult:
+    """Model output (or error) for one request of a finished batch job."""
+
+    key: str
+    text: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the request produced output."""
+        return self.error is None and bool(self.text)
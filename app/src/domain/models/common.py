@@ -31,6 +31,13 @@ class SnsPromotionsResponse(BaseModel):
     promotions: list[SnsPromotionContent] = Field(..., description="List of generated promotions.")
 
 
+class SummaryWithPromotions(BaseModel):
+    """Episode summary and SNS promotions generated in one model call."""
+
+    summary: Summary = Field(..., description="Episode title and description.")
+    promotions: list[SnsPromotionContent] = Field(..., description="SNS promotions for the episode.")
+
+
 @dataclass
 class NewsItem:
     """News item fetched from feeds."""
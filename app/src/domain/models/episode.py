@@ -37,3 +37,18 @@ class EpisodeObjectReference:
             filename=match.group("filename"),
             object_path=object_path,
         )
+
+
+@dataclass(frozen=True)
+class EpisodeWorkItem:
+    """A queued request to process one uploaded source object.
+
+    Attributes:
+        item_id: キュー内で一意な ID。
+        object_name: 処理するソース音声のオブジェクト名 (GCS_TRIGGER_OBJECT_NAME と同じ形式)。
+        attempts: この取得を含む取得回数。
+    """
+
+    item_id: str
+    object_name: str
+    attempts: int
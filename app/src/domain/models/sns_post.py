@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+
 DEFAULT_HASHTAGS = ["#Podcast", "#新着エピソード", "#議事録"]
 
 PLATFORM_LABELS = {
@@ -11,6 +13,20 @@ PLATFORM_LABELS = {
 }
 
 
+@dataclass(frozen=True)
+class SnsPromotionRecord:
+    """An SNS promotion stored for the promoter job to post at scheduled_time (ISO 8601)."""
+
+    promotion_id: str
+    generated_at: str
+    scheduled_time: str
+    episode_number: int
+    message: str
+    hashtags: list[str]
+    platform_urls: dict[str, str] = field(default_factory=dict)
+    status: str = "pending"
+
+
 class SnsPost:
     """Represents a scheduled SNS post."""
 
@@ -12,7 +12,10 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from infrastructure.discord_fetcher import DiscordFetcher
+from infrastructure.episode_transcript_cache import GcsEpisodeTranscriptCache, SqliteEpisodeTranscriptCache
 from infrastructure.notifier import Notifier
+from infrastructure.rate_limiter import FirestoreRateBudget, build_rate_limiter
+from infrastructure.storage import GCSClient
 from services.agenda_formatter import format_agenda_message
 from services.firestore_manager import FirestoreManager
 from services.news_fetcher import DEFAULT_RSS_SOURCES, NewsFetcher
@@ -22,6 +25,7 @@ from services.transcript_analyzer import AgendaResult, Episode, TranscriptAnalyz
 from usecases import GenerateWeeklyAgendaUsecase
 
 if TYPE_CHECKING:
+    from domain.interfaces import EpisodeTranscriptCache
     from services.news_relevance import NewsCandidate
 
 
@@ -47,11 +51,16 @@ class AgendaEnvConfig:
     transcript_fetch_limit: int
     debug_json_path: str | None
     gcp_project_id: str | None
+    ai_rate_limits: str = ""
+    ai_rate_limit_backend: str = "local"
+    transcript_cache_backend: str = "none"
+    transcript_cache_path: str = ".cache/agenda_transcripts.sqlite3"
+    transcript_cache_uri: str | None = None
 
 
 def _load_agenda_env() -> AgendaEnvConfig:
     """Load environment variables for weekly agenda job."""
-    return AgendaEnvConfig(
+    config = AgendaEnvConfig(
         project_id=os.environ.get("PROJECT_ID"),
         podcast_id=os.environ.get("PODCAST_ID"),
         discord_webhook_agenda_url=os.environ.get("DISCORD_WEBHOOK_AGENDA_URL"),
@@ -60,8 +69,37 @@ def _load_agenda_env() -> AgendaEnvConfig:
         transcript_fetch_limit=int(os.environ.get("TRANSCRIPT_FETCH_LIMIT", "50")),
         debug_json_path=os.environ.get("DEBUG_JSON_PATH"),
         gcp_project_id=os.environ.get("GOOGLE_CLOUD_PROJECT"),
+        ai_rate_limits=os.environ.get("AI_RATE_LIMITS", ""),
+        ai_rate_limit_backend=os.environ.get("AI_RATE_LIMIT_BACKEND", "local").lower(),
+        transcript_cache_backend=os.environ.get("AGENDA_TRANSCRIPT_CACHE_BACKEND", "none").lower(),
+        transcript_cache_path=os.environ.get("AGENDA_TRANSCRIPT_CACHE_PATH", ".cache/agenda_transcripts.sqlite3"),
+        transcript_cache_uri=os.environ.get("AGENDA_TRANSCRIPT_CACHE_URI") or None,
     )
 
+    if config.transcript_cache_backend not in {"none", "local", "gcs"}:
+        msg = "AGENDA_TRANSCRIPT_CACHE_BACKEND must be one of: none, local, gcs."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if config.transcript_cache_backend == "gcs" and not (config.transcript_cache_uri or "").startswith("gs://"):
+        msg = "AGENDA_TRANSCRIPT_CACHE_URI must be a gs:// URI when AGENDA_TRANSCRIPT_CACHE_BACKEND=gcs."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    return config
+
+
+def _build_transcript_cache(cfg: AgendaEnvConfig) -> EpisodeTranscriptCache | None:
+    """Build the read-through cache for Firestore transcripts (None when disabled)."""
+    if cfg.transcript_cache_backend == "local":
+        return SqliteEpisodeTranscriptCache(cfg.transcript_cache_path)
+    if cfg.transcript_cache_backend == "gcs" and cfg.transcript_cache_uri:
+        try:
+            return GcsEpisodeTranscriptCache(gcs_client=GCSClient(cfg.project_id), gcs_uri=cfg.transcript_cache_uri)
+        except Exception:  # noqa: BLE001 - キャッシュなしでも Firestore から全件読めば動く
+            logger.warning("Failed to load the transcript cache. Continuing without it.", exc_info=True)
+    return None
+
 
 def _build_agenda_from_episodes(
     *,
@@ -107,6 +145,7 @@ def _fetch_from_firestore(
     *,
     cfg: AgendaEnvConfig,
     firestore_manager: FirestoreManager | None,
+    transcript_cache: EpisodeTranscriptCache | None = None,
 ) -> tuple[AgendaResult | None, list[str], list[NewsCandidate]]:
     """Fetch stored transcripts from Firestore and build an agenda."""
     if firestore_manager is None or not cfg.podcast_id:
@@ -116,7 +155,13 @@ def _fetch_from_firestore(
     raw_episodes = firestore_manager.list_recent_transcript_episodes(
         podcast_id=cfg.podcast_id,
         limit=cfg.transcript_fetch_limit,
+        transcript_cache=transcript_cache,
     )
+    if isinstance(transcript_cache, GcsEpisodeTranscriptCache):
+        try:
+            transcript_cache.persist()
+        except Exception:  # noqa: BLE001
+            logger.warning("Failed to upload the transcript cache.", exc_info=True)
     if not raw_episodes:
         logger.info("Firestore に agenda 生成対象の transcripts がありません。")
         return None, [], []
@@ -175,11 +220,13 @@ def _fetch_from_discord(cfg: AgendaEnvConfig) -> tuple[AgendaResult | None, list
 def _fetch_and_reconstruct(
     cfg: AgendaEnvConfig,
     firestore_manager: FirestoreManager | None,
+    transcript_cache: EpisodeTranscriptCache | None = None,
 ) -> tuple[AgendaResult | None, list[str], list[NewsCandidate]]:
     """Fetch transcripts from Firestore first, falling back to Discord."""
     firestore_result, firestore_warnings, firestore_news = _fetch_from_firestore(
         cfg=cfg,
         firestore_manager=firestore_manager,
+        transcript_cache=transcript_cache,
     )
     if firestore_result is not None:
         return firestore_result, firestore_warnings, firestore_news
@@ -209,6 +256,7 @@ def send_weekly_agenda() -> None:
 
     notifier = Notifier(discord_webhook_url=cfg.discord_webhook_agenda_url)
     firestore_manager = FirestoreManager(project_id=cfg.project_id) if cfg.project_id and cfg.podcast_id else None
+    transcript_cache = _build_transcript_cache(cfg) if firestore_manager is not None else None
     usecase = GenerateWeeklyAgendaUsecase(
         notifier=notifier,
         firestore_manager=firestore_manager,
@@ -216,7 +264,7 @@ def send_weekly_agenda() -> None:
     )
 
     def build_agenda_message() -> tuple[str, AgendaResult | None, list[NewsCandidate], list[dict[str, object]] | None]:
-        result, _warnings, news_candidates = _fetch_and_reconstruct(cfg, firestore_manager)
+        result, _warnings, news_candidates = _fetch_and_reconstruct(cfg, firestore_manager, transcript_cache)
         if result is None:
             return AGENDA_MESSAGE, None, [], None
 
@@ -233,7 +281,15 @@ def send_weekly_agenda() -> None:
         related_news: list[dict[str, object]] | None = None
         if cfg.gcp_project_id and result.recurring_themes:
             try:
-                researcher = AINewsResearcher(project_id=cfg.gcp_project_id)
+                researcher = AINewsResearcher(
+                    project_id=cfg.gcp_project_id,
+                    rate_limiter=build_rate_limiter(
+                        cfg.ai_rate_limits,
+                        shared_budget=FirestoreRateBudget(client=firestore_manager.client)
+                        if cfg.ai_rate_limit_backend == "firestore" and firestore_manager is not None
+                        else None,
+                    ),
+                )
                 research_result = researcher.research_with_sources(result.recurring_themes)
                 ai_news_section = research_result.text
                 if research_result.related_news:
@@ -0,0 +1,179 @@
+"""Archive backfill entrypoint: regenerate transcripts and summaries with batch prediction."""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from google import genai
+
+from infrastructure.batch_prediction import (
+    LocalBatchPredictionGateway,
+    VertexBatchPredictionClient,
+    interactive_responder,
+)
+from infrastructure.model_call import ModelCaller
+from infrastructure.secret_manager import SecretManagerClient
+from infrastructure.storage import GCSClient, R2Client, read_manifest
+from services.firestore_manager import FirestoreManager
+from services.rss_manager import PodcastRssManager
+from usecases import BackfillEpisodesInput, BackfillEpisodesUsecase
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from domain.interfaces import BatchPredictionGateway
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+
+
+@dataclass(frozen=True)
+class BackfillEnvConfig:
+    """Resolved environment variables for the archive backfill job."""
+
+    project_id: str
+    manifest: str
+    r2_bucket: str
+    r2_key_prefix: str
+    r2_endpoint_url: str
+    secret_name: str | None
+    r2_access_key_id: str | None
+    r2_secret_access_key: str | None
+    ai_model_id: str = "gemini-2.5-flash"
+    location: str = "us-central1"
+    batch_backend: str = "vertex"
+    staging_uri: str | None = None
+    regenerate_transcripts: bool = True
+    poll_seconds: float = 60.0
+    timeout_seconds: float = 24 * 3600.0
+
+
+def _required_env(environ: Mapping[str, str], key: str) -> str:
+    """Return required environment value or raise ValueError."""
+    value = environ.get(key)
+    if value is None:
+        msg = f"{key} environment variable is required."
+        logger.error(msg)
+        raise ValueError(msg)
+    return value
+
+
+def _env_flag(environ: Mapping[str, str], key: str, *, default: bool = False) -> bool:
+    """Return a boolean environment flag ("1", "true", "yes" and "on" are truthy)."""
+    value = environ.get(key)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _load_backfill_env(environ: Mapping[str, str]) -> BackfillEnvConfig:
+    """Load and validate environment variables for the backfill job."""
+    r2_account_id = environ.get("CLOUDFLARE_ACCOUNT_ID", "8ed20f6872cea7c9219d68bfcf5f98ae")
+    config = BackfillEnvConfig(
+        project_id=_required_env(environ, "PROJECT_ID"),
+        manifest=_required_env(environ, "BACKFILL_MANIFEST"),
+        r2_bucket=_required_env(environ, "R2_BUCKET"),
+        r2_key_prefix=environ.get("R2_KEY_PREFIX", "test"),
+        r2_endpoint_url=environ.get("R2_ENDPOINT_URL", f"https://{r2_account_id}.r2.cloudflarestorage.com"),
+        secret_name=environ.get("SECRET_NAME"),
+        r2_access_key_id=environ.get("CLOUDFLARE_ACCESS_KEY_ID"),
+        r2_secret_access_key=environ.get("CLOUDFLARE_SECRET_ACCESS_KEY"),
+        ai_model_id=environ.get("AI_MODEL_ID", "gemini-2.5-flash"),
+        location=environ.get("GOOGLE_CLOUD_REGION", "us-central1"),
+        batch_backend=environ.get("BACKFILL_BATCH_BACKEND", "vertex").lower(),
+        staging_uri=environ.get("BACKFILL_STAGING_URI") or None,
+        regenerate_transcripts=_env_flag(environ, "BACKFILL_REGENERATE_TRANSCRIPTS", default=True),
+        poll_seconds=float(environ.get("BACKFILL_POLL_SECONDS", "60")),
+        timeout_seconds=float(environ.get("BACKFILL_TIMEOUT_SECONDS", "86400")),
+    )
+
+    if config.secret_name is None and (config.r2_access_key_id is None or config.r2_secret_access_key is None):
+        msg = "Either SECRET_NAME or both R2_ACCESS_KEY_ID and R2_SECRET_ACCESS_KEY must be provided."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if config.batch_backend not in {"vertex", "local"}:
+        msg = "BACKFILL_BATCH_BACKEND must be one of: vertex, local."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if config.batch_backend == "vertex" and not (config.staging_uri or "").startswith("gs://"):
+        msg = "BACKFILL_STAGING_URI (gs://...) is required when BACKFILL_BATCH_BACKEND=vertex."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    return config
+
+
+def _build_batch_gateway(config: BackfillEnvConfig, *, gcs_client: GCSClient) -> BatchPredictionGateway:
+    """Create the Vertex AI batch client, or the local gateway that calls the model one request at a time."""
+    client = genai.Client(vertexai=True, project=config.project_id, location=config.location)
+    if config.batch_backend == "local":
+        return LocalBatchPredictionGateway(interactive_responder(ModelCaller(client)))
+    return VertexBatchPredictionClient(
+        client=client,
+        gcs_client=gcs_client,
+        staging_uri=config.staging_uri or "",
+        poll_interval_seconds=config.poll_seconds,
+        timeout_seconds=config.timeout_seconds,
+    )
+
+
+def backfill_episodes() -> None:
+    """Regenerate AI output for the episodes listed in BACKFILL_MANIFEST."""
+    config = _load_backfill_env(os.environ)
+    logger.info(
+        "Backfill: manifest=%s backend=%s model=%s regenerate_transcripts=%s",
+        config.manifest,
+        config.batch_backend,
+        config.ai_model_id,
+        config.regenerate_transcripts,
+    )
+
+    if config.secret_name:
+        r2_access_key, r2_secret_key = SecretManagerClient(
+            project_id=config.project_id,
+            secret_name=config.secret_name,
+        ).get_r2_credentials()
+    else:
+        r2_access_key = config.r2_access_key_id
+        r2_secret_key = config.r2_secret_access_key
+
+    gcs_client = GCSClient(project_id=config.project_id)
+    source_uris = read_manifest(config.manifest, gcs_client=gcs_client)
+    usecase = BackfillEpisodesUsecase(
+        batch_gateway=_build_batch_gateway(config, gcs_client=gcs_client),
+        firestore_manager=FirestoreManager(project_id=config.project_id),
+        object_storage=R2Client(
+            project_id=config.project_id,
+            endpoint_url=config.r2_endpoint_url,
+            bucket_name=config.r2_bucket,
+            access_key=r2_access_key,
+            secret_key=r2_secret_key,
+        ),
+        rss_manager_factory=PodcastRssManager,
+        logger=logger,
+    )
+    report = usecase.run(
+        BackfillEpisodesInput(
+            source_uris=source_uris,
+            ai_model_id=config.ai_model_id,
+            r2_key_prefix=config.r2_key_prefix,
+            regenerate_transcripts=config.regenerate_transcripts,
+        ),
+    )
+    if report.failed:
+        msg = f"Backfill failed for {len(report.failed)} of {len(source_uris)} episodes."
+        raise RuntimeError(msg)
+
+
+def main() -> None:
+    """Main entry point."""
+    backfill_episodes()
+
+
+if __name__ == "__main__":
+    main()
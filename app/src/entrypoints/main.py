@@ -12,18 +12,43 @@ import urllib.request
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-from infrastructure.ai_analyzer import AudioAnalyzer
-from infrastructure.episode_repository import PostgresEpisodeRepository
+from domain.models import EpisodeObjectReference
+from infrastructure.ai_analyzer import AudioAnalyzer, SummaryBudget, TranscriptChunking
+from infrastructure.context_cache import ContextCaching
+from infrastructure.episode_repository import PostgresEpisodeRepository, PostgresWorkflowCheckpointStore
+from infrastructure.gemini_stream import StreamProgressLogger
+from infrastructure.memory import RssMonitor
+from infrastructure.model_call import ModelCallPolicy
 from infrastructure.notifier import Notifier
+from infrastructure.rate_limiter import FirestoreRateBudget, RateLimiter, build_rate_limiter
 from infrastructure.secret_manager import SecretManagerClient
-from infrastructure.storage import GCSClient, R2Client, get_audio_info
+from infrastructure.storage import (
+    GCSClient,
+    R2Client,
+    get_audio_file_info,
+    get_audio_info,
+    read_manifest,
+    split_gcs_uri,
+)
+from infrastructure.tracing import JsonLogSpanExporter, OtlpJsonFileExporter, SpanExporter, SpanTracer
+from infrastructure.transcript_cache import CachedTranscriptProvider, FirestoreTranscriptCache, LocalTranscriptCache
+from infrastructure.transcript_recording import RecordingTranscriptProvider
+from infrastructure.workflow_checkpoint import FirestoreWorkflowCheckpointStore, LocalWorkflowCheckpointStore
 from services.audio_converter import AudioConverter
-from services.firestore_manager import FirestoreManager
+from services.firestore_manager import AsyncFirestoreManager, FirestoreManager
 from services.rss_manager import PodcastRssManager
-from usecases import ProcessPodcastWorkflow, ProcessPodcastWorkflowInput
+from usecases import (
+    MemoryBudget,
+    ProcessPodcastBatchInput,
+    ProcessPodcastBatchUsecase,
+    ProcessPodcastWorkflow,
+    ProcessPodcastWorkflowInput,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Mapping, Sequence
+
+    from domain.interfaces import Tracer, TranscriptCache, TranscriptProvider, WorkflowCheckpointStore
 
 
 logger = logging.getLogger(__name__)
@@ -49,6 +74,41 @@ class PodcastEnvConfig:
     ai_model_id: str
     r2_custom_domain: str
     sns_promotion_count: int
+    transcript_cache_backend: str = "firestore"
+    transcript_cache_dir: str = ".cache/transcripts"
+    transcript_cache_refresh: bool = False
+    transcript_chunk_seconds: int = 0
+    transcript_chunk_overlap_seconds: int = 15
+    transcript_chunk_workers: int = 4
+    ai_streaming: bool = False
+    ai_combined_summary: bool = False
+    summary_token_budget: int = 120_000
+    summary_section_tokens: int = 30_000
+    ai_call_timeout_seconds: float = 600.0
+    ai_call_deadline_seconds: float = 1500.0
+    ai_call_max_attempts: int = 4
+    ai_call_hedge_percentile: float | None = None
+    ai_rate_limits: str = ""
+    ai_rate_limit_backend: str = "local"
+    transcript_record_dir: str | None = None
+    ai_context_cache_ttl_seconds: int = 0
+    ai_context_cache_min_tokens: int = 4096
+    workflow_checkpoint_backend: str = "none"
+    workflow_checkpoint_dir: str = ".cache/checkpoints"
+    workflow_trace_log: bool = False
+    workflow_trace_file: str | None = None
+    batch_source_prefix: str | None = None
+    batch_manifest: str | None = None
+    batch_max_parallel_episodes: int = 2
+    episode_lease_seconds: float = 900.0
+    workflow_memory_budget_mb: int = 0
+    workflow_temp_dir: str | None = None
+    firestore_async_writes: bool = False
+
+    @property
+    def batch_mode(self) -> bool:
+        """Return whether the job processes a prefix or manifest instead of a single trigger object."""
+        return bool(self.batch_source_prefix or self.batch_manifest)
 
 
 def _required_env(environ: Mapping[str, str], key: str) -> str:
@@ -61,12 +121,34 @@ def _required_env(environ: Mapping[str, str], key: str) -> str:
     return value
 
 
-def _load_podcast_env(environ: Mapping[str, str]) -> PodcastEnvConfig:
-    """Load and validate environment variables for podcast workflow."""
+def _env_flag(environ: Mapping[str, str], key: str, *, default: bool = False) -> bool:
+    """Return a boolean environment flag ("1", "true", "yes" and "on" are truthy)."""
+    value = environ.get(key)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def load_podcast_env(environ: Mapping[str, str], *, require_trigger_object: bool = True) -> PodcastEnvConfig:
+    """Load and validate environment variables for podcast workflow.
+
+    require_trigger_object=False はキューから処理対象を受け取るワーカー用。
+    """
     project_id = _required_env(environ, "PROJECT_ID")
     database_url = _required_env(environ, "DATABASE_URL")
     gcs_bucket = _required_env(environ, "GCS_BUCKET")
-    gcs_trigger_object_name = _required_env(environ, "GCS_TRIGGER_OBJECT_NAME")
+    batch_source_prefix = environ.get("BATCH_SOURCE_PREFIX") or None
+    batch_manifest = environ.get("BATCH_MANIFEST") or None
+    batch_max_parallel_episodes = int(environ.get("BATCH_MAX_PARALLEL_EPISODES", "2"))
+    episode_lease_seconds = float(environ.get("EPISODE_LEASE_SECONDS", "900"))
+    workflow_memory_budget_mb = int(environ.get("WORKFLOW_MEMORY_BUDGET_MB", "0"))
+    workflow_temp_dir = environ.get("WORKFLOW_TEMP_DIR") or None
+    firestore_async_writes = _env_flag(environ, "FIRESTORE_ASYNC_WRITES")
+    # バッチ実行では処理対象をプレフィックスかマニフェストから決めるため、トリガーオブジェクトは不要
+    if batch_source_prefix or batch_manifest or not require_trigger_object:
+        gcs_trigger_object_name = environ.get("GCS_TRIGGER_OBJECT_NAME", "")
+    else:
+        gcs_trigger_object_name = _required_env(environ, "GCS_TRIGGER_OBJECT_NAME")
     r2_bucket = _required_env(environ, "R2_BUCKET")
 
     sns_schedule_offset_hours = int(environ.get("SNS_SCHEDULE_OFFSET_HOURS", "1"))
@@ -80,12 +162,96 @@ def _load_podcast_env(environ: Mapping[str, str]) -> PodcastEnvConfig:
     ai_model_id = environ.get("AI_MODEL_ID", "gemini-2.5-flash")
     r2_custom_domain = environ.get("R2_CUSTOM_DOMAIN", "podcast.sunabalog.com")
     sns_promotion_count = int(environ.get("SNS_PROMOTION_COUNT", "3"))
+    transcript_cache_backend = environ.get("TRANSCRIPT_CACHE_BACKEND", "firestore").lower()
+    transcript_cache_dir = environ.get("TRANSCRIPT_CACHE_DIR", ".cache/transcripts")
+    transcript_cache_refresh = _env_flag(environ, "TRANSCRIPT_CACHE_REFRESH")
+    transcript_chunk_seconds = int(environ.get("TRANSCRIPT_CHUNK_SECONDS", "0"))
+    transcript_chunk_overlap_seconds = int(environ.get("TRANSCRIPT_CHUNK_OVERLAP_SECONDS", "15"))
+    transcript_chunk_workers = int(environ.get("TRANSCRIPT_CHUNK_WORKERS", "4"))
+    ai_streaming = _env_flag(environ, "AI_STREAMING")
+    ai_combined_summary = _env_flag(environ, "AI_COMBINED_SUMMARY")
+    summary_token_budget = int(environ.get("SUMMARY_TOKEN_BUDGET", "120000"))
+    summary_section_tokens = int(environ.get("SUMMARY_SECTION_TOKENS", "30000"))
+    ai_call_timeout_seconds = float(environ.get("AI_CALL_TIMEOUT_SECONDS", "600"))
+    ai_call_deadline_seconds = float(environ.get("AI_CALL_DEADLINE_SECONDS", "1500"))
+    ai_call_max_attempts = int(environ.get("AI_CALL_MAX_ATTEMPTS", "4"))
+    ai_call_hedge_percentile_value = environ.get("AI_CALL_HEDGE_PERCENTILE", "").strip()
+    ai_call_hedge_percentile = float(ai_call_hedge_percentile_value) if ai_call_hedge_percentile_value else None
+    ai_rate_limits = environ.get("AI_RATE_LIMITS", "")
+    ai_rate_limit_backend = environ.get("AI_RATE_LIMIT_BACKEND", "local").lower()
+    transcript_record_dir = environ.get("TRANSCRIPT_RECORD_DIR") or None
+    ai_context_cache_ttl_seconds = int(environ.get("AI_CONTEXT_CACHE_TTL_SECONDS", "0"))
+    ai_context_cache_min_tokens = int(environ.get("AI_CONTEXT_CACHE_MIN_TOKENS", "4096"))
+    workflow_checkpoint_backend = environ.get("WORKFLOW_CHECKPOINT_BACKEND", "none").lower()
+    workflow_checkpoint_dir = environ.get("WORKFLOW_CHECKPOINT_DIR", ".cache/checkpoints")
+    workflow_trace_log = _env_flag(environ, "WORKFLOW_TRACE_LOG")
+    workflow_trace_file = environ.get("WORKFLOW_TRACE_FILE") or None
 
     if secret_name is None and (r2_access_key_id is None or r2_secret_access_key is None):
         msg = "Either SECRET_NAME or both R2_ACCESS_KEY_ID and R2_SECRET_ACCESS_KEY must be provided."
         logger.error(msg)
         raise ValueError(msg)
 
+    if transcript_cache_backend not in {"firestore", "local", "none"}:
+        msg = "TRANSCRIPT_CACHE_BACKEND must be one of: firestore, local, none."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if transcript_chunk_seconds and transcript_chunk_seconds <= transcript_chunk_overlap_seconds:
+        msg = "TRANSCRIPT_CHUNK_SECONDS must be greater than TRANSCRIPT_CHUNK_OVERLAP_SECONDS."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if summary_token_budget and not 0 < summary_section_tokens < summary_token_budget:
+        msg = "SUMMARY_SECTION_TOKENS must be positive and smaller than SUMMARY_TOKEN_BUDGET."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if ai_call_hedge_percentile is not None and not 0 < ai_call_hedge_percentile < 1:
+        msg = "AI_CALL_HEDGE_PERCENTILE must be between 0 and 1 (e.g. 0.95)."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if ai_rate_limit_backend not in {"local", "firestore"}:
+        msg = "AI_RATE_LIMIT_BACKEND must be one of: local, firestore."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if workflow_checkpoint_backend not in {"none", "local", "firestore", "postgres"}:
+        msg = "WORKFLOW_CHECKPOINT_BACKEND must be one of: none, local, firestore, postgres."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if ai_context_cache_ttl_seconds < 0:
+        msg = "AI_CONTEXT_CACHE_TTL_SECONDS must be zero (disabled) or positive."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if batch_source_prefix and batch_manifest:
+        msg = "Set only one of BATCH_SOURCE_PREFIX and BATCH_MANIFEST."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if episode_lease_seconds <= 0:
+        msg = "EPISODE_LEASE_SECONDS must be positive."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if workflow_memory_budget_mb < 0:
+        msg = "WORKFLOW_MEMORY_BUDGET_MB must not be negative."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if batch_max_parallel_episodes < 1:
+        msg = "BATCH_MAX_PARALLEL_EPISODES must be at least 1."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if transcript_chunk_workers < 1:
+        msg = "TRANSCRIPT_CHUNK_WORKERS must be at least 1."
+        logger.error(msg)
+        raise ValueError(msg)
+
     return PodcastEnvConfig(
         project_id=project_id,
         database_url=database_url,
@@ -102,10 +268,40 @@ def _load_podcast_env(environ: Mapping[str, str]) -> PodcastEnvConfig:
         ai_model_id=ai_model_id,
         r2_custom_domain=r2_custom_domain,
         sns_promotion_count=sns_promotion_count,
+        transcript_cache_backend=transcript_cache_backend,
+        transcript_cache_dir=transcript_cache_dir,
+        transcript_cache_refresh=transcript_cache_refresh,
+        transcript_chunk_seconds=transcript_chunk_seconds,
+        transcript_chunk_overlap_seconds=transcript_chunk_overlap_seconds,
+        transcript_chunk_workers=transcript_chunk_workers,
+        ai_streaming=ai_streaming,
+        ai_combined_summary=ai_combined_summary,
+        summary_token_budget=summary_token_budget,
+        summary_section_tokens=summary_section_tokens,
+        ai_call_timeout_seconds=ai_call_timeout_seconds,
+        ai_call_deadline_seconds=ai_call_deadline_seconds,
+        ai_call_max_attempts=ai_call_max_attempts,
+        ai_call_hedge_percentile=ai_call_hedge_percentile,
+        ai_rate_limits=ai_rate_limits,
+        ai_rate_limit_backend=ai_rate_limit_backend,
+        transcript_record_dir=transcript_record_dir,
+        ai_context_cache_ttl_seconds=ai_context_cache_ttl_seconds,
+        ai_context_cache_min_tokens=ai_context_cache_min_tokens,
+        workflow_checkpoint_backend=workflow_checkpoint_backend,
+        workflow_checkpoint_dir=workflow_checkpoint_dir,
+        workflow_trace_log=workflow_trace_log,
+        workflow_trace_file=workflow_trace_file,
+        batch_source_prefix=batch_source_prefix,
+        batch_manifest=batch_manifest,
+        batch_max_parallel_episodes=batch_max_parallel_episodes,
+        episode_lease_seconds=episode_lease_seconds,
+        workflow_memory_budget_mb=workflow_memory_budget_mb,
+        workflow_temp_dir=workflow_temp_dir,
+        firestore_async_writes=firestore_async_writes,
     )
 
 
-def _log_environment(config: PodcastEnvConfig) -> None:
+def log_environment(config: PodcastEnvConfig) -> None:
     """Log resolved environment settings."""
     logger.info("## Environment Variables ##")
     logger.info("PROJECT_ID: %s", config.project_id)
@@ -120,6 +316,31 @@ def _log_environment(config: PodcastEnvConfig) -> None:
     logger.info("AI_MODEL_ID: %s", config.ai_model_id)
     logger.info("R2_CUSTOM_DOMAIN: %s", config.r2_custom_domain)
     logger.info("SNS_PROMOTION_COUNT: %s", config.sns_promotion_count)
+    logger.info("TRANSCRIPT_CACHE_BACKEND: %s", config.transcript_cache_backend)
+    logger.info("TRANSCRIPT_CACHE_REFRESH: %s", config.transcript_cache_refresh)
+    logger.info("TRANSCRIPT_CHUNK_SECONDS: %s", config.transcript_chunk_seconds)
+    logger.info("TRANSCRIPT_CHUNK_WORKERS: %s", config.transcript_chunk_workers)
+    logger.info("AI_STREAMING: %s", config.ai_streaming)
+    logger.info("AI_COMBINED_SUMMARY: %s", config.ai_combined_summary)
+    logger.info("SUMMARY_TOKEN_BUDGET: %s", config.summary_token_budget)
+    logger.info("AI_CALL_TIMEOUT_SECONDS: %s", config.ai_call_timeout_seconds)
+    logger.info("AI_CALL_DEADLINE_SECONDS: %s", config.ai_call_deadline_seconds)
+    logger.info("AI_CALL_MAX_ATTEMPTS: %s", config.ai_call_max_attempts)
+    logger.info("AI_CALL_HEDGE_PERCENTILE: %s", config.ai_call_hedge_percentile)
+    logger.info("AI_RATE_LIMITS: %s", config.ai_rate_limits)
+    logger.info("AI_RATE_LIMIT_BACKEND: %s", config.ai_rate_limit_backend)
+    logger.info("TRANSCRIPT_RECORD_DIR: %s", config.transcript_record_dir)
+    logger.info("AI_CONTEXT_CACHE_TTL_SECONDS: %s", config.ai_context_cache_ttl_seconds)
+    logger.info("WORKFLOW_CHECKPOINT_BACKEND: %s", config.workflow_checkpoint_backend)
+    logger.info("WORKFLOW_TRACE_LOG: %s", config.workflow_trace_log)
+    logger.info("WORKFLOW_TRACE_FILE: %s", config.workflow_trace_file)
+    logger.info("BATCH_SOURCE_PREFIX: %s", config.batch_source_prefix)
+    logger.info("BATCH_MANIFEST: %s", config.batch_manifest)
+    logger.info("BATCH_MAX_PARALLEL_EPISODES: %s", config.batch_max_parallel_episodes)
+    logger.info("EPISODE_LEASE_SECONDS: %s", config.episode_lease_seconds)
+    logger.info("WORKFLOW_MEMORY_BUDGET_MB: %s", config.workflow_memory_budget_mb)
+    logger.info("WORKFLOW_TEMP_DIR: %s", config.workflow_temp_dir)
+    logger.info("FIRESTORE_ASYNC_WRITES: %s", config.firestore_async_writes)
     logger.info("###########################\n")
 
 
@@ -169,11 +390,178 @@ def send_discord_notification(
         logger.exception("Failed to send Discord notification")
 
 
-def process_podcast_workflow() -> None:
-    """GCSへのファイルアップロードをトリガーに実行されるメイン関数."""
-    config = _load_podcast_env(os.environ)
-    _log_environment(config)
+def _build_audio_analyzer(
+    config: PodcastEnvConfig,
+    *,
+    gcs_client: GCSClient,
+    rate_limiter: RateLimiter | None = None,
+) -> AudioAnalyzer:
+    """Create the analyzer with the configured chunking and streaming modes."""
+    chunking = None
+    if config.transcript_chunk_seconds:
+        chunking = TranscriptChunking(
+            segment_seconds=config.transcript_chunk_seconds,
+            overlap_seconds=config.transcript_chunk_overlap_seconds,
+            max_workers=config.transcript_chunk_workers,
+        )
+    return AudioAnalyzer(
+        project_id=config.project_id,
+        chunking=chunking,
+        blob_source=gcs_client,
+        audio_segmenter=AudioConverter.split_segments,
+        streaming=config.ai_streaming,
+        on_stream_text=StreamProgressLogger() if config.ai_streaming else None,
+        summary_budget=SummaryBudget(
+            max_input_tokens=config.summary_token_budget,
+            section_tokens=config.summary_section_tokens,
+            max_workers=config.transcript_chunk_workers,
+        )
+        if config.summary_token_budget
+        else None,
+        call_policy=ModelCallPolicy(
+            deadline_seconds=config.ai_call_deadline_seconds,
+            attempt_timeout_seconds=config.ai_call_timeout_seconds,
+            max_attempts=config.ai_call_max_attempts,
+            hedge_percentile=config.ai_call_hedge_percentile,
+        ),
+        rate_limiter=rate_limiter,
+        context_caching=ContextCaching(
+            ttl_seconds=config.ai_context_cache_ttl_seconds,
+            min_tokens=config.ai_context_cache_min_tokens,
+        )
+        if config.ai_context_cache_ttl_seconds
+        else None,
+    )
+
+
+def _build_checkpoint_store(
+    config: PodcastEnvConfig,
+    *,
+    firestore_manager: FirestoreManager,
+) -> WorkflowCheckpointStore | None:
+    """Create the configured workflow checkpoint backend."""
+    if config.workflow_checkpoint_backend == "local":
+        return LocalWorkflowCheckpointStore(config.workflow_checkpoint_dir)
+    if config.workflow_checkpoint_backend == "firestore":
+        return FirestoreWorkflowCheckpointStore(client=firestore_manager.client)
+    if config.workflow_checkpoint_backend == "postgres":
+        return PostgresWorkflowCheckpointStore(database_url=config.database_url)
+    return None
+
+
+def _build_tracer(config: PodcastEnvConfig) -> Tracer | None:
+    """Create the span tracer, or None when no trace exporter is enabled."""
+    exporters: list[SpanExporter] = []
+    if config.workflow_trace_log:
+        exporters.append(JsonLogSpanExporter())
+    if config.workflow_trace_file:
+        exporters.append(OtlpJsonFileExporter(config.workflow_trace_file))
+    return SpanTracer(exporters) if exporters else None
+
+
+def _build_memory_budget(config: PodcastEnvConfig) -> MemoryBudget | None:
+    """Create the memory budget settings, or None when WORKFLOW_MEMORY_BUDGET_MB is not set."""
+    if not config.workflow_memory_budget_mb:
+        return None
+    return MemoryBudget(
+        limit_bytes=config.workflow_memory_budget_mb * 2**20,
+        audio_file_converter=AudioConverter.convert_file_to_mp3,
+        audio_file_info_reader=get_audio_file_info,
+        memory_monitor=RssMonitor(),
+        temp_dir=config.workflow_temp_dir,
+    )
+
+
+def _build_transcript_provider(
+    config: PodcastEnvConfig,
+    *,
+    audio_analyzer: AudioAnalyzer,
+    gcs_client: GCSClient,
+    firestore_manager: FirestoreManager,
+) -> TranscriptProvider:
+    """Wrap the analyzer with the optional fixture recorder and the configured transcript cache backend."""
+    inner: TranscriptProvider = audio_analyzer
+    if config.transcript_record_dir:
+        # キャッシュより内側で記録し、実際の Gemini 呼び出しとそのレイテンシだけをフィクスチャにする
+        inner = RecordingTranscriptProvider(inner=audio_analyzer, fixture_dir=config.transcript_record_dir)
+
+    cache: TranscriptCache
+    if config.transcript_cache_backend == "none":
+        return inner
+    if config.transcript_cache_backend == "local":
+        cache = LocalTranscriptCache(config.transcript_cache_dir)
+    else:
+        cache = FirestoreTranscriptCache(client=firestore_manager.client)
+
+    return CachedTranscriptProvider(
+        inner=inner,
+        cache=cache,
+        source_fingerprint=lambda source_uri: gcs_client.get_blob_fingerprint(*split_gcs_uri(source_uri)),
+        prompt_version=audio_analyzer.prompt_version,
+    )
+
+
+def _batch_object_names(config: PodcastEnvConfig, *, gcs_client: GCSClient) -> list[str]:
+    """Return the source objects of a batch run (manifest order, or upload order for a prefix)."""
+    if config.batch_manifest:
+        object_names = []
+        for entry in read_manifest(config.batch_manifest, gcs_client=gcs_client):
+            if entry.startswith("gs://"):
+                bucket_name, object_name = split_gcs_uri(entry)
+                if bucket_name != config.gcs_bucket:
+                    msg = f"Manifest entry {entry} is not in GCS_BUCKET ({config.gcs_bucket})."
+                    logger.error(msg)
+                    raise ValueError(msg)
+                entry = object_name  # noqa: PLW2901
+            object_names.append(entry)
+        return object_names
+
+    blobs = gcs_client.list_blobs(config.gcs_bucket, prefix=config.batch_source_prefix)
+    # エピソード番号は処理順に割り当てるため、アップロード順 (作成日時順) に並べる
+    blobs.sort(key=lambda blob: (blob.time_created is None, blob.time_created, blob.name))
+    return [blob.name for blob in blobs if _is_episode_source(blob.name)]
+
+
+def _is_episode_source(object_name: str) -> bool:
+    try:
+        EpisodeObjectReference.parse(object_name)
+    except ValueError:
+        return False
+    return True
+
 
+@dataclass(frozen=True)
+class PodcastRuntime:
+    """Clients and the workflow built once per process (single run, batch or worker)."""
+
+    workflow: ProcessPodcastWorkflow
+    workflow_input: ProcessPodcastWorkflowInput
+    transcript_provider: TranscriptProvider
+    gcs_client: GCSClient
+    r2_client: R2Client
+    audio_analyzer: AudioAnalyzer
+    tracer: Tracer | None
+    async_firestore_manager: AsyncFirestoreManager | None = None
+
+    def invalidate_transcripts(self, object_names: Sequence[str]) -> None:
+        """Drop cached transcripts of the objects so they are transcribed again."""
+        if not isinstance(self.transcript_provider, CachedTranscriptProvider):
+            return
+        bucket = self.workflow_input.gcs_bucket
+        for object_name in object_names:
+            self.transcript_provider.invalidate(f"gs://{bucket}/{object_name}")
+
+    def close(self) -> None:
+        """Delete context caches, flush buffered spans and close the async Firestore client."""
+        self.audio_analyzer.release_context_caches()
+        if self.tracer is not None:
+            self.tracer.flush()
+        if self.async_firestore_manager is not None:
+            self.async_firestore_manager.close()
+
+
+def build_podcast_runtime(config: PodcastEnvConfig) -> PodcastRuntime:
+    """Read secrets and construct the clients and the workflow."""
     if config.secret_name:
         secret_manager_client = SecretManagerClient(project_id=config.project_id, secret_name=config.secret_name)
         r2_access_key, r2_secret_key = secret_manager_client.get_r2_credentials()
@@ -184,8 +572,15 @@ def process_podcast_workflow() -> None:
         discord_webhook_url = config.discord_webhook_info_url
 
     notifier_client = Notifier(discord_webhook_url=discord_webhook_url)
-    audio_analyzer = AudioAnalyzer(project_id=config.project_id)
+    gcs_client = GCSClient(project_id=config.project_id)
     firestore_manager = FirestoreManager(project_id=config.project_id)
+    rate_limiter = build_rate_limiter(
+        config.ai_rate_limits,
+        shared_budget=FirestoreRateBudget(client=firestore_manager.client)
+        if config.ai_rate_limit_backend == "firestore"
+        else None,
+    )
+    audio_analyzer = _build_audio_analyzer(config, gcs_client=gcs_client, rate_limiter=rate_limiter)
     episode_repository = PostgresEpisodeRepository(database_url=config.database_url)
     r2_client = R2Client(
         project_id=config.project_id,
@@ -194,10 +589,19 @@ def process_podcast_workflow() -> None:
         access_key=r2_access_key,
         secret_key=r2_secret_key,
     )
-    gcs_client = GCSClient(project_id=config.project_id)
+    transcript_provider = _build_transcript_provider(
+        config,
+        audio_analyzer=audio_analyzer,
+        gcs_client=gcs_client,
+        firestore_manager=firestore_manager,
+    )
 
-    usecase = ProcessPodcastWorkflow(
-        transcript_provider=audio_analyzer,
+    tracer = _build_tracer(config)
+    async_firestore_manager = (
+        AsyncFirestoreManager(project_id=config.project_id) if config.firestore_async_writes else None
+    )
+    workflow = ProcessPodcastWorkflow(
+        transcript_provider=transcript_provider,
         object_storage=r2_client,
         blob_source=gcs_client,
         notifier=notifier_client,
@@ -207,22 +611,72 @@ def process_podcast_workflow() -> None:
         firestore_manager=firestore_manager,
         episode_repository=episode_repository,
         logger=logger,
+        combine_summary_and_promotions=config.ai_combined_summary,
+        checkpoint_store=_build_checkpoint_store(config, firestore_manager=firestore_manager),
+        tracer=tracer,
+        lease_seconds=config.episode_lease_seconds,
+        memory_budget=_build_memory_budget(config),
+        async_firestore_manager=async_firestore_manager,
     )
-    usecase.run(
-        ProcessPodcastWorkflowInput(
-            project_id=config.project_id,
-            sns_schedule_offset_hours=config.sns_schedule_offset_hours,
-            gcs_bucket=config.gcs_bucket,
-            gcs_trigger_object_name=config.gcs_trigger_object_name,
-            r2_bucket=config.r2_bucket,
-            r2_key_prefix=config.r2_key_prefix,
-            ai_model_id=config.ai_model_id,
-            r2_custom_domain=config.r2_custom_domain,
-            sns_promotion_count=config.sns_promotion_count,
-        )
+    workflow_input = ProcessPodcastWorkflowInput(
+        project_id=config.project_id,
+        sns_schedule_offset_hours=config.sns_schedule_offset_hours,
+        gcs_bucket=config.gcs_bucket,
+        gcs_trigger_object_name=config.gcs_trigger_object_name,
+        r2_bucket=config.r2_bucket,
+        r2_key_prefix=config.r2_key_prefix,
+        ai_model_id=config.ai_model_id,
+        r2_custom_domain=config.r2_custom_domain,
+        sns_promotion_count=config.sns_promotion_count,
+    )
+    return PodcastRuntime(
+        workflow=workflow,
+        workflow_input=workflow_input,
+        transcript_provider=transcript_provider,
+        gcs_client=gcs_client,
+        r2_client=r2_client,
+        audio_analyzer=audio_analyzer,
+        tracer=tracer,
+        async_firestore_manager=async_firestore_manager,
     )
 
 
+def process_podcast_workflow() -> None:
+    """GCSへのファイルアップロードをトリガーに実行されるメイン関数."""
+    config = load_podcast_env(os.environ)
+    log_environment(config)
+
+    runtime = build_podcast_runtime(config)
+    object_names = (
+        _batch_object_names(config, gcs_client=runtime.gcs_client)
+        if config.batch_mode
+        else [config.gcs_trigger_object_name]
+    )
+    if config.transcript_cache_refresh:
+        runtime.invalidate_transcripts(object_names)
+    try:
+        if not config.batch_mode:
+            runtime.workflow.run(runtime.workflow_input)
+            return
+        report = ProcessPodcastBatchUsecase(
+            workflow=runtime.workflow,
+            object_storage=runtime.r2_client,
+            rss_manager_factory=PodcastRssManager,
+            logger=logger,
+        ).run(
+            ProcessPodcastBatchInput(
+                workflow=runtime.workflow_input,
+                object_names=object_names,
+                max_parallel_episodes=config.batch_max_parallel_episodes,
+            )
+        )
+        if report.failed:
+            msg = f"Batch processing failed for {len(report.failed)} of {len(report.results)} episodes."
+            raise RuntimeError(msg)
+    finally:
+        runtime.close()
+
+
 def main() -> None:
     """Main entry point for the podcast processor."""
     for arg in sys.argv:
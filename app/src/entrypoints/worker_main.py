@@ -0,0 +1,123 @@
+"""Long-lived episode worker entrypoint.
+
+`python -m entrypoints.worker_main` processes queued uploads until the queue stays
+empty for WORKER_IDLE_TIMEOUT_SECONDS or SIGTERM is received.
+`python -m entrypoints.worker_main enqueue <object name or gs:// URI>...` adds work items.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from entrypoints.main import build_podcast_runtime, load_podcast_env, log_environment
+from infrastructure.storage import split_gcs_uri
+from infrastructure.work_queue import PostgresEpisodeWorkQueue
+from usecases import EpisodeWorker, EpisodeWorkerSettings
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from domain.interfaces import EpisodeWorkQueue
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+
+
+@dataclass(frozen=True)
+class WorkerEnvConfig:
+    """Resolved environment variables for the episode worker."""
+
+    max_concurrency: int = 2
+    idle_timeout_seconds: float = 300.0
+    poll_interval_seconds: float = 5.0
+    visibility_seconds: float = 3600.0
+    max_attempts: int = 3
+
+
+def _load_worker_env(environ: Mapping[str, str]) -> WorkerEnvConfig:
+    """Load and validate the worker settings."""
+    config = WorkerEnvConfig(
+        max_concurrency=int(environ.get("WORKER_MAX_CONCURRENCY", "2")),
+        idle_timeout_seconds=float(environ.get("WORKER_IDLE_TIMEOUT_SECONDS", "300")),
+        poll_interval_seconds=float(environ.get("WORKER_POLL_INTERVAL_SECONDS", "5")),
+        visibility_seconds=float(environ.get("WORKER_VISIBILITY_SECONDS", "3600")),
+        max_attempts=int(environ.get("WORKER_MAX_ATTEMPTS", "3")),
+    )
+
+    if config.max_concurrency < 1 or config.max_attempts < 1:
+        msg = "WORKER_MAX_CONCURRENCY and WORKER_MAX_ATTEMPTS must be at least 1."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if config.poll_interval_seconds <= 0 or config.visibility_seconds <= 0:
+        msg = "WORKER_POLL_INTERVAL_SECONDS and WORKER_VISIBILITY_SECONDS must be positive."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    return config
+
+
+def enqueue_objects(queue: EpisodeWorkQueue, entries: Sequence[str], *, gcs_bucket: str) -> list[str]:
+    """Enqueue object names (gs:// URIs must point into gcs_bucket) and return the item IDs."""
+    item_ids = []
+    for entry in entries:
+        object_name = entry
+        if entry.startswith("gs://"):
+            bucket_name, object_name = split_gcs_uri(entry)
+            if bucket_name != gcs_bucket:
+                msg = f"{entry} is not in GCS_BUCKET ({gcs_bucket})."
+                raise ValueError(msg)
+        item_ids.append(queue.enqueue(object_name))
+        logger.info("Enqueued %s", object_name)
+    return item_ids
+
+
+def run_worker() -> None:
+    """Process queued uploads with clients built once for the lifetime of the worker."""
+    config = load_podcast_env(os.environ, require_trigger_object=False)
+    worker_config = _load_worker_env(os.environ)
+    log_environment(config)
+    queue = PostgresEpisodeWorkQueue(database_url=config.database_url)
+
+    runtime = build_podcast_runtime(config)
+    worker = EpisodeWorker(
+        queue=queue,
+        workflow=runtime.workflow,
+        workflow_input=runtime.workflow_input,
+        settings=EpisodeWorkerSettings(
+            max_concurrency=worker_config.max_concurrency,
+            idle_timeout_seconds=worker_config.idle_timeout_seconds,
+            poll_interval_seconds=worker_config.poll_interval_seconds,
+            visibility_seconds=worker_config.visibility_seconds,
+            max_attempts=worker_config.max_attempts,
+        ),
+        logger=logger,
+    )
+    # Cloud Run はインスタンス停止前に SIGTERM を送るため、新規取得をやめて処理中の項目の完了を待つ
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    try:
+        worker.run()
+    finally:
+        runtime.close()
+
+
+def main() -> None:
+    """Main entry point for the episode worker."""
+    if len(sys.argv) > 1 and sys.argv[1] == "enqueue":
+        config = load_podcast_env(os.environ, require_trigger_object=False)
+        enqueue_objects(
+            PostgresEpisodeWorkQueue(database_url=config.database_url),
+            sys.argv[2:],
+            gcs_bucket=config.gcs_bucket,
+        )
+        return
+    run_worker()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,34 @@
 """Gemini-based audio analysis and summary generation."""
 
+import hashlib
 import logging
 import os
+import re
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Protocol, TypeVar
 
 from google import genai
-from google.genai.types import GenerateContentConfig, Part
-
-from domain.interfaces import TranscriptProvider
-from domain.models import SnsPromotionsResponse, Summary
+from google.genai import errors
+from google.genai.types import Content, GenerateContentConfig, GenerateContentResponse, Part
+
+from domain.interfaces import BlobSource, TranscriptProvider
+from domain.models import (
+    AudioChunk,
+    BatchPredictionRequest,
+    BatchRequestKind,
+    SnsPromotionsResponse,
+    Summary,
+    SummaryWithPromotions,
+)
+from infrastructure.context_cache import ContextCacheRegistry, ContextCaching
+from infrastructure.gemini_stream import StreamAssembler
+from infrastructure.model_call import ModelCaller, ModelCallPolicy
+from infrastructure.rate_limiter import RateLimiter
+from infrastructure.storage import split_gcs_uri
+from infrastructure.token_budget import estimate_tokens, split_into_sections
 
 logger = logging.getLogger(__name__)
 
@@ -28,23 +48,345 @@ AUDIO_FORMAT_MAPPING = {
     "webm": "audio/webm",
 }
 
+TRANSCRIPT_PROMPT = """
+提供されたポッドキャスト配信の音声記録をもとに、議事録を作成して下さい。
+議論された主要なトピック、決定事項、各担当者のアクションアイテムを正確かつ簡潔に記録した、フォーマルなビジネス文書にして下さい。
+また、【目次】も作成して下さい。(議事録の内容から主要トピックを時系列で抽出し、以下の形式で記載)
+0:00 AAA
+0:16 BBB
+5:00 CCC
+12:54 DDD
+17:11 EEE
+登場人物は小野、数森、高島です。
+"""
+
+SUMMARY_PROMPT = """
+以下の議事録の内容をもとに、リスナーの興味を引く形で番組紹介文を作成してください。
+
+出力は必ず **JSONのみ** とし、次のスキーマに厳密に従ってください。
+{{
+    "title": "キャッチーで分かりやすいエピソードタイトル(200文字以内)",
+    "description": "RSSフィードに適した番組紹介文。HTMLタグは<p>と<br>のみを使用してください。段落は<p>...</p>で囲み、改行は<br>を使用してください。その他のHTMLタグは使用しないでください。"
+}}
+
+制約条件:
+- descriptionには、以下の見出しを必ず含めること
+  1. エピソード概要(400字程度の概要)
+  2. 目次
+  3. 関連情報
+    技術スタックとキーワードは**箇条書き**で列挙すること
+    キーワード: 議事録内で扱われたキーワードを**箇条書き**で列挙
+  4. about us
+- HTMLタグは<p>と<br>のみを使用すること
+- 見出しは【】で囲んでテキストとして表現すること
+
+descriptionの出力例:
+<p>【エピソード概要】</p><p><br></p><p>【目次】</p><p>0:00 AAA</p><p>0:16 BBB</p><p><br></p><p>【関連情報】</p><p>- GitHub: https://github.com/sunaba-log</p><p>- 技術スタック: 議事録内で扱われた技術スタックを箇条書きで列挙</p><p>  - 例: GCS</p><p>- キーワード: 議事録内で扱われたキーワードを箇条書きで列挙</p><p>  - 例: ARグラス</p><p><br></p><p>【about us】</p><p>sunaba log: 友人同士で週次で雑談しながら「30 days to build」プロジェクトを進行する、雑談発想型プロトタイピング会議録。</p>
+
+--- 以下が議事録です ---
+{transcript}
+"""
+
+SUMMARY_WITH_PROMOTIONS_PROMPT = """
+以下の議事録の内容をもとに、リスナーの興味を引く番組紹介文(summary)と、その回を告知するSNS投稿文(promotions)を {num_promotions} 種類、まとめて作成してください。
+
+出力は必ず **JSONのみ** とし、次のスキーマに厳密に従ってください。
+{{
+    "summary": {{
+        "title": "キャッチーで分かりやすいエピソードタイトル(200文字以内)",
+        "description": "RSSフィードに適した番組紹介文。HTMLタグは<p>と<br>のみを使用してください。段落は<p>...</p>で囲み、改行は<br>を使用してください。その他のHTMLタグは使用しないでください。"
+    }},
+    "promotions": [
+        {{
+            "message": "SNS投稿文の本文",
+            "hashtags": ["#タグ1", "#タグ2", "#タグ3"]
+        }},
+        ...
+    ]
+}}
+
+summary.descriptionの制約条件:
+- 以下の見出しを必ず含めること
+  1. エピソード概要(400字程度の概要)
+  2. 目次
+  3. 関連情報
+    技術スタックとキーワードは**箇条書き**で列挙すること
+    キーワード: 議事録内で扱われたキーワードを**箇条書き**で列挙
+  4. about us
+- HTMLタグは<p>と<br>のみを使用すること
+- 見出しは【】で囲んでテキストとして表現すること
+
+summary.descriptionの出力例:
+<p>【エピソード概要】</p><p><br></p><p>【目次】</p><p>0:00 AAA</p><p>0:16 BBB</p><p><br></p><p>【関連情報】</p><p>- GitHub: https://github.com/sunaba-log</p><p>- 技術スタック: 議事録内で扱われた技術スタックを箇条書きで列挙</p><p>  - 例: GCS</p><p>- キーワード: 議事録内で扱われたキーワードを箇条書きで列挙</p><p>  - 例: ARグラス</p><p><br></p><p>【about us】</p><p>sunaba log: 友人同士で週次で雑談しながら「30 days to build」プロジェクトを進行する、雑談発想型プロトタイピング会議録。</p>
+
+promotionsの制約条件:
+- 各投稿は、切り口の異なるパターン(例: 告知重視、インサイト重視、パワーワード重視など)にすること
+- 読み手が思わずクリックしたくなるような、簡潔で魅力的な言葉を選ぶこと
+- ハッシュタグは文脈に合わせて3個程度選定すること
+- ややフレンドリーな口調にすること
+
+--- 以下が議事録です ---
+{transcript}
+"""
+
+SECTION_SUMMARY_PROMPT = """
+以下は、長い議事録を分割したパート{part}/{total}です。
+後で全パートの要約をまとめて番組紹介文を作成するため、このパートの内容を要約して下さい。
+- 議論された主要なトピック、決定事項、アクションアイテム、登場した技術スタックとキーワードを漏らさず箇条書きで記載すること
+- このパートに含まれる【目次】の項目は、タイムスタンプを変えずにそのまま残すこと
+- 出力はプレーンテキストとし、前置きやまとめの文は付けないこと
+
+--- 以下が議事録のパート{part}/{total}です ---
+{section}
+"""
+
+MAX_REDUCE_ROUNDS = 3
+
+CACHED_TRANSCRIPT_CONTEXT = """
+--- 議事録 ---
+{transcript}
+"""
+
+CACHED_TRANSCRIPT_NOTE = "(議事録はキャッシュ済みのコンテキストとして先に渡しています)"
+
+# キャッシュが失効・削除されていた場合に返るステータス。議事録をそのまま送って再試行する
+_CACHE_MISS_STATUS_CODES = frozenset({400, 403, 404})
+
+T = TypeVar("T")
+
+TRANSCRIPT_SEGMENT_PROMPT = """
+提供された音声は、長時間のポッドキャスト配信を分割したパート{part}/{total}(配信全体の{start}〜{end})です。
+このパートの音声記録をもとに、議事録を作成して下さい。
+議論された主要なトピック、決定事項、各担当者のアクションアイテムを正確かつ簡潔に記録した、フォーマルなビジネス文書にして下さい。
+また、【目次】も作成して下さい。(議事録の内容から主要トピックを時系列で抽出し、以下の形式で記載)
+タイムスタンプは配信全体ではなく、この音声ファイルの先頭を0:00とした時刻で記載して下さい。
+0:00 AAA
+0:16 BBB
+5:00 CCC
+{overlap_note}登場人物は小野、数森、高島です。
+"""
+
+TRANSCRIPT_OVERLAP_NOTE = "冒頭の約{seconds}秒は前のパートと重複しています。重複部分は文脈の把握にのみ使い、議事録と目次には含めないで下さい。\n"
+
+_TOC_HEADER_RE = re.compile(r"^[\s#*]*【目次】[\s*]*$")
+_TIMESTAMP_LINE_RE = re.compile(
+    r"^(?P<prefix>\s*(?:[-*・]\s*)?)(?:(?P<hours>\d+):)?(?P<minutes>\d{1,3}):(?P<seconds>\d{2})(?=\s)"
+)
+
+
+@dataclass(frozen=True)
+class TranscriptChunking:
+    """Settings for chunked transcription of long recordings.
+
+    Attributes:
+        segment_seconds: 1 セグメントの目標長(秒)。
+        overlap_seconds: 隣接セグメントの重なり(秒)。
+        max_workers: 同時に文字起こしするセグメント数の上限。
+    """
+
+    segment_seconds: int = 600
+    overlap_seconds: int = 15
+    max_workers: int = 4
+
+
+@dataclass(frozen=True)
+class SummaryBudget:
+    """Token budget that switches summarisation to map-reduce for long transcripts.
+
+    Attributes:
+        max_input_tokens: 要約プロンプトに入れる議事録の推定トークン数の上限。超えると map-reduce に切り替える。
+        section_tokens: map 段階で 1 回に要約するセクションの推定トークン数。
+        max_workers: 同時に要約するセクション数の上限。
+    """
+
+    max_input_tokens: int = 120_000
+    section_tokens: int = 30_000
+    max_workers: int = 4
+
+
+class AudioSegmenter(Protocol):
+    """Splits audio bytes into overlapping segments."""
+
+    def __call__(self, audio_data: bytes, file_extension: str, *, segment_ms: int, overlap_ms: int) -> list[AudioChunk]:
+        """Return segments in playback order."""
+
+
+@dataclass(frozen=True)
+class SegmentTranscript:
+    """Transcript text of one segment and its position in the full recording."""
+
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+def _summary_config() -> GenerateContentConfig:
+    return GenerateContentConfig(
+        temperature=0.3,
+        max_output_tokens=12000,
+        response_mime_type="application/json",
+        response_json_schema=Summary.model_json_schema(),
+    )
+
+
+def _summary_with_promotions_config() -> GenerateContentConfig:
+    # 要約 (0.3) と SNS 投稿 (0.7) の中間の温度で、両方の出力上限を合算する
+    return GenerateContentConfig(
+        temperature=0.5,
+        max_output_tokens=16000,
+        response_mime_type="application/json",
+        response_json_schema=SummaryWithPromotions.model_json_schema(),
+    )
+
+
+def batch_request_payload(request: BatchPredictionRequest) -> tuple[Content, GenerateContentConfig | None]:
+    """Build the contents and config of a batch request with the same prompts as the interactive calls.
+
+    バッチでは map-reduce 要約を使わないため、議事録全体を 1 リクエストで要約する。
+    """
+    if request.kind is BatchRequestKind.TRANSCRIPT:
+        if not request.source_uri:
+            msg = f"source_uri is required for transcript request {request.key}"
+            raise ValueError(msg)
+        parts = [
+            Part.from_uri(file_uri=request.source_uri, mime_type=AudioAnalyzer.get_mime_type(request.source_uri)),
+            Part.from_text(text=TRANSCRIPT_PROMPT),
+        ]
+        return Content(role="user", parts=parts), None
+
+    if not request.transcript:
+        msg = f"transcript is required for summary request {request.key}"
+        raise ValueError(msg)
+    prompt = SUMMARY_PROMPT.format(transcript=request.transcript)
+    return Content(role="user", parts=[Part.from_text(text=prompt)]), _summary_config()
+
+
+def format_timestamp(total_seconds: int) -> str:
+    """Format seconds as m:ss, or h:mm:ss from one hour."""
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+def _parse_timestamp_line(line: str) -> tuple[str, int, str] | None:
+    """Return (prefix, seconds, rest) for a line starting with a timestamp."""
+    match = _TIMESTAMP_LINE_RE.match(line)
+    if match is None:
+        return None
+    seconds = int(match.group("hours") or 0) * 3600 + int(match.group("minutes")) * 60 + int(match.group("seconds"))
+    return match.group("prefix"), seconds, line[match.end() :]
+
+
+def stitch_segment_transcripts(segments: Sequence[SegmentTranscript]) -> str:
+    """Merge per-segment transcripts into one document with absolute table-of-contents times.
+
+    各セグメントの【目次】のタイムスタンプをセグメント開始位置だけずらし、ひとつの【目次】にまとめる。
+    前のセグメントの終了位置より前の項目は重複区間のものとして捨てる。
+    """
+    toc_lines: list[str] = []
+    bodies: list[str] = []
+    covered_until_seconds = 0
+    for segment in sorted(segments, key=lambda item: item.start_ms):
+        offset_seconds = segment.start_ms // 1000
+        body_lines: list[str] = []
+        in_toc = False
+        for line in segment.text.strip().splitlines():
+            if _TOC_HEADER_RE.match(line):
+                in_toc = True
+                continue
+            parsed = _parse_timestamp_line(line)
+            if parsed is None:
+                if in_toc and line.strip():
+                    in_toc = False
+                if not in_toc:
+                    body_lines.append(line)
+                continue
+
+            prefix, seconds, rest = parsed
+            absolute_seconds = offset_seconds + seconds
+            shifted = f"{prefix}{format_timestamp(absolute_seconds)}{rest}"
+            if not in_toc:
+                body_lines.append(shifted)
+            elif absolute_seconds >= covered_until_seconds:
+                toc_lines.append(shifted.strip())
+
+        covered_until_seconds = segment.end_ms // 1000
+        body = "\n".join(body_lines).strip()
+        if body:
+            bodies.append(body)
+
+    sections = []
+    if toc_lines:
+        sections.append("\n".join(["【目次】", *toc_lines]))
+    sections.extend(bodies)
+    return "\n\n".join(sections)
+
 
 class AudioAnalyzer(TranscriptProvider):
     """Gemini API based audio analysis."""
 
     DEFAULT_MODEL_ID = "gemini-2.0-flash-001"
     DEFAULT_LOCATION = "us-central1"
+    PROMPT_VERSION = "v1"
 
-    def __init__(self, project_id: str | None = None, location: str | None = None) -> None:
-        """Initialize analyzer with project and location settings."""
+    def __init__(
+        self,
+        project_id: str | None = None,
+        location: str | None = None,
+        *,
+        chunking: TranscriptChunking | None = None,
+        blob_source: BlobSource | None = None,
+        audio_segmenter: AudioSegmenter | None = None,
+        streaming: bool = False,
+        on_stream_text: Callable[[str, str], None] | None = None,
+        summary_budget: SummaryBudget | None = None,
+        call_policy: ModelCallPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        context_caching: ContextCaching | None = None,
+    ) -> None:
+        """Initialize analyzer with project and location settings.
+
+        chunking を指定すると、音声を blob_source から取得して audio_segmenter で分割し、
+        セグメントごとに並列で文字起こしする。
+        streaming を有効にすると、文字起こしと要約をストリーミング API で受信し、
+        受信した差分を on_stream_text(operation, text) に転送する。
+        summary_budget を指定すると、議事録の推定トークン数が上限を超えた場合に
+        セクションごとの並列要約 (map) とその統合 (reduce) で要約する。
+        generate_content の呼び出し (ストリーミングを含む) は call_policy のタイムアウト・リトライ・ヘッジの下で実行し、
+        rate_limiter を指定した場合は各リクエストの前に (モデル, リージョン) 単位の許可を得る。
+        context_caching を指定すると、議事録をモデル側のキャッシュに TTL 付きで一度だけ登録し、
+        要約 (SNS 投稿との同時生成を含む) のプロンプトからはキャッシュを参照して議事録の再送を省く。
+        """
         self.project_id = project_id or os.environ.get("GOOGLE_CLOUD_PROJECT")
         if not self.project_id:
             raise ValueError("project_id must be provided or set in GOOGLE_CLOUD_PROJECT env var")
         self.location = location or os.environ.get("GOOGLE_CLOUD_REGION", self.DEFAULT_LOCATION)
         self.client = genai.Client(vertexai=True, project=self.project_id, location=self.location)
+        self._model_caller = ModelCaller(self.client, call_policy, rate_limiter=rate_limiter, location=self.location)
+        if chunking is not None and (blob_source is None or audio_segmenter is None):
+            raise ValueError("blob_source and audio_segmenter are required for chunked transcription")
+        self._chunking = chunking
+        self._blob_source = blob_source
+        self._audio_segmenter = audio_segmenter
+        self._streaming = streaming
+        self._on_stream_text = on_stream_text
+        self._summary_budget = summary_budget
+        self._context_cache = (
+            ContextCacheRegistry(self.client, self._model_caller, context_caching) if context_caching else None
+        )
+
+    @property
+    def prompt_version(self) -> str:
+        """Prompt version including the transcription mode, used for AI output cache keys."""
+        if self._chunking is None:
+            return self.PROMPT_VERSION
+        return f"{self.PROMPT_VERSION}+chunk{self._chunking.segment_seconds}s"
 
     @staticmethod
-    def _get_mime_type(gcs_uri: str) -> str:
+    def get_mime_type(gcs_uri: str) -> str:
+        """Return the audio MIME type for a GCS object from its extension."""
         file_path = Path(gcs_uri)
         extension = file_path.suffix.lstrip(".").lower()
 
@@ -58,73 +400,170 @@ class AudioAnalyzer(TranscriptProvider):
     def generate_transcript(self, gcs_uri: str, model_id: str | None = None) -> str | None:
         """Generate transcript text from an audio object in GCS."""
         model_id = model_id or self.DEFAULT_MODEL_ID
-        mime_type = self._get_mime_type(gcs_uri)
+        mime_type = self.get_mime_type(gcs_uri)
+        if self._chunking is not None:
+            return self._generate_transcript_chunked(gcs_uri, model_id, self._chunking)
+
+        if self._streaming:
+            return self.stream_transcript(gcs_uri, model_id).text or None
 
         audio_part = Part.from_uri(
             file_uri=gcs_uri,
             mime_type=mime_type,
         )
-        prompt = """
-提供されたポッドキャスト配信の音声記録をもとに、議事録を作成して下さい。
-議論された主要なトピック、決定事項、各担当者のアクションアイテムを正確かつ簡潔に記録した、フォーマルなビジネス文書にして下さい。
-また、【目次】も作成して下さい。(議事録の内容から主要トピックを時系列で抽出し、以下の形式で記載)
-0:00 AAA
-0:16 BBB
-5:00 CCC
-12:54 DDD
-17:11 EEE
-登場人物は小野、数森、高島です。
-"""
 
-        response = self.client.models.generate_content(
+        response = self._model_caller.generate_content(
+            operation="transcript",
             model=model_id,
-            contents=[audio_part, prompt],
+            contents=[audio_part, TRANSCRIPT_PROMPT],
         )
 
         return response.text
 
-    def summarize_transcript(self, transcript: str, prompt: str | None = None, model_id: str | None = None) -> Summary:
-        """Generate a structured summary from transcript text."""
+    def stream_transcript(self, gcs_uri: str, model_id: str | None = None) -> StreamAssembler:
+        """Stream the transcript, forwarding deltas to on_stream_text, and return the drained stream."""
         model_id = model_id or self.DEFAULT_MODEL_ID
+        audio_part = Part.from_uri(file_uri=gcs_uri, mime_type=self.get_mime_type(gcs_uri))
+        return self._model_caller.generate_content_stream(
+            operation="transcript",
+            model=model_id,
+            contents=[audio_part, TRANSCRIPT_PROMPT],
+            on_text=self._stream_progress("transcript"),
+        )
 
-        if not prompt:
-            prompt = f"""
-以下の議事録の内容をもとに、リスナーの興味を引く形で番組紹介文を作成してください。
+    def stream_summary(
+        self,
+        transcript: str,
+        prompt: str | None = None,
+        model_id: str | None = None,
+        *,
+        group: str | None = None,
+    ) -> StreamAssembler:
+        """Stream the summary JSON; validate the result with StreamAssembler.validate(Summary).
 
-出力は必ず **JSONのみ** とし、次のスキーマに厳密に従ってください。
-{{
-    "title": "キャッチーで分かりやすいエピソードタイトル(200文字以内)",
-    "description": "RSSフィードに適した番組紹介文。HTMLタグは<p>と<br>のみを使用してください。段落は<p>...</p>で囲み、改行は<br>を使用してください。その他のHTMLタグは使用しないでください。"
-}}
+        group は文字起こしのコンテキストキャッシュをまとめて削除する単位 (release_transcript 参照)。
+        """
+        model_id = model_id or self.DEFAULT_MODEL_ID
+        on_text = self._stream_progress("summary")
 
-制約条件:
-- descriptionには、以下の見出しを必ず含めること
-  1. エピソード概要(400字程度の概要)
-  2. 目次
-  3. 関連情報
-    技術スタックとキーワードは**箇条書き**で列挙すること
-    キーワード: 議事録内で扱われたキーワードを**箇条書き**で列挙
-  4. about us
-- HTMLタグは<p>と<br>のみを使用すること
-- 見出しは【】で囲んでテキストとして表現すること
+        def send(contents: str, config: GenerateContentConfig) -> StreamAssembler:
+            return self._model_caller.generate_content_stream(
+                operation="summary", model=model_id, contents=[contents], config=config, on_text=on_text
+            )
 
-descriptionの出力例:
-<p>【エピソード概要】</p><p><br></p><p>【目次】</p><p>0:00 AAA</p><p>0:16 BBB</p><p><br></p><p>【関連情報】</p><p>- GitHub: https://github.com/sunaba-log</p><p>- 技術スタック: 議事録内で扱われた技術スタックを箇条書きで列挙</p><p>  - 例: GCS</p><p>- キーワード: 議事録内で扱われたキーワードを箇条書きで列挙</p><p>  - 例: ARグラス</p><p><br></p><p>【about us】</p><p>sunaba log: 友人同士で週次で雑談しながら「30 days to build」プロジェクトを進行する、雑談発想型プロトタイピング会議録。</p>
+        if prompt:
+            return send(prompt, _summary_config())
+        return self._with_transcript(
+            model_id,
+            transcript,
+            lambda text: SUMMARY_PROMPT.format(transcript=text),
+            _summary_config(),
+            send,
+            group=group or _transcript_group(transcript),
+        )
 
---- 以下が議事録です ---
-{transcript}
-"""
+    def _stream_progress(self, operation: str) -> Callable[[str], None] | None:
+        if self._on_stream_text is None:
+            return None
+        callback = self._on_stream_text
+        return lambda text: callback(operation, text)
+
+    def _generate_transcript_chunked(self, gcs_uri: str, model_id: str, chunking: TranscriptChunking) -> str | None:
+        """Transcribe overlapping segments concurrently and stitch the results."""
+        if self._blob_source is None or self._audio_segmenter is None:
+            raise ValueError("blob_source and audio_segmenter are required for chunked transcription")
+
+        bucket_name, object_name = split_gcs_uri(gcs_uri)
+        audio_data = self._blob_source.download_blob_as_bytes(bucket_name, object_name)
+        chunks = self._audio_segmenter(
+            audio_data,
+            Path(object_name).suffix,
+            segment_ms=chunking.segment_seconds * 1000,
+            overlap_ms=chunking.overlap_seconds * 1000,
+        )
+        del audio_data
+        if len(chunks) <= 1:
+            logger.info("Audio fits in one segment; transcribing %s in a single request", gcs_uri)
+            response = self._model_caller.generate_content(
+                operation="transcript",
+                model=model_id,
+                contents=[Part.from_uri(file_uri=gcs_uri, mime_type=self.get_mime_type(gcs_uri)), TRANSCRIPT_PROMPT],
+            )
+            return response.text
 
-        response = self.client.models.generate_content(
+        total = len(chunks)
+        logger.info("Transcribing %s in %d segments with up to %d workers", gcs_uri, total, chunking.max_workers)
+        results: list[SegmentTranscript] = []
+        executor = ThreadPoolExecutor(max_workers=min(chunking.max_workers, total))
+        try:
+            futures = {
+                executor.submit(self._transcribe_segment, chunk, total, model_id, chunking.overlap_seconds): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
+                results.append(SegmentTranscript(start_ms=chunk.start_ms, end_ms=chunk.end_ms, text=future.result()))
+                logger.info(
+                    "Transcribed segment %d/%d (%s-%s); %d/%d done",
+                    chunk.index + 1,
+                    total,
+                    format_timestamp(chunk.start_ms // 1000),
+                    format_timestamp(chunk.end_ms // 1000),
+                    len(results),
+                    total,
+                )
+        finally:
+            # 失敗時は未着手のセグメントを取り消す
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return stitch_segment_transcripts(results)
+
+    def _transcribe_segment(self, chunk: AudioChunk, total: int, model_id: str, overlap_seconds: int) -> str:
+        """Transcribe one segment with timestamps relative to the segment start."""
+        prompt = TRANSCRIPT_SEGMENT_PROMPT.format(
+            part=chunk.index + 1,
+            total=total,
+            start=format_timestamp(chunk.start_ms // 1000),
+            end=format_timestamp(chunk.end_ms // 1000),
+            overlap_note=TRANSCRIPT_OVERLAP_NOTE.format(seconds=overlap_seconds) if chunk.index else "",
+        )
+        response = self._model_caller.generate_content(
+            operation="transcript_segment",
             model=model_id,
-            contents=[prompt],
-            config=GenerateContentConfig(
-                temperature=0.3,
-                max_output_tokens=12000,
-                response_mime_type="application/json",
-                response_json_schema=Summary.model_json_schema(),
-            ),
+            contents=[Part.from_bytes(data=chunk.data, mime_type=chunk.mime_type), prompt],
         )
+        if not response.text:
+            msg = f"No transcript received for segment {chunk.index + 1}/{total}."
+            raise ValueError(msg)
+        return response.text
+
+    def summarize_transcript(self, transcript: str, prompt: str | None = None, model_id: str | None = None) -> Summary:
+        """Generate a structured summary from transcript text."""
+        model_id = model_id or self.DEFAULT_MODEL_ID
+        # 要約前に縮約しても、キャッシュは元の文字起こし単位で release_transcript() から削除できるようにする
+        group = _transcript_group(transcript)
+        if not prompt:
+            transcript = self._fit_to_budget(transcript, model_id)
+
+        if self._streaming:
+            return self.stream_summary(transcript, prompt, model_id, group=group).validate(Summary)
+
+        if prompt:
+            response = self._model_caller.generate_content(
+                operation="summary",
+                model=model_id,
+                contents=[prompt],
+                config=_summary_config(),
+            )
+        else:
+            response = self._generate_with_transcript(
+                "summary",
+                model_id,
+                transcript,
+                lambda text: SUMMARY_PROMPT.format(transcript=text),
+                _summary_config(),
+                group=group,
+            )
         if not response.text:
             raise ValueError("No response received from the model.")
 
@@ -151,6 +590,134 @@ descriptionの出力例:
                 return Summary.model_validate_json(candidate)
             raise
 
+    def _fit_to_budget(self, transcript: str, model_id: str) -> str:
+        """Condense the transcript with section summaries until it fits the summary budget (map step)."""
+        budget = self._summary_budget
+        if budget is None:
+            return transcript
+
+        text = transcript
+        for reduce_round in range(1, MAX_REDUCE_ROUNDS + 1):
+            tokens = estimate_tokens(text)
+            if tokens <= budget.max_input_tokens:
+                return text
+            sections = split_into_sections(text, budget.section_tokens)
+            if len(sections) <= 1:
+                break
+            logger.info(
+                "Transcript estimated at %d tokens exceeds budget %d; summarizing %d sections (round %d)",
+                tokens,
+                budget.max_input_tokens,
+                len(sections),
+                reduce_round,
+            )
+            text = self._summarize_sections(sections, model_id, budget.max_workers)
+
+        logger.warning("Condensed transcript still exceeds the summary budget (%d tokens)", estimate_tokens(text))
+        return text
+
+    def _summarize_sections(self, sections: Sequence[str], model_id: str, max_workers: int) -> str:
+        """Summarize sections concurrently and join the notes in transcript order."""
+        total = len(sections)
+
+        def summarize(indexed_section: tuple[int, str]) -> str:
+            index, section = indexed_section
+            response = self._model_caller.generate_content(
+                operation="section_summary",
+                model=model_id,
+                contents=[SECTION_SUMMARY_PROMPT.format(part=index + 1, total=total, section=section)],
+                config=GenerateContentConfig(temperature=0.3, max_output_tokens=4000),
+            )
+            if not response.text:
+                msg = f"No section summary received for part {index + 1}/{total}."
+                raise ValueError(msg)
+            return f"【パート{index + 1}/{total}】\n{response.text.strip()}"
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, total)) as executor:
+            notes = list(executor.map(summarize, enumerate(sections)))
+        return "\n\n".join(notes)
+
+    def _transcript_request(
+        self,
+        transcript: str,
+        model_id: str,
+        render: Callable[[str], str],
+        config: GenerateContentConfig,
+        *,
+        group: str,
+    ) -> tuple[str, GenerateContentConfig, str | None]:
+        """Return (prompt, config, cache name), referencing the cached transcript when one is available."""
+        if self._context_cache is None:
+            return render(transcript), config, None
+        cache_name = self._context_cache.get_or_create(
+            model_id=model_id,
+            text=transcript,
+            contents=[
+                Content(
+                    role="user", parts=[Part.from_text(text=CACHED_TRANSCRIPT_CONTEXT.format(transcript=transcript))]
+                )
+            ],
+            display_name="podcast-transcript",
+            group=group,
+        )
+        if cache_name is None:
+            return render(transcript), config, None
+        return render(CACHED_TRANSCRIPT_NOTE), config.model_copy(update={"cached_content": cache_name}), cache_name
+
+    def _generate_with_transcript(
+        self,
+        operation: str,
+        model_id: str,
+        transcript: str,
+        render: Callable[[str], str],
+        config: GenerateContentConfig,
+        *,
+        group: str,
+    ) -> GenerateContentResponse:
+        """Call the model with the transcript prompt, falling back to the inline transcript if the cache is gone."""
+        return self._with_transcript(
+            model_id,
+            transcript,
+            render,
+            config,
+            lambda prompt, request_config: self._model_caller.generate_content(
+                operation=operation, model=model_id, contents=[prompt], config=request_config
+            ),
+            group=group,
+        )
+
+    def _with_transcript(
+        self,
+        model_id: str,
+        transcript: str,
+        render: Callable[[str], str],
+        config: GenerateContentConfig,
+        send: Callable[[str, GenerateContentConfig], T],
+        *,
+        group: str,
+    ) -> T:
+        """Run send(prompt, config) against the cached transcript, resending it inline if the cache was rejected."""
+        prompt, request_config, cache_name = self._transcript_request(transcript, model_id, render, config, group=group)
+        if cache_name is not None and self._context_cache is not None:
+            try:
+                return send(prompt, request_config)
+            except errors.ClientError as err:
+                if err.code not in _CACHE_MISS_STATUS_CODES:
+                    raise
+                logger.warning("Cached transcript %s was rejected (%s); resending it inline", cache_name, err)
+                self._context_cache.invalidate(cache_name)
+        return send(render(transcript), config)
+
+    def release_transcript(self, transcript: str) -> None:
+        """Delete the context caches created for the transcript once its episode no longer sends it to the model."""
+        if self._context_cache is not None:
+            self._context_cache.release_group(_transcript_group(transcript))
+
+    def release_context_caches(self) -> None:
+        """Delete the context caches created by this analyzer instead of waiting for their TTL."""
+        if self._context_cache is not None:
+            self._context_cache.release()
+
     def generate_sns_promotions(
         self,
         summary_description: str,
@@ -186,7 +753,8 @@ descriptionの出力例:
 {summary_description}
 """
 
-        response = self.client.models.generate_content(
+        response = self._model_caller.generate_content(
+            operation="sns_promotions",
             model=model_id,
             contents=[prompt],
             config=GenerateContentConfig(
@@ -211,6 +779,54 @@ descriptionの出力例:
                 return SnsPromotionsResponse.model_validate_json(candidate)
             raise
 
+    def generate_summary_and_promotions(
+        self,
+        transcript: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SummaryWithPromotions:
+        """Generate the summary and SNS promotions from the transcript in one model call."""
+        model_id = model_id or self.DEFAULT_MODEL_ID
+        group = _transcript_group(transcript)
+        transcript = self._fit_to_budget(transcript, model_id)
+
+        def render(text: str) -> str:
+            return SUMMARY_WITH_PROMOTIONS_PROMPT.format(num_promotions=num_promotions, transcript=text)
+
+        if self._streaming:
+            on_text = self._stream_progress("summary_with_promotions")
+            assembler = self._with_transcript(
+                model_id,
+                transcript,
+                render,
+                _summary_with_promotions_config(),
+                lambda prompt, config: self._model_caller.generate_content_stream(
+                    operation="summary_with_promotions",
+                    model=model_id,
+                    contents=[prompt],
+                    config=config,
+                    on_text=on_text,
+                ),
+                group=group,
+            )
+        else:
+            assembler = StreamAssembler(operation="summary_with_promotions", model_id=model_id)
+            response = self._generate_with_transcript(
+                "summary_with_promotions",
+                model_id,
+                transcript,
+                render,
+                _summary_with_promotions_config(),
+                group=group,
+            )
+            assembler.feed(response.text or "")
+        return assembler.validate(SummaryWithPromotions)
+
+
+def _transcript_group(transcript: str) -> str:
+    """Return the context cache group of a transcript as passed in by the caller (before any condensing)."""
+    return hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+
 
 def generate_transcript_with_gemini(gcs_uri: str) -> str | None:
     """Deprecated helper wrapper."""
@@ -0,0 +1,226 @@
+"""Batch prediction backends for re-processing many episodes at once.
+
+VertexBatchPredictionClient writes the requests as JSONL to GCS, submits a Vertex AI
+batch prediction job and reads the prediction files back. LocalBatchPredictionGateway
+runs the same requests one by one through a responder function, for tests and small
+local dry runs.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from google.genai.types import CreateBatchJobConfig, JobState
+
+from domain.interfaces import BatchPredictionGateway
+from domain.models import BatchPredictionResult
+from infrastructure.ai_analyzer import batch_request_payload
+from infrastructure.storage import split_gcs_uri
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from google import genai
+
+    from domain.models import BatchPredictionRequest
+    from infrastructure.model_call import ModelCaller
+    from infrastructure.storage import GCSClient
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL_STATES = frozenset(
+    {
+        JobState.JOB_STATE_SUCCEEDED,
+        JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+        JobState.JOB_STATE_FAILED,
+        JobState.JOB_STATE_CANCELLED,
+        JobState.JOB_STATE_EXPIRED,
+    },
+)
+_SUCCEEDED_STATES = frozenset({JobState.JOB_STATE_SUCCEEDED, JobState.JOB_STATE_PARTIALLY_SUCCEEDED})
+
+
+def build_jsonl_line(request: BatchPredictionRequest) -> dict[str, Any]:
+    """Build one line of a Vertex AI batch prediction input file."""
+    content, config = batch_request_payload(request)
+    body: dict[str, Any] = {"contents": [content.model_dump(mode="json", by_alias=True, exclude_none=True)]}
+    if config is not None:
+        body["generationConfig"] = config.model_dump(mode="json", by_alias=True, exclude_none=True)
+    return {"key": request.key, "request": body}
+
+
+def parse_prediction_line(line: dict[str, Any], keys_by_request: dict[str, str]) -> BatchPredictionResult | None:
+    """Convert one line of a prediction output file into a result.
+
+    出力行に key が残っていない場合は、入力したリクエスト本文との一致でキーを求める。
+    """
+    key = line.get("key") or keys_by_request.get(_canonical(line.get("request")))
+    if not key:
+        logger.warning("Skipping prediction line without a known key")
+        return None
+    status = line.get("status")
+    if status:
+        return BatchPredictionResult(key=key, error=str(status))
+
+    candidates = (line.get("response") or {}).get("candidates") or []
+    parts = ((candidates[0].get("content") or {}).get("parts") or []) if candidates else []
+    text = "".join(part.get("text", "") for part in parts if not part.get("thought"))
+    if not text:
+        return BatchPredictionResult(key=key, error="Empty response")
+    return BatchPredictionResult(key=key, text=text)
+
+
+def _canonical(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+class VertexBatchPredictionClient(BatchPredictionGateway):
+    """Vertex AI batch prediction job with GCS input and output."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        client: genai.Client,
+        gcs_client: GCSClient,
+        staging_uri: str,
+        poll_interval_seconds: float = 60.0,
+        timeout_seconds: float = 24 * 3600.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            client: Vertex AI モードの genai クライアント。
+            gcs_client: 入力ファイルのアップロードと出力ファイルの読み込みに使う GCS クライアント。
+            staging_uri: ジョブごとの入出力を置く gs:// プレフィックス。
+            poll_interval_seconds: ジョブ状態のポーリング間隔(秒)。
+            timeout_seconds: ジョブ完了を待つ上限(秒)。
+            sleep: 待機関数。
+            clock: 経過時間の計測に使う時計。
+        """
+        self._client = client
+        self._gcs_client = gcs_client
+        self._staging_uri = staging_uri.rstrip("/")
+        self._poll_interval_seconds = poll_interval_seconds
+        self._timeout_seconds = timeout_seconds
+        self._sleep = sleep
+        self._clock = clock
+        self._keys_by_request: dict[str, dict[str, str]] = {}
+
+    def submit(self, requests: Sequence[BatchPredictionRequest], *, model_id: str, display_name: str) -> str:
+        """Upload the JSONL input and create the batch job."""
+        lines = [build_jsonl_line(request) for request in requests]
+        bucket_name, prefix = split_gcs_uri(f"{self._staging_uri}/{display_name}")
+        input_object = f"{prefix}/input.jsonl"
+        self._gcs_client.upload_blob_from_bytes(
+            bucket_name,
+            "\n".join(json.dumps(line, ensure_ascii=False) for line in lines).encode("utf-8"),
+            input_object,
+            content_type="application/jsonl",
+        )
+        job = self._client.batches.create(
+            model=model_id,
+            src=f"gs://{bucket_name}/{input_object}",
+            config=CreateBatchJobConfig(display_name=display_name, dest=f"gs://{bucket_name}/{prefix}/output"),
+        )
+        if not job.name:
+            msg = f"Batch job for {display_name} was created without a name"
+            raise RuntimeError(msg)
+        self._keys_by_request[job.name] = {_canonical(line["request"]): line["key"] for line in lines}
+        logger.info("Submitted batch job %s with %d requests (%s)", job.name, len(lines), model_id)
+        return job.name
+
+    def wait(self, job_name: str) -> None:
+        """Poll the job until it reaches a terminal state."""
+        deadline = self._clock() + self._timeout_seconds
+        while True:
+            job = self._client.batches.get(name=job_name)
+            if job.state in _TERMINAL_STATES:
+                break
+            if self._clock() + self._poll_interval_seconds > deadline:
+                msg = f"Batch job {job_name} did not finish within {self._timeout_seconds:.0f}s (state={job.state})"
+                raise TimeoutError(msg)
+            logger.info("Batch job %s is %s; checking again in %.0fs", job_name, job.state, self._poll_interval_seconds)
+            self._sleep(self._poll_interval_seconds)
+
+        if job.state not in _SUCCEEDED_STATES:
+            msg = f"Batch job {job_name} ended in {job.state}: {job.error}"
+            raise RuntimeError(msg)
+        logger.info("Batch job %s finished: %s", job_name, job.state)
+
+    def fetch_results(self, job_name: str) -> list[BatchPredictionResult]:
+        """Read every prediction file written under the job's output prefix."""
+        job = self._client.batches.get(name=job_name)
+        if job.dest is None or not job.dest.gcs_uri:
+            msg = f"Batch job {job_name} has no GCS output"
+            raise RuntimeError(msg)
+        bucket_name, prefix = split_gcs_uri(job.dest.gcs_uri)
+        keys_by_request = self._keys_by_request.get(job_name, {})
+
+        results: list[BatchPredictionResult] = []
+        for blob in self._gcs_client.list_blobs(bucket_name, prefix=prefix):
+            if not blob.name.endswith(".jsonl"):
+                continue
+            payload = self._gcs_client.download_blob_as_bytes(bucket_name, blob.name).decode("utf-8")
+            for raw_line in payload.splitlines():
+                if not raw_line.strip():
+                    continue
+                result = parse_prediction_line(json.loads(raw_line), keys_by_request)
+                if result is not None:
+                    results.append(result)
+        return results
+
+
+class LocalBatchPredictionGateway(BatchPredictionGateway):
+    """In-process batch backend that answers each request with a responder function.
+
+    Args:
+        responder: (model_id, request) を受け取り、モデル出力のテキストを返す関数。
+    """
+
+    def __init__(self, responder: Callable[[str, BatchPredictionRequest], str]) -> None:
+        """Initialize with the function that answers single requests."""
+        self._responder = responder
+        self._jobs: dict[str, tuple[str, list[BatchPredictionRequest]]] = {}
+        self._results: dict[str, list[BatchPredictionResult]] = {}
+
+    def submit(self, requests: Sequence[BatchPredictionRequest], *, model_id: str, display_name: str) -> str:
+        """Store the requests under a new job name."""
+        job_name = f"local/{display_name}/{len(self._jobs)}"
+        self._jobs[job_name] = (model_id, list(requests))
+        return job_name
+
+    def wait(self, job_name: str) -> None:
+        """Run every request of the job; failures become error results."""
+        model_id, requests = self._jobs[job_name]
+        results: list[BatchPredictionResult] = []
+        for request in requests:
+            try:
+                results.append(BatchPredictionResult(key=request.key, text=self._responder(model_id, request)))
+            except Exception as err:  # noqa: BLE001 - バッチジョブと同様に 1 件の失敗はその結果にだけ記録する
+                results.append(BatchPredictionResult(key=request.key, error=f"{type(err).__name__}: {err}"))
+        self._results[job_name] = results
+
+    def fetch_results(self, job_name: str) -> list[BatchPredictionResult]:
+        """Return the results produced by wait()."""
+        return list(self._results[job_name])
+
+
+def interactive_responder(model_caller: ModelCaller) -> Callable[[str, BatchPredictionRequest], str]:
+    """Answer batch requests with interactive generate_content calls (for local dry runs)."""
+
+    def respond(model_id: str, request: BatchPredictionRequest) -> str:
+        content, config = batch_request_payload(request)
+        response = model_caller.generate_content(
+            operation=f"batch_{request.kind}",
+            model=model_id,
+            contents=[content],
+            config=config,
+        )
+        return response.text or ""
+
+    return respond
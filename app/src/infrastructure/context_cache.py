@@ -0,0 +1,192 @@
+"""Model-side context caching for payloads reused by several prompts of one episode.
+
+The transcript is registered once as Gemini cached content with a TTL. Later prompts
+(summary, summary with promotions, and their retries or hedged requests) reference the
+cache by name instead of resending the full text, which lowers input token cost and
+latency. When a cache cannot be created (e.g. the payload is below the model's minimum
+cacheable size), callers fall back to sending the payload inline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import httpx
+from google.genai import errors
+from google.genai.types import CreateCachedContentConfig, HttpOptions
+
+from infrastructure.token_budget import estimate_tokens
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from google import genai
+    from google.genai.types import Content
+
+    from infrastructure.model_call import ModelCaller
+
+logger = logging.getLogger(__name__)
+
+# 期限直前のキャッシュを参照すると生成中に失効しうるため、残り時間がこれを下回ったら作り直す
+EXPIRY_MARGIN_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class ContextCaching:
+    """Settings for model-side context caching.
+
+    Attributes:
+        ttl_seconds: キャッシュの有効期間(秒)。
+        min_tokens: キャッシュする最小の推定トークン数。これ未満のペイロードはそのまま送信する
+            (モデルごとにキャッシュ可能な最小トークン数が決まっているため)。
+    """
+
+    ttl_seconds: int = 3600
+    min_tokens: int = 4096
+
+
+@dataclass
+class _CacheEntry:
+    expires_at: float
+    group: str | None
+    name: str | None = None
+    # 作成中のエントリを見つけた呼び出しは、作成が終わるまで待ってから name を使う
+    created: threading.Event = field(default_factory=threading.Event)
+
+
+class ContextCacheRegistry:
+    """Creates cached contents on demand and reuses them until shortly before they expire.
+
+    同じペイロードの作成は 1 回にまとめるが、作成 (ネットワーク呼び出し) の間は他のペイロードの
+    参照・作成を止めない。期限切れのエントリは参照時に捨て、release_group() でエピソードごとに削除できる。
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        model_caller: ModelCaller,
+        settings: ContextCaching,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            client: caches.create/delete を呼び出す genai クライアント。
+            model_caller: キャッシュ作成をタイムアウト・リトライ・レート制限の下で実行する呼び出し層。
+            settings: TTL と最小トークン数の設定。
+            clock: 有効期限の判定に使う時計。
+        """
+        self._client = client
+        self._model_caller = model_caller
+        self._settings = settings
+        self._clock = clock
+        self._entries: dict[tuple[str, str], _CacheEntry] = {}
+        # _entries の参照・更新だけを守る。キャッシュの作成・削除はロックの外で行う
+        self._lock = threading.Lock()
+
+    def get_or_create(
+        self,
+        *,
+        model_id: str,
+        text: str,
+        contents: list[Content],
+        display_name: str,
+        group: str | None = None,
+    ) -> str | None:
+        """Return the cached content name for text, creating it if needed; None means send inline.
+
+        group を指定すると、release_group() で同じ group のキャッシュをまとめて削除できる。
+        """
+        if estimate_tokens(text) < self._settings.min_tokens:
+            return None
+
+        key = (model_id, hashlib.sha256(text.encode("utf-8")).hexdigest())
+        ttl_seconds = self._settings.ttl_seconds
+        with self._lock:
+            now = self._clock()
+            self._drop_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None and (not entry.created.is_set() or entry.expires_at - EXPIRY_MARGIN_SECONDS > now):
+                pending = entry
+            else:
+                pending = None
+                entry = _CacheEntry(expires_at=now + ttl_seconds, group=group)
+                self._entries[key] = entry
+        if pending is not None:
+            pending.created.wait()
+            return pending.name
+
+        try:
+            name = self._create(model_id, contents, display_name, ttl_seconds)
+        except BaseException:
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            entry.created.set()
+            raise
+        with self._lock:
+            entry.name = name
+            entry.expires_at = self._clock() + ttl_seconds
+        entry.created.set()
+        return name
+
+    def _create(self, model_id: str, contents: list[Content], display_name: str, ttl_seconds: int) -> str | None:
+        try:
+            cached = self._model_caller.call(
+                "context_cache",
+                model_id,
+                lambda timeout_seconds: self._client.caches.create(
+                    model=model_id,
+                    config=CreateCachedContentConfig(
+                        contents=contents,
+                        ttl=f"{ttl_seconds}s",
+                        display_name=display_name,
+                        http_options=HttpOptions(timeout=max(1, int(timeout_seconds * 1000))),
+                    ),
+                ),
+            )
+        except (errors.APIError, httpx.TransportError, TimeoutError, ConnectionError) as err:
+            # 作成できない場合 (リトライ後の通信エラーやタイムアウトを含む) は TTL の間は再作成を試みず、
+            # ペイロードをそのまま送信する
+            logger.warning("Context cache for %s was not created (%s); sending the payload inline", model_id, err)
+            return None
+        logger.info("Created context cache %s for %s (ttl=%ss)", cached.name, display_name, ttl_seconds)
+        return cached.name
+
+    def _drop_expired(self, now: float) -> None:
+        # 期限切れのキャッシュはサーバー側でも失効済みのため、削除は呼ばずに忘れるだけでよい
+        expired = [key for key, entry in self._entries.items() if entry.created.is_set() and entry.expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def invalidate(self, name: str) -> None:
+        """Forget a cache that the model no longer accepts (e.g. it expired early or was deleted)."""
+        with self._lock:
+            self._entries = {key: entry for key, entry in self._entries.items() if entry.name != name}
+
+    def release_group(self, group: str) -> None:
+        """Delete the caches created for group (e.g. when the episode that used them has finished)."""
+        with self._lock:
+            released = [key for key, entry in self._entries.items() if entry.group == group and entry.created.is_set()]
+            names = [name for key in released if (name := self._entries.pop(key).name)]
+        self._delete(names)
+
+    def release(self) -> None:
+        """Delete every cache created by this registry before its TTL runs out."""
+        with self._lock:
+            names = [entry.name for entry in self._entries.values() if entry.name]
+            self._entries.clear()
+        self._delete(names)
+
+    def _delete(self, names: list[str]) -> None:
+        for name in names:
+            try:
+                self._client.caches.delete(name=name)
+            except errors.APIError as err:
+                logger.warning("Failed to delete context cache %s: %s", name, err)
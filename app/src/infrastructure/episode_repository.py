@@ -5,6 +5,9 @@ from __future__ import annotations
 from typing import Any
 
 import psycopg
+from psycopg.types.json import Jsonb
+
+from domain.interfaces import EpisodeLeaseLostError, WorkflowCheckpointStore
 
 
 class PostgresEpisodeRepository:
@@ -31,18 +34,79 @@ class PostgresEpisodeRepository:
             episode_id=episode_id,
         )
 
+    def claim_processing(
+        self,
+        *,
+        podcast_id: str,
+        episode_id: str,
+        source_audio_path: str,
+        owner: str,
+        lease_seconds: float,
+    ) -> bool:
+        """Atomically mark the episode as processing by owner unless another run holds a live lease.
+
+        Eventarc は同じ finalize イベントを重複して配信しうるため、処理中 (status = 'processing') かつ
+        リース期限内のエピソードは取得できない。同じソース音声で完了済み (status = 'completed') の
+        エピソードも、遅れて届いた重複配信で公開し直さないよう取得できない。リースが切れた処理中の
+        エピソード (異常終了したジョブ) と、失敗したエピソードは取得し直せる。
+        """
+        with psycopg.connect(self._database_url) as connection, connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE episodes
+                SET status = 'processing',
+                    source_audio_path = COALESCE(source_audio_path, %s),
+                    processing_error = NULL,
+                    processing_started_at = now(),
+                    lease_owner = %s,
+                    lease_expires_at = now() + make_interval(secs => %s),
+                    updated_at = now()
+                WHERE podcast_id = %s AND episode_id = %s
+                  AND (status <> 'processing' OR lease_expires_at IS NULL OR lease_expires_at < now())
+                  AND (status <> 'completed' OR source_audio_path IS DISTINCT FROM %s)
+                RETURNING episode_id
+                """,
+                (source_audio_path, owner, lease_seconds, podcast_id, episode_id, source_audio_path),
+            )
+            if cursor.fetchone() is not None:
+                return True
+            cursor.execute(
+                "SELECT 1 FROM episodes WHERE podcast_id = %s AND episode_id = %s",
+                (podcast_id, episode_id),
+            )
+            if cursor.fetchone() is None:
+                msg = f"Episode not found: podcast_id={podcast_id}, episode_id={episode_id}"
+                raise LookupError(msg)
+            return False
+
+    def renew_lease(self, *, podcast_id: str, episode_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the processing lease; return False when owner no longer holds it."""
+        with psycopg.connect(self._database_url) as connection, connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE episodes
+                SET lease_expires_at = now() + make_interval(secs => %s),
+                    updated_at = now()
+                WHERE podcast_id = %s AND episode_id = %s
+                  AND status = 'processing' AND lease_owner = %s
+                """,
+                (lease_seconds, podcast_id, episode_id, owner),
+            )
+            return cursor.rowcount == 1
+
     def mark_completed(
         self,
         *,
         podcast_id: str,
         episode_id: str,
+        owner: str,
         title: str,
         description: str,
         audio_url: str,
         duration_seconds: int | None,
     ) -> None:
-        """Store generated metadata and mark an episode complete."""
-        self._execute_update(
+        """Store generated metadata and mark an episode complete while owner still holds the lease."""
+        self._execute_leased_update(
             """
             UPDATE episodes
             SET status = 'completed',
@@ -53,30 +117,58 @@ class PostgresEpisodeRepository:
                 processing_error = NULL,
                 processing_completed_at = now(),
                 published_at = COALESCE(published_at, now()),
+                lease_owner = NULL,
+                lease_expires_at = NULL,
                 updated_at = now()
-            WHERE podcast_id = %s AND episode_id = %s
+            WHERE podcast_id = %s AND episode_id = %s AND lease_owner = %s
             """,
-            (title, description, audio_url, duration_seconds, podcast_id, episode_id),
+            (title, description, audio_url, duration_seconds, podcast_id, episode_id, owner),
             podcast_id=podcast_id,
             episode_id=episode_id,
         )
 
-    def mark_failed(self, *, podcast_id: str, episode_id: str, error_message: str) -> None:
-        """Record a processing failure."""
-        self._execute_update(
+    def mark_failed(self, *, podcast_id: str, episode_id: str, owner: str, error_message: str) -> None:
+        """Record a processing failure while owner still holds the lease."""
+        self._execute_leased_update(
             """
             UPDATE episodes
             SET status = 'failed',
                 processing_error = %s,
                 processing_completed_at = now(),
+                lease_owner = NULL,
+                lease_expires_at = NULL,
                 updated_at = now()
-            WHERE podcast_id = %s AND episode_id = %s
+            WHERE podcast_id = %s AND episode_id = %s AND lease_owner = %s
             """,
-            (error_message[:2000], podcast_id, episode_id),
+            (error_message[:2000], podcast_id, episode_id, owner),
             podcast_id=podcast_id,
             episode_id=episode_id,
         )
 
+    def _execute_leased_update(
+        self,
+        statement: str,
+        parameters: tuple[Any, ...],
+        *,
+        podcast_id: str,
+        episode_id: str,
+    ) -> None:
+        # リースの延長は lease/3 ごとのため、奪われたことに気付く前に新しい所有者の状態を上書きしないよう
+        # 更新自体を lease_owner で条件付けする
+        with psycopg.connect(self._database_url) as connection, connection.cursor() as cursor:
+            cursor.execute(statement, parameters)
+            if cursor.rowcount == 1:
+                return
+            cursor.execute(
+                "SELECT 1 FROM episodes WHERE podcast_id = %s AND episode_id = %s",
+                (podcast_id, episode_id),
+            )
+            if cursor.fetchone() is None:
+                msg = f"Episode not found: podcast_id={podcast_id}, episode_id={episode_id}"
+                raise LookupError(msg)
+            msg = f"Another run holds the processing lease of episode podcast_id={podcast_id}, episode_id={episode_id}"
+            raise EpisodeLeaseLostError(msg)
+
     def _execute_update(
         self,
         statement: str,
@@ -90,3 +182,54 @@ class PostgresEpisodeRepository:
             if cursor.rowcount != 1:
                 msg = f"Episode not found: podcast_id={podcast_id}, episode_id={episode_id}"
                 raise LookupError(msg)
+
+
+class PostgresWorkflowCheckpointStore(WorkflowCheckpointStore):
+    """Store workflow step outputs in the episode_step_checkpoints table."""
+
+    def __init__(self, *, database_url: str) -> None:
+        """Initialize the store."""
+        self._database_url = database_url
+
+    def load(self, *, podcast_id: str, episode_id: str, source_audio_path: str) -> dict[str, Any]:
+        """Return saved outputs by step name for the same source audio."""
+        with psycopg.connect(self._database_url) as connection, connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT step, value
+                FROM episode_step_checkpoints
+                WHERE podcast_id = %s AND episode_id = %s AND source_audio_path = %s
+                """,
+                (podcast_id, episode_id, source_audio_path),
+            )
+            return dict(cursor.fetchall())
+
+    def save(self, *, podcast_id: str, episode_id: str, source_audio_path: str, step: str, value: Any) -> None:  # noqa: ANN401
+        """Upsert a step output; checkpoints of another source audio are dropped first."""
+        with psycopg.connect(self._database_url) as connection, connection.cursor() as cursor:
+            cursor.execute(
+                """
+                DELETE FROM episode_step_checkpoints
+                WHERE podcast_id = %s AND episode_id = %s AND source_audio_path <> %s
+                """,
+                (podcast_id, episode_id, source_audio_path),
+            )
+            cursor.execute(
+                """
+                INSERT INTO episode_step_checkpoints (podcast_id, episode_id, step, source_audio_path, value)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (podcast_id, episode_id, step)
+                DO UPDATE SET source_audio_path = EXCLUDED.source_audio_path,
+                              value = EXCLUDED.value,
+                              completed_at = now()
+                """,
+                (podcast_id, episode_id, step, source_audio_path, Jsonb(value)),
+            )
+
+    def clear(self, *, podcast_id: str, episode_id: str) -> None:
+        """Delete every checkpoint of the episode."""
+        with psycopg.connect(self._database_url) as connection, connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM episode_step_checkpoints WHERE podcast_id = %s AND episode_id = %s",
+                (podcast_id, episode_id),
+            )
@@ -0,0 +1,141 @@
+"""Read-through cache for the episode transcripts read by the weekly agenda job.
+
+Entries are keyed by podcast and episode ID and carry the episode document's
+`updated_at`. An entry is only returned while the episode still has the same
+`updated_at`; every write path that replaces a transcript (workflow, backfill) also
+updates it, so a changed episode is simply read from Firestore again. The SQLite
+backend keeps the cache in a local file; the GCS backend keeps the same file in a
+bucket so it survives Cloud Run Job executions.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import tempfile
+from contextlib import closing
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from google.api_core.exceptions import NotFound
+
+from domain.interfaces import EpisodeTranscriptCache
+from infrastructure.storage import split_gcs_uri
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from infrastructure.storage import GCSClient
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS episode_transcripts (
+    podcast_id TEXT NOT NULL,
+    episode_id TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    transcript TEXT NOT NULL,
+    cached_at TEXT NOT NULL,
+    PRIMARY KEY (podcast_id, episode_id)
+)
+"""
+
+# SQLite のバインド変数の上限 (既定 999) を超えないよう IN 句を分割する
+_MAX_QUERY_IDS = 500
+
+
+class SqliteEpisodeTranscriptCache(EpisodeTranscriptCache):
+    """SQLite file cache backend for local runs and tests."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (or create) the cache database."""
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self._path)) as connection, connection:
+            connection.execute(_SCHEMA)
+
+    @property
+    def path(self) -> Path:
+        """Location of the database file."""
+        return self._path
+
+    def get_many(self, podcast_id: str, versions: Mapping[str, str]) -> dict[str, str]:
+        """Return cached transcripts whose updated_at matches versions (episode_id -> updated_at)."""
+        episode_ids = list(versions)
+        cached: dict[str, str] = {}
+        with closing(sqlite3.connect(self._path)) as connection:
+            for start in range(0, len(episode_ids), _MAX_QUERY_IDS):
+                chunk = episode_ids[start : start + _MAX_QUERY_IDS]
+                rows = connection.execute(
+                    "SELECT episode_id, updated_at, transcript FROM episode_transcripts "  # noqa: S608
+                    f"WHERE podcast_id = ? AND episode_id IN ({', '.join('?' * len(chunk))})",
+                    (podcast_id, *chunk),
+                )
+                cached.update(
+                    (episode_id, transcript)
+                    for episode_id, updated_at, transcript in rows
+                    if updated_at == versions[episode_id]
+                )
+        return cached
+
+    def put_many(self, podcast_id: str, entries: Mapping[str, tuple[str, str]]) -> None:
+        """Store transcripts (episode_id -> (updated_at, transcript)), replacing older versions."""
+        if not entries:
+            return
+        cached_at = datetime.now(UTC).isoformat()
+        with closing(sqlite3.connect(self._path)) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO episode_transcripts "
+                "(podcast_id, episode_id, updated_at, transcript, cached_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (podcast_id, episode_id, updated_at, transcript, cached_at)
+                    for episode_id, (updated_at, transcript) in entries.items()
+                ],
+            )
+
+
+class GcsEpisodeTranscriptCache(EpisodeTranscriptCache):
+    """SQLite cache persisted as one object in GCS, for Cloud Run Jobs.
+
+    生成時にデータベースファイルを GCS からダウンロードし (なければ空で始める)、実行中はローカルの
+    ファイルを読み書きする。persist() で変更があった場合だけアップロードする。
+    """
+
+    def __init__(self, *, gcs_client: GCSClient, gcs_uri: str, local_dir: str | Path | None = None) -> None:
+        """Download the database from gcs_uri into local_dir (a temporary directory by default)."""
+        self._gcs_client = gcs_client
+        self._bucket_name, self._object_name = split_gcs_uri(gcs_uri)
+        directory = Path(local_dir) if local_dir else Path(tempfile.mkdtemp(prefix="agenda-transcripts-"))
+        directory.mkdir(parents=True, exist_ok=True)
+        local_path = directory / Path(self._object_name).name
+        try:
+            gcs_client.download_blob(self._bucket_name, self._object_name, str(local_path))
+        except NotFound:
+            logger.info("Transcript cache %s does not exist yet; starting empty.", gcs_uri)
+            local_path.unlink(missing_ok=True)
+        self._local = SqliteEpisodeTranscriptCache(local_path)
+        self._dirty = False
+
+    def get_many(self, podcast_id: str, versions: Mapping[str, str]) -> dict[str, str]:
+        """Return cached transcripts whose updated_at matches versions."""
+        return self._local.get_many(podcast_id, versions)
+
+    def put_many(self, podcast_id: str, entries: Mapping[str, tuple[str, str]]) -> None:
+        """Store transcripts locally; they are uploaded by persist()."""
+        if entries:
+            self._local.put_many(podcast_id, entries)
+            self._dirty = True
+
+    def persist(self) -> bool:
+        """Upload the database if anything was stored since it was downloaded; return whether it was uploaded."""
+        if not self._dirty:
+            return False
+        self._gcs_client.upload_blob(
+            self._bucket_name,
+            str(self._local.path),
+            self._object_name,
+            content_type="application/vnd.sqlite3",
+        )
+        self._dirty = False
+        return True
@@ -0,0 +1,158 @@
+"""Assembly and metrics for streamed Gemini responses."""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@dataclass(frozen=True)
+class StreamMetrics:
+    """Latency and size of one streamed response.
+
+    Attributes:
+        operation: 処理名 (transcript / summary など)。
+        model_id: 呼び出したモデル ID。
+        time_to_first_token_seconds: 最初の非空チャンクを受信するまでの秒数。受信しなかった場合は None。
+        total_seconds: ストリーム完了までの秒数。
+        chunks: 受信した非空チャンク数。
+        characters: 受信した文字数。
+    """
+
+    operation: str
+    model_id: str
+    time_to_first_token_seconds: float | None
+    total_seconds: float
+    chunks: int
+    characters: int
+
+
+class StreamAssembler:
+    """Accumulates streamed text, records time-to-first-token and validates JSON output."""
+
+    def __init__(
+        self,
+        *,
+        operation: str,
+        model_id: str,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Start the latency clock for one streamed call."""
+        self._operation = operation
+        self._model_id = model_id
+        self._clock = clock
+        self._started = clock()
+        self._first_token_at: float | None = None
+        self._finished_at: float | None = None
+        self._parts: list[str] = []
+
+    def feed(self, text: str) -> None:
+        """Append one streamed text delta."""
+        if not text:
+            return
+        if self._first_token_at is None:
+            self._first_token_at = self._clock()
+        self._parts.append(text)
+
+    def consume(self, stream: Iterable[str], on_text: Callable[[str], None] | None = None) -> str:
+        """Drain a stream of text deltas and return the assembled text.
+
+        Args:
+            stream: テキスト差分のイテレータ。
+            on_text: 差分を受信するたびに呼ばれるコールバック (進捗の転送用)。
+        """
+        for text in stream:
+            self.feed(text)
+            if text and on_text is not None:
+                on_text(text)
+        self.finish()
+        return self.text
+
+    def finish(self) -> StreamMetrics:
+        """Mark the stream complete and log its metrics."""
+        if self._finished_at is None:
+            self._finished_at = self._clock()
+            metrics = self.metrics
+            logger.info(
+                "Stream finished: operation=%s model=%s ttft=%s total=%.3fs chunks=%d chars=%d",
+                metrics.operation,
+                metrics.model_id,
+                "n/a" if metrics.time_to_first_token_seconds is None else f"{metrics.time_to_first_token_seconds:.3f}s",
+                metrics.total_seconds,
+                metrics.chunks,
+                metrics.characters,
+            )
+        return self.metrics
+
+    @property
+    def text(self) -> str:
+        """Text received so far."""
+        return "".join(self._parts)
+
+    @property
+    def metrics(self) -> StreamMetrics:
+        """Metrics for the stream (up to now if it has not finished)."""
+        now = self._finished_at if self._finished_at is not None else self._clock()
+        return StreamMetrics(
+            operation=self._operation,
+            model_id=self._model_id,
+            time_to_first_token_seconds=None if self._first_token_at is None else self._first_token_at - self._started,
+            total_seconds=now - self._started,
+            chunks=len(self._parts),
+            characters=sum(len(part) for part in self._parts),
+        )
+
+    def validate(self, schema: type[ModelT]) -> ModelT:
+        """Validate the completed stream as JSON of the given schema.
+
+        Raises:
+            ValueError: ストリームが空、または JSON が途中で切れている場合
+            ValidationError: スキーマに一致しない場合
+        """
+        self.finish()
+        text = self.text.strip()
+        if not text:
+            raise ValueError("No response received from the model.")
+        if not text.endswith("}"):
+            logger.error("Streamed output truncated or incomplete JSON. text=%s", text)
+            raise ValueError(
+                "Model output was truncated or incomplete JSON. Try increasing max_output_tokens or simplifying the prompt."
+            )
+
+        try:
+            return schema.model_validate_json(text)
+        except ValidationError:
+            # JSON の前後に余計なテキストが付いている場合は {...} の範囲だけを取り出して再検証する
+            start = text.find("{")
+            if start <= 0:
+                raise
+            logger.warning("Streamed JSON validation failed; retrying with the enclosed object. text=%s", text)
+            return schema.model_validate_json(text[start:])
+
+
+class StreamProgressLogger:
+    """on_stream_text callback that logs cumulative received characters at a fixed interval."""
+
+    def __init__(self, interval_chars: int = 2000) -> None:
+        """Initialize with the number of characters between progress lines."""
+        self._interval_chars = interval_chars
+        self._received: dict[str, int] = {}
+
+    def __call__(self, operation: str, text: str) -> None:
+        """Record a streamed delta and log when another interval has been received."""
+        previous = self._received.get(operation, 0)
+        current = previous + len(text)
+        self._received[operation] = current
+        if current // self._interval_chars > previous // self._interval_chars:
+            logger.info("Streaming %s: %d characters received", operation, current)
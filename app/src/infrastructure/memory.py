@@ -0,0 +1,89 @@
+"""Resident memory sampling for memory-budgeted workflow runs.
+
+RssMonitor reads the current resident set size (RSS) from /proc/self/statm on a
+background thread while at least one window is open, and each window keeps the
+highest value seen between its start and end. Steps that run concurrently share the
+process, so their windows observe the same RSS; the peak of a step is the peak of
+the process while that step was running. Where /proc is not available (macOS), the
+process-wide high-water mark from getrusage is used instead.
+"""
+
+from __future__ import annotations
+
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from domain.interfaces import MemoryMonitor, MemoryWindow
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_STATM_PATH = Path("/proc/self/statm")
+
+
+def current_rss_bytes() -> int:
+    """Return the resident set size of this process in bytes."""
+    try:
+        resident_pages = int(_STATM_PATH.read_text(encoding="ascii").split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss は Linux では KiB、macOS ではバイト単位
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class _Window(MemoryWindow):
+    def __init__(self, rss_bytes: int) -> None:
+        self._peak_bytes = rss_bytes
+
+    @property
+    def peak_bytes(self) -> int:
+        return self._peak_bytes
+
+    def observe(self, rss_bytes: int) -> None:
+        self._peak_bytes = max(self._peak_bytes, rss_bytes)
+
+
+class RssMonitor(MemoryMonitor):
+    """Samples RSS every interval_seconds while any tracked block is running."""
+
+    def __init__(self, *, interval_seconds: float = 0.05) -> None:
+        """Initialize the monitor; the sampling thread starts with the first tracked block."""
+        self._interval_seconds = interval_seconds
+        self._windows: set[_Window] = set()
+        self._lock = threading.Lock()
+        self._sampler: threading.Thread | None = None
+
+    @contextmanager
+    def track(self) -> Iterator[MemoryWindow]:
+        """Record the peak RSS until the block exits."""
+        window = _Window(current_rss_bytes())
+        with self._lock:
+            self._windows.add(window)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, name="rss-monitor", daemon=True)
+                self._sampler.start()
+        try:
+            yield window
+        finally:
+            # 短いブロックでもサンプリング間隔に関係なく終了時点の値を反映する
+            window.observe(current_rss_bytes())
+            with self._lock:
+                self._windows.discard(window)
+
+    def _sample(self) -> None:
+        while True:
+            rss_bytes = current_rss_bytes()
+            with self._lock:
+                if not self._windows:
+                    self._sampler = None
+                    return
+                for window in self._windows:
+                    window.observe(rss_bytes)
+            time.sleep(self._interval_seconds)
@@ -0,0 +1,357 @@
+"""Resilient wrapper around Gemini generate_content calls.
+
+Every call gets a per-attempt HTTP timeout and an overall deadline. Retryable errors
+(HTTP 408/429/5xx and transport errors) are retried with full-jitter exponential
+backoff. Optionally, a second identical request is sent when the first one is slower
+than a latency percentile of recent calls (hedging). Each call emits one metrics record.
+
+The losing request of a hedged pair cannot be cancelled: it keeps running until it
+finishes or hits its HTTP timeout. Hedged requests therefore run on a bounded pool
+(`ModelCallPolicy.hedge_max_in_flight`), and a call runs unhedged on the caller's thread
+while that pool is full. Streaming calls are never hedged, because both streams would
+forward their deltas to the same progress callback.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import httpx
+from google.genai import errors
+from google.genai.types import GenerateContentConfig, HttpOptions
+
+from infrastructure.gemini_stream import StreamAssembler
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from google import genai
+    from google.genai.types import GenerateContentResponse
+
+    from infrastructure.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+LATENCY_WINDOW = 100
+
+
+@dataclass(frozen=True)
+class ModelCallPolicy:
+    """Timeout, retry and hedging settings for model calls.
+
+    Attributes:
+        deadline_seconds: リトライを含めた 1 回の論理呼び出し全体の期限(秒)。
+        attempt_timeout_seconds: 1 回のリクエストの HTTP タイムアウト(秒)。
+        max_attempts: 最大試行回数(初回を含む)。
+        initial_backoff_seconds: 1 回目のリトライ前の最大待機時間(秒)。試行ごとに 2 倍になる。
+        max_backoff_seconds: リトライ前の待機時間の上限(秒)。
+        hedge_percentile: 直近の成功レイテンシのこのパーセンタイルを超えたら同じリクエストをもう 1 本送る。
+            None の場合はヘッジしない。
+        hedge_min_samples: ヘッジ判定に必要な直近の成功サンプル数。
+        hedge_max_in_flight: ヘッジ用スレッドで同時に実行できるリクエスト数 (負けたリクエストを含む)。
+            枠が空いていない間はヘッジせずに呼び出し元のスレッドで実行する。
+    """
+
+    deadline_seconds: float = 1500.0
+    attempt_timeout_seconds: float = 600.0
+    max_attempts: int = 4
+    initial_backoff_seconds: float = 2.0
+    max_backoff_seconds: float = 60.0
+    hedge_percentile: float | None = None
+    hedge_min_samples: int = 20
+    hedge_max_in_flight: int = 8
+
+
+@dataclass(frozen=True)
+class ModelCallMetrics:
+    """Outcome and latency of one logical model call."""
+
+    operation: str
+    model_id: str
+    outcome: str
+    attempts: int
+    hedged: bool
+    latency_seconds: float
+    attempt_latencies_seconds: tuple[float, ...]
+    error: str | None = None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return True for errors worth retrying (throttling, server errors, timeouts)."""
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError))
+
+
+def _with_timeout(config: GenerateContentConfig | None, timeout_seconds: float) -> GenerateContentConfig:
+    """Return a copy of config whose HTTP options carry the attempt timeout."""
+    timeout_ms = max(1, int(timeout_seconds * 1000))
+    if config is None:
+        return GenerateContentConfig(http_options=HttpOptions(timeout=timeout_ms))
+    http_options = config.http_options or HttpOptions()
+    return config.model_copy(update={"http_options": http_options.model_copy(update={"timeout": timeout_ms})})
+
+
+class ModelCaller:
+    """Runs model requests under a ModelCallPolicy and records latency metrics."""
+
+    def __init__(
+        self,
+        client: genai.Client,
+        policy: ModelCallPolicy | None = None,
+        *,
+        metrics_sink: Callable[[ModelCallMetrics], None] | None = None,
+        rate_limiter: RateLimiter | None = None,
+        location: str = "global",
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        """Initialize the caller.
+
+        Args:
+            client: generate_content を呼び出す genai クライアント。
+            policy: タイムアウト・リトライ・ヘッジの設定。None の場合はデフォルト。
+            metrics_sink: 呼び出しごとのメトリクスを受け取るコールバック。ログ出力に加えて呼ばれる。
+            rate_limiter: 各リクエスト (リトライ・ヘッジを含む) の送信前に許可を得るレートリミッター。
+            location: レートリミッターのキーに使う Vertex AI のリージョン。
+            clock: 経過時間の計測に使う時計。
+            sleep: バックオフの待機関数。
+            jitter: [0, 1) の乱数を返す関数。
+        """
+        self._client = client
+        self.policy = policy or ModelCallPolicy()
+        self._metrics_sink = metrics_sink
+        self._rate_limiter = rate_limiter
+        self._location = location
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._latencies: dict[tuple[str, str], deque[float]] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self._latencies_lock = threading.Lock()
+        self._hedge_executor: ThreadPoolExecutor | None = None
+        if self.policy.hedge_percentile is not None:
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=self.policy.hedge_max_in_flight, thread_name_prefix="model-hedge"
+            )
+        self._hedge_slots = threading.BoundedSemaphore(max(1, self.policy.hedge_max_in_flight))
+
+    def generate_content(
+        self,
+        *,
+        operation: str,
+        model: str,
+        contents: Any,  # noqa: ANN401 - generate_content が受け付ける型をそのまま渡す
+        config: GenerateContentConfig | None = None,
+    ) -> GenerateContentResponse:
+        """Call client.models.generate_content under the policy."""
+        return self.call(
+            operation,
+            model,
+            lambda timeout_seconds: self._client.models.generate_content(
+                model=model,
+                contents=contents,
+                config=_with_timeout(config, timeout_seconds),
+            ),
+        )
+
+    def generate_content_stream(
+        self,
+        *,
+        operation: str,
+        model: str,
+        contents: Any,  # noqa: ANN401 - generate_content_stream が受け付ける型をそのまま渡す
+        config: GenerateContentConfig | None = None,
+        on_text: Callable[[str], None] | None = None,
+    ) -> StreamAssembler:
+        """Stream client.models.generate_content_stream under the policy and return the drained stream.
+
+        ストリームは 1 回の試行の中で最後まで受信するため、タイムアウト・リトライ・レート制限は
+        generate_content と同じく試行単位で適用される。ヘッジはしない (2 本のストリームが同じ on_text に
+        差分を交互に流さないように)。on_text には受信中の試行の差分を渡すので、リトライが起きた場合は
+        同じ内容の差分が再度届くことがある。
+        """
+
+        def request(timeout_seconds: float) -> StreamAssembler:
+            assembler = StreamAssembler(operation=operation, model_id=model)
+            stream = self._client.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=_with_timeout(config, timeout_seconds),
+            )
+            assembler.consume((chunk.text for chunk in stream if chunk.text), on_text=on_text)
+            return assembler
+
+        return self.call(operation, model, request, hedge=False)
+
+    def call(self, operation: str, model_id: str, request: Callable[[float], T], *, hedge: bool = True) -> T:
+        """Run `request(timeout_seconds)` with retries, deadline and optional hedging.
+
+        hedge=False の場合は hedge_percentile が設定されていてもヘッジしない (副作用を伴う要求向け)。
+        """
+        policy = self.policy
+        if self._rate_limiter is not None:
+            request = self._rate_limited(self._rate_limiter, model_id, request)
+        started = self._clock()
+        deadline = started + policy.deadline_seconds
+        attempt_latencies: list[float] = []
+        hedged = False
+        attempt = 0
+        while True:
+            attempt += 1
+            timeout_seconds = min(policy.attempt_timeout_seconds, deadline - self._clock())
+            attempt_started = self._clock()
+            try:
+                result, attempt_hedged = self._attempt(operation, model_id, request, timeout_seconds, hedge=hedge)
+            except Exception as err:
+                attempt_latencies.append(self._clock() - attempt_started)
+                backoff = min(policy.max_backoff_seconds, policy.initial_backoff_seconds * 2 ** (attempt - 1))
+                backoff *= self._jitter()
+                if not is_retryable(err) or attempt >= policy.max_attempts or self._clock() + backoff >= deadline:
+                    self._emit(
+                        operation,
+                        model_id,
+                        outcome="error",
+                        attempt_latencies=attempt_latencies,
+                        hedged=hedged,
+                        started=started,
+                        error=err,
+                    )
+                    raise
+                logger.warning(
+                    "Model call %s (%s) failed on attempt %d/%d: %s; retrying in %.1fs",
+                    operation,
+                    model_id,
+                    attempt,
+                    policy.max_attempts,
+                    err,
+                    backoff,
+                )
+                self._sleep(backoff)
+                continue
+
+            latency = self._clock() - attempt_started
+            attempt_latencies.append(latency)
+            hedged = hedged or attempt_hedged
+            with self._latencies_lock:
+                self._latencies[operation, model_id].append(latency)
+            self._emit(
+                operation,
+                model_id,
+                outcome="ok",
+                attempt_latencies=attempt_latencies,
+                hedged=hedged,
+                started=started,
+                error=None,
+            )
+            return result
+
+    def _attempt(
+        self,
+        operation: str,
+        model_id: str,
+        request: Callable[[float], T],
+        timeout_seconds: float,
+        *,
+        hedge: bool,
+    ) -> tuple[T, bool]:
+        """Run one attempt, sending a hedge request if it outlives the latency percentile."""
+        hedge_delay = self._hedge_delay(operation, model_id) if hedge else None
+        if hedge_delay is None or hedge_delay >= timeout_seconds:
+            return request(timeout_seconds), False
+
+        primary = self._submit_hedgeable(request, timeout_seconds)
+        if primary is None:
+            # ヘッジ用の枠が (取り消せない負けたリクエストなどで) 埋まっている間はヘッジしない
+            return request(timeout_seconds), False
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result(), False
+
+        hedge = self._submit_hedgeable(request, timeout_seconds - hedge_delay)
+        if hedge is None:
+            return primary.result(), False
+        logger.info("Hedging model call %s (%s) after %.2fs", operation, model_id, hedge_delay)
+        pending = {primary, hedge}
+        first_error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    # 負けた方のリクエストは取り消せないが HTTP タイムアウトで必ず終わり、枠もそこで返る
+                    return future.result(), True
+                first_error = first_error or error
+        raise first_error  # type: ignore[misc]
+
+    def _submit_hedgeable(self, request: Callable[[float], T], timeout_seconds: float) -> Future[T] | None:
+        """Run the request on the hedge pool, or return None when every slot is in use."""
+        if self._hedge_executor is None or not self._hedge_slots.acquire(blocking=False):
+            return None
+        future = self._hedge_executor.submit(request, timeout_seconds)
+        future.add_done_callback(lambda _: self._hedge_slots.release())
+        return future
+
+    def _rate_limited(
+        self,
+        rate_limiter: RateLimiter,
+        model_id: str,
+        request: Callable[[float], T],
+    ) -> Callable[[float], T]:
+        """Wrap a request so that it holds a rate limiter permit while it runs."""
+
+        def limited(timeout_seconds: float) -> T:
+            waiting_started = self._clock()
+            with rate_limiter.acquire(model_id, self._location, timeout_seconds=timeout_seconds):
+                # 許可待ちに使った時間の分だけ HTTP タイムアウトを短くする
+                remaining = timeout_seconds - (self._clock() - waiting_started)
+                return request(max(0.001, remaining))
+
+        return limited
+
+    def _hedge_delay(self, operation: str, model_id: str) -> float | None:
+        percentile = self.policy.hedge_percentile
+        if percentile is None:
+            return None
+        with self._latencies_lock:
+            samples = sorted(self._latencies[operation, model_id])
+        if len(samples) < self.policy.hedge_min_samples:
+            return None
+        index = min(len(samples) - 1, int(percentile * len(samples)))
+        return samples[index]
+
+    def _emit(
+        self,
+        operation: str,
+        model_id: str,
+        *,
+        outcome: str,
+        attempt_latencies: list[float],
+        hedged: bool,
+        started: float,
+        error: BaseException | None,
+    ) -> None:
+        metrics = ModelCallMetrics(
+            operation=operation,
+            model_id=model_id,
+            outcome=outcome,
+            attempts=len(attempt_latencies),
+            hedged=hedged,
+            latency_seconds=round(self._clock() - started, 3),
+            attempt_latencies_seconds=tuple(round(latency, 3) for latency in attempt_latencies),
+            error=None if error is None else f"{type(error).__name__}: {error}",
+        )
+        logger.info("model_call %s", json.dumps(asdict(metrics), ensure_ascii=False))
+        if self._metrics_sink is not None:
+            self._metrics_sink(metrics)
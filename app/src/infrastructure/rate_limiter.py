@@ -0,0 +1,247 @@
+"""Rate limiting and concurrency control for Gemini calls.
+
+A token bucket per (model, location) bounds the request rate of this process, and a
+semaphore bounds in-flight requests. An optional shared budget (a per-minute counter in
+Firestore) makes parallel jobs respect one global request rate.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Protocol
+
+from google.cloud import firestore
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping
+    from contextlib import AbstractContextManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIRESTORE_COLLECTION = "ai_rate_limits"
+SHARED_WINDOW_SECONDS = 60
+
+
+class RateLimitTimeoutError(TimeoutError):
+    """Raised when a permit cannot be acquired before the caller's deadline."""
+
+
+@dataclass(frozen=True)
+class ModelRateLimit:
+    """Request budget for one model.
+
+    Attributes:
+        requests_per_minute: 1 分あたりのリクエスト数の上限。
+        burst: 連続して即時に送れるリクエスト数 (バケット容量)。
+        max_concurrent: 同時に実行中にできるリクエスト数。None の場合は制限しない。
+    """
+
+    requests_per_minute: float
+    burst: int = 1
+    max_concurrent: int | None = None
+
+
+def parse_rate_limits(spec: str) -> dict[str, ModelRateLimit]:
+    """Parse `model=rpm[/max_concurrent[/burst]][,model=...]`, e.g. `gemini-2.5-flash=60/4/5,gemini-2.5-pro=10`.
+
+    `*` をモデル名にすると、個別に指定していないモデルのデフォルトになる。同時実行数を制限せずに
+    burst だけ指定する場合は `60//5` のように同時実行数を空にする。
+    """
+    limits: dict[str, ModelRateLimit] = {}
+    for raw_entry in spec.split(","):
+        entry = raw_entry.strip()
+        if not entry:
+            continue
+        model_id, separator, value = entry.partition("=")
+        fields = value.split("/")
+        if not separator or not model_id.strip() or len(fields) > 3:  # noqa: PLR2004 - rpm/max_concurrent/burst
+            msg = f"Invalid rate limit entry: {entry!r} (expected model=rpm[/max_concurrent[/burst]])"
+            raise ValueError(msg)
+        rate, concurrency, burst = (*fields, "", "")[:3]
+        requests_per_minute = float(rate)
+        if requests_per_minute <= 0:
+            msg = f"requests_per_minute must be positive: {entry!r}"
+            raise ValueError(msg)
+        if burst and int(burst) < 1:
+            msg = f"burst must be at least 1: {entry!r}"
+            raise ValueError(msg)
+        limits[model_id.strip()] = ModelRateLimit(
+            requests_per_minute=requests_per_minute,
+            burst=int(burst) if burst else 1,
+            max_concurrent=int(concurrency) if concurrency else None,
+        )
+    return limits
+
+
+def build_rate_limiter(
+    spec: str | None,
+    *,
+    shared_budget: SharedRateBudget | None = None,
+) -> TokenBucketRateLimiter | None:
+    """Build a limiter from an AI_RATE_LIMITS spec, or return None when no limits are configured."""
+    limits = parse_rate_limits(spec or "")
+    if not limits:
+        return None
+    logger.info("Gemini rate limits: %s (shared=%s)", limits, shared_budget is not None)
+    return TokenBucketRateLimiter(limits, shared_budget=shared_budget)
+
+
+class SharedRateBudget(Protocol):
+    """Request counter shared by every job that calls the same model."""
+
+    def try_acquire(self, key: str, requests_per_window: int) -> float:
+        """Take one request from the current window; return 0.0 on success or seconds until the next window."""
+
+
+class RateLimiter(Protocol):
+    """Grants permission to send one model request."""
+
+    def acquire(self, model_id: str, location: str, *, timeout_seconds: float) -> AbstractContextManager[None]:
+        """Block until a request may be sent; the permit is held for the duration of the request."""
+
+
+class _TokenBucket:
+    def __init__(self, limit: ModelRateLimit, clock: Callable[[], float]) -> None:
+        self._rate_per_second = limit.requests_per_minute / 60
+        self._capacity = float(max(1, limit.burst))
+        self._tokens = self._capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_take(self) -> float:
+        """Take a token and return 0.0, or return seconds until one is available."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate_per_second)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self._rate_per_second
+
+
+class TokenBucketRateLimiter:
+    """Process-wide limiter keyed by (model, location), optionally backed by a shared budget."""
+
+    def __init__(
+        self,
+        limits: Mapping[str, ModelRateLimit],
+        *,
+        shared_budget: SharedRateBudget | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize with per-model limits (`*` is the default for unlisted models)."""
+        self._limits = dict(limits)
+        self._shared_budget = shared_budget
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: dict[tuple[str, str], _TokenBucket] = {}
+        self._semaphores: dict[tuple[str, str], threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, model_id: str, location: str, *, timeout_seconds: float) -> Iterator[None]:
+        """Wait for rate and concurrency permits for one request."""
+        limit = self._limits.get(model_id) or self._limits.get("*")
+        if limit is None:
+            yield
+            return
+
+        key = (model_id, location)
+        deadline = self._clock() + timeout_seconds
+        semaphore = self._semaphore(key, limit)
+        if semaphore is not None and not semaphore.acquire(timeout=max(0.0, timeout_seconds)):
+            msg = f"Timed out waiting for a concurrency slot for {model_id} ({location})"
+            raise RateLimitTimeoutError(msg)
+        try:
+            self._wait(lambda: self._bucket(key, limit).try_take(), deadline, key)
+            if self._shared_budget is not None:
+                shared_budget = self._shared_budget
+                requests_per_window = max(1, int(limit.requests_per_minute * SHARED_WINDOW_SECONDS / 60))
+                self._wait(
+                    lambda: shared_budget.try_acquire(f"{model_id}|{location}", requests_per_window),
+                    deadline,
+                    key,
+                )
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    def _wait(self, try_acquire: Callable[[], float], deadline: float, key: tuple[str, str]) -> None:
+        while True:
+            wait_seconds = try_acquire()
+            if wait_seconds <= 0:
+                return
+            if self._clock() + wait_seconds > deadline:
+                msg = f"Timed out waiting for rate limit budget for {key[0]} ({key[1]})"
+                raise RateLimitTimeoutError(msg)
+            logger.info("Rate limit reached for %s (%s); waiting %.2fs", key[0], key[1], wait_seconds)
+            self._sleep(wait_seconds)
+
+    def _bucket(self, key: tuple[str, str], limit: ModelRateLimit) -> _TokenBucket:
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = _TokenBucket(limit, self._clock)
+            return self._buckets[key]
+
+    def _semaphore(self, key: tuple[str, str], limit: ModelRateLimit) -> threading.BoundedSemaphore | None:
+        if limit.max_concurrent is None:
+            return None
+        with self._lock:
+            if key not in self._semaphores:
+                self._semaphores[key] = threading.BoundedSemaphore(limit.max_concurrent)
+            return self._semaphores[key]
+
+
+class FirestoreRateBudget(SharedRateBudget):
+    """Fixed-window request counter in Firestore shared across Cloud Run Job executions.
+
+    ドキュメント ID は `{key}|{window_start}` で、expire_at に TTL ポリシーを設定して古い窓を削除する。
+    """
+
+    def __init__(
+        self,
+        *,
+        client: firestore.Client,
+        collection: str = DEFAULT_FIRESTORE_COLLECTION,
+        now: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        """Initialize with a Firestore client and a top-level collection name."""
+        self._client = client
+        self._collection = collection
+        self._now = now
+
+    def try_acquire(self, key: str, requests_per_window: int) -> float:
+        """Increment the current window's counter in a transaction if it is below the limit."""
+        now = self._now()
+        window_start = int(now.timestamp()) // SHARED_WINDOW_SECONDS * SHARED_WINDOW_SECONDS
+        doc_ref = self._client.collection(self._collection).document(f"{key.replace('/', '_')}|{window_start}")
+
+        @firestore.transactional
+        def increment(transaction: firestore.Transaction) -> bool:
+            snapshot = doc_ref.get(transaction=transaction)
+            count = int((snapshot.to_dict() or {}).get("count", 0)) if snapshot.exists else 0
+            if count >= requests_per_window:
+                return False
+            transaction.set(
+                doc_ref,
+                {
+                    "key": key,
+                    "window_start": window_start,
+                    "count": count + 1,
+                    "expire_at": datetime.fromtimestamp(window_start, UTC) + timedelta(days=1),
+                },
+            )
+            return True
+
+        if increment(self._client.transaction()):
+            return 0.0
+        return max(0.05, window_start + SHARED_WINDOW_SECONDS - now.timestamp())
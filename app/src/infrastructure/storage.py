@@ -3,11 +3,13 @@
 import io
 import json
 import logging
+from pathlib import Path
 
 import boto3
 from botocore.exceptions import ClientError
 from google.cloud import secretmanager_v1, storage
 from pydub import AudioSegment
+from pydub.utils import mediainfo
 
 from domain.interfaces import BlobSource, ObjectStorage
 
@@ -96,6 +98,29 @@ class R2Client(ObjectStorage):
             logger.exception("Failed to upload file to R2:")
             raise
 
+    def upload_file_from_path(
+        self,
+        file_path: str,
+        remote_key: str,
+        content_type: str | None = None,
+        *,
+        public: bool = False,
+    ) -> str:
+        """Upload a local file to R2, streaming it in multipart chunks."""
+        extra_args = {}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        if public:
+            extra_args["ACL"] = "public-read"
+        try:
+            self.client.upload_file(file_path, self.bucket_name, remote_key, ExtraArgs=extra_args)
+        except ClientError:
+            logger.exception("Failed to upload file to R2:")
+            raise
+        url = f"{self.endpoint_url}/{self.bucket_name}/{remote_key}"
+        logger.info("Uploaded %s to R2: %s", file_path, url)
+        return url
+
     def generate_public_url(self, remote_key: str, custom_domain: str | None = None) -> str:
         """Generate a public URL for an R2 object."""
         if custom_domain:
@@ -150,6 +175,23 @@ class GCSClient(BlobSource):
             logger.exception("Failed to upload blob:")
             raise
 
+    def upload_blob_from_bytes(
+        self,
+        bucket_name: str,
+        data: bytes,
+        destination_object_name: str,
+        content_type: str | None = None,
+    ) -> None:
+        """Upload in-memory bytes to GCS."""
+        try:
+            bucket = self.client.bucket(bucket_name)
+            blob = bucket.blob(destination_object_name)
+            blob.upload_from_string(data, content_type=content_type)
+            logger.info("Uploaded %d bytes to gs://%s/%s", len(data), bucket_name, destination_object_name)
+        except Exception:
+            logger.exception("Failed to upload blob:")
+            raise
+
     def get_blob_metadata(self, bucket_name: str, object_name: str) -> dict:
         """Get blob metadata."""
         try:
@@ -166,6 +208,20 @@ class GCSClient(BlobSource):
             logger.exception("Failed to get blob metadata:")
             raise
 
+    def get_blob_fingerprint(self, bucket_name: str, object_name: str) -> str:
+        """Return a content fingerprint (MD5 hash, or generation as fallback) for a blob."""
+        try:
+            blob = self.client.bucket(bucket_name).get_blob(object_name)
+        except Exception:
+            logger.exception("Failed to get blob fingerprint:")
+            raise
+        if blob is None:
+            msg = f"Blob not found: gs://{bucket_name}/{object_name}"
+            raise LookupError(msg)
+        if blob.md5_hash:
+            return f"md5:{blob.md5_hash}"
+        return f"generation:{blob.generation}"
+
     def list_blobs(self, bucket_name: str, prefix: str | None = None) -> list:
         """List blobs in a bucket."""
         try:
@@ -176,6 +232,30 @@ class GCSClient(BlobSource):
             raise
 
 
+def split_gcs_uri(gcs_uri: str) -> tuple[str, str]:
+    """Split a gs://bucket/object URI into bucket and object names."""
+    if not gcs_uri.startswith("gs://"):
+        msg = f"Not a GCS URI: {gcs_uri}"
+        raise ValueError(msg)
+    bucket_name, _, object_name = gcs_uri.removeprefix("gs://").partition("/")
+    if not bucket_name or not object_name:
+        msg = f"GCS URI must include bucket and object name: {gcs_uri}"
+        raise ValueError(msg)
+    return bucket_name, object_name
+
+
+def read_manifest(manifest: str, *, gcs_client: GCSClient | None = None) -> list[str]:
+    """Read source URIs (one per line, `#` comments allowed) from a local file or a gs:// object."""
+    if manifest.startswith("gs://"):
+        if gcs_client is None:
+            msg = "A GCS client is required to read a gs:// manifest."
+            raise ValueError(msg)
+        text = gcs_client.download_blob_as_bytes(*split_gcs_uri(manifest)).decode("utf-8")
+    else:
+        text = Path(manifest).read_text(encoding="utf-8")
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+
+
 def get_audio_info(file_buffer: io.BytesIO, audio_format: str) -> list:
     """Get audio file size and duration information."""
     file_size_bytes = file_buffer.getbuffer().nbytes
@@ -186,11 +266,28 @@ def get_audio_info(file_buffer: io.BytesIO, audio_format: str) -> list:
     logger.info("frame rate: %s", sounds.frame_rate)
     logger.info("duration: %s s", sounds.duration_seconds)
 
-    duration_seconds = int(sounds.duration_seconds)
+    return [file_size_bytes, _format_duration(sounds.duration_seconds)]
+
+
+def get_audio_file_info(file_path: Path) -> list:
+    """Get audio file size and duration from the container metadata (ffprobe), without decoding the audio."""
+    file_size_bytes = file_path.stat().st_size
+    logger.info("File size: %d bytes", file_size_bytes)
+
+    info = mediainfo(str(file_path))
+    if "duration" not in info:
+        msg = f"ffprobe reported no duration for {file_path}"
+        raise ValueError(msg)
+    logger.info("duration: %s s", info["duration"])
+
+    return [file_size_bytes, _format_duration(float(info["duration"]))]
+
+
+def _format_duration(total_seconds: float) -> str:
+    duration_seconds = int(total_seconds)
     hours = duration_seconds // 3600
     minutes = (duration_seconds % 3600) // 60
     seconds = duration_seconds % 60
     duration_str = f"{hours:02}:{minutes:02}:{seconds:02}"
     logger.info("Formatted duration: %s", duration_str)
-
-    return [file_size_bytes, duration_str]
+    return duration_str
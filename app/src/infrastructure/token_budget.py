@@ -0,0 +1,51 @@
+"""Token estimation and transcript sectioning for prompt budgeting."""
+
+from __future__ import annotations
+
+# 英数字は 1 トークンあたり約 4 文字、日本語などの非 ASCII 文字は約 1 文字 1 トークンとして見積もる
+ASCII_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in text without calling the API.
+
+    Gemini のトークナイザーを呼ばずに見積もるための近似値で、日本語の議事録では多めに見積もる。
+    """
+    ascii_chars = sum(1 for char in text if char.isascii())
+    non_ascii_chars = len(text) - ascii_chars
+    return non_ascii_chars + -(-ascii_chars // ASCII_CHARS_PER_TOKEN)
+
+
+def split_into_sections(text: str, max_tokens: int) -> list[str]:
+    """Split text at line boundaries into sections of at most `max_tokens` estimated tokens.
+
+    1 行だけで上限を超える場合は、その行を文字数で分割する。
+    """
+    if max_tokens <= 0:
+        msg = f"max_tokens must be positive: {max_tokens}"
+        raise ValueError(msg)
+
+    sections: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+    for line in _bounded_lines(text, max_tokens):
+        line_tokens = estimate_tokens(line)
+        if current and current_tokens + line_tokens > max_tokens:
+            sections.append("".join(current))
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += line_tokens
+    if current:
+        sections.append("".join(current))
+    return sections
+
+
+def _bounded_lines(text: str, max_tokens: int) -> list[str]:
+    lines: list[str] = []
+    for line in text.splitlines(keepends=True):
+        if estimate_tokens(line) <= max_tokens:
+            lines.append(line)
+            continue
+        # 非 ASCII 1 文字が 1 トークンなので、max_tokens 文字ずつ切れば必ず上限内に収まる
+        lines.extend(line[start : start + max_tokens] for start in range(0, len(line), max_tokens))
+    return lines
@@ -0,0 +1,260 @@
+"""Lightweight tracing for workflow steps.
+
+Spans are nested through a context variable and record their duration, the number of
+bytes they read or wrote, and whether they finished successfully. Finished spans are
+handed to exporters: one writes a structured `span {...}` JSON log record per span,
+the other appends the OTLP/JSON trace format (one ExportTraceServiceRequest per line)
+to a local file, which an OpenTelemetry collector can ingest later. Nothing here needs
+a network connection or the OpenTelemetry SDK. When tracing is disabled, no tracer is
+built and the workflow's spans are plain null contexts.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+from domain.interfaces import Tracer, TraceSpan
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+logger = logging.getLogger(__name__)
+
+AttributeValue = str | float | bool
+
+# OTLP の Span.SpanKind / Status.StatusCode
+_SPAN_KIND_INTERNAL = 1
+_STATUS_CODE_OK = 1
+_STATUS_CODE_ERROR = 2
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    """A finished span.
+
+    Attributes:
+        name: スパン名 (例: "audio.upload")。
+        trace_id: 32 桁の 16 進数。ルートスパンで採番し、子スパンに引き継ぐ。
+        span_id: 16 桁の 16 進数。
+        parent_span_id: 親スパンの ID。ルートスパンは None。
+        start_time_unix_nano: 開始時刻 (UNIX エポックからのナノ秒)。
+        end_time_unix_nano: 終了時刻 (UNIX エポックからのナノ秒)。
+        duration_seconds: 経過時間(秒)。単調増加時計で計測する。
+        outcome: "ok" または "error"。
+        bytes: スパン内で読み書きしたバイト数。
+        attributes: 任意の属性。
+        error: 失敗した場合の例外の型とメッセージ。
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    start_time_unix_nano: int
+    end_time_unix_nano: int
+    duration_seconds: float
+    outcome: str
+    bytes: int
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    error: str | None = None
+
+
+class SpanExporter(Protocol):
+    """Receives finished spans."""
+
+    def export(self, record: SpanRecord) -> None:
+        """Handle one finished span."""
+
+    def flush(self) -> None:
+        """Write buffered spans, if any."""
+
+
+class JsonLogSpanExporter:
+    """Logs each finished span as a `span {...}` JSON record (same shape as the model_call records)."""
+
+    def __init__(self, span_logger: logging.Logger | None = None) -> None:
+        """Initialize with the logger that receives the records."""
+        self._logger = span_logger or logger
+
+    def export(self, record: SpanRecord) -> None:
+        """Log the span."""
+        self._logger.info("span %s", json.dumps(asdict(record), ensure_ascii=False))
+
+    def flush(self) -> None:
+        """Nothing is buffered."""
+
+
+class OtlpJsonFileExporter:
+    """Appends spans to a file in the OTLP/JSON trace format.
+
+    スパンはメモリに溜め、flush 時に 1 行 1 リクエスト (ExportTraceServiceRequest) として追記する。
+    OpenTelemetry Collector の otlpjsonfile receiver などでそのまま読み込める。
+    """
+
+    def __init__(self, path: str | Path, *, service_name: str = "podcast-workflow") -> None:
+        """Initialize with the output file and the service.name resource attribute."""
+        self._path = Path(path)
+        self._service_name = service_name
+        self._records: list[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def export(self, record: SpanRecord) -> None:
+        """Buffer the span until the next flush."""
+        with self._lock:
+            self._records.append(record)
+
+    def flush(self) -> None:
+        """Append the buffered spans as one ExportTraceServiceRequest line."""
+        with self._lock:
+            records, self._records = self._records, []
+        if not records:
+            return
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": self._service_name})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [_otlp_span(record) for record in records],
+                        },
+                    ],
+                },
+            ],
+        }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+
+def _otlp_span(record: SpanRecord) -> dict[str, Any]:
+    attributes: dict[str, AttributeValue] = {**record.attributes, "bytes": record.bytes}
+    status: dict[str, Any] = {"code": _STATUS_CODE_OK if record.outcome == "ok" else _STATUS_CODE_ERROR}
+    if record.error:
+        status["message"] = record.error
+    span: dict[str, Any] = {
+        "traceId": record.trace_id,
+        "spanId": record.span_id,
+        "name": record.name,
+        "kind": _SPAN_KIND_INTERNAL,
+        # OTLP/JSON では 64 ビット整数を文字列で表す
+        "startTimeUnixNano": str(record.start_time_unix_nano),
+        "endTimeUnixNano": str(record.end_time_unix_nano),
+        "attributes": _otlp_attributes(attributes),
+        "status": status,
+    }
+    if record.parent_span_id:
+        span["parentSpanId"] = record.parent_span_id
+    return span
+
+
+def _otlp_attributes(attributes: dict[str, AttributeValue]) -> list[dict[str, Any]]:
+    converted = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed: dict[str, Any] = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        converted.append({"key": key, "value": typed})
+    return converted
+
+
+class _Span(TraceSpan):
+    def __init__(self, name: str, trace_id: str, parent_span_id: str | None, attributes: dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.attributes: dict[str, AttributeValue] = attributes
+        self.bytes = 0
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:  # noqa: FBT001
+        self.attributes[key] = value
+
+    def add_bytes(self, size: int) -> None:
+        self.bytes += size
+
+
+_current_span: contextvars.ContextVar[_Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+class SpanTracer(Tracer):
+    """Tracer that times spans and hands them to exporters when they end.
+
+    親子関係は contextvars で引き継ぐため、別スレッドでスパンを開く場合は
+    contextvars.copy_context() でコンテキストを渡す (StepGraph はステップごとにそうしている)。
+    ルートスパンが終わるたびに exporter を flush するため、長時間動くワーカーでもエピソード
+    (トレース) ごとに書き出され、バッファが溜まり続けることはない。
+    """
+
+    def __init__(self, exporters: Sequence[SpanExporter]) -> None:
+        """Initialize with the exporters that receive finished spans."""
+        self._exporters = list(exporters)
+
+    @contextmanager
+    def span(self, name: str, **attributes: AttributeValue) -> Iterator[TraceSpan]:
+        """Open a child span of the current span (or a new trace when there is none)."""
+        parent = _current_span.get()
+        span = _Span(
+            name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            parent_span_id=parent.span_id if parent else None,
+            attributes=dict(attributes),
+        )
+        token = _current_span.set(span)
+        start_time_unix_nano = time.time_ns()
+        started = time.perf_counter_ns()
+        error: BaseException | None = None
+        try:
+            yield span
+        except BaseException as err:
+            error = err
+            raise
+        finally:
+            _current_span.reset(token)
+            elapsed_nano = time.perf_counter_ns() - started
+            self._export(
+                SpanRecord(
+                    name=span.name,
+                    trace_id=span.trace_id,
+                    span_id=span.span_id,
+                    parent_span_id=span.parent_span_id,
+                    start_time_unix_nano=start_time_unix_nano,
+                    end_time_unix_nano=start_time_unix_nano + elapsed_nano,
+                    duration_seconds=round(elapsed_nano / 1e9, 6),
+                    outcome="ok" if error is None else "error",
+                    bytes=span.bytes,
+                    attributes=span.attributes,
+                    error=None if error is None else f"{type(error).__name__}: {error}",
+                )
+            )
+            if parent is None:
+                self.flush()
+
+    def flush(self) -> None:
+        """Flush every exporter."""
+        for exporter in self._exporters:
+            try:
+                exporter.flush()
+            except Exception:  # noqa: BLE001 - トレースの書き出し失敗で処理を失敗させない
+                logger.warning("Failed to flush spans with %s", type(exporter).__name__, exc_info=True)
+
+    def _export(self, record: SpanRecord) -> None:
+        for exporter in self._exporters:
+            try:
+                exporter.export(record)
+            except Exception:  # noqa: BLE001
+                logger.warning("Failed to export span %s", record.name, exc_info=True)
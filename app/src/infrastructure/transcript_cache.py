@@ -0,0 +1,295 @@
+"""Cache for generated transcripts and summaries.
+
+A workflow retry (e.g. after an R2 upload or Postgres failure) reuses the AI output
+produced by the previous attempt instead of calling Gemini again. Entries are keyed by
+the source object fingerprint, model ID and prompt version.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar, overload
+
+from domain.interfaces import TranscriptCache, TranscriptProvider
+from domain.models import Summary, SummaryWithPromotions
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from google.cloud import firestore
+
+    from domain.models import SnsPromotionsResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIRESTORE_COLLECTION = "ai_output_cache"
+# 要約まで進まなかった (release_transcript が呼ばれない) エピソードがあっても、長時間動くワーカーで
+# transcript → source の対応表が増え続けないようにする上限
+MAX_TRACKED_TRANSCRIPTS = 256
+
+T = TypeVar("T")
+
+
+def build_cache_key(*, kind: str, source_fingerprint: str, model_id: str, prompt_version: str) -> str:
+    """Build a cache key from the inputs that determine an AI output."""
+    return f"{kind}|{source_fingerprint}|{model_id}|{prompt_version}"
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class LocalTranscriptCache(TranscriptCache):
+    """File-based cache backend for local runs and tests."""
+
+    def __init__(self, directory: str | Path) -> None:
+        """Initialize the cache directory."""
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> str | None:
+        """Return the cached payload for a key."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        return entry.get("value")
+
+    def put(self, key: str, value: str, *, source_fingerprint: str) -> None:
+        """Store a payload as a JSON file."""
+        entry = {
+            "key": key,
+            "source_fingerprint": source_fingerprint,
+            "value": value,
+            "created_at": datetime.now(UTC).isoformat(),
+        }
+        self._path(key).write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+
+    def invalidate(self, source_fingerprint: str) -> int:
+        """Delete every entry derived from a source."""
+        deleted = 0
+        for path in self._directory.glob("*.json"):
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            if entry.get("source_fingerprint") == source_fingerprint:
+                path.unlink(missing_ok=True)
+                deleted += 1
+        return deleted
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{_digest(key)}.json"
+
+
+class FirestoreTranscriptCache(TranscriptCache):
+    """Firestore cache backend shared across Cloud Run Job executions."""
+
+    def __init__(self, *, client: firestore.Client, collection: str = DEFAULT_FIRESTORE_COLLECTION) -> None:
+        """Initialize with a Firestore client and a top-level collection name."""
+        self._client = client
+        self._collection = collection
+
+    def get(self, key: str) -> str | None:
+        """Return the cached payload for a key."""
+        snapshot = self._client.collection(self._collection).document(_digest(key)).get()
+        if not snapshot.exists:
+            return None
+        data = snapshot.to_dict() or {}
+        value = data.get("value")
+        return value if isinstance(value, str) else None
+
+    def put(self, key: str, value: str, *, source_fingerprint: str) -> None:
+        """Store a payload document."""
+        self._client.collection(self._collection).document(_digest(key)).set(
+            {
+                "key": key,
+                "source_fingerprint": source_fingerprint,
+                "value": value,
+                "created_at": datetime.now(UTC).isoformat(),
+            },
+        )
+
+    def invalidate(self, source_fingerprint: str) -> int:
+        """Delete every entry derived from a source."""
+        query = self._client.collection(self._collection).where("source_fingerprint", "==", source_fingerprint)
+        deleted = 0
+        for doc in query.stream():
+            doc.reference.delete()
+            deleted += 1
+        return deleted
+
+
+class CachedTranscriptProvider(TranscriptProvider):
+    """TranscriptProvider decorator that reads through a TranscriptCache.
+
+    キャッシュの読み書きやフィンガープリントの取得に失敗しても警告を出すだけで、AI の呼び出しに
+    フォールバックする (キャッシュは最適化であり、ワークフローを止める理由にはしない)。
+
+    Args:
+        inner: 実際に AI を呼び出す TranscriptProvider。
+        cache: キャッシュバックエンド。
+        source_fingerprint: source URI から内容のフィンガープリント (MD5 や generation) を返す関数。
+        prompt_version: プロンプトのバージョン。プロンプト変更時に上げるとキャッシュが無効になる。
+    """
+
+    def __init__(
+        self,
+        *,
+        inner: TranscriptProvider,
+        cache: TranscriptCache,
+        source_fingerprint: Callable[[str], str],
+        prompt_version: str,
+    ) -> None:
+        """Initialize the caching decorator."""
+        self._inner = inner
+        self._cache = cache
+        self._source_fingerprint = source_fingerprint
+        self._prompt_version = prompt_version
+        # transcript ハッシュ → source フィンガープリント (要約を source 単位で無効化するため)。
+        # エピソードの要約が終わった時点 (release_transcript) で削除し、古いものから上限で捨てる
+        self._transcript_sources: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def generate_transcript(self, source_uri: str, model_id: str | None = None) -> str | None:
+        """Return a cached transcript or generate and cache it."""
+        try:
+            fingerprint = self._source_fingerprint(source_uri)
+        except Exception:  # noqa: BLE001 - フィンガープリントが取れない場合はキャッシュを使わずに生成する
+            logger.warning(
+                "Failed to fingerprint %s; generating the transcript without cache", source_uri, exc_info=True
+            )
+            return self._inner.generate_transcript(source_uri, model_id=model_id)
+        key = build_cache_key(
+            kind="transcript",
+            source_fingerprint=fingerprint,
+            model_id=model_id or "default",
+            prompt_version=self._prompt_version,
+        )
+        cached = self._get(key)
+        if cached is not None:
+            logger.info("Transcript cache hit: %s", source_uri)
+            self._track_source(cached, fingerprint)
+            return cached
+
+        transcript = self._inner.generate_transcript(source_uri, model_id=model_id)
+        if transcript:
+            self._put(key, transcript, source_fingerprint=fingerprint)
+            self._track_source(transcript, fingerprint)
+        return transcript
+
+    def summarize_transcript(
+        self,
+        transcript: str,
+        prompt: str | None = None,
+        model_id: str | None = None,
+    ) -> Summary:
+        """Return a cached summary or generate and cache it."""
+        transcript_digest = _digest(transcript)
+        fingerprint = self._source_of(transcript_digest)
+        prompt_version = self._prompt_version if prompt is None else f"{self._prompt_version}+{_digest(prompt)[:16]}"
+        key = build_cache_key(
+            kind=f"summary:{transcript_digest}",
+            source_fingerprint=fingerprint,
+            model_id=model_id or "default",
+            prompt_version=prompt_version,
+        )
+        cached = self._get(key, Summary.model_validate_json)
+        if cached is not None:
+            logger.info("Summary cache hit: %s", fingerprint)
+            return cached
+
+        summary = self._inner.summarize_transcript(transcript, prompt=prompt, model_id=model_id)
+        self._put(key, summary.model_dump_json(), source_fingerprint=fingerprint)
+        return summary
+
+    def generate_sns_promotions(
+        self,
+        summary_description: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SnsPromotionsResponse:
+        """Delegate promotion generation without caching."""
+        return self._inner.generate_sns_promotions(
+            summary_description,
+            num_promotions=num_promotions,
+            model_id=model_id,
+        )
+
+    def generate_summary_and_promotions(
+        self,
+        transcript: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SummaryWithPromotions:
+        """Return cached summary and promotions or generate and cache them."""
+        transcript_digest = _digest(transcript)
+        fingerprint = self._source_of(transcript_digest)
+        key = build_cache_key(
+            kind=f"summary_with_promotions:{num_promotions}:{transcript_digest}",
+            source_fingerprint=fingerprint,
+            model_id=model_id or "default",
+            prompt_version=self._prompt_version,
+        )
+        cached = self._get(key, SummaryWithPromotions.model_validate_json)
+        if cached is not None:
+            logger.info("Summary and promotions cache hit: %s", fingerprint)
+            return cached
+
+        result = self._inner.generate_summary_and_promotions(
+            transcript,
+            num_promotions=num_promotions,
+            model_id=model_id,
+        )
+        self._put(key, result.model_dump_json(), source_fingerprint=fingerprint)
+        return result
+
+    def release_transcript(self, transcript: str) -> None:
+        """Forget the transcript's source and let the inner provider free what it kept for the transcript."""
+        with self._lock:
+            self._transcript_sources.pop(_digest(transcript), None)
+        self._inner.release_transcript(transcript)
+
+    def _track_source(self, transcript: str, fingerprint: str) -> None:
+        with self._lock:
+            self._transcript_sources[_digest(transcript)] = fingerprint
+            while len(self._transcript_sources) > MAX_TRACKED_TRANSCRIPTS:
+                del self._transcript_sources[next(iter(self._transcript_sources))]
+
+    def _source_of(self, transcript_digest: str) -> str:
+        with self._lock:
+            return self._transcript_sources.get(transcript_digest, f"transcript:{transcript_digest}")
+
+    @overload
+    def _get(self, key: str) -> str | None: ...
+
+    @overload
+    def _get(self, key: str, parse: Callable[[str], T]) -> T | None: ...
+
+    def _get(self, key: str, parse: Callable[[str], object] | None = None) -> object | None:
+        """Return the cached (and parsed) value, or None on a miss or any cache error."""
+        try:
+            cached = self._cache.get(key)
+            if cached is None or parse is None:
+                return cached
+            return parse(cached)
+        except Exception:  # noqa: BLE001 - 読めないキャッシュはミスとして扱い、AI で生成し直す
+            logger.warning("Failed to read AI output cache entry %s; regenerating", key, exc_info=True)
+            return None
+
+    def _put(self, key: str, value: str, *, source_fingerprint: str) -> None:
+        try:
+            self._cache.put(key, value, source_fingerprint=source_fingerprint)
+        except Exception:  # noqa: BLE001 - 保存に失敗しても生成結果はそのまま返す
+            logger.warning("Failed to store AI output cache entry %s", key, exc_info=True)
+
+    def invalidate(self, source_uri: str) -> int:
+        """Drop cached transcript and summaries for a source object."""
+        fingerprint = self._source_fingerprint(source_uri)
+        # 同じ provider を共有するスレッドの記録・参照と競合しないよう、ロックを取って削除する
+        with self._lock:
+            deleted = self._cache.invalidate(fingerprint)
+        logger.info("Invalidated %d cached AI outputs for %s", deleted, source_uri)
+        return deleted
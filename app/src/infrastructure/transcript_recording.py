@@ -0,0 +1,266 @@
+"""Record and replay TranscriptProvider calls as JSON fixtures.
+
+RecordingTranscriptProvider wraps a real provider (e.g. AudioAnalyzer) and saves every
+request/response pair with its latency. ReplayTranscriptProvider serves the saved
+responses back without network access, optionally sleeping for the recorded (or a
+fixed) latency, so the whole workflow can be benchmarked and profiled offline.
+
+Fixtures are stored as `{fixture_dir}/{operation}/{request_hash}.json`. The request hash
+is computed from the operation name and the request arguments after Unicode (NFKC) and
+whitespace normalisation, so insignificant formatting differences still hit the same
+fixture.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import time
+import unicodedata
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from domain.interfaces import TranscriptProvider
+from domain.models import SnsPromotionsResponse, Summary, SummaryWithPromotions
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalise_request_text(value: str) -> str:
+    """Normalise text for hashing: NFKC, collapsed whitespace and trimmed ends."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", value)).strip()
+
+
+def request_hash(operation: str, request: Mapping[str, Any]) -> str:
+    """Return the SHA-256 fixture key of a normalised request."""
+    normalised = {
+        key: normalise_request_text(value) if isinstance(value, str) else value for key, value in request.items()
+    }
+    payload = json.dumps({"operation": operation, "request": normalised}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RecordingTranscriptProvider(TranscriptProvider):
+    """TranscriptProvider decorator that saves each call as a replayable fixture.
+
+    Args:
+        inner: 実際に AI を呼び出す TranscriptProvider。
+        fixture_dir: フィクスチャの保存先ディレクトリ。
+        clock: レイテンシの計測に使う時計。
+    """
+
+    def __init__(
+        self,
+        *,
+        inner: TranscriptProvider,
+        fixture_dir: str | Path,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Initialize the recording decorator."""
+        self._inner = inner
+        self._fixture_dir = Path(fixture_dir)
+        self._clock = clock
+
+    def generate_transcript(self, source_uri: str, model_id: str | None = None) -> str | None:
+        """Generate a transcript and record it."""
+        return self._record(
+            "generate_transcript",
+            {"source_uri": source_uri, "model_id": model_id},
+            lambda: self._inner.generate_transcript(source_uri, model_id=model_id),
+        )
+
+    def summarize_transcript(
+        self,
+        transcript: str,
+        prompt: str | None = None,
+        model_id: str | None = None,
+    ) -> Summary:
+        """Generate a summary and record it."""
+        return self._record(
+            "summarize_transcript",
+            {"transcript": transcript, "prompt": prompt, "model_id": model_id},
+            lambda: self._inner.summarize_transcript(transcript, prompt=prompt, model_id=model_id),
+        )
+
+    def generate_sns_promotions(
+        self,
+        summary_description: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SnsPromotionsResponse:
+        """Generate SNS promotions and record them."""
+        return self._record(
+            "generate_sns_promotions",
+            {"summary_description": summary_description, "num_promotions": num_promotions, "model_id": model_id},
+            lambda: self._inner.generate_sns_promotions(
+                summary_description,
+                num_promotions=num_promotions,
+                model_id=model_id,
+            ),
+        )
+
+    def generate_summary_and_promotions(
+        self,
+        transcript: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SummaryWithPromotions:
+        """Generate the summary and SNS promotions together and record them."""
+        return self._record(
+            "generate_summary_and_promotions",
+            {"transcript": transcript, "num_promotions": num_promotions, "model_id": model_id},
+            lambda: self._inner.generate_summary_and_promotions(
+                transcript,
+                num_promotions=num_promotions,
+                model_id=model_id,
+            ),
+        )
+
+    def release_transcript(self, transcript: str) -> None:
+        """Let the inner provider free what it kept for the transcript (not recorded)."""
+        self._inner.release_transcript(transcript)
+
+    def _record(self, operation: str, request: dict[str, Any], call: Callable[[], T]) -> T:
+        started = self._clock()
+        response = call()
+        latency = self._clock() - started
+
+        key = request_hash(operation, request)
+        path = self._fixture_dir / operation / f"{key}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fixture = {
+            "operation": operation,
+            "request_hash": key,
+            "request": request,
+            "response": _dump_response(response),
+            "latency_seconds": round(latency, 3),
+            "recorded_at": datetime.now(UTC).isoformat(),
+        }
+        path.write_text(json.dumps(fixture, ensure_ascii=False, indent=2), encoding="utf-8")
+        logger.info("Recorded %s fixture %s (%.2fs)", operation, key[:12], latency)
+        return response
+
+
+class ReplayTranscriptProvider(TranscriptProvider):
+    """TranscriptProvider that serves recorded fixtures with simulated latency.
+
+    Args:
+        fixture_dir: RecordingTranscriptProvider が保存したディレクトリ。
+        latency_scale: 記録されたレイテンシに掛ける係数。0 の場合は待機しない。
+        latency_seconds: 指定すると記録値の代わりにこの秒数だけ待機する。
+        strict: True の場合、一致するフィクスチャがなければ KeyError を送出する。
+            False の場合は同じ操作のフィクスチャを順番に使い回す (合成入力のベンチマーク用)。
+        sleep: 待機関数。
+    """
+
+    def __init__(
+        self,
+        *,
+        fixture_dir: str | Path,
+        latency_scale: float = 0.0,
+        latency_seconds: float | None = None,
+        strict: bool = True,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Load every fixture under fixture_dir."""
+        self._latency_scale = latency_scale
+        self._latency_seconds = latency_seconds
+        self._strict = strict
+        self._sleep = sleep
+        self._fixtures: dict[str, dict[str, dict[str, Any]]] = {}
+        for path in sorted(Path(fixture_dir).glob("*/*.json")):
+            fixture = json.loads(path.read_text(encoding="utf-8"))
+            self._fixtures.setdefault(fixture["operation"], {})[fixture["request_hash"]] = fixture
+        self._fallback_index: dict[str, int] = {}
+        self.simulated_latency_seconds = 0.0
+
+    @property
+    def fixture_count(self) -> int:
+        """Number of loaded fixtures."""
+        return sum(len(fixtures) for fixtures in self._fixtures.values())
+
+    def generate_transcript(self, source_uri: str, model_id: str | None = None) -> str | None:
+        """Replay a recorded transcript."""
+        response = self._replay("generate_transcript", {"source_uri": source_uri, "model_id": model_id})
+        return response if isinstance(response, str) else None
+
+    def summarize_transcript(
+        self,
+        transcript: str,
+        prompt: str | None = None,
+        model_id: str | None = None,
+    ) -> Summary:
+        """Replay a recorded summary."""
+        response = self._replay(
+            "summarize_transcript",
+            {"transcript": transcript, "prompt": prompt, "model_id": model_id},
+        )
+        return Summary.model_validate(response)
+
+    def generate_sns_promotions(
+        self,
+        summary_description: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SnsPromotionsResponse:
+        """Replay recorded SNS promotions."""
+        response = self._replay(
+            "generate_sns_promotions",
+            {"summary_description": summary_description, "num_promotions": num_promotions, "model_id": model_id},
+        )
+        return SnsPromotionsResponse.model_validate(response)
+
+    def generate_summary_and_promotions(
+        self,
+        transcript: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SummaryWithPromotions:
+        """Replay a recorded summary and SNS promotions."""
+        response = self._replay(
+            "generate_summary_and_promotions",
+            {"transcript": transcript, "num_promotions": num_promotions, "model_id": model_id},
+        )
+        return SummaryWithPromotions.model_validate(response)
+
+    def release_transcript(self, transcript: str) -> None:
+        """Nothing is kept per transcript when replaying."""
+
+    def _replay(self, operation: str, request: dict[str, Any]) -> Any:  # noqa: ANN401 - 操作ごとに型が異なる JSON 値
+        fixtures = self._fixtures.get(operation, {})
+        key = request_hash(operation, request)
+        fixture = fixtures.get(key)
+        if fixture is None:
+            if self._strict or not fixtures:
+                msg = f"No recorded fixture for {operation} ({key[:12]})"
+                raise KeyError(msg)
+            recorded = list(fixtures.values())
+            index = self._fallback_index.get(operation, 0)
+            fixture = recorded[index % len(recorded)]
+            self._fallback_index[operation] = index + 1
+
+        latency = self._latency_seconds
+        if latency is None:
+            latency = float(fixture.get("latency_seconds", 0.0)) * self._latency_scale
+        if latency > 0:
+            self._sleep(latency)
+            self.simulated_latency_seconds += latency
+        return fixture["response"]
+
+
+def _dump_response(response: BaseModel | str | None) -> Any:  # noqa: ANN401 - JSON にそのまま保存できる値
+    if response is None or isinstance(response, str):
+        return response
+    return response.model_dump(mode="json")
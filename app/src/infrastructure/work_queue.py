@@ -0,0 +1,189 @@
+"""Work queues feeding the long-lived episode worker.
+
+The Cloud SQL backend claims rows with `FOR UPDATE SKIP LOCKED`, so several workers
+can poll the same table without blocking on or double-claiming each other's rows. A
+claim is only visible to its worker for `visibility_seconds`; items of a worker that
+died are claimed again after that, until they have been claimed `max_attempts` times.
+An expired item that used up its attempts (e.g. one that keeps crashing the worker) is
+marked failed instead. The in-memory backend has the same semantics for tests and
+local runs.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import psycopg
+
+from domain.interfaces import EpisodeWorkQueue
+from domain.models import EpisodeWorkItem
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class PostgresEpisodeWorkQueue(EpisodeWorkQueue):
+    """Work queue stored in the episode_work_queue table."""
+
+    def __init__(self, *, database_url: str) -> None:
+        """Initialize the queue."""
+        self._database_url = database_url
+
+    def enqueue(self, object_name: str) -> str:
+        """Insert a queued item and return its ID."""
+        with psycopg.connect(self._database_url) as connection, connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO episode_work_queue (object_name) VALUES (%s) RETURNING item_id",
+                (object_name,),
+            )
+            row = cursor.fetchone()
+        return str(row[0])
+
+    def claim(
+        self, *, worker_id: str, limit: int, visibility_seconds: float, max_attempts: int
+    ) -> list[EpisodeWorkItem]:
+        """Claim the oldest available items, skipping rows locked by other workers."""
+        if limit < 1:
+            return []
+        with psycopg.connect(self._database_url) as connection, connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE episode_work_queue
+                SET status = 'failed',
+                    last_error = %s,
+                    locked_by = NULL,
+                    locked_until = NULL,
+                    updated_at = now()
+                WHERE status = 'running' AND locked_until < now() AND attempts >= %s
+                """,
+                (_abandoned_error(max_attempts), max_attempts),
+            )
+            cursor.execute(
+                """
+                UPDATE episode_work_queue
+                SET status = 'running',
+                    attempts = attempts + 1,
+                    locked_by = %s,
+                    locked_until = now() + make_interval(secs => %s),
+                    updated_at = now()
+                WHERE item_id IN (
+                    SELECT item_id
+                    FROM episode_work_queue
+                    WHERE status = 'queued' OR (status = 'running' AND locked_until < now() AND attempts < %s)
+                    ORDER BY enqueued_at
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING item_id, object_name, attempts
+                """,
+                (worker_id, visibility_seconds, max_attempts, limit),
+            )
+            rows = cursor.fetchall()
+        return [
+            EpisodeWorkItem(item_id=str(item_id), object_name=object_name, attempts=attempts)
+            for item_id, object_name, attempts in rows
+        ]
+
+    def complete(self, item_id: str) -> None:
+        """Mark the item as done."""
+        with psycopg.connect(self._database_url) as connection, connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE episode_work_queue
+                SET status = 'done', locked_by = NULL, locked_until = NULL, updated_at = now()
+                WHERE item_id = %s
+                """,
+                (int(item_id),),
+            )
+
+    def fail(self, item_id: str, *, error_message: str, retry: bool) -> None:
+        """Requeue the item (retry) or mark it as failed, keeping the last error."""
+        with psycopg.connect(self._database_url) as connection, connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE episode_work_queue
+                SET status = %s, last_error = %s, locked_by = NULL, locked_until = NULL, updated_at = now()
+                WHERE item_id = %s
+                """,
+                ("queued" if retry else "failed", error_message[:2000], int(item_id)),
+            )
+
+
+def _abandoned_error(max_attempts: int) -> str:
+    return f"Claim expired after {max_attempts} attempts without the worker finishing the item"
+
+
+@dataclass
+class _QueuedItem:
+    item_id: str
+    object_name: str
+    status: str = "queued"
+    attempts: int = 0
+    locked_until: float = 0.0
+    last_error: str | None = None
+
+
+class InMemoryEpisodeWorkQueue(EpisodeWorkQueue):
+    """Process-local work queue for tests and local runs."""
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize an empty queue."""
+        self._clock = clock
+        self._items: dict[str, _QueuedItem] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def enqueue(self, object_name: str) -> str:
+        """Add a queued item and return its ID."""
+        with self._lock:
+            item_id = str(next(self._ids))
+            self._items[item_id] = _QueuedItem(item_id=item_id, object_name=object_name)
+        return item_id
+
+    def claim(
+        self,
+        *,
+        worker_id: str,  # noqa: ARG002
+        limit: int,
+        visibility_seconds: float,
+        max_attempts: int,
+    ) -> list[EpisodeWorkItem]:
+        """Claim the oldest available items."""
+        now = self._clock()
+        claimed: list[EpisodeWorkItem] = []
+        with self._lock:
+            for item in self._items.values():
+                expired = item.status == "running" and item.locked_until < now
+                if expired and item.attempts >= max_attempts:
+                    item.status = "failed"
+                    item.last_error = _abandoned_error(max_attempts)
+                    continue
+                if len(claimed) >= limit:
+                    continue
+                if item.status == "queued" or expired:
+                    item.status = "running"
+                    item.attempts += 1
+                    item.locked_until = now + visibility_seconds
+                    claimed.append(EpisodeWorkItem(item.item_id, item.object_name, item.attempts))
+        return claimed
+
+    def complete(self, item_id: str) -> None:
+        """Mark the item as done."""
+        with self._lock:
+            self._items[item_id].status = "done"
+
+    def fail(self, item_id: str, *, error_message: str, retry: bool) -> None:
+        """Requeue the item (retry) or mark it as failed."""
+        with self._lock:
+            item = self._items[item_id]
+            item.status = "queued" if retry else "failed"
+            item.last_error = error_message
+
+    def status(self, item_id: str) -> str:
+        """Return the item status (queued, running, done or failed)."""
+        with self._lock:
+            return self._items[item_id].status
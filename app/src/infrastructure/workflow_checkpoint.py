@@ -0,0 +1,120 @@
+"""Checkpoint stores for resumable podcast workflow runs.
+
+Each completed step of ProcessPodcastWorkflow saves its (JSON-serializable) output
+against the episode ID. A retry loads the checkpoints and resumes from the first
+incomplete step. Checkpoints recorded for a different source audio path are ignored,
+so re-uploading an episode starts over. The Cloud SQL backend lives in
+`infrastructure.episode_repository`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from domain.interfaces import WorkflowCheckpointStore
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIRESTORE_COLLECTION = "workflow_checkpoints"
+
+
+class LocalWorkflowCheckpointStore(WorkflowCheckpointStore):
+    """File-based checkpoint backend for local runs and tests (one JSON file per episode)."""
+
+    def __init__(self, directory: str | Path) -> None:
+        """Initialize the checkpoint directory."""
+        self._directory = Path(directory)
+
+    def load(self, *, podcast_id: str, episode_id: str, source_audio_path: str) -> dict[str, Any]:
+        """Return saved outputs by step name."""
+        path = self._path(podcast_id, episode_id)
+        if not path.exists():
+            return {}
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        if entry.get("source_audio_path") != source_audio_path:
+            return {}
+        return {step: saved["value"] for step, saved in entry.get("steps", {}).items()}
+
+    def save(self, *, podcast_id: str, episode_id: str, source_audio_path: str, step: str, value: Any) -> None:  # noqa: ANN401
+        """Add a step output to the episode's checkpoint file."""
+        path = self._path(podcast_id, episode_id)
+        entry: dict[str, Any] = {}
+        if path.exists():
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        if entry.get("source_audio_path") != source_audio_path:
+            entry = {"source_audio_path": source_audio_path, "steps": {}}
+        entry["steps"][step] = {"value": value, "completed_at": datetime.now(UTC).isoformat()}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+
+    def clear(self, *, podcast_id: str, episode_id: str) -> None:
+        """Delete the episode's checkpoint file."""
+        self._path(podcast_id, episode_id).unlink(missing_ok=True)
+
+    def _path(self, podcast_id: str, episode_id: str) -> Path:
+        return self._directory / podcast_id / f"{episode_id}.json"
+
+
+class FirestoreWorkflowCheckpointStore(WorkflowCheckpointStore):
+    """Firestore checkpoint backend shared across Cloud Run Job executions.
+
+    議事録は 1 MiB のドキュメント上限に近づきうるため、ステップごとに `steps` サブコレクションの
+    ドキュメントへ分けて保存する。
+    """
+
+    def __init__(self, *, client: firestore.Client, collection: str = DEFAULT_FIRESTORE_COLLECTION) -> None:
+        """Initialize with a Firestore client and a top-level collection name."""
+        self._client = client
+        self._collection = collection
+
+    def load(self, *, podcast_id: str, episode_id: str, source_audio_path: str) -> dict[str, Any]:
+        """Return saved outputs by step name."""
+        run_ref = self._run_ref(podcast_id, episode_id)
+        snapshot = run_ref.get()
+        if not snapshot.exists or (snapshot.to_dict() or {}).get("source_audio_path") != source_audio_path:
+            return {}
+        checkpoints: dict[str, Any] = {}
+        for doc in run_ref.collection("steps").stream():
+            data = doc.to_dict() or {}
+            checkpoints[doc.id] = json.loads(data["value"])
+        return checkpoints
+
+    def save(self, *, podcast_id: str, episode_id: str, source_audio_path: str, step: str, value: Any) -> None:  # noqa: ANN401
+        """Save a step output document."""
+        run_ref = self._run_ref(podcast_id, episode_id)
+        snapshot = run_ref.get()
+        if snapshot.exists and (snapshot.to_dict() or {}).get("source_audio_path") != source_audio_path:
+            self._delete_steps(run_ref)
+        completed_at = datetime.now(UTC).isoformat()
+        run_ref.set(
+            {
+                "podcast_id": podcast_id,
+                "episode_id": episode_id,
+                "source_audio_path": source_audio_path,
+                "updated_at": completed_at,
+            },
+        )
+        run_ref.collection("steps").document(step).set(
+            {"value": json.dumps(value, ensure_ascii=False), "completed_at": completed_at},
+        )
+
+    def clear(self, *, podcast_id: str, episode_id: str) -> None:
+        """Delete the run document and its step documents."""
+        run_ref = self._run_ref(podcast_id, episode_id)
+        self._delete_steps(run_ref)
+        run_ref.delete()
+
+    def _run_ref(self, podcast_id: str, episode_id: str) -> firestore.DocumentReference:
+        return self._client.collection(self._collection).document(f"{podcast_id}_{episode_id}")
+
+    @staticmethod
+    def _delete_steps(run_ref: firestore.DocumentReference) -> None:
+        for doc in run_ref.collection("steps").stream():
+            doc.reference.delete()
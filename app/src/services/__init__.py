@@ -1,10 +1,11 @@
 """Services package exports for remaining non-migrated components."""
 
 from .audio_converter import AudioConverter
-from .firestore_manager import FirestoreManager
+from .firestore_manager import AsyncFirestoreManager, FirestoreManager
 from .rss_manager import PodcastRssManager
 
 __all__ = [
+    "AsyncFirestoreManager",
     "AudioConverter",
     "FirestoreManager",
     "PodcastRssManager",
@@ -1,18 +1,85 @@
 """Audio file converter service.
 
-This module handles conversion of audio files (FLAC, WAV, AAC/m4a) to MP3 format.
+This module handles conversion of audio files (FLAC, WAV, AAC/m4a) to MP3 format
+and splitting of long recordings into overlapping segments.
 """
 
 import io
 import logging
+import shutil
+import subprocess
+from collections.abc import Callable, Sequence
+from pathlib import Path
 
 from pydub import AudioSegment
+from pydub.silence import detect_silence
+from pydub.utils import get_encoder_name
+
+from domain.models import AudioChunk
 
 logger = logging.getLogger(__name__)
 
 # Supported audio formats
 SUPPORTED_FORMATS = {".flac", ".wav", ".m4a", ".mp3"}
 
+# Segment splitting defaults
+DEFAULT_SILENCE_SEARCH_MS = 30_000
+MIN_SILENCE_LEN_MS = 500
+SILENCE_THRESHOLD_DB = 16
+
+SilenceFinder = Callable[[int, int], Sequence[tuple[int, int]]]
+
+
+def plan_segments(
+    duration_ms: int,
+    segment_ms: int,
+    overlap_ms: int,
+    find_silences: SilenceFinder | None = None,
+    search_ms: int = DEFAULT_SILENCE_SEARCH_MS,
+) -> list[tuple[int, int]]:
+    """Plan overlapping (start_ms, end_ms) spans that cut at silence where possible.
+
+    Args:
+        duration_ms: 音声全体の長さ(ミリ秒)。
+        segment_ms: 1 セグメントの目標長(ミリ秒)。
+        overlap_ms: 隣接セグメントの重なり(ミリ秒)。次のセグメントは前の切れ目の overlap_ms 手前から始まる。
+        find_silences: (lower_ms, upper_ms) を受け取り、その範囲の無音区間を絶対位置で返す関数。
+            None の場合は目標長ちょうどで切る。
+        search_ms: 目標の切れ目から何ミリ秒手前まで無音を探すか。
+
+    Returns:
+        各セグメントの (start_ms, end_ms) のリスト。
+
+    Raises:
+        ValueError: segment_ms が overlap_ms 以下の場合
+    """
+    if segment_ms <= overlap_ms:
+        msg = f"segment_ms ({segment_ms}) must be greater than overlap_ms ({overlap_ms})."
+        raise ValueError(msg)
+
+    spans: list[tuple[int, int]] = []
+    start_ms = 0
+    while True:
+        nominal_end_ms = start_ms + segment_ms
+        if nominal_end_ms >= duration_ms:
+            spans.append((start_ms, duration_ms))
+            return spans
+
+        # 次のセグメントが必ず前進するよう、探索範囲は start_ms + overlap_ms より後に限る
+        lower_ms = max(start_ms + overlap_ms + 1, nominal_end_ms - search_ms)
+        cut_ms = nominal_end_ms
+        if find_silences is not None:
+            midpoints = [
+                (silence_start + silence_end) // 2
+                for silence_start, silence_end in find_silences(lower_ms, nominal_end_ms)
+            ]
+            candidates = [midpoint for midpoint in midpoints if lower_ms <= midpoint <= nominal_end_ms]
+            if candidates:
+                cut_ms = max(candidates)
+
+        spans.append((start_ms, cut_ms))
+        start_ms = cut_ms - overlap_ms
+
 
 class AudioConverter:
     """Audio format converter using pydub."""
@@ -69,3 +136,118 @@ class AudioConverter:
         except Exception as e:
             logger.exception("Failed to convert audio to MP3")
             raise
+
+    @staticmethod
+    def convert_file_to_mp3(
+        source_path: Path,
+        file_extension: str,
+        destination_path: Path,
+        bitrate: str = "192k",
+    ) -> None:
+        """Convert an audio file to an MP3 file, streaming through ffmpeg.
+
+        convert_to_mp3 と違い、デコードした PCM 全体をメモリに載せないため、長時間の音声でも
+        メモリ使用量は音声の長さにほぼ依存しない。
+
+        Args:
+            source_path: Source audio file
+            file_extension: File extension including the dot (e.g., '.flac', '.wav', '.m4a')
+            destination_path: Path of the MP3 file to write
+            bitrate: Target bitrate for MP3 (default: '192k')
+
+        Raises:
+            ValueError: If file extension is not supported
+            RuntimeError: If ffmpeg fails
+        """
+        file_extension = file_extension.lower()
+        if file_extension not in SUPPORTED_FORMATS:
+            msg = f"Unsupported audio format: {file_extension}. Supported formats: {SUPPORTED_FORMATS}"
+            logger.error(msg)
+            raise ValueError(msg)
+
+        if file_extension == ".mp3":
+            logger.info("Audio is already in MP3 format, skipping conversion")
+            shutil.copyfile(source_path, destination_path)
+            return
+
+        logger.info("Converting %s to MP3 with bitrate %s (streaming)", source_path.name, bitrate)
+        command = [
+            get_encoder_name(),
+            "-nostdin",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-i",
+            str(source_path),
+            "-vn",
+            "-acodec",
+            "libmp3lame",
+            "-b:a",
+            bitrate,
+            str(destination_path),
+        ]
+        completed = subprocess.run(command, capture_output=True, check=False)  # noqa: S603
+        if completed.returncode != 0:
+            msg = f"ffmpeg failed with exit code {completed.returncode}: {completed.stderr.decode(errors='replace')}"
+            logger.error(msg)
+            raise RuntimeError(msg)
+        logger.info("Audio conversion successful, output size: %d bytes", destination_path.stat().st_size)
+
+    @staticmethod
+    def split_segments(
+        audio_data: bytes,
+        file_extension: str,
+        *,
+        segment_ms: int,
+        overlap_ms: int,
+        search_ms: int = DEFAULT_SILENCE_SEARCH_MS,
+        bitrate: str = "64k",
+    ) -> list[AudioChunk]:
+        """Split audio into overlapping MP3 segments, cutting at silence near each boundary.
+
+        Args:
+            audio_data: Raw audio file data as bytes
+            file_extension: File extension including the dot (e.g., '.flac', '.wav', '.m4a')
+            segment_ms: Target segment length in milliseconds
+            overlap_ms: Overlap between adjacent segments in milliseconds
+            search_ms: How far before each target boundary to look for silence
+            bitrate: Bitrate of the exported mono MP3 segments (default: '64k')
+
+        Returns:
+            Segments in playback order
+
+        Raises:
+            ValueError: If file extension is not supported
+        """
+        file_extension = file_extension.lower()
+        if file_extension not in SUPPORTED_FORMATS:
+            msg = f"Unsupported audio format: {file_extension}. Supported formats: {SUPPORTED_FORMATS}"
+            logger.error(msg)
+            raise ValueError(msg)
+
+        audio = AudioSegment.from_file(io.BytesIO(audio_data), format=file_extension[1:])
+        silence_threshold = audio.dBFS - SILENCE_THRESHOLD_DB
+
+        def find_silences(lower_ms: int, upper_ms: int) -> list[tuple[int, int]]:
+            # 全体に対する無音検出は長時間音声だと遅いため、切れ目候補の窓だけを調べる
+            window = audio[lower_ms:upper_ms]
+            return [
+                (lower_ms + start, lower_ms + end)
+                for start, end in detect_silence(
+                    window,
+                    min_silence_len=MIN_SILENCE_LEN_MS,
+                    silence_thresh=silence_threshold,
+                    seek_step=10,
+                )
+            ]
+
+        spans = plan_segments(len(audio), segment_ms, overlap_ms, find_silences, search_ms)
+        chunks: list[AudioChunk] = []
+        for index, (start_ms, end_ms) in enumerate(spans):
+            output_buffer = io.BytesIO()
+            audio[start_ms:end_ms].set_channels(1).export(output_buffer, format="mp3", bitrate=bitrate)
+            chunks.append(AudioChunk(index=index, start_ms=start_ms, end_ms=end_ms, data=output_buffer.getvalue()))
+
+        logger.info("Split %d ms of audio into %d segments", len(audio), len(chunks))
+        return chunks
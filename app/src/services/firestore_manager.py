@@ -2,12 +2,52 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
+import threading
 import uuid
-from typing import Any
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from google.cloud import firestore
 
+from domain.models import SnsPromotionRecord
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine, Mapping, Sequence
+
+    from domain.interfaces import EpisodeTranscriptCache
+
+    # (ドキュメント, 書き込む内容)。内容が None の場合は削除
+    _BatchWrite = tuple[firestore.DocumentReference | firestore.AsyncDocumentReference, dict[str, Any] | None]
+
+T = TypeVar("T")
+
+# 読み込み API が既定で取得するフィールド (呼び出し元のジョブが実際に使うもの)。ai_generated_meta・
+# show_notes_summary・audio_metadata などの大きなマップは読み込まない
+RECENT_EPISODE_FIELDS = ("episode_number", "updated_at", "transcript_summary")
+EPISODE_CONTENT_FIELDS = ("episode_number",)
+DUE_PROMOTION_FIELDS = ("scheduled_time", "message", "episode.number", "platform_urls", "hashtags")
+TRANSCRIPT_CHUNK_FIELDS = ("text",)
+TRANSCRIPT_BLOB_FIELDS = ("encoding", "data", "sha256")
+
+# Firestore の 1 バッチあたりの書き込み上限
+MAX_BATCH_WRITES = 500
+# サブコレクションを並行に読み込むときの同時実行数の既定値
+DEFAULT_PARALLEL_READS = 8
+# 500 件を超える書き込みを複数バッチに分けたときに同時にコミットするバッチ数
+MAX_PARALLEL_COMMITS = 4
+# 文字起こし全文を圧縮して 1 ドキュメントにまとめたもの (transcripts チャンクの非正規化コピー)
+TRANSCRIPT_BLOB_COLLECTION = "transcript_blob"
+TRANSCRIPT_BLOB_DOCUMENT_ID = "full"
+TRANSCRIPT_BLOB_ENCODING = "zlib"
+# Firestore のドキュメント上限 (1 MiB) から他のフィールドの分を引いた、圧縮後の最大サイズ
+MAX_TRANSCRIPT_BLOB_BYTES = 1_000_000
+
 
 class FirestoreManager:
     """Persist generated podcast artifacts to Firestore."""
@@ -19,6 +59,11 @@ class FirestoreManager:
         self._client = client or firestore.Client(project=project_id)
         self._logger = logger or logging.getLogger(__name__)
 
+    @property
+    def client(self) -> firestore.Client:
+        """Underlying Firestore client, shared with other Firestore-backed adapters."""
+        return self._client
+
     def save_episode_content(
         self,
         *,
@@ -34,15 +79,15 @@ class FirestoreManager:
         """Upsert episode content document."""
         doc_ref = self._episode_contents_collection(podcast_id).document(episode_id)
         doc_ref.set(
-            {
-                "episode_id": episode_id,
-                "episode_number": episode_number,
-                "updated_at": updated_at,
-                "transcript_summary": transcript_summary,
-                "ai_generated_meta": ai_generated_meta,
-                "show_notes_summary": show_notes_summary,
-                "audio_metadata": audio_metadata,
-            },
+            _episode_content_document(
+                episode_id=episode_id,
+                episode_number=episode_number,
+                updated_at=updated_at,
+                transcript_summary=transcript_summary,
+                ai_generated_meta=ai_generated_meta,
+                show_notes_summary=show_notes_summary,
+                audio_metadata=audio_metadata,
+            ),
             merge=True,
         )
         return doc_ref.id
@@ -55,34 +100,38 @@ class FirestoreManager:
         transcript: str,
         chunk_size: int = 1200,
     ) -> list[str]:
-        """Store transcript chunks in a subcollection."""
+        """Store transcript chunks in a subcollection, plus a compressed copy of the full text.
+
+        既存チャンクの content_hash と比較して内容が変わったチャンクだけを書き込み、前回より分割数が
+        減った場合は余った末尾のチャンクを削除する。書き込みは 500 件ごとのバッチに分けて並行にコミットする。
+        全文を読むだけの処理はチャンクの代わりに圧縮した全文 (transcript_blob/full) を読む。
+        全文はハッシュで検証して読むため、バッチが分かれてチャンクと一時的に食い違っても問題ない。
+        """
         chunks = list(_chunk_text(transcript, chunk_size=chunk_size))
-        batch = self._client.batch()
-        saved_ids: list[str] = []
-
-        for index, chunk_text in enumerate(chunks, start=1):
-            chunk_id = f"chunk_{index:04d}"
-            saved_ids.append(chunk_id)
-            doc_ref = (
-                self._episode_contents_collection(podcast_id)
-                .document(episode_id)
-                .collection("transcripts")
-                .document(
-                    chunk_id,
-                )
-            )
-            batch.set(
-                doc_ref,
-                {
-                    "chunk_id": chunk_id,
-                    "start_time": 0,
-                    "end_time": 0,
-                    "speaker": "unknown",
-                    "text": chunk_text,
-                },
+        transcripts = self._episode_contents_collection(podcast_id).document(episode_id).collection("transcripts")
+        existing_hashes = {
+            doc.id: (doc.to_dict() or {}).get("content_hash") for doc in transcripts.select(["content_hash"]).stream()
+        }
+        writes, saved_ids, changed_count, stale_ids = _transcript_chunk_writes(transcripts, chunks, existing_hashes)
+
+        blob = _encode_transcript_blob(transcript.strip(), chunk_count=len(chunks))
+        blob_ref = self._transcript_blob_ref(podcast_id, episode_id)
+        if blob is None:
+            self._logger.warning(
+                "Transcript of episode %s is too large for a single document; storing chunks only", episode_id
             )
+            writes.append((blob_ref, None))
+        elif (blob_ref.get(field_paths=["sha256"]).to_dict() or {}).get("sha256") != blob["sha256"]:
+            writes.append((blob_ref, blob))
 
-        batch.commit()
+        self._commit_in_batches(writes)
+        self._logger.info(
+            "Saved transcript of episode %s: %d chunks, %d unchanged, %d stale deleted",
+            episode_id,
+            len(chunks),
+            len(chunks) - changed_count,
+            len(stale_ids),
+        )
         return saved_ids
 
     def create_sns_promotion(
@@ -99,7 +148,7 @@ class FirestoreManager:
         hashtags: list[str],
         status: str = "pending",
     ) -> str:
-        """Create or overwrite an SNS promotion record."""
+        """Create or overwrite an SNS promotion record; scheduled_time is stored in UTC so it can be range-queried."""
         promotion_doc_id = promotion_id or uuid.uuid4().hex
         doc_ref = (
             self._episode_contents_collection(podcast_id)
@@ -110,15 +159,18 @@ class FirestoreManager:
             )
         )
         doc_ref.set(
-            {
-                "status": status,
-                "generated_at": generated_at,
-                "scheduled_time": scheduled_time,
-                "episode": {"number": episode_number},
-                "message": message,
-                "platform_urls": platform_urls,
-                "hashtags": hashtags,
-            },
+            _sns_promotion_document(
+                SnsPromotionRecord(
+                    promotion_id=promotion_doc_id,
+                    generated_at=generated_at,
+                    scheduled_time=scheduled_time,
+                    episode_number=episode_number,
+                    message=message,
+                    hashtags=hashtags,
+                    platform_urls=platform_urls,
+                    status=status,
+                )
+            ),
             merge=True,
         )
         return doc_ref.id
@@ -153,30 +205,45 @@ class FirestoreManager:
         *,
         podcast_id: str,
         limit: int,
+        max_parallel_reads: int = DEFAULT_PARALLEL_READS,
+        transcript_cache: EpisodeTranscriptCache | None = None,
     ) -> list[dict[str, Any]]:
-        """Read recent episode transcripts from Firestore for agenda generation."""
+        """Read recent episode transcripts from Firestore for agenda generation.
+
+        文字起こしは圧縮した全文ドキュメントを全エピソード分まとめて 1 回で読み込む。全文ドキュメントが
+        ない (または壊れている) エピソードだけ、transcripts サブコレクションを最大 max_parallel_reads 件ずつ
+        並行に読み込む。transcript_cache を渡すと、updated_at が変わっていないエピソードの文字起こしは
+        キャッシュから返し、新規・更新されたエピソードだけを Firestore から読み込んでキャッシュに追加する。
+        エピソードのドキュメントは RECENT_EPISODE_FIELDS だけを読み込む。
+        """
         query = (
             self._episode_contents_collection(podcast_id)
+            .select(list(RECENT_EPISODE_FIELDS))
             .order_by("updated_at", direction=firestore.Query.DESCENDING)
             .limit(limit)
         )
-        episodes: list[dict[str, Any]] = []
-
-        for doc in query.stream():
-            data = doc.to_dict() or {}
-            episode_number = data.get("episode_number")
-            if not isinstance(episode_number, int):
-                continue
-
-            transcript_parts: list[str] = []
-            transcript_docs = doc.reference.collection("transcripts").order_by("chunk_id").stream()
-            for transcript_doc in transcript_docs:
-                transcript_data = transcript_doc.to_dict() or {}
-                text = transcript_data.get("text")
-                if isinstance(text, str) and text.strip():
-                    transcript_parts.append(text.strip())
+        candidates = [(doc, doc.to_dict() or {}) for doc in query.stream()]
+        candidates = [(doc, data) for doc, data in candidates if isinstance(data.get("episode_number"), int)]
+        versions = {doc.id: str(data.get("updated_at") or "") for doc, data in candidates}
+        transcripts = self._read_cached_transcripts(transcript_cache, podcast_id, versions)
+        to_read = [doc for doc, _ in candidates if doc.id not in transcripts]
+        fetched = self._read_transcript_blobs(podcast_id, [doc.id for doc in to_read])
+        missing = [doc for doc in to_read if doc.id not in fetched]
+        if missing:
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(max_parallel_reads, len(missing))), thread_name_prefix="firestore-read"
+            ) as pool:
+                fetched.update(zip((doc.id for doc in missing), pool.map(_read_transcript, missing), strict=True))
+        transcripts.update(fetched)
+        if transcript_cache is not None:
+            self._logger.info(
+                "Transcript cache: %d hits, %d read from Firestore", len(candidates) - len(to_read), len(to_read)
+            )
+            self._store_cached_transcripts(transcript_cache, podcast_id, versions, fetched)
 
-            content = "\n\n".join(transcript_parts).strip()
+        episodes: list[dict[str, Any]] = []
+        for doc, data in candidates:
+            content = transcripts[doc.id]
             if not content:
                 summary = data.get("transcript_summary")
                 content = summary.strip() if isinstance(summary, str) else ""
@@ -186,7 +253,7 @@ class FirestoreManager:
             episodes.append(
                 {
                     "episode_id": doc.id,
-                    "episode_number": episode_number,
+                    "episode_number": data["episode_number"],
                     "content": content,
                     "updated_at": str(data.get("updated_at") or ""),
                 },
@@ -194,9 +261,62 @@ class FirestoreManager:
 
         return sorted(episodes, key=lambda item: int(item["episode_number"]))
 
-    def get_pending_sns_promotions(self) -> list[dict[str, Any]]:
-        """Retrieve all pending SNS promotions across all episodes using a collection group query."""
+    def get_episode_contents(
+        self,
+        *,
+        podcast_id: str,
+        episode_ids: Sequence[str],
+        fields: Sequence[str] | None = EPISODE_CONTENT_FIELDS,
+    ) -> dict[str, dict[str, Any]]:
+        """Read several episode content documents in one round trip; missing episodes are omitted.
+
+        fields のフィールドだけを読み込む (None ならドキュメント全体)。
+        """
+        collection = self._episode_contents_collection(podcast_id)
+        refs = [collection.document(episode_id) for episode_id in episode_ids]
+        return {
+            snapshot.id: snapshot.to_dict() or {}
+            for snapshot in self._client.get_all(refs, field_paths=_field_paths(fields))
+            if snapshot.exists
+        }
+
+    def get_transcript(self, *, podcast_id: str, episode_id: str) -> str:
+        """Return the stored transcript of an episode (empty if none is stored)."""
+        transcripts = self._read_transcript_blobs(podcast_id, [episode_id])
+        if episode_id in transcripts:
+            return transcripts[episode_id]
+        return _read_transcript(self._episode_contents_collection(podcast_id).document(episode_id))
+
+    def update_episode_contents(self, *, podcast_id: str, updates: Mapping[str, dict[str, Any]]) -> int:
+        """Merge fields into many episode content documents using batched writes."""
+        collection = self._episode_contents_collection(podcast_id)
+        self._commit_in_batches(
+            [(collection.document(episode_id), fields) for episode_id, fields in updates.items()], merge=True
+        )
+        return len(updates)
+
+    def get_pending_sns_promotions(
+        self,
+        *,
+        due_at: datetime | None = None,
+        limit: int | None = None,
+        fields: Sequence[str] | None = DUE_PROMOTION_FIELDS,
+    ) -> list[dict[str, Any]]:
+        """Retrieve pending SNS promotions across all episodes using a collection group query.
+
+        due_at を渡すと、scheduled_time が due_at 以前のものだけを scheduled_time の古い順に返す。
+        絞り込み・並べ替え・件数制限は Firestore 側で (status, scheduled_time) の複合インデックスを使って
+        行うため、未投稿の件数が増えても読み込むドキュメントは limit 件までになる。
+        scheduled_time は UTC の ISO 8601 文字列で保存しているため、文字列の比較が時刻の比較になる。
+        fields のフィールドだけを読み込む (None ならドキュメント全体)。
+        """
         query = self._client.collection_group("sns_promotions").where("status", "==", "pending")
+        if fields is not None:
+            query = query.select(list(fields))
+        if due_at is not None:
+            query = query.where("scheduled_time", "<=", _utc_isoformat(due_at)).order_by("scheduled_time")
+        if limit is not None:
+            query = query.limit(limit)
         results = []
         for doc in query.stream():
             data = doc.to_dict()
@@ -209,6 +329,84 @@ class FirestoreManager:
         """Update status of a specific SNS promotion document by its full reference path."""
         self._client.document(doc_path).update({"status": status})
 
+    def _read_cached_transcripts(
+        self, cache: EpisodeTranscriptCache | None, podcast_id: str, versions: Mapping[str, str]
+    ) -> dict[str, str]:
+        # updated_at のないエピソードは更新を検知できないため、キャッシュしない
+        cacheable = {episode_id: updated_at for episode_id, updated_at in versions.items() if updated_at}
+        if cache is None or not cacheable:
+            return {}
+        try:
+            return cache.get_many(podcast_id, cacheable)
+        except Exception:  # noqa: BLE001 - キャッシュが読めなくても Firestore から読めばよい
+            self._logger.warning("Failed to read the transcript cache", exc_info=True)
+            return {}
+
+    def _store_cached_transcripts(
+        self,
+        cache: EpisodeTranscriptCache,
+        podcast_id: str,
+        versions: Mapping[str, str],
+        transcripts: Mapping[str, str],
+    ) -> None:
+        # 空の transcript (チャンクの書き込み途中など) をキャッシュすると、updated_at が変わるまで空のまま読まれる
+        entries = {
+            episode_id: (versions[episode_id], transcript)
+            for episode_id, transcript in transcripts.items()
+            if versions[episode_id] and transcript
+        }
+        try:
+            cache.put_many(podcast_id, entries)
+        except Exception:  # noqa: BLE001
+            self._logger.warning("Failed to update the transcript cache", exc_info=True)
+
+    def _commit_in_batches(self, writes: Sequence[_BatchWrite], *, merge: bool = False) -> None:
+        """Commit sets (data) and deletes (None) in batches of MAX_BATCH_WRITES, several batches at a time."""
+        batches = []
+        for start in range(0, len(writes), MAX_BATCH_WRITES):
+            batch = self._client.batch()
+            for doc_ref, data in writes[start : start + MAX_BATCH_WRITES]:
+                if data is None:
+                    batch.delete(doc_ref)
+                else:
+                    batch.set(doc_ref, data, merge=merge)
+            batches.append(batch)
+        if len(batches) <= 1:
+            for batch in batches:
+                batch.commit()
+            return
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_PARALLEL_COMMITS, len(batches)), thread_name_prefix="firestore-commit"
+        ) as pool:
+            # 例外はここで送出する (他のバッチのコミットは待ってから)
+            list(pool.map(lambda batch: batch.commit(), batches))
+
+    def _read_transcript_blobs(self, podcast_id: str, episode_ids: Sequence[str]) -> dict[str, str]:
+        """Read the compressed full transcripts of several episodes in one round trip (valid ones only)."""
+        if not episode_ids:
+            return {}
+        refs = [self._transcript_blob_ref(podcast_id, episode_id) for episode_id in episode_ids]
+        episode_ids_by_path = {ref.path: episode_id for ref, episode_id in zip(refs, episode_ids, strict=True)}
+        transcripts: dict[str, str] = {}
+        for snapshot in self._client.get_all(refs, field_paths=list(TRANSCRIPT_BLOB_FIELDS)):
+            if not snapshot.exists:
+                continue
+            episode_id = episode_ids_by_path[snapshot.reference.path]
+            transcript = _decode_transcript_blob(snapshot.to_dict() or {})
+            if transcript is None:
+                self._logger.warning("Ignoring invalid transcript blob of episode %s; reading chunks", episode_id)
+                continue
+            transcripts[episode_id] = transcript
+        return transcripts
+
+    def _transcript_blob_ref(self, podcast_id: str, episode_id: str) -> firestore.DocumentReference:
+        return (
+            self._episode_contents_collection(podcast_id)
+            .document(episode_id)
+            .collection(TRANSCRIPT_BLOB_COLLECTION)
+            .document(TRANSCRIPT_BLOB_DOCUMENT_ID)
+        )
+
     def _podcast_collection(self, podcast_id: str) -> firestore.DocumentReference:
         return self._client.collection("podcasts").document(str(podcast_id))
 
@@ -216,6 +414,306 @@ class FirestoreManager:
         return self._podcast_collection(podcast_id).collection("episodes_contents")
 
 
+class AsyncFirestoreManager:
+    """Async counterpart of FirestoreManager for the writes made after an episode is published.
+
+    エピソード本文・文字起こし・SNS 投稿文の書き込みを非同期クライアントで同時に発行する。SNS 投稿文は
+    1 つのバッチにまとめるため、書き込みの往復は 2+N 回の逐次実行から並行する 1 回分になる
+    (文字起こしは差分を判定する読み込みの後に書き込む)。同期コードからは run_blocking() で呼ぶ。
+    非同期クライアントの接続はイベントループに紐づくため、run_blocking() は常にこのインスタンス専用の
+    スレッドで動くループで実行する。
+    """
+
+    def __init__(  # noqa: D107
+        self, *, project_id: str, client: firestore.AsyncClient | None = None, logger: logging.Logger | None = None
+    ) -> None:
+        self._project_id = project_id
+        self._client = client or firestore.AsyncClient(project=project_id)
+        self._logger = logger or logging.getLogger(__name__)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._loop_lock = threading.Lock()
+
+    async def save_episode_content(
+        self,
+        *,
+        podcast_id: str,
+        episode_id: str,
+        episode_number: int,
+        updated_at: str,
+        transcript_summary: str,
+        ai_generated_meta: dict[str, Any],
+        show_notes_summary: dict[str, Any],
+        audio_metadata: dict[str, Any],
+    ) -> str:
+        """Upsert episode content document."""
+        doc_ref = self._episode_contents_collection(podcast_id).document(episode_id)
+        await doc_ref.set(
+            _episode_content_document(
+                episode_id=episode_id,
+                episode_number=episode_number,
+                updated_at=updated_at,
+                transcript_summary=transcript_summary,
+                ai_generated_meta=ai_generated_meta,
+                show_notes_summary=show_notes_summary,
+                audio_metadata=audio_metadata,
+            ),
+            merge=True,
+        )
+        return doc_ref.id
+
+    async def save_transcript_chunks(
+        self,
+        *,
+        podcast_id: str,
+        episode_id: str,
+        transcript: str,
+        chunk_size: int = 1200,
+    ) -> list[str]:
+        """Store changed transcript chunks and the compressed full text (same layout as FirestoreManager).
+
+        既存チャンクのハッシュと全文のハッシュは並行に読み込む。
+        """
+        chunks = list(_chunk_text(transcript, chunk_size=chunk_size))
+        episode_ref = self._episode_contents_collection(podcast_id).document(episode_id)
+        transcripts = episode_ref.collection("transcripts")
+        blob_ref = episode_ref.collection(TRANSCRIPT_BLOB_COLLECTION).document(TRANSCRIPT_BLOB_DOCUMENT_ID)
+        existing_hashes, blob_snapshot = await asyncio.gather(
+            self._read_chunk_hashes(transcripts), blob_ref.get(field_paths=["sha256"])
+        )
+        writes, saved_ids, changed_count, stale_ids = _transcript_chunk_writes(transcripts, chunks, existing_hashes)
+
+        blob = _encode_transcript_blob(transcript.strip(), chunk_count=len(chunks))
+        if blob is None:
+            self._logger.warning(
+                "Transcript of episode %s is too large for a single document; storing chunks only", episode_id
+            )
+            writes.append((blob_ref, None))
+        elif (blob_snapshot.to_dict() or {}).get("sha256") != blob["sha256"]:
+            writes.append((blob_ref, blob))
+
+        await self._commit_in_batches(writes)
+        self._logger.info(
+            "Saved transcript of episode %s: %d chunks, %d unchanged, %d stale deleted",
+            episode_id,
+            len(chunks),
+            len(chunks) - changed_count,
+            len(stale_ids),
+        )
+        return saved_ids
+
+    async def create_sns_promotions(
+        self, *, podcast_id: str, episode_id: str, promotions: Sequence[SnsPromotionRecord]
+    ) -> list[str]:
+        """Create or overwrite several SNS promotion records in one batch."""
+        collection = self._episode_contents_collection(podcast_id).document(episode_id).collection("sns_promotions")
+        writes: list[_BatchWrite] = [
+            (collection.document(promotion.promotion_id), _sns_promotion_document(promotion))
+            for promotion in promotions
+        ]
+        await self._commit_in_batches(writes, merge=True)
+        return [promotion.promotion_id for promotion in promotions]
+
+    async def save_episode_artifacts(  # noqa: PLR0913
+        self,
+        *,
+        podcast_id: str,
+        episode_id: str,
+        episode_number: int,
+        updated_at: str,
+        transcript_summary: str,
+        ai_generated_meta: dict[str, Any],
+        show_notes_summary: dict[str, Any],
+        audio_metadata: dict[str, Any],
+        transcript: str,
+        promotions: Sequence[SnsPromotionRecord],
+    ) -> None:
+        """Write the episode content, transcript and SNS promotions concurrently."""
+        await asyncio.gather(
+            self.save_episode_content(
+                podcast_id=podcast_id,
+                episode_id=episode_id,
+                episode_number=episode_number,
+                updated_at=updated_at,
+                transcript_summary=transcript_summary,
+                ai_generated_meta=ai_generated_meta,
+                show_notes_summary=show_notes_summary,
+                audio_metadata=audio_metadata,
+            ),
+            self.save_transcript_chunks(podcast_id=podcast_id, episode_id=episode_id, transcript=transcript),
+            self.create_sns_promotions(podcast_id=podcast_id, episode_id=episode_id, promotions=promotions),
+        )
+
+    def run_blocking(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on this manager's event loop thread and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._event_loop()).result()
+
+    def close(self) -> None:
+        """Stop the event loop thread and close the client."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is not None and thread is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self._client.close()
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="firestore-async", daemon=True)
+                thread.start()
+                self._loop, self._loop_thread = loop, thread
+            return self._loop
+
+    @staticmethod
+    async def _read_chunk_hashes(transcripts: firestore.AsyncCollectionReference) -> dict[str, str | None]:
+        return {
+            doc.id: (doc.to_dict() or {}).get("content_hash")
+            async for doc in transcripts.select(["content_hash"]).stream()
+        }
+
+    async def _commit_in_batches(self, writes: Sequence[_BatchWrite], *, merge: bool = False) -> None:
+        """Commit sets (data) and deletes (None) in batches of MAX_BATCH_WRITES, several batches at a time."""
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_COMMITS)
+
+        async def commit(batch: firestore.AsyncWriteBatch) -> None:
+            async with semaphore:
+                await batch.commit()
+
+        batches = []
+        for start in range(0, len(writes), MAX_BATCH_WRITES):
+            batch = self._client.batch()
+            for doc_ref, data in writes[start : start + MAX_BATCH_WRITES]:
+                if data is None:
+                    batch.delete(doc_ref)
+                else:
+                    batch.set(doc_ref, data, merge=merge)
+            batches.append(batch)
+        await asyncio.gather(*(commit(batch) for batch in batches))
+
+    def _episode_contents_collection(self, podcast_id: str) -> firestore.AsyncCollectionReference:
+        return self._client.collection("podcasts").document(str(podcast_id)).collection("episodes_contents")
+
+
+def _episode_content_document(  # noqa: PLR0913
+    *,
+    episode_id: str,
+    episode_number: int,
+    updated_at: str,
+    transcript_summary: str,
+    ai_generated_meta: dict[str, Any],
+    show_notes_summary: dict[str, Any],
+    audio_metadata: dict[str, Any],
+) -> dict[str, Any]:
+    return {
+        "episode_id": episode_id,
+        "episode_number": episode_number,
+        "updated_at": updated_at,
+        "transcript_summary": transcript_summary,
+        "ai_generated_meta": ai_generated_meta,
+        "show_notes_summary": show_notes_summary,
+        "audio_metadata": audio_metadata,
+    }
+
+
+def _sns_promotion_document(record: SnsPromotionRecord) -> dict[str, Any]:
+    return {
+        "status": record.status,
+        "generated_at": record.generated_at,
+        "scheduled_time": _utc_isoformat(datetime.fromisoformat(record.scheduled_time)),
+        "episode": {"number": record.episode_number},
+        "message": record.message,
+        "platform_urls": record.platform_urls,
+        "hashtags": record.hashtags,
+    }
+
+
+def _transcript_chunk_writes(
+    transcripts: firestore.CollectionReference | firestore.AsyncCollectionReference,
+    chunks: Sequence[str],
+    existing_hashes: Mapping[str, str | None],
+) -> tuple[list[_BatchWrite], list[str], int, list[str]]:
+    """Return the chunk writes (changed chunks, then deletes of stale ones), chunk IDs, changed count and stale IDs."""
+    writes: list[_BatchWrite] = []
+    saved_ids: list[str] = []
+    for index, chunk_text in enumerate(chunks, start=1):
+        chunk_id = f"chunk_{index:04d}"
+        saved_ids.append(chunk_id)
+        document: dict[str, Any] = {
+            "chunk_id": chunk_id,
+            "start_time": 0,
+            "end_time": 0,
+            "speaker": "unknown",
+            "text": chunk_text,
+        }
+        document["content_hash"] = _content_hash(document)
+        if existing_hashes.get(chunk_id) != document["content_hash"]:
+            writes.append((transcripts.document(chunk_id), document))
+    changed_count = len(writes)
+    stale_ids = sorted(set(existing_hashes) - set(saved_ids))
+    writes.extend((transcripts.document(chunk_id), None) for chunk_id in stale_ids)
+    return writes, saved_ids, changed_count, stale_ids
+
+
+def _field_paths(fields: Sequence[str] | None) -> list[str] | None:
+    return None if fields is None else list(fields)
+
+
+def _utc_isoformat(value: datetime) -> str:
+    """Format a time as a fixed-width UTC ISO 8601 string (naive times are taken as UTC), so strings sort by time."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).isoformat(timespec="microseconds")
+
+
+def _content_hash(document: Mapping[str, Any]) -> str:
+    """Return a stable hash of a document's fields (used to skip rewriting unchanged chunks)."""
+    return hashlib.sha256(json.dumps(document, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _read_transcript(episode_ref: firestore.DocumentReference) -> str:
+    """Join the non-empty transcript chunks of an episode in chunk order."""
+    transcript_parts: list[str] = []
+    transcripts = episode_ref.collection("transcripts").select(list(TRANSCRIPT_CHUNK_FIELDS))
+    for transcript_doc in transcripts.order_by("chunk_id").stream():
+        text = (transcript_doc.to_dict() or {}).get("text")
+        if isinstance(text, str) and text.strip():
+            transcript_parts.append(text.strip())
+    return "\n\n".join(transcript_parts).strip()
+
+
+def _encode_transcript_blob(transcript: str, *, chunk_count: int) -> dict[str, Any] | None:
+    """Build the compressed full-transcript document, or None if it would not fit in one document."""
+    raw = transcript.encode("utf-8")
+    data = zlib.compress(raw, level=9)
+    if len(data) > MAX_TRANSCRIPT_BLOB_BYTES:
+        return None
+    return {
+        "encoding": TRANSCRIPT_BLOB_ENCODING,
+        "data": data,
+        "sha256": hashlib.sha256(raw).hexdigest(),
+        "size_bytes": len(raw),
+        "chunk_count": chunk_count,
+    }
+
+
+def _decode_transcript_blob(document: Mapping[str, Any]) -> str | None:
+    """Decompress a full-transcript document; None if the encoding is unknown or the hash does not match."""
+    data = document.get("data")
+    if document.get("encoding") != TRANSCRIPT_BLOB_ENCODING or not isinstance(data, bytes):
+        return None
+    try:
+        raw = zlib.decompress(data)
+    except zlib.error:
+        return None
+    if hashlib.sha256(raw).hexdigest() != document.get("sha256"):
+        return None
+    return raw.decode("utf-8")
+
+
 def _chunk_text(text: str, *, chunk_size: int) -> list[str]:
     """Split text into Firestore-friendly chunks."""
     normalized = text.strip()
@@ -23,7 +23,10 @@ from google.auth.exceptions import DefaultCredentialsError
 from google.genai import types
 from google.oauth2 import credentials as google_oauth2_credentials
 
+from infrastructure.model_call import ModelCaller, ModelCallPolicy
+
 if TYPE_CHECKING:
+    from infrastructure.rate_limiter import RateLimiter
     from services.transcript_analyzer import TopicMatch
 
 logger = logging.getLogger(__name__)
@@ -31,6 +34,8 @@ logger = logging.getLogger(__name__)
 _DEFAULT_MODEL: str = "gemini-2.5-flash"
 _DEFAULT_LOCATION: str = "us-central1"
 _DEFAULT_MAX_ITEMS: int = 3
+# Agenda Job のタスクタイムアウト (300s) 内に収まるよう、対話的な呼び出しより短く設定する
+_DEFAULT_CALL_POLICY = ModelCallPolicy(deadline_seconds=180.0, attempt_timeout_seconds=90.0, max_attempts=3)
 _NEWS_ITEM_RE = re.compile(
     r"^\s*\d+\.\s+\*\*(?P<title>.+?)\*\*\s+\(出典:\s*(?P<source>.+?)\)\s*$",
 )
@@ -69,6 +74,8 @@ class AINewsResearcher:
         location: Vertex AI のリージョン。デフォルト us-central1。
         model: 使用する Gemini モデル ID。
         credentials: 認証情報。None の場合は _resolve_credentials() で自動解決。
+        call_policy: Gemini 呼び出しのタイムアウト・リトライ設定。
+        rate_limiter: Gemini 呼び出し前に許可を得るレートリミッター。
     """
 
     def __init__(
@@ -77,6 +84,9 @@ class AINewsResearcher:
         location: str = _DEFAULT_LOCATION,
         model: str = _DEFAULT_MODEL,
         credentials: object | None = None,
+        *,
+        call_policy: ModelCallPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
         """Initialize the Gemini client with resolved credentials.
 
@@ -85,6 +95,8 @@ class AINewsResearcher:
             location: Vertex AI のリージョン。
             model: 使用する Gemini モデル ID。
             credentials: 明示的な認証情報。None の場合は自動解決する。
+            call_policy: Gemini 呼び出しのタイムアウト・リトライ設定。None の場合はデフォルト。
+            rate_limiter: Gemini 呼び出し前に許可を得るレートリミッター。None の場合は制限しない。
         """
         self._model = model
         resolved = credentials if credentials is not None else _resolve_credentials()
@@ -94,6 +106,12 @@ class AINewsResearcher:
             location=location,
             **({"credentials": resolved} if resolved is not None else {}),
         )
+        self._model_caller = ModelCaller(
+            self._client,
+            call_policy or _DEFAULT_CALL_POLICY,
+            rate_limiter=rate_limiter,
+            location=location,
+        )
 
     def research(
         self,
@@ -133,7 +151,8 @@ class AINewsResearcher:
             max_items,
         )
 
-        response = self._client.models.generate_content(
+        response = self._model_caller.generate_content(
+            operation="news_research",
             model=self._model,
             contents=prompt,
             config=types.GenerateContentConfig(
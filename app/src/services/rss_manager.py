@@ -636,6 +636,35 @@ class PodcastRssManager:
 
         self.set_rss_xml()
 
+    def update_episodes(self, updates: dict[str, EpisodeData]) -> None:
+        """複数のエピソードをまとめて更新し、フィードの再構築を 1 回で済ませる.
+
+        Args:
+            updates: guid をキー、更新する情報 (update_episode と同じキー) を値とする辞書.
+
+        Raises:
+            ValueError: 存在しない guid が含まれている場合.
+        """
+        known_guids = {episode.get("guid") for episode in self.episodes}
+        missing = [guid for guid in updates if guid not in known_guids]
+        if missing:
+            msg = f"Episodes with IDs {missing} not found"
+            raise ValueError(msg)
+
+        self._initialize_fg()
+        self._register_channel()
+
+        self.total_episodes = 0
+        for episode in self.episodes:
+            updated_data = updates.get(episode.get("guid", ""))
+            if updated_data:
+                for key, value in updated_data.items():
+                    episode[key] = value
+            self._register_episode(episode)
+            self.total_episodes += 1
+
+        self.set_rss_xml()
+
     def delete_episode(self, episode_id: str) -> None:
         """指定されたエピソードをRSSフィードから削除.
 
@@ -1,12 +1,41 @@
 """Application use cases package."""
 
 from .auto_post_sns import AutoPostSnsUsecase
+from .backfill_episodes import BackfillEpisodesInput, BackfillEpisodesUsecase, BackfillReport
+from .episode_worker import EpisodeWorker, EpisodeWorkerReport, EpisodeWorkerSettings
 from .generate_weekly_agenda import GenerateWeeklyAgendaUsecase
-from .process_podcast_workflow import ProcessPodcastWorkflow, ProcessPodcastWorkflowInput
+from .process_podcast_batch import (
+    BatchEpisodeFeed,
+    EpisodeBatchResult,
+    ProcessPodcastBatchInput,
+    ProcessPodcastBatchReport,
+    ProcessPodcastBatchUsecase,
+)
+from .process_podcast_workflow import (
+    EpisodeLeaseLostError,
+    MemoryBudget,
+    ProcessPodcastWorkflow,
+    ProcessPodcastWorkflowInput,
+    ProcessPodcastWorkflowResult,
+)
 
 __all__ = [
     "AutoPostSnsUsecase",
+    "BackfillEpisodesInput",
+    "BackfillEpisodesUsecase",
+    "BackfillReport",
+    "BatchEpisodeFeed",
+    "EpisodeBatchResult",
+    "EpisodeLeaseLostError",
+    "EpisodeWorker",
+    "EpisodeWorkerReport",
+    "EpisodeWorkerSettings",
     "GenerateWeeklyAgendaUsecase",
+    "MemoryBudget",
+    "ProcessPodcastBatchInput",
+    "ProcessPodcastBatchReport",
+    "ProcessPodcastBatchUsecase",
     "ProcessPodcastWorkflow",
     "ProcessPodcastWorkflowInput",
+    "ProcessPodcastWorkflowResult",
 ]
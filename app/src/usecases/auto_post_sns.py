@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from domain.models.sns_post import SnsPost
 
@@ -14,6 +14,10 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# 投稿するのは最も古い 1 件だけ。scheduled_time が壊れているもの (failed にして次回から除外する) を
+# 読み飛ばせるよう数件だけ余分に取得する
+DUE_PROMOTIONS_FETCH_LIMIT = 10
+
 
 class AutoPostSnsUsecase:
     """Retrieves due SNS promotions from Firestore and posts the oldest one to X."""
@@ -34,40 +38,37 @@ class AutoPostSnsUsecase:
         """Execute the auto-posting process."""
         self._logger.info("Auto-posting process started.")
 
+        now = datetime.now(UTC)
         try:
-            pending_promotions = self._firestore_manager.get_pending_sns_promotions()
+            due_candidates = self._firestore_manager.get_pending_sns_promotions(
+                due_at=now, limit=DUE_PROMOTIONS_FETCH_LIMIT
+            )
         except Exception:
             self._logger.exception("Failed to fetch pending SNS promotions from Firestore.")
             raise
 
-        if not pending_promotions:
-            self._logger.info("No pending SNS promotions found.")
-            return
-
-        now = datetime.now(UTC)
-        due_promotions = []
-        for promo in pending_promotions:
+        # Firestore returns due promotions oldest first; re-check each scheduled_time in case it was not
+        # stored in the UTC format the query relies on.
+        oldest_promo = None
+        for promo in due_candidates:
             sched_time_str = promo.get("scheduled_time")
-            if not sched_time_str:
-                continue
             try:
                 # Parse scheduled time in ISO 8601 format
-                sched_time = datetime.fromisoformat(sched_time_str)
-            except ValueError:
-                self._logger.warning("Invalid scheduled_time format: %s", sched_time_str)
+                sched_time = datetime.fromisoformat(sched_time_str or "")
+            except (TypeError, ValueError):
+                # Mark it failed so that it leaves the due query window instead of being fetched on every run
+                self._logger.warning("Invalid scheduled_time format: %s (doc_id: %s)", sched_time_str, promo["doc_id"])
+                self._mark_failed(promo)
                 continue
 
             if sched_time <= now:
-                due_promotions.append((sched_time, promo))
+                oldest_promo = promo
+                break
 
-        if not due_promotions:
+        if oldest_promo is None:
             self._logger.info("No SNS promotions are due for posting.")
             return
 
-        # Sort by scheduled time, and pick the oldest one.
-        due_promotions.sort(key=lambda item: item[0])
-        _, oldest_promo = due_promotions[0]
-
         reference_path = oldest_promo["reference_path"]
         doc_id = oldest_promo["doc_id"]
         self._logger.info("Selected promotion to post. doc_id: %s, path: %s", doc_id, reference_path)
@@ -104,3 +105,10 @@ class AutoPostSnsUsecase:
             except Exception:
                 self._logger.exception("Failed to update status to failed in Firestore. doc_id: %s", doc_id)
             raise
+
+    def _mark_failed(self, promo: dict[str, Any]) -> None:
+        """Mark a promotion that can never be posted as failed."""
+        try:
+            self._firestore_manager.update_sns_promotion_status(promo["reference_path"], "failed")
+        except Exception:
+            self._logger.exception("Failed to update status to failed in Firestore. doc_id: %s", promo["doc_id"])
@@ -0,0 +1,287 @@
+"""Use case for regenerating transcripts and summaries of archived episodes with batch prediction."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Protocol
+
+from pydantic import ValidationError
+
+from domain.models import BatchPredictionRequest, BatchRequestKind, EpisodeObjectReference, Summary
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from domain.interfaces import BatchPredictionGateway, ObjectStorage
+    from domain.models import BatchPredictionResult
+    from services.firestore_manager import FirestoreManager
+
+
+class BackfillFeedManager(Protocol):
+    """Minimal interface required to rewrite archived episodes in the RSS feed."""
+
+    def list_episodes(self) -> list:  # type: ignore[type-arg]
+        """Return every episode item of the feed."""
+
+    def update_episodes(self, updates: dict) -> None:  # type: ignore[type-arg]
+        """Apply updates keyed by guid and rebuild the feed once."""
+
+    def get_rss_xml(self) -> str:
+        """Return serialized RSS XML."""
+
+
+class BackfillFeedManagerFactory(Protocol):
+    """Factory for RSS manager creation from source XML."""
+
+    def __call__(self, *, rss_xml: str) -> BackfillFeedManager:
+        """Build an RSS manager instance from XML string."""
+
+
+@dataclass(frozen=True)
+class BackfillEpisodesInput:
+    """Input parameters for the archive backfill.
+
+    Attributes:
+        source_uris: 再処理するエピソードの元音声 (gs://{bucket}/podcasts/.../source/{file})。
+        ai_model_id: バッチジョブで使うモデル ID。
+        r2_key_prefix: feed.xml を置いている R2 のキープレフィックス。
+        regenerate_transcripts: True の場合は文字起こしからやり直し、False の場合は Firestore の議事録を要約し直す。
+        job_label: バッチジョブの表示名と GCS の入出力パスに使うラベル。
+    """
+
+    source_uris: Sequence[str]
+    ai_model_id: str
+    r2_key_prefix: str
+    regenerate_transcripts: bool = True
+    job_label: str = "backfill"
+
+
+@dataclass
+class BackfillReport:
+    """Outcome of a backfill run, keyed by `{podcast_id}/{episode_id}`."""
+
+    succeeded: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    rss_updated: int = 0
+
+
+@dataclass
+class _BackfillEpisode:
+    ref: EpisodeObjectReference
+    source_uri: str
+    episode_number: int
+    transcript: str | None = None
+    summary: Summary | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.ref.podcast_id}/{self.ref.episode_id}"
+
+
+class BackfillEpisodesUsecase:
+    """Regenerates AI output for many episodes with batch jobs and writes it back in bulk."""
+
+    def __init__(
+        self,
+        *,
+        batch_gateway: BatchPredictionGateway,
+        firestore_manager: FirestoreManager,
+        object_storage: ObjectStorage,
+        rss_manager_factory: BackfillFeedManagerFactory,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """Initialize use case dependencies."""
+        self._batch_gateway = batch_gateway
+        self._firestore_manager = firestore_manager
+        self._object_storage = object_storage
+        self._rss_manager_factory = rss_manager_factory
+        self._logger = logger or logging.getLogger(__name__)
+
+    def run(self, request: BackfillEpisodesInput) -> BackfillReport:
+        """Run the transcript (optional) and summary batch jobs, then update Firestore and the RSS feed."""
+        report = BackfillReport()
+        episodes = self._load_episodes(request.source_uris, report)
+        job_suffix = datetime.now(UTC).strftime("%Y%m%d%H%M%S")
+
+        if request.regenerate_transcripts:
+            results = self._run_job(
+                [
+                    BatchPredictionRequest(
+                        key=episode.key, kind=BatchRequestKind.TRANSCRIPT, source_uri=episode.source_uri
+                    )
+                    for episode in episodes
+                ],
+                model_id=request.ai_model_id,
+                display_name=f"{request.job_label}-transcript-{job_suffix}",
+            )
+            for episode in episodes:
+                episode.transcript = self._result_text(results, episode.key, report)
+        else:
+            for episode in episodes:
+                transcript = self._firestore_manager.get_transcript(
+                    podcast_id=episode.ref.podcast_id,
+                    episode_id=episode.ref.episode_id,
+                )
+                if transcript:
+                    episode.transcript = transcript
+                else:
+                    report.failed[episode.key] = "No stored transcript"
+        episodes = [episode for episode in episodes if episode.transcript]
+
+        results = self._run_job(
+            [
+                BatchPredictionRequest(key=episode.key, kind=BatchRequestKind.SUMMARY, transcript=episode.transcript)
+                for episode in episodes
+            ],
+            model_id=request.ai_model_id,
+            display_name=f"{request.job_label}-summary-{job_suffix}",
+        )
+        for episode in episodes:
+            text = self._result_text(results, episode.key, report)
+            if text is None:
+                continue
+            try:
+                episode.summary = Summary.model_validate_json(_extract_json_object(text))
+            except ValidationError as err:
+                report.failed[episode.key] = f"Invalid summary JSON: {err.error_count()} errors"
+        episodes = [episode for episode in episodes if episode.summary is not None]
+
+        self._save_to_firestore(episodes, regenerate_transcripts=request.regenerate_transcripts)
+        report.rss_updated = self._update_feed(episodes, r2_key_prefix=request.r2_key_prefix)
+        report.succeeded = [episode.key for episode in episodes]
+        self._logger.info(
+            "Backfill finished: %d succeeded, %d failed, %d RSS items updated",
+            len(report.succeeded),
+            len(report.failed),
+            report.rss_updated,
+        )
+        for key, error in report.failed.items():
+            self._logger.warning("Backfill failed for %s: %s", key, error)
+        return report
+
+    def _load_episodes(self, source_uris: Sequence[str], report: BackfillReport) -> list[_BackfillEpisode]:
+        """Parse the source URIs and look up the stored episode numbers."""
+        refs: dict[str, tuple[EpisodeObjectReference, str]] = {}
+        for source_uri in source_uris:
+            object_path = source_uri.removeprefix("gs://").partition("/")[2]
+            try:
+                ref = EpisodeObjectReference.parse(object_path)
+            except ValueError as err:
+                report.failed[source_uri] = str(err)
+                continue
+            refs[f"{ref.podcast_id}/{ref.episode_id}"] = (ref, source_uri)
+
+        episodes: list[_BackfillEpisode] = []
+        for podcast_id in sorted({ref.podcast_id for ref, _ in refs.values()}):
+            episode_ids = [ref.episode_id for ref, _ in refs.values() if ref.podcast_id == podcast_id]
+            contents = self._firestore_manager.get_episode_contents(podcast_id=podcast_id, episode_ids=episode_ids)
+            for episode_id in episode_ids:
+                ref, source_uri = refs[f"{podcast_id}/{episode_id}"]
+                episode_number = contents.get(episode_id, {}).get("episode_number")
+                if not isinstance(episode_number, int):
+                    report.failed[f"{podcast_id}/{episode_id}"] = "Episode content with episode_number not found"
+                    continue
+                episodes.append(_BackfillEpisode(ref=ref, source_uri=source_uri, episode_number=episode_number))
+        self._logger.info("Backfilling %d episodes (%d skipped)", len(episodes), len(report.failed))
+        return episodes
+
+    def _run_job(
+        self,
+        requests: list[BatchPredictionRequest],
+        *,
+        model_id: str,
+        display_name: str,
+    ) -> dict[str, BatchPredictionResult]:
+        if not requests:
+            return {}
+        job_name = self._batch_gateway.submit(requests, model_id=model_id, display_name=display_name)
+        self._batch_gateway.wait(job_name)
+        return {result.key: result for result in self._batch_gateway.fetch_results(job_name)}
+
+    @staticmethod
+    def _result_text(results: dict[str, BatchPredictionResult], key: str, report: BackfillReport) -> str | None:
+        result = results.get(key)
+        if result is None:
+            report.failed[key] = "No batch result"
+            return None
+        if not result.ok:
+            report.failed[key] = result.error or "Empty response"
+            return None
+        return result.text
+
+    def _save_to_firestore(self, episodes: list[_BackfillEpisode], *, regenerate_transcripts: bool) -> None:
+        generated_at = datetime.now(UTC).isoformat()
+        for podcast_id in sorted({episode.ref.podcast_id for episode in episodes}):
+            updates = {}
+            for episode in episodes:
+                if episode.ref.podcast_id != podcast_id or episode.summary is None:
+                    continue
+                title = f"#{episode.episode_number} {episode.summary.title}"
+                updates[episode.ref.episode_id] = {
+                    "updated_at": generated_at,
+                    "transcript_summary": episode.summary.description,
+                    "ai_generated_meta": {
+                        "title": title,
+                        "description": episode.summary.description,
+                        "prompt_version": "v1",
+                        "generated_at": generated_at,
+                        "generation_mode": "batch",
+                    },
+                    "show_notes_summary": {
+                        "overview": episode.summary.description,
+                        "topics": [{"time": "00:00", "title": title}],
+                    },
+                }
+                if regenerate_transcripts and episode.transcript:
+                    self._firestore_manager.save_transcript_chunks(
+                        podcast_id=podcast_id,
+                        episode_id=episode.ref.episode_id,
+                        transcript=episode.transcript,
+                    )
+            self._firestore_manager.update_episode_contents(podcast_id=podcast_id, updates=updates)
+
+    def _update_feed(self, episodes: list[_BackfillEpisode], *, r2_key_prefix: str) -> int:
+        """Rewrite titles and descriptions of the backfilled episodes and upload the feed once."""
+        if not episodes:
+            return 0
+        feed_key = f"{r2_key_prefix}/feed.xml"
+        rss_manager = self._rss_manager_factory(rss_xml=self._object_storage.download_file(feed_key).decode("utf-8"))
+        guids_by_number = {
+            str(item.get("itunes_episode_number")): item.get("guid")
+            for item in rss_manager.list_episodes()
+            if item.get("itunes_episode_number") is not None
+        }
+
+        updates = {}
+        for episode in episodes:
+            guid = guids_by_number.get(str(episode.episode_number))
+            if guid is None or episode.summary is None:
+                self._logger.warning("Episode #%s is not in the RSS feed", episode.episode_number)
+                continue
+            updates[guid] = {
+                "title": f"#{episode.episode_number} {episode.summary.title}",
+                "description": episode.summary.description,
+                "itunes_summary": episode.summary.description,
+            }
+        if not updates:
+            return 0
+
+        rss_manager.update_episodes(updates)
+        self._object_storage.upload_file(
+            file_content=rss_manager.get_rss_xml().encode("utf-8"),
+            remote_key=feed_key,
+            content_type="application/rss+xml; charset=utf-8",
+            public=True,
+        )
+        return len(updates)
+
+
+def _extract_json_object(text: str) -> str:
+    """Strip anything (e.g. code fences) around the outermost JSON object."""
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end <= start:
+        return text
+    return text[start : end + 1]
@@ -0,0 +1,162 @@
+"""Use case for a long-lived worker that processes queued uploads with warm clients."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from domain.interfaces import EpisodeWorkQueue
+    from domain.models import EpisodeWorkItem
+    from usecases.process_podcast_workflow import ProcessPodcastWorkflow, ProcessPodcastWorkflowInput
+
+
+@dataclass(frozen=True)
+class EpisodeWorkerSettings:
+    """Settings for the episode worker.
+
+    Attributes:
+        max_concurrency: 同時に処理するエピソード数の上限。
+        idle_timeout_seconds: キューが空で処理中のエピソードもない状態がこの秒数続いたら終了する。
+        poll_interval_seconds: キューが空のときの取得間隔(秒)。
+        visibility_seconds: 取得した項目を他のワーカーから見えなくする秒数。これを過ぎても完了しない項目は
+            (ワーカーの異常終了とみなして) 再取得される。エピソード自体の二重処理は処理リースで防ぐ。
+        max_attempts: 失敗した項目を再投入する最大取得回数。取得の期限切れ (ワーカーの異常終了) による
+            再取得にも適用し、使い切った項目は failed にする。
+    """
+
+    max_concurrency: int = 2
+    idle_timeout_seconds: float = 300.0
+    poll_interval_seconds: float = 5.0
+    visibility_seconds: float = 3600.0
+    max_attempts: int = 3
+
+
+@dataclass
+class EpisodeWorkerReport:
+    """Counts of items handled by a worker run."""
+
+    processed: int = 0
+    failed: int = 0
+    duplicates: int = 0
+
+
+class EpisodeWorker:
+    """Pulls episode work items from a queue and runs the podcast workflow for each of them.
+
+    クライアントやキャッシュを持つ workflow はワーカーの生存期間中使い回すため、起動・認証・クライアント
+    生成の固定コストはワーカーごとに 1 回だけになる。
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        queue: EpisodeWorkQueue,
+        workflow: ProcessPodcastWorkflow,
+        workflow_input: ProcessPodcastWorkflowInput,
+        settings: EpisodeWorkerSettings | None = None,
+        logger: logging.Logger | None = None,
+        worker_id: str | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the worker.
+
+        workflow_input は全項目に共通の入力で、gcs_trigger_object_name は項目ごとに置き換える。
+        """
+        self._queue = queue
+        self._workflow = workflow
+        self._workflow_input = workflow_input
+        self._settings = settings or EpisodeWorkerSettings()
+        self._logger = logger or logging.getLogger(__name__)
+        self._worker_id = worker_id or uuid.uuid4().hex
+        self._clock = clock
+        self._stopping = threading.Event()
+
+    def stop(self) -> None:
+        """Stop claiming new items; run() returns once the items in progress have finished."""
+        self._stopping.set()
+
+    def run(self) -> EpisodeWorkerReport:
+        """Process items until stop() is called or the queue stays empty for idle_timeout_seconds."""
+        settings = self._settings
+        report = EpisodeWorkerReport()
+        running: set[Future[str]] = set()
+        idle_since = self._clock()
+        self._logger.info("Worker %s started (max_concurrency=%d)", self._worker_id, settings.max_concurrency)
+        with ThreadPoolExecutor(max_workers=settings.max_concurrency, thread_name_prefix="episode-worker") as pool:
+            while True:
+                if not self._stopping.is_set():
+                    for item in self._claim(settings.max_concurrency - len(running)):
+                        running.add(pool.submit(self._process, item))
+                        idle_since = self._clock()
+
+                if not running:
+                    if self._stopping.is_set():
+                        break
+                    if self._clock() - idle_since >= settings.idle_timeout_seconds:
+                        self._logger.info("Worker %s is idle; shutting down", self._worker_id)
+                        break
+                    # stop() で待機を打ち切れるよう、sleep ではなく Event で待つ
+                    self._stopping.wait(settings.poll_interval_seconds)
+                    continue
+
+                done, running = wait(running, timeout=settings.poll_interval_seconds, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcome = future.result()
+                    if outcome == "processed":
+                        report.processed += 1
+                    elif outcome == "duplicate":
+                        report.duplicates += 1
+                    else:
+                        report.failed += 1
+                if done:
+                    idle_since = self._clock()
+
+        self._logger.info(
+            "Worker %s finished: %d processed, %d failed, %d duplicates",
+            self._worker_id,
+            report.processed,
+            report.failed,
+            report.duplicates,
+        )
+        return report
+
+    def _claim(self, limit: int) -> list[EpisodeWorkItem]:
+        if limit < 1:
+            return []
+        try:
+            return self._queue.claim(
+                worker_id=self._worker_id,
+                limit=limit,
+                visibility_seconds=self._settings.visibility_seconds,
+                max_attempts=self._settings.max_attempts,
+            )
+        except Exception:  # noqa: BLE001 - キューに一時的に接続できなくても次のポーリングで再試行する
+            self._logger.warning("Failed to claim work items", exc_info=True)
+            return []
+
+    def _process(self, item: EpisodeWorkItem) -> str:
+        self._logger.info("Processing work item %s: %s (attempt %d)", item.item_id, item.object_name, item.attempts)
+        try:
+            result = self._workflow.run(replace(self._workflow_input, gcs_trigger_object_name=item.object_name))
+        except Exception as err:  # noqa: BLE001 - 失敗はワークフロー側で記録・通知済み。ワーカーは次の項目へ進む
+            retry = item.attempts < self._settings.max_attempts
+            error_message = f"{type(err).__name__}: {err}"
+            self._logger.warning("Work item %s failed (retry=%s): %s", item.item_id, retry, error_message)
+            self._settle(lambda: self._queue.fail(item.item_id, error_message=error_message, retry=retry))
+            return "failed"
+        self._settle(lambda: self._queue.complete(item.item_id))
+        return "processed" if result.claimed else "duplicate"
+
+    def _settle(self, update: Callable[[], None]) -> None:
+        try:
+            update()
+        except Exception:  # noqa: BLE001 - 反映できなかった項目は可視性タイムアウト後に再取得される
+            self._logger.warning("Failed to update the work queue", exc_info=True)
@@ -0,0 +1,267 @@
+"""Use case for processing many uploaded source objects in one job execution."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from domain.interfaces import ObjectStorage
+    from usecases.process_podcast_workflow import (
+        DeferredEpisodeCompletion,
+        PodcastFeedManager,
+        PodcastFeedManagerFactory,
+        ProcessPodcastWorkflow,
+        ProcessPodcastWorkflowInput,
+    )
+
+
+@dataclass(frozen=True)
+class ProcessPodcastBatchInput:
+    """Input parameters for a batch run.
+
+    Attributes:
+        workflow: 各エピソードに共通のワークフロー入力。gcs_trigger_object_name はエピソードごとに置き換える。
+        object_names: 処理するソース音声のオブジェクト名 (workflow.gcs_bucket 内)。成功したエピソードにこの順で番号を割り当てる。
+        max_parallel_episodes: 同時に処理するエピソード数の上限。
+    """
+
+    workflow: ProcessPodcastWorkflowInput
+    object_names: Sequence[str]
+    max_parallel_episodes: int = 2
+
+
+@dataclass(frozen=True)
+class EpisodeBatchResult:
+    """Outcome of one episode of a batch run.
+
+    claimed is False when another run was processing it or it was already completed; episode_number is 0
+    when the episode was not added to the feed.
+    """
+
+    object_name: str
+    episode_number: int
+    succeeded: bool
+    error: str | None = None
+    claimed: bool = True
+
+
+@dataclass
+class ProcessPodcastBatchReport:
+    """Per-episode results of a batch run and whether feed.xml was published."""
+
+    results: list[EpisodeBatchResult] = field(default_factory=list)
+    feed_published: bool = False
+
+    @property
+    def failed(self) -> list[EpisodeBatchResult]:
+        """Return the episodes that failed."""
+        return [result for result in self.results if not result.succeeded]
+
+
+class BatchEpisodeFeed:
+    """Shared RSS feed for a batch run: downloaded once, updated in memory, uploaded once.
+
+    エピソード番号は入力順に「既存のエピソード数 + 1」から、最後まで成功したエピソードだけに
+    連番で割り当てる。番号の予約は入力順で前のエピソードがすべて終わる (成功するか失敗する)
+    まで待つため、途中のエピソードが失敗しても番号は欠けず、後から再実行したエピソードが公開済みの
+    番号と衝突することもない。文字起こしと音声変換は待たずに並列に進む。
+    RSS の項目は成功として settle されたエピソードの分だけ publish() でフィードに追加する
+    (RSS の後のステップで失敗したエピソードの項目は公開しない)。
+    """
+
+    def __init__(
+        self,
+        *,
+        object_storage: ObjectStorage,
+        rss_manager_factory: PodcastFeedManagerFactory,
+        r2_key_prefix: str,
+        object_names: Sequence[str],
+    ) -> None:
+        """Initialize the feed; feed.xml is downloaded on first use."""
+        self._object_storage = object_storage
+        self._rss_manager_factory = rss_manager_factory
+        self._feed_key = f"{r2_key_prefix}/feed.xml"
+        self._object_names = list(object_names)
+        self._positions = {name: index for index, name in enumerate(self._object_names)}
+        self._rss_manager: PodcastFeedManager | None = None
+        self._base_episode_count = 0
+        self._reserved: dict[str, int] = {}
+        self._items: dict[str, dict] = {}  # type: ignore[type-arg]
+        self._published: dict[str, int] = {}
+        self._settled: set[str] = set()
+        self._condition = threading.Condition()
+
+    def episode_number(self, object_path: str) -> int:
+        """Reserve the next episode number once every earlier source object has settled.
+
+        Raises:
+            KeyError: object_path がこのバッチの入力に含まれていない場合。
+        """
+        earlier = self._object_names[: self._positions[object_path]]
+        with self._condition:
+            self._condition.wait_for(lambda: self._settled.issuperset(earlier))
+            self._load()
+            number = self._base_episode_count + sum(name in self._published for name in earlier) + 1
+            self._reserved[object_path] = number
+            return number
+
+    def add_episode(self, object_path: str, new_episode_data: dict) -> None:  # type: ignore[type-arg]
+        """Hold the episode item until the source object settles as succeeded."""
+        with self._condition:
+            self._items[object_path] = new_episode_data
+
+    def settle(self, object_path: str, *, succeeded: bool) -> None:
+        """Mark the source object as finished.
+
+        成功した場合は予約した番号が確定する。失敗した場合は RSS の項目を破棄し、番号は次のエピソードが使う。
+        """
+        with self._condition:
+            if succeeded and object_path in self._items:
+                self._published[object_path] = self._reserved[object_path]
+            else:
+                self._items.pop(object_path, None)
+            self._settled.add(object_path)
+            self._condition.notify_all()
+
+    def published_number(self, object_path: str) -> int | None:
+        """Return the episode number of the source object if its item will be published."""
+        with self._condition:
+            return self._published.get(object_path)
+
+    def publish(self) -> bool:
+        """Add the items of the succeeded episodes in number order and upload feed.xml; return whether uploaded."""
+        with self._condition:
+            if not self._published:
+                return False
+            rss_manager = self._load()
+            for object_path in sorted(self._published, key=self._published.__getitem__):
+                rss_manager.add_episode(self._items[object_path])
+            self._object_storage.upload_file(
+                file_content=rss_manager.get_rss_xml().encode("utf-8"),
+                remote_key=self._feed_key,
+                content_type="application/rss+xml; charset=utf-8",
+                public=True,
+            )
+            return True
+
+    def _load(self) -> PodcastFeedManager:
+        if self._rss_manager is None:
+            rss_feed_bytes = self._object_storage.download_file(self._feed_key)
+            self._rss_manager = self._rss_manager_factory(rss_xml=rss_feed_bytes.decode("utf-8"))
+            self._base_episode_count = self._rss_manager.get_total_episodes()
+        return self._rss_manager
+
+
+class ProcessPodcastBatchUsecase:
+    """Runs the podcast workflow for many source objects with shared clients and one feed upload."""
+
+    def __init__(
+        self,
+        *,
+        workflow: ProcessPodcastWorkflow,
+        object_storage: ObjectStorage,
+        rss_manager_factory: PodcastFeedManagerFactory,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """Initialize use case dependencies.
+
+        workflow は全エピソードで共有する (クライアントやモデル呼び出しのレート制限も共有される)。
+        """
+        self._workflow = workflow
+        self._object_storage = object_storage
+        self._rss_manager_factory = rss_manager_factory
+        self._logger = logger or logging.getLogger(__name__)
+
+    def run(self, request: ProcessPodcastBatchInput) -> ProcessPodcastBatchReport:
+        """Process every object, then publish feed.xml once with the episodes that succeeded.
+
+        失敗したエピソードは他のエピソードの処理を止めず、レポートに記録する。
+        """
+        object_names = list(dict.fromkeys(request.object_names))
+        feed = BatchEpisodeFeed(
+            object_storage=self._object_storage,
+            rss_manager_factory=self._rss_manager_factory,
+            r2_key_prefix=request.workflow.r2_key_prefix,
+            object_names=object_names,
+        )
+        report = ProcessPodcastBatchReport()
+        if not object_names:
+            return report
+
+        self._logger.info(
+            "Batch: processing %d episodes with up to %d in parallel", len(object_names), request.max_parallel_episodes
+        )
+        with ThreadPoolExecutor(max_workers=max(1, min(request.max_parallel_episodes, len(object_names)))) as pool:
+            processed = list(pool.map(lambda name: self._process(request, name, feed), object_names))
+        report.results = [result for result, _ in processed]
+        completions = {index: completion for index, (_, completion) in enumerate(processed) if completion is not None}
+
+        try:
+            report.feed_published = feed.publish()
+        except Exception as err:  # noqa: BLE001 - 公開できなかったエピソードを失敗として記録する
+            self._logger.exception("Failed to publish feed.xml")
+            for index, completion in completions.items():
+                completion.fail(err)
+                report.results[index] = self._failed(report.results[index], err, published=False)
+        else:
+            # 完了の記録と成功通知は feed.xml を公開してから行う (公開前に失敗したら再処理できるように)
+            for index, completion in completions.items():
+                try:
+                    completion.complete()
+                except Exception as err:  # noqa: BLE001 - 失敗はワークフロー側で記録・通知済み
+                    self._logger.exception("Failed to mark %s completed", report.results[index].object_name)
+                    report.results[index] = self._failed(report.results[index], err, published=True)
+        for result in report.results:
+            self._logger.info(
+                "Batch result: #%s %s %s%s",
+                result.episode_number,
+                result.object_name,
+                ("succeeded" if result.claimed else "skipped (processing elsewhere or completed)")
+                if result.succeeded
+                else "failed",
+                f" ({result.error})" if result.error else "",
+            )
+        self._logger.info(
+            "Batch finished: %d succeeded, %d failed, feed published: %s",
+            len(report.results) - len(report.failed),
+            len(report.failed),
+            report.feed_published,
+        )
+        return report
+
+    def _process(
+        self, request: ProcessPodcastBatchInput, object_name: str, feed: BatchEpisodeFeed
+    ) -> tuple[EpisodeBatchResult, DeferredEpisodeCompletion | None]:
+        episode_input = replace(request.workflow, gcs_trigger_object_name=object_name)
+        succeeded = False
+        try:
+            result = self._workflow.run(episode_input, shared_feed=feed)
+            succeeded = True
+        except Exception as err:  # noqa: BLE001 - 失敗はワークフロー側で記録・通知済み。残りのエピソードは続ける
+            return EpisodeBatchResult(
+                object_name=object_name, episode_number=0, succeeded=False, error=f"{type(err).__name__}: {err}"
+            ), None
+        finally:
+            # 後続のエピソードの番号予約を進める (失敗したエピソードの項目と番号は破棄し、次のエピソードが使う)
+            feed.settle(object_name, succeeded=succeeded)
+        return EpisodeBatchResult(
+            object_name=object_name,
+            episode_number=feed.published_number(object_name) or 0,
+            succeeded=True,
+            claimed=result.claimed,
+        ), result.completion
+
+    @staticmethod
+    def _failed(result: EpisodeBatchResult, err: Exception, *, published: bool) -> EpisodeBatchResult:
+        return replace(
+            result,
+            episode_number=result.episode_number if published else 0,
+            succeeded=False,
+            error=f"{type(err).__name__}: {err}",
+        )
@@ -4,18 +4,37 @@ from __future__ import annotations
 
 import io
 import mimetypes
-from dataclasses import dataclass
+import tempfile
+import threading
+import uuid
+from contextlib import AbstractContextManager, ExitStack, nullcontext
+from dataclasses import asdict, dataclass, field, replace
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import TYPE_CHECKING, Protocol
+from typing import TYPE_CHECKING, Any, Protocol, Self
 
-from domain.models import EpisodeObjectReference
+from domain.interfaces import EpisodeLeaseLostError
+from domain.models import EpisodeObjectReference, SnsPromotionRecord, SnsPromotionsResponse, Summary
+from usecases.step_graph import Step, StepGraph
 
 if TYPE_CHECKING:
     import logging
+    from collections.abc import Callable, Mapping
 
-    from domain.interfaces import BlobSource, EpisodeRepository, NotificationGateway, ObjectStorage, TranscriptProvider
-    from services.firestore_manager import FirestoreManager
+    from domain.interfaces import (
+        BlobSource,
+        EpisodeRepository,
+        MemoryMonitor,
+        NotificationGateway,
+        ObjectStorage,
+        Tracer,
+        TraceSpan,
+        TranscriptProvider,
+        WorkflowCheckpointStore,
+    )
+    from services.firestore_manager import AsyncFirestoreManager, FirestoreManager
+
+AUDIO_UPLOAD_MIME_TYPE = "audio/mpeg"
 
 
 class PodcastFeedManager(Protocol):
@@ -38,6 +57,16 @@ class PodcastFeedManagerFactory(Protocol):
         """Build an RSS manager instance from XML string."""
 
 
+class SharedEpisodeFeed(Protocol):
+    """RSS feed shared by several workflow runs and published once by the caller (batch mode)."""
+
+    def episode_number(self, object_path: str) -> int:
+        """Return the episode number reserved for the source object."""
+
+    def add_episode(self, object_path: str, new_episode_data: dict) -> None:  # type: ignore[type-arg]
+        """Queue the source object's episode item for the feed that will be published later."""
+
+
 class AudioConverterGateway(Protocol):
     """Converts source audio bytes into MP3 bytes."""
 
@@ -52,6 +81,42 @@ class AudioInfoReader(Protocol):
         """Return [size_bytes, duration_str]."""
 
 
+class AudioFileConverter(Protocol):
+    """Converts a source audio file into an MP3 file without loading it into memory."""
+
+    def __call__(self, source_path: Path, source_suffix: str, destination_path: Path) -> None:
+        """Write the MP3 encoding of source_path to destination_path."""
+
+
+class AudioFileInfoReader(Protocol):
+    """Reads file size and duration information from an audio file."""
+
+    def __call__(self, file_path: Path) -> list:
+        """Return [size_bytes, duration_str]."""
+
+
+@dataclass(frozen=True)
+class MemoryBudget:
+    """Settings of the memory-budgeted execution mode.
+
+    音声はメモリ上のバイト列ではなく一時ファイル経由でダウンロード・変換・アップロードし、
+    各ファイルは使い終わった時点で削除する。
+
+    Attributes:
+        limit_bytes: メモリ予算 (バイト)。ステップ実行中のピーク RSS がこれを超えると警告する。
+        audio_file_converter: ソース音声ファイルを MP3 ファイルに変換する関数。
+        audio_file_info_reader: MP3 ファイルのサイズと再生時間を返す関数。
+        memory_monitor: ステップごとのピーク RSS を計測する。None の場合は計測しない。
+        temp_dir: 一時ファイルを置くディレクトリ。None の場合はシステムの既定。
+    """
+
+    limit_bytes: int
+    audio_file_converter: AudioFileConverter
+    audio_file_info_reader: AudioFileInfoReader
+    memory_monitor: MemoryMonitor | None = None
+    temp_dir: str | None = None
+
+
 @dataclass(frozen=True)
 class ProcessPodcastWorkflowInput:
     """Input parameters for podcast processing workflow."""
@@ -67,6 +132,184 @@ class ProcessPodcastWorkflowInput:
     sns_promotion_count: int = 3
 
 
+@dataclass(frozen=True)
+class ProcessPodcastWorkflowResult:
+    """Steps executed by a run and steps skipped because a checkpoint already covered them.
+
+    claimed が False の場合は別の実行がエピソードを処理中だったため、何も実行していない。
+    peak_rss_bytes はメモリ予算モードで計測した、実行したステップごとのピーク RSS。
+    completion は shared_feed を渡した実行でだけ設定され、フィードの公開後に呼び出し元が完了させる。
+    """
+
+    executed_steps: tuple[str, ...]
+    skipped_steps: tuple[str, ...]
+    claimed: bool = True
+    peak_rss_bytes: dict[str, int] = field(default_factory=dict)
+    completion: DeferredEpisodeCompletion | None = None
+
+
+class DeferredEpisodeCompletion:
+    """Completion of a batch episode that waits until the shared feed containing it is published.
+
+    complete() か fail() のどちらかを 1 回だけ呼ぶ。それまではエピソードの処理リースを延長し続ける。
+    """
+
+    def __init__(
+        self,
+        *,
+        complete: Callable[[], None],
+        fail: Callable[[Exception], None],
+        release: Callable[[], None],
+    ) -> None:
+        """Initialize with the workflow's completion and failure handlers and the lease release."""
+        self._complete = complete
+        self._fail = fail
+        self._release = release
+
+    def complete(self) -> None:
+        """Mark the episode completed and send the success notification; on error the episode is marked failed."""
+        try:
+            self._complete()
+        except Exception as err:
+            self._fail(err)
+            raise
+        finally:
+            self._release()
+
+    def fail(self, error: Exception) -> None:
+        """Mark the episode failed because the feed could not be published."""
+        try:
+            self._fail(error)
+        finally:
+            self._release()
+
+
+@dataclass(frozen=True)
+class _FeedState:
+    # チェックポイントから復元した場合は None。RSS 更新時にフィードを読み込み直す
+    rss_manager: PodcastFeedManager | None
+    episode_number: int
+
+
+@dataclass(frozen=True)
+class _GeneratedSummary:
+    summary: Summary
+    sns_promotions: SnsPromotionsResponse | None
+
+
+@dataclass(frozen=True)
+class _ConvertedAudio:
+    file_size_bytes: int
+    duration_str: str
+    # メモリ予算モードでは mp3_path (一時ファイル)、それ以外は mp3_bytes のどちらか一方を持つ
+    mp3_bytes: bytes | None = None
+    mp3_path: Path | None = None
+
+
+@dataclass(frozen=True)
+class _UploadedAudio:
+    remote_key: str
+    public_url: str
+    file_size_bytes: int
+    duration_str: str
+
+
+@dataclass(frozen=True)
+class _PlannedPromotion:
+    # 再開時に同じドキュメントを上書きするよう、ID は生成時に決めてチェックポイントに含める
+    promotion_id: str
+    message: str
+    hashtags: list[str]
+
+
+class _UntracedSpan:
+    """Span used when no tracer is configured; every call is a no-op."""
+
+    def set_attribute(self, key: str, value: str | float | bool) -> None:  # noqa: FBT001
+        pass
+
+    def add_bytes(self, size: int) -> None:
+        pass
+
+
+_UNTRACED_SPAN = _UntracedSpan()
+
+
+class _LeaseHeartbeat:
+    """Renews the episode processing lease in the background while the workflow runs.
+
+    延長に失敗した (別の実行にリースを奪われた) ことは ensure_held() で検出でき、公開系のステップの
+    直前に呼んで二重公開を防ぐ。
+    """
+
+    def __init__(
+        self,
+        *,
+        repository: EpisodeRepository,
+        episode_ref: EpisodeObjectReference,
+        owner: str,
+        lease_seconds: float,
+        logger: logging.Logger,
+    ) -> None:
+        self._repository = repository
+        self._episode_ref = episode_ref
+        self._owner = owner
+        self._lease_seconds = lease_seconds
+        self._logger = logger
+        self._stopped = threading.Event()
+        self._lost = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="episode-lease-heartbeat", daemon=True)
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    @property
+    def owner(self) -> str:
+        """The run ID that holds the lease."""
+        return self._owner
+
+    @property
+    def lost(self) -> bool:
+        """Whether a renewal found that another run now holds the lease."""
+        return self._lost.is_set()
+
+    def ensure_held(self, action: str) -> None:
+        """Raise EpisodeLeaseLostError if the lease was lost before running action."""
+        if self._lost.is_set():
+            msg = (
+                f"Lost the processing lease of episode {self._episode_ref.podcast_id}/{self._episode_ref.episode_id}"
+                f" to another run; aborting before {action}"
+            )
+            raise EpisodeLeaseLostError(msg)
+
+    def _run(self) -> None:
+        # リース期間の 1/3 ごとに延長し、1 回失敗してもリースが切れる前に再試行できるようにする
+        while not self._stopped.wait(self._lease_seconds / 3):
+            try:
+                renewed = self._repository.renew_lease(
+                    podcast_id=self._episode_ref.podcast_id,
+                    episode_id=self._episode_ref.episode_id,
+                    owner=self._owner,
+                    lease_seconds=self._lease_seconds,
+                )
+            except Exception:  # noqa: BLE001
+                self._logger.warning("Failed to renew the episode processing lease", exc_info=True)
+                continue
+            if not renewed:
+                self._logger.error(
+                    "Lost the processing lease of episode %s/%s to another run",
+                    self._episode_ref.podcast_id,
+                    self._episode_ref.episode_id,
+                )
+                self._lost.set()
+                return
+
+
 class ProcessPodcastWorkflow:
     """Coordinates podcast processing from transcript generation to RSS update."""
 
@@ -83,8 +326,29 @@ class ProcessPodcastWorkflow:
         firestore_manager: FirestoreManager | None,
         episode_repository: EpisodeRepository,
         logger: logging.Logger,
+        combine_summary_and_promotions: bool = False,
+        max_parallel_steps: int = 4,
+        checkpoint_store: WorkflowCheckpointStore | None = None,
+        tracer: Tracer | None = None,
+        lease_seconds: float = 900.0,
+        memory_budget: MemoryBudget | None = None,
+        async_firestore_manager: AsyncFirestoreManager | None = None,
     ) -> None:
-        """Initialize use case dependencies."""
+        """Initialize use case dependencies.
+
+        combine_summary_and_promotions を有効にすると、Firestore に SNS 投稿を保存する場合に
+        要約と SNS 投稿文を 1 回のモデル呼び出しでまとめて生成する。
+        max_parallel_steps は同時に実行するステップ数の上限で、1 にすると逐次実行になる。
+        checkpoint_store を指定すると、各ステップの出力をエピソード ID ごとに保存し、
+        リトライ時は未完了の最初のステップから再開する。
+        tracer を指定すると、各ステップ (フィード取得・文字起こし・要約・音声の取得/変換/解析/アップロード・
+        RSS・Firestore) を入れ子のスパンとして所要時間・バイト数・成否を記録する。
+        lease_seconds は Cloud SQL 上の処理リースの期間で、実行中はその 1/3 ごとに延長する。
+        別の実行がリースを保持しているエピソード (Eventarc の重複配信など) は処理せずに終了する。
+        memory_budget を指定すると、音声を一時ファイル経由で扱い、ステップごとのピーク RSS を記録する。
+        async_firestore_manager を firestore_manager と併せて指定すると、公開後のエピソード本文・文字起こし・
+        SNS 投稿文を非同期クライアントで同時に書き込む (SNS 投稿文は 1 バッチ)。
+        """
         self._transcript_provider = transcript_provider
         self._object_storage = object_storage
         self._blob_source = blob_source
@@ -95,184 +359,668 @@ class ProcessPodcastWorkflow:
         self._firestore_manager = firestore_manager
         self._episode_repository = episode_repository
         self._logger = logger
+        self._combine_summary_and_promotions = combine_summary_and_promotions
+        self._max_parallel_steps = max_parallel_steps
+        self._checkpoint_store = checkpoint_store
+        self._tracer = tracer
+        self._lease_seconds = lease_seconds
+        self._memory_budget = memory_budget
+        self._async_firestore_manager = async_firestore_manager
 
-    def run(self, request: ProcessPodcastWorkflowInput) -> None:
-        """Execute podcast workflow and emit notifications for success/failure."""
+    def run(
+        self,
+        request: ProcessPodcastWorkflowInput,
+        *,
+        shared_feed: SharedEpisodeFeed | None = None,
+    ) -> ProcessPodcastWorkflowResult:
+        """Execute podcast workflow and emit notifications for success/failure.
+
+        文字起こし・要約の系統と、音声の変換・アップロードの系統は互いに依存しないため並行に実行し、
+        RSS と Firestore の更新で合流する。
+        shared_feed を渡すと feed.xml のダウンロード・アップロードは行わず、エピソード番号の取得と
+        RSS への追加を shared_feed に委ねる (フィードの公開は呼び出し元が最後に 1 回だけ行う)。
+        この場合、完了の記録と成功通知は結果の completion で公開後に行う。
+        """
         self._logger.info("GCS Bucket: %s, File: %s", request.gcs_bucket, request.gcs_trigger_object_name)
         self._logger.info("DEBUG: Processing GCS Object Path: %s", request.gcs_trigger_object_name)
         episode_ref = EpisodeObjectReference.parse(request.gcs_trigger_object_name)
-        gcs_path = Path(request.gcs_trigger_object_name)
         audio_source_mime_type = mimetypes.guess_type(request.gcs_trigger_object_name)[0] or "audio/x-m4a"
         self._logger.info("Detected mime type: %s", audio_source_mime_type)
 
+        lease_owner = uuid.uuid4().hex
+        completion: DeferredEpisodeCompletion | None = None
+        try:
+            with (
+                self._span(
+                    "workflow", podcast_id=episode_ref.podcast_id, episode_id=episode_ref.episode_id
+                ) as workflow_span,
+                ExitStack() as lease_scope,
+            ):
+                claimed = self._episode_repository.claim_processing(
+                    podcast_id=episode_ref.podcast_id,
+                    episode_id=episode_ref.episode_id,
+                    source_audio_path=episode_ref.object_path,
+                    owner=lease_owner,
+                    lease_seconds=self._lease_seconds,
+                )
+                workflow_span.set_attribute("claimed", claimed)
+                if not claimed:
+                    self._logger.info(
+                        "Episode %s/%s is being processed by another run or already completed; skipping this delivery",
+                        episode_ref.podcast_id,
+                        episode_ref.episode_id,
+                    )
+                    return ProcessPodcastWorkflowResult(executed_steps=(), skipped_steps=(), claimed=False)
+                peak_rss_bytes: dict[str, int] = {}
+                lease = lease_scope.enter_context(
+                    _LeaseHeartbeat(
+                        repository=self._episode_repository,
+                        episode_ref=episode_ref,
+                        owner=lease_owner,
+                        lease_seconds=self._lease_seconds,
+                        logger=self._logger,
+                    )
+                )
+                with self._audio_workdir() as workdir:
+                    graph = StepGraph(
+                        [
+                            self._lease_guarded(step, lease) if step.name in _LEASE_GUARDED_STEPS else step
+                            for step in self._build_steps(request, episode_ref, shared_feed, workdir, peak_rss_bytes)
+                        ],
+                        logger=self._logger,
+                    )
+                    results = graph.run(
+                        max_workers=self._max_parallel_steps,
+                        completed=self._load_checkpoints(episode_ref, deferred_feed=shared_feed is not None),
+                        on_step_completed=lambda step, value: self._save_checkpoint(
+                            episode_ref, step, value, deferred_feed=shared_feed is not None
+                        ),
+                    )
+                if graph.skipped:
+                    self._logger.info("Resumed from checkpoints; skipped steps: %s", ", ".join(graph.skipped))
+                workflow_span.set_attribute("skipped_steps", len(graph.skipped))
+                if peak_rss_bytes:
+                    workflow_span.set_attribute("peak_rss_bytes", max(peak_rss_bytes.values()))
+                summary: Summary = results["summary"].summary
+                upload: _UploadedAudio = results["upload"]
+
+                if shared_feed is None:
+                    self._complete(episode_ref, lease, summary, upload)
+                else:
+                    # フィードの公開前に完了扱いにすると、公開に失敗したエピソードを再処理できなくなる。
+                    # 公開まではリースの延長を続け、完了・通知・チェックポイント削除は呼び出し元に委ねる
+                    completion = DeferredEpisodeCompletion(
+                        complete=lambda: self._complete(episode_ref, lease, summary, upload),
+                        fail=lambda err: self._handle_failure(episode_ref, lease_owner, err),
+                        release=lease_scope.pop_all().close,
+                    )
+        except Exception as err:
+            self._logger.exception("Error occurred during podcast processing:")
+            self._handle_failure(episode_ref, lease_owner, err)
+            raise
+        return ProcessPodcastWorkflowResult(
+            executed_steps=tuple(name for name in graph.order if name not in graph.skipped),
+            skipped_steps=tuple(graph.skipped),
+            peak_rss_bytes=peak_rss_bytes,
+            completion=completion,
+        )
+
+    def _complete(
+        self,
+        episode_ref: EpisodeObjectReference,
+        lease: _LeaseHeartbeat,
+        summary: Summary,
+        upload: _UploadedAudio,
+    ) -> None:
+        lease.ensure_held("mark_completed")
+        self._episode_repository.mark_completed(
+            podcast_id=episode_ref.podcast_id,
+            episode_id=episode_ref.episode_id,
+            owner=lease.owner,
+            title=summary.title,
+            description=summary.description,
+            audio_url=upload.public_url,
+            duration_seconds=_duration_to_seconds(upload.duration_str),
+        )
+        self._logger.info("\n## Notifying Discord (Success)... ##")
+        self._notifier.send_discord_message(
+            message=f"Podcast Episode Published Successfully:\nTitle: {summary.title}\nURL: {upload.public_url}"
+        )
+        self._clear_checkpoints(episode_ref)
+
+    def _handle_failure(self, episode_ref: EpisodeObjectReference, lease_owner: str, err: Exception) -> None:
+        # リースを奪われた場合、エピソードの状態は新しい所有者が更新するので上書きしない
+        if not isinstance(err, EpisodeLeaseLostError):
+            try:
+                self._episode_repository.mark_failed(
+                    podcast_id=episode_ref.podcast_id,
+                    episode_id=episode_ref.episode_id,
+                    owner=lease_owner,
+                    error_message=str(err),
+                )
+            except EpisodeLeaseLostError:
+                self._logger.warning("Another run took over the episode; leaving its state to that run")
+            except Exception:  # noqa: BLE001
+                self._logger.exception("Failed to persist episode failure state")
+        self._notifier.send_discord_message(message=f"Podcast Processing Failed:\nError: {err}")
+
+    def _span(self, name: str, **attributes: str | float | bool) -> AbstractContextManager[TraceSpan]:
+        if self._tracer is None:
+            return nullcontext(_UNTRACED_SPAN)
+        return self._tracer.span(name, **attributes)
+
+    def _audio_workdir(self) -> AbstractContextManager[str | None]:
+        if self._memory_budget is None:
+            return nullcontext()
+        return tempfile.TemporaryDirectory(prefix="podcast-audio-", dir=self._memory_budget.temp_dir)
+
+    @staticmethod
+    def _lease_guarded(step: Step, lease: _LeaseHeartbeat) -> Step:
+        """Wrap the step so that it aborts instead of publishing when the lease was lost."""
+
+        def run(results: Mapping[str, Any]) -> Any:  # noqa: ANN401
+            lease.ensure_held(step.name)
+            return step.run(results)
+
+        return replace(step, run=run)
+
+    def _measured(self, step: Step, peak_rss_bytes: dict[str, int]) -> Step:
+        """Wrap the step so that the peak RSS while it runs is recorded."""
+        if self._memory_budget is None or self._memory_budget.memory_monitor is None:
+            return step
+        limit_bytes = self._memory_budget.limit_bytes
+        monitor = self._memory_budget.memory_monitor
+
+        def run(results: Mapping[str, Any]) -> Any:  # noqa: ANN401
+            with monitor.track() as window:
+                value = step.run(results)
+            peak_rss_bytes[step.name] = window.peak_bytes
+            self._logger.info("Step %s peak RSS: %.1f MiB", step.name, window.peak_bytes / 2**20)
+            if window.peak_bytes > limit_bytes:
+                self._logger.warning(
+                    "Step %s exceeded the memory budget: %.1f MiB > %.1f MiB",
+                    step.name,
+                    window.peak_bytes / 2**20,
+                    limit_bytes / 2**20,
+                )
+            return value
+
+        return replace(step, run=run)
+
+    def _load_checkpoints(self, episode_ref: EpisodeObjectReference, *, deferred_feed: bool) -> dict[str, Any]:
+        if self._checkpoint_store is None:
+            return {}
+        steps = _BATCH_CHECKPOINT_STEPS if deferred_feed else _CHECKPOINT_STEPS
+        try:
+            saved = self._checkpoint_store.load(
+                podcast_id=episode_ref.podcast_id,
+                episode_id=episode_ref.episode_id,
+                source_audio_path=episode_ref.object_path,
+            )
+            return {step: _load_checkpoint(step, value) for step, value in saved.items() if step in steps}
+        except Exception:  # noqa: BLE001 - チェックポイントが読めない場合は最初から実行する
+            self._logger.warning("Failed to load workflow checkpoints; starting from the beginning", exc_info=True)
+            return {}
+
+    def _save_checkpoint(
+        self,
+        episode_ref: EpisodeObjectReference,
+        step: str,
+        value: object,
+        *,
+        deferred_feed: bool,
+    ) -> None:
+        if self._checkpoint_store is None or step not in _CHECKPOINT_STEPS:
+            return
+        if deferred_feed and step not in _BATCH_CHECKPOINT_STEPS:
+            # バッチ実行ではエピソード番号が前のエピソードの結果で決まるため、番号に依存するステップは毎回やり直す
+            return
         try:
-            self._episode_repository.mark_processing(
+            self._checkpoint_store.save(
                 podcast_id=episode_ref.podcast_id,
                 episode_id=episode_ref.episode_id,
                 source_audio_path=episode_ref.object_path,
+                step=step,
+                value=_dump_checkpoint(step, value),
             )
+        except Exception:  # noqa: BLE001 - 保存に失敗しても処理は続け、次のリトライでそのステップをやり直す
+            self._logger.warning("Failed to save checkpoint for step %s", step, exc_info=True)
+
+    def _clear_checkpoints(self, episode_ref: EpisodeObjectReference) -> None:
+        if self._checkpoint_store is None:
+            return
+        try:
+            self._checkpoint_store.clear(podcast_id=episode_ref.podcast_id, episode_id=episode_ref.episode_id)
+        except Exception:  # noqa: BLE001
+            self._logger.warning("Failed to clear workflow checkpoints", exc_info=True)
+
+    def _build_steps(
+        self,
+        request: ProcessPodcastWorkflowInput,
+        episode_ref: EpisodeObjectReference,
+        shared_feed: SharedEpisodeFeed | None,
+        workdir: str | None,
+        peak_rss_bytes: dict[str, int],
+    ) -> list[Step]:
+        """Return the workflow steps and their dependencies."""
+        steps = [
+            Step("feed", lambda _: self._reserve_episode(request, shared_feed)),
+            Step("transcript", lambda _: self._generate_transcript(request)),
+            Step(
+                "summary",
+                lambda results: self._generate_summary(request, results["feed"], results["transcript"]),
+                depends_on=("feed", "transcript"),
+            ),
+            # MP3 はアップロードが終わった時点で破棄する (メモリ予算モードでは一時ファイルを削除済み)
+            Step("audio", lambda _: self._convert_audio(request, workdir), release_after_use=True),
+            Step(
+                "upload",
+                lambda results: self._upload_audio(request, results["feed"], results["audio"]),
+                depends_on=("feed", "audio"),
+            ),
+            Step(
+                "rss",
+                lambda results: self._publish_feed(
+                    request, results["feed"], results["summary"], results["upload"], shared_feed=shared_feed
+                ),
+                depends_on=("feed", "summary", "upload"),
+            ),
+        ]
+        if self._firestore_manager is not None:
+            steps.append(
+                Step(
+                    "promotions",
+                    lambda results: self._plan_promotions(request, results["summary"]),
+                    depends_on=("summary",),
+                )
+            )
+            steps.append(
+                Step(
+                    "firestore",
+                    lambda results: self._save_to_firestore(
+                        request,
+                        episode_ref=episode_ref,
+                        feed=results["feed"],
+                        transcript=results["transcript"],
+                        generated=results["summary"],
+                        upload=results["upload"],
+                        promotions=results["promotions"],
+                    ),
+                    depends_on=("feed", "transcript", "summary", "upload", "promotions"),
+                )
+            )
+        return [self._measured(step, peak_rss_bytes) for step in steps]
+
+    def _reserve_episode(
+        self,
+        request: ProcessPodcastWorkflowInput,
+        shared_feed: SharedEpisodeFeed | None,
+    ) -> _FeedState:
+        if shared_feed is None:
+            return self._load_feed(request)
+        episode_number = shared_feed.episode_number(request.gcs_trigger_object_name)
+        self._logger.info("Reserved Episode Number: %s", episode_number)
+        return _FeedState(rss_manager=None, episode_number=episode_number)
+
+    def _load_feed(self, request: ProcessPodcastWorkflowInput) -> _FeedState:
+        with self._span("feed.download") as span:
             rss_feed_bytes = self._object_storage.download_file(f"{request.r2_key_prefix}/feed.xml")
-            rss_manager = self._rss_manager_factory(rss_xml=rss_feed_bytes.decode("utf-8"))
-            latest_episode_number = rss_manager.get_total_episodes() + 1
-            self._logger.info("Latest Episode Number: %s", latest_episode_number)
+            span.add_bytes(len(rss_feed_bytes))
+        rss_manager = self._rss_manager_factory(rss_xml=rss_feed_bytes.decode("utf-8"))
+        episode_number = rss_manager.get_total_episodes() + 1
+        self._logger.info("Latest Episode Number: %s", episode_number)
+        return _FeedState(rss_manager=rss_manager, episode_number=episode_number)
 
-            self._logger.info("\n## Step1: Running AI Analysis... ##")
+    def _generate_transcript(self, request: ProcessPodcastWorkflowInput) -> str | None:
+        self._logger.info("\n## Step1: Running AI Analysis... ##")
+        with self._span("transcript", model_id=request.ai_model_id) as span:
             transcript = self._transcript_provider.generate_transcript(
                 f"gs://{request.gcs_bucket}/{request.gcs_trigger_object_name}", model_id=request.ai_model_id
             )
-            self._notifier.send_discord_message(message=f"#{latest_episode_number} Meeting Transcript:\n\n{transcript}")
-            if not transcript:
-                raise ValueError("Failed to make transcript.")
+            span.add_bytes(len(transcript.encode("utf-8")) if transcript else 0)
+        return transcript
+
+    def _generate_summary(
+        self,
+        request: ProcessPodcastWorkflowInput,
+        feed: _FeedState,
+        transcript: str | None,
+    ) -> _GeneratedSummary:
+        self._notifier.send_discord_message(message=f"#{feed.episode_number} Meeting Transcript:\n\n{transcript}")
+        if not transcript:
+            raise ValueError("Failed to make transcript.")
+
+        sns_promotions: SnsPromotionsResponse | None = None
+        combined = self._combine_summary_and_promotions and self._firestore_manager is not None
+        try:
+            with self._span("summary", model_id=request.ai_model_id, combined=combined):
+                if combined:
+                    generated = self._transcript_provider.generate_summary_and_promotions(
+                        transcript,
+                        num_promotions=request.sns_promotion_count,
+                        model_id=request.ai_model_id,
+                    )
+                    summary = generated.summary
+                    sns_promotions = SnsPromotionsResponse(promotions=generated.promotions)
+                else:
+                    summary = self._transcript_provider.summarize_transcript(transcript, model_id=request.ai_model_id)
+        finally:
+            # 文字起こしをモデルに送るのは要約まで。コンテキストキャッシュなどはここで解放する
+            self._release_transcript(transcript)
+        self._logger.info("Generated Summary: %s", summary)
+        summary.title = f"#{feed.episode_number} {summary.title}"
 
-            summary = self._transcript_provider.summarize_transcript(transcript, model_id=request.ai_model_id)
-            self._logger.info("Generated Summary: %s", summary)
-            summary.title = f"#{latest_episode_number} {summary.title}"
+        self._notifier.send_discord_message(
+            message=f"New Podcast Processed:\nTitle: {summary.title}\nDescription: {summary.description}"
+        )
+        return _GeneratedSummary(summary=summary, sns_promotions=sns_promotions)
 
-            self._notifier.send_discord_message(
-                message=f"New Podcast Processed:\nTitle: {summary.title}\nDescription: {summary.description}"
+    def _release_transcript(self, transcript: str) -> None:
+        try:
+            self._transcript_provider.release_transcript(transcript)
+        except Exception:  # noqa: BLE001 - 解放に失敗してもキャッシュは TTL で失効する
+            self._logger.warning("Failed to release resources kept for the transcript", exc_info=True)
+
+    def _convert_audio(self, request: ProcessPodcastWorkflowInput, workdir: str | None) -> _ConvertedAudio:
+        self._logger.info("\n## Step2: Converting to MP3 and Uploading to Cloudflare R2... ##")
+        if workdir is not None:
+            return self._convert_audio_file(request, Path(workdir))
+        with self._span("audio"):
+            with self._span("audio.download") as span:
+                original_audio_bytes = self._blob_source.download_blob_as_bytes(
+                    request.gcs_bucket, request.gcs_trigger_object_name
+                )
+                span.add_bytes(len(original_audio_bytes))
+            source_suffix = Path(request.gcs_trigger_object_name).suffix
+            with self._span("audio.convert", source_format=source_suffix.lstrip(".")) as span:
+                mp3_bytes = self._audio_converter(original_audio_bytes, source_suffix)
+                span.add_bytes(len(mp3_bytes))
+            del original_audio_bytes
+
+            file_size_bytes, duration_str = self._probe_audio(
+                lambda: self._audio_info_reader(file_buffer=io.BytesIO(mp3_bytes), audio_format="mp3"),
+                fallback_size=len(mp3_bytes),
             )
+        return _ConvertedAudio(file_size_bytes=file_size_bytes, duration_str=duration_str, mp3_bytes=mp3_bytes)
+
+    def _convert_audio_file(self, request: ProcessPodcastWorkflowInput, workdir: Path) -> _ConvertedAudio:
+        """Download, convert and probe through temporary files; the source file is deleted after conversion."""
+        budget = self._memory_budget
+        source_suffix = Path(request.gcs_trigger_object_name).suffix
+        source_path = workdir / f"source{source_suffix}"
+        mp3_path = workdir / "audio.mp3"
+        with self._span("audio", streamed=True):
+            with self._span("audio.download") as span:
+                self._blob_source.download_blob(request.gcs_bucket, request.gcs_trigger_object_name, str(source_path))
+                span.add_bytes(source_path.stat().st_size)
+            try:
+                with self._span("audio.convert", source_format=source_suffix.lstrip(".")) as span:
+                    budget.audio_file_converter(source_path, source_suffix, mp3_path)
+                    span.add_bytes(mp3_path.stat().st_size)
+            finally:
+                source_path.unlink(missing_ok=True)
 
-            self._logger.info("\n## Step2: Converting to MP3 and Uploading to Cloudflare R2... ##")
-            audio_upload_mime_type = "audio/mpeg"
-            original_audio_bytes = self._blob_source.download_blob_as_bytes(
-                request.gcs_bucket, request.gcs_trigger_object_name
+            file_size_bytes, duration_str = self._probe_audio(
+                lambda: budget.audio_file_info_reader(mp3_path),
+                fallback_size=mp3_path.stat().st_size,
             )
-            mp3_bytes = self._audio_converter(original_audio_bytes, gcs_path.suffix)
+        return _ConvertedAudio(file_size_bytes=file_size_bytes, duration_str=duration_str, mp3_path=mp3_path)
 
+    def _probe_audio(self, read_info: Callable[[], list], *, fallback_size: int) -> tuple[int, str]:
+        with self._span("audio.probe") as span:
             try:
-                file_size_bytes, duration_str = self._audio_info_reader(
-                    file_buffer=io.BytesIO(mp3_bytes),
-                    audio_format="mp3",
-                )
+                file_size_bytes, duration_str = read_info()
             except Exception:  # noqa: BLE001
                 self._logger.warning("Failed to get audio info")
-                file_size_bytes, duration_str = len(mp3_bytes), "00:00:00"
+                span.set_attribute("fallback", True)  # noqa: FBT003
+                return fallback_size, "00:00:00"
+        return file_size_bytes, duration_str
 
-            r2_remote_key = f"{request.r2_key_prefix}/ep/{latest_episode_number}/audio.mp3"
-            self._object_storage.upload_file(
-                file_content=mp3_bytes,
-                remote_key=r2_remote_key,
-                content_type=audio_upload_mime_type,
-                public=True,
-            )
-            public_url = self._object_storage.generate_public_url(
-                remote_key=r2_remote_key,
-                custom_domain=request.r2_custom_domain,
-            )
-            self._logger.info(
-                "Uploaded audio to R2: %s, Size: %s bytes, Duration: %s",
-                public_url,
-                file_size_bytes,
-                duration_str,
-            )
+    def _upload_audio(
+        self,
+        request: ProcessPodcastWorkflowInput,
+        feed: _FeedState,
+        audio: _ConvertedAudio,
+    ) -> _UploadedAudio:
+        r2_remote_key = f"{request.r2_key_prefix}/ep/{feed.episode_number}/audio.mp3"
+        with self._span("audio.upload", remote_key=r2_remote_key) as span:
+            if audio.mp3_path is not None:
+                span.add_bytes(audio.mp3_path.stat().st_size)
+                self._object_storage.upload_file_from_path(
+                    file_path=str(audio.mp3_path),
+                    remote_key=r2_remote_key,
+                    content_type=AUDIO_UPLOAD_MIME_TYPE,
+                    public=True,
+                )
+                audio.mp3_path.unlink(missing_ok=True)
+            else:
+                span.add_bytes(len(audio.mp3_bytes))
+                self._object_storage.upload_file(
+                    file_content=audio.mp3_bytes,
+                    remote_key=r2_remote_key,
+                    content_type=AUDIO_UPLOAD_MIME_TYPE,
+                    public=True,
+                )
+        public_url = self._object_storage.generate_public_url(
+            remote_key=r2_remote_key,
+            custom_domain=request.r2_custom_domain,
+        )
+        self._logger.info(
+            "Uploaded audio to R2: %s, Size: %s bytes, Duration: %s",
+            public_url,
+            audio.file_size_bytes,
+            audio.duration_str,
+        )
+        return _UploadedAudio(
+            remote_key=r2_remote_key,
+            public_url=public_url,
+            file_size_bytes=audio.file_size_bytes,
+            duration_str=audio.duration_str,
+        )
 
-            self._logger.info("\n## Updating RSS Feed... ##")
-            new_episode_data = {
-                "title": summary.title,
-                "description": summary.description,
-                "audio_url": public_url,
-                "file_size": file_size_bytes,
-                "itunes_duration": duration_str,
-                "creator": "sunabalog",
-                "mime_type": audio_upload_mime_type,
-                "itunes_summary": summary.description,
-                "itunes_explicit": "no",
-                "itunes_season": 1,
-                "itunes_episode_number": latest_episode_number,
-                "itunes_episode_type": "full",
-            }
-            rss_manager.add_episode(new_episode_data)
+    def _publish_feed(
+        self,
+        request: ProcessPodcastWorkflowInput,
+        feed: _FeedState,
+        generated: _GeneratedSummary,
+        upload: _UploadedAudio,
+        *,
+        shared_feed: SharedEpisodeFeed | None,
+    ) -> None:
+        self._logger.info("\n## Updating RSS Feed... ##")
+        summary = generated.summary
+        new_episode_data = {
+            "title": summary.title,
+            "description": summary.description,
+            "audio_url": upload.public_url,
+            "file_size": upload.file_size_bytes,
+            "itunes_duration": upload.duration_str,
+            "creator": "sunabalog",
+            "mime_type": AUDIO_UPLOAD_MIME_TYPE,
+            "itunes_summary": summary.description,
+            "itunes_explicit": "no",
+            "itunes_season": 1,
+            "itunes_episode_number": feed.episode_number,
+            "itunes_episode_type": "full",
+        }
+        if shared_feed is not None:
+            shared_feed.add_episode(request.gcs_trigger_object_name, new_episode_data)
+            return
+        rss_manager = feed.rss_manager or self._load_feed(request).rss_manager
+        if rss_manager is None:
+            raise ValueError("Failed to load RSS feed.")
+        rss_manager.add_episode(new_episode_data)
+        with self._span("rss.publish") as span:
+            rss_bytes = rss_manager.get_rss_xml().encode("utf-8")
             self._object_storage.upload_file(
-                file_content=rss_manager.get_rss_xml().encode("utf-8"),
+                file_content=rss_bytes,
                 remote_key=f"{request.r2_key_prefix}/feed.xml",
                 content_type="application/rss+xml; charset=utf-8",
                 public=True,
             )
+            span.add_bytes(len(rss_bytes))
 
-            if self._firestore_manager is not None:
-                generated_at = datetime.now(UTC).isoformat()
-                transcript_summary = summary.description
-                ai_generated_meta = {
-                    "title": summary.title,
-                    "description": summary.description,
-                    "prompt_version": "v1",
-                    "generated_at": generated_at,
-                }
-                show_notes_summary = {
-                    "overview": summary.description,
-                    "topics": [
-                        {
-                            "time": "00:00",
-                            "title": summary.title,
-                        },
-                    ],
-                }
-                audio_metadata = {
-                    "file_size_bytes": file_size_bytes,
-                    "duration_str": duration_str,
-                    "audio_url": public_url,
-                    "mime_type": audio_upload_mime_type,
-                }
-                self._firestore_manager.save_episode_content(
-                    podcast_id=episode_ref.podcast_id,
-                    episode_id=episode_ref.episode_id,
-                    episode_number=latest_episode_number,
-                    updated_at=generated_at,
-                    transcript_summary=transcript_summary,
-                    ai_generated_meta=ai_generated_meta,
-                    show_notes_summary=show_notes_summary,
-                    audio_metadata=audio_metadata,
-                )
-                self._firestore_manager.save_transcript_chunks(
-                    podcast_id=episode_ref.podcast_id,
-                    episode_id=episode_ref.episode_id,
-                    transcript=transcript,
-                )
+    def _plan_promotions(
+        self,
+        request: ProcessPodcastWorkflowInput,
+        generated: _GeneratedSummary,
+    ) -> list[_PlannedPromotion]:
+        sns_promotions = generated.sns_promotions
+        if sns_promotions is None:
+            with self._span("promotions", model_id=request.ai_model_id):
                 sns_promotions = self._transcript_provider.generate_sns_promotions(
-                    summary_description=summary.description,
+                    summary_description=generated.summary.description,
                     num_promotions=request.sns_promotion_count,
                     model_id=request.ai_model_id,
                 )
-                for i, promo in enumerate(sns_promotions.promotions):
-                    promo_scheduled_time = (
+        return [
+            _PlannedPromotion(promotion_id=uuid.uuid4().hex, message=promo.message, hashtags=promo.hashtags)
+            for promo in sns_promotions.promotions
+        ]
+
+    def _save_to_firestore(  # noqa: PLR0913
+        self,
+        request: ProcessPodcastWorkflowInput,
+        *,
+        episode_ref: EpisodeObjectReference,
+        feed: _FeedState,
+        transcript: str,
+        generated: _GeneratedSummary,
+        upload: _UploadedAudio,
+        promotions: list[_PlannedPromotion],
+    ) -> None:
+        if self._firestore_manager is None:
+            return
+        with self._span("firestore.save", promotions=len(promotions)) as span:
+            # 書き込み量の大半を占める議事録チャンクのサイズを記録する
+            span.add_bytes(len(transcript.encode("utf-8")))
+            summary = generated.summary
+            generated_at = datetime.now(UTC).isoformat()
+            transcript_summary = summary.description
+            ai_generated_meta = {
+                "title": summary.title,
+                "description": summary.description,
+                "prompt_version": "v1",
+                "generated_at": generated_at,
+            }
+            show_notes_summary = {
+                "overview": summary.description,
+                "topics": [
+                    {
+                        "time": "00:00",
+                        "title": summary.title,
+                    },
+                ],
+            }
+            audio_metadata = {
+                "file_size_bytes": upload.file_size_bytes,
+                "duration_str": upload.duration_str,
+                "audio_url": upload.public_url,
+                "mime_type": AUDIO_UPLOAD_MIME_TYPE,
+            }
+            promotion_records = [
+                SnsPromotionRecord(
+                    promotion_id=promo.promotion_id,
+                    generated_at=generated_at,
+                    scheduled_time=(
                         datetime.now(UTC) + timedelta(hours=request.sns_schedule_offset_hours) + timedelta(days=i)
-                    ).isoformat()
-                    self._firestore_manager.create_sns_promotion(
+                    ).isoformat(),
+                    episode_number=feed.episode_number,
+                    message=promo.message,
+                    hashtags=promo.hashtags,
+                    platform_urls={"apple": "", "spotify": "", "amazon": ""},
+                )
+                for i, promo in enumerate(promotions)
+            ]
+            if self._async_firestore_manager is not None:
+                self._async_firestore_manager.run_blocking(
+                    self._async_firestore_manager.save_episode_artifacts(
                         podcast_id=episode_ref.podcast_id,
                         episode_id=episode_ref.episode_id,
-                        promotion_id=None,
-                        generated_at=generated_at,
-                        scheduled_time=promo_scheduled_time,
-                        episode_number=latest_episode_number,
-                        message=promo.message,
-                        platform_urls={"apple": "", "spotify": "", "amazon": ""},
-                        hashtags=promo.hashtags,
+                        episode_number=feed.episode_number,
+                        updated_at=generated_at,
+                        transcript_summary=transcript_summary,
+                        ai_generated_meta=ai_generated_meta,
+                        show_notes_summary=show_notes_summary,
+                        audio_metadata=audio_metadata,
+                        transcript=transcript,
+                        promotions=promotion_records,
                     )
+                )
+                return
 
-            self._episode_repository.mark_completed(
+            self._firestore_manager.save_episode_content(
                 podcast_id=episode_ref.podcast_id,
                 episode_id=episode_ref.episode_id,
-                title=summary.title,
-                description=summary.description,
-                audio_url=public_url,
-                duration_seconds=_duration_to_seconds(duration_str),
+                episode_number=feed.episode_number,
+                updated_at=generated_at,
+                transcript_summary=transcript_summary,
+                ai_generated_meta=ai_generated_meta,
+                show_notes_summary=show_notes_summary,
+                audio_metadata=audio_metadata,
             )
-            self._logger.info("\n## Notifying Discord (Success)... ##")
-            self._notifier.send_discord_message(
-                message=f"Podcast Episode Published Successfully:\nTitle: {summary.title}\nURL: {public_url}"
+            self._firestore_manager.save_transcript_chunks(
+                podcast_id=episode_ref.podcast_id,
+                episode_id=episode_ref.episode_id,
+                transcript=transcript,
             )
-        except Exception as err:
-            self._logger.exception("Error occurred during podcast processing:")
-            try:
-                self._episode_repository.mark_failed(
+            for record in promotion_records:
+                self._firestore_manager.create_sns_promotion(
                     podcast_id=episode_ref.podcast_id,
                     episode_id=episode_ref.episode_id,
-                    error_message=str(err),
+                    promotion_id=record.promotion_id,
+                    generated_at=record.generated_at,
+                    scheduled_time=record.scheduled_time,
+                    episode_number=record.episode_number,
+                    message=record.message,
+                    platform_urls=record.platform_urls,
+                    hashtags=record.hashtags,
                 )
-            except Exception:  # noqa: BLE001
-                self._logger.exception("Failed to persist episode failure state")
-            self._notifier.send_discord_message(message=f"Podcast Processing Failed:\nError: {err}")
-            raise
+
+
+# 音声変換 (audio) の出力は MP3 本体のため保存しない。アップロード済みなら再開時は実行されない
+_CHECKPOINT_STEPS = frozenset({"feed", "transcript", "summary", "upload", "rss", "promotions", "firestore"})
+# バッチ実行で再開に使うステップ (エピソード番号に依存しないもの)
+_BATCH_CHECKPOINT_STEPS = frozenset({"transcript"})
+# 外部に公開・永続化するステップ。リースを失っていたら実行しない
+_LEASE_GUARDED_STEPS = frozenset({"rss", "firestore"})
+
+
+def _dump_checkpoint(step: str, value: Any) -> Any:  # noqa: ANN401, PLR0911
+    """Convert a step result to a JSON-serializable checkpoint value."""
+    if step == "feed":
+        return {"episode_number": value.episode_number}
+    if step == "summary":
+        return {
+            "summary": value.summary.model_dump(mode="json"),
+            "sns_promotions": value.sns_promotions.model_dump(mode="json") if value.sns_promotions else None,
+        }
+    if step == "upload":
+        return asdict(value)
+    if step == "promotions":
+        return [asdict(promotion) for promotion in value]
+    if step in {"rss", "firestore"}:
+        return True
+    return value
+
+
+def _load_checkpoint(step: str, value: Any) -> Any:  # noqa: ANN401, PLR0911
+    """Rebuild a step result from its checkpoint value."""
+    if step == "feed":
+        return _FeedState(rss_manager=None, episode_number=int(value["episode_number"]))
+    if step == "summary":
+        promotions = value.get("sns_promotions")
+        return _GeneratedSummary(
+            summary=Summary.model_validate(value["summary"]),
+            sns_promotions=SnsPromotionsResponse.model_validate(promotions) if promotions else None,
+        )
+    if step == "upload":
+        return _UploadedAudio(**value)
+    if step == "promotions":
+        return [_PlannedPromotion(**promotion) for promotion in value]
+    if step in {"rss", "firestore"}:
+        return None
+    return value
 
 
 def _duration_to_seconds(duration: str) -> int | None:
@@ -0,0 +1,147 @@
+"""Small dependency-graph executor for use case steps.
+
+Each step declares the steps it depends on and receives their results. Steps whose
+dependencies are complete run concurrently on a thread pool, so independent branches
+(e.g. transcription and audio transcoding) take roughly the time of the slowest branch
+instead of their sum. Results restored from a previous run (checkpoints) are reused,
+and steps that only feed restored steps are skipped. Large intermediate results (e.g.
+transcoded audio) can be released as soon as every step that consumes them is done.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+
+
+@dataclass(frozen=True)
+class Step:
+    """One node of a StepGraph.
+
+    Attributes:
+        name: グラフ内で一意なステップ名。後続ステップはこの名前で結果を参照する。
+        run: 依存ステップの結果 (ステップ名 -> 結果) を受け取り、このステップの結果を返す関数。
+        depends_on: 完了を待つステップ名。
+        release_after_use: True の場合、後続ステップがすべて完了した時点で結果を破棄する
+            (run() の戻り値にも含めない)。大きなバイト列などを早く解放するために使う。
+    """
+
+    name: str
+    run: Callable[[Mapping[str, Any]], Any]
+    depends_on: tuple[str, ...] = ()
+    release_after_use: bool = False
+
+
+class StepGraph:
+    """Runs steps as soon as their dependencies have finished."""
+
+    def __init__(self, steps: Sequence[Step], *, logger: logging.Logger | None = None) -> None:
+        """Validate the graph (unique names, known dependencies, no cycles)."""
+        self._steps = {step.name: step for step in steps}
+        if len(self._steps) != len(steps):
+            msg = "Step names must be unique"
+            raise ValueError(msg)
+        for step in steps:
+            unknown = set(step.depends_on) - self._steps.keys()
+            if unknown:
+                msg = f"Step {step.name} depends on unknown steps: {', '.join(sorted(unknown))}"
+                raise ValueError(msg)
+        self.order = self._topological_order()
+        self._dependents: dict[str, list[str]] = {name: [] for name in self._steps}
+        for step in steps:
+            for dep in step.depends_on:
+                self._dependents[dep].append(step.name)
+        self.durations: dict[str, float] = {}
+        self.skipped: list[str] = []
+        self._logger = logger or logging.getLogger(__name__)
+
+    def _topological_order(self) -> list[str]:
+        remaining = {name: set(step.depends_on) for name, step in self._steps.items()}
+        order: list[str] = []
+        while remaining:
+            ready = sorted(name for name, deps in remaining.items() if not deps)
+            if not ready:
+                msg = f"Steps have a dependency cycle: {', '.join(sorted(remaining))}"
+                raise ValueError(msg)
+            order.extend(ready)
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def _steps_to_run(self, completed: Mapping[str, Any]) -> set[str]:
+        """Return the steps that are not completed and are still needed by a step that will run."""
+        dependents = self._dependents
+        to_run: set[str] = set()
+        for name in reversed(self.order):
+            if name in completed:
+                continue
+            # 後続がすべて復元済みのステップ (例: アップロード済みの音声の変換) は実行しない
+            if not dependents[name] or any(dependent in to_run for dependent in dependents[name]):
+                to_run.add(name)
+        return to_run
+
+    def run(
+        self,
+        *,
+        max_workers: int = 4,
+        completed: Mapping[str, Any] | None = None,
+        on_step_completed: Callable[[str, Any], None] | None = None,
+    ) -> dict[str, Any]:
+        """Execute the steps and return every available result by name.
+
+        completed に前回の実行結果を渡すと、そのステップは実行せずに結果を再利用する。
+        on_step_completed はステップが完了するたびに呼び出し元のスレッドで呼ばれる。
+        ステップが失敗した場合は未着手のステップを取り消し、実行中のステップの終了を待ってから
+        最初の例外を送出する。
+        """
+        results: dict[str, Any] = {name: value for name, value in (completed or {}).items() if name in self._steps}
+        to_run = self._steps_to_run(results)
+        self.skipped = [name for name in self.order if name not in to_run]
+        durations = self.durations = {}
+        pending = {name: step for name, step in self._steps.items() if name in to_run}
+        running: dict[Future[Any], tuple[str, float]] = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(self._steps))))
+        try:
+            while pending or running:
+                for name in [name for name in self.order if name in pending]:
+                    step = pending[name]
+                    if all(dep in results for dep in step.depends_on):
+                        del pending[name]
+                        inputs = {dep: results[dep] for dep in step.depends_on}
+                        # 呼び出し元のコンテキスト (トレースの親スパンなど) をワーカースレッドへ引き継ぐ
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, step.run, inputs)] = (name, time.perf_counter())
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, started = running.pop(future)
+                    durations[name] = time.perf_counter() - started
+                    # 失敗したステップの例外はここで送出され、finally で残りを取り消す
+                    results[name] = future.result()
+                    self._logger.info("Step %s finished in %.2fs", name, durations[name])
+                    if on_step_completed is not None:
+                        on_step_completed(name, results[name])
+                    self._release_consumed(name, results)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return results
+
+    def _release_consumed(self, finished: str, results: dict[str, Any]) -> None:
+        """Drop results marked release_after_use whose consumers have all finished."""
+        for dep in self._steps[finished].depends_on:
+            if (
+                self._steps[dep].release_after_use
+                and dep in results
+                and all(dependent in results for dependent in self._dependents[dep])
+            ):
+                del results[dep]
+                self._logger.info("Released the result of step %s", dep)
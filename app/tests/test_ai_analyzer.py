@@ -241,3 +241,34 @@ class TestGenerateSnsPromotions:
         config = call_args.kwargs["config"]
         assert config.temperature == 0.7
         assert config.response_json_schema == SnsPromotionsResponse.model_json_schema()
+
+
+class TestGenerateSummaryAndPromotions:
+    """generate_summary_and_promotions メソッドのテスト."""
+
+    @patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
+    @patch("infrastructure.ai_analyzer.genai.Client")
+    def test_generate_summary_and_promotions_single_call(self, mock_client_class):
+        """要約とSNS投稿文を1回の呼び出しで生成."""
+        mock_client = MagicMock()
+        mock_client_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.text = dumps(
+            {
+                "summary": {"title": "Episode Title", "description": "Episode Description"},
+                "promotions": [{"message": "Promotion 1 message", "hashtags": ["#Tag1"]}],
+            },
+            ensure_ascii=False,
+        )
+        mock_client.models.generate_content.return_value = mock_response
+
+        analyzer = AudioAnalyzer()
+        result = analyzer.generate_summary_and_promotions("Transcript", num_promotions=1)
+
+        assert result.summary == Summary(title="Episode Title", description="Episode Description")
+        assert result.promotions[0].message == "Promotion 1 message"
+        mock_client.models.generate_content.assert_called_once()
+        call_kwargs = mock_client.models.generate_content.call_args.kwargs
+        assert "1 種類" in call_kwargs["contents"][0]
+        assert "Transcript" in call_kwargs["contents"][0]
@@ -1,8 +1,13 @@
 """Tests for AudioConverter."""
 
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
 
 from services import AudioConverter
+from services.audio_converter import plan_segments
 
 
 def test_convert_to_mp3_passthrough_for_mp3() -> None:
@@ -16,3 +21,55 @@ def test_convert_to_mp3_unsupported_extension() -> None:
     """Unsupported extensions should raise ValueError."""
     with pytest.raises(ValueError, match="Unsupported audio format"):
         AudioConverter.convert_to_mp3(b"data", ".ogg")
+
+
+def test_convert_file_to_mp3_copies_mp3_input(tmp_path: Path) -> None:
+    """MP3 input should be copied to the destination without running ffmpeg."""
+    source = tmp_path / "source.mp3"
+    source.write_bytes(b"fake-mp3-data")
+
+    with patch("services.audio_converter.subprocess.run") as run:
+        AudioConverter.convert_file_to_mp3(source, ".mp3", tmp_path / "audio.mp3")
+
+    run.assert_not_called()
+    assert (tmp_path / "audio.mp3").read_bytes() == b"fake-mp3-data"
+
+
+def test_convert_file_to_mp3_streams_through_ffmpeg_and_reports_failures(tmp_path: Path) -> None:
+    """Other formats should be converted file-to-file by ffmpeg; a non-zero exit raises."""
+    failed = subprocess.CompletedProcess(args=[], returncode=1, stdout=b"", stderr=b"Invalid data")
+
+    with (
+        patch("services.audio_converter.subprocess.run", return_value=failed) as run,
+        pytest.raises(RuntimeError, match="Invalid data"),
+    ):
+        AudioConverter.convert_file_to_mp3(tmp_path / "source.m4a", ".m4a", tmp_path / "audio.mp3")
+
+    command = run.call_args.args[0]
+    assert command[command.index("-i") + 1] == str(tmp_path / "source.m4a")
+    assert command[-1] == str(tmp_path / "audio.mp3")
+
+
+def test_plan_segments_overlaps_fixed_length_without_silence() -> None:
+    """Segments should overlap and cover the whole recording."""
+    spans = plan_segments(25_000, segment_ms=10_000, overlap_ms=1_000)
+
+    assert spans == [(0, 10_000), (9_000, 19_000), (18_000, 25_000)]
+
+
+def test_plan_segments_cuts_at_latest_silence_before_boundary() -> None:
+    """The cut should move back to the silence closest to the target boundary."""
+    silences = [(6_000, 6_400), (8_000, 8_400), (15_000, 15_200)]
+
+    def find_silences(lower_ms: int, upper_ms: int) -> list[tuple[int, int]]:
+        return [(start, end) for start, end in silences if end > lower_ms and start < upper_ms]
+
+    spans = plan_segments(20_000, segment_ms=10_000, overlap_ms=1_000, find_silences=find_silences, search_ms=5_000)
+
+    assert spans == [(0, 8_200), (7_200, 15_100), (14_100, 20_000)]
+
+
+def test_plan_segments_rejects_overlap_longer_than_segment() -> None:
+    """Overlap must be shorter than the segment."""
+    with pytest.raises(ValueError, match="must be greater than overlap_ms"):
+        plan_segments(10_000, segment_ms=1_000, overlap_ms=1_000)
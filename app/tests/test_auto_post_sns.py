@@ -7,19 +7,33 @@ from typing import Any
 
 import pytest
 
-from usecases.auto_post_sns import AutoPostSnsUsecase
+from usecases.auto_post_sns import DUE_PROMOTIONS_FETCH_LIMIT, AutoPostSnsUsecase
 
 
 class DummyFirestoreManager:
     def __init__(self, promotions: list[dict[str, Any]]) -> None:
         self.promotions = promotions
         self.updates: list[tuple[str, str]] = []
-
-    def get_pending_sns_promotions(self) -> list[dict[str, Any]]:
-        return self.promotions
+        self.queries: list[tuple[datetime | None, int | None]] = []
+
+    def get_pending_sns_promotions(
+        self, *, due_at: datetime | None = None, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        # Firestore 側の絞り込み・並べ替えと同じく、UTC の文字列として比較する
+        self.queries.append((due_at, limit))
+        promotions = [promo for promo in self.promotions if promo.get("status", "pending") == "pending"]
+        if due_at is not None:
+            due = due_at.astimezone(UTC).isoformat()
+            promotions = sorted(
+                (promo for promo in promotions if promo["scheduled_time"] <= due), key=lambda p: p["scheduled_time"]
+            )
+        return promotions[:limit]
 
     def update_sns_promotion_status(self, reference_path: str, status: str) -> None:
         self.updates.append((reference_path, status))
+        for promo in self.promotions:
+            if promo["reference_path"] == reference_path:
+                promo["status"] = status
 
 
 class DummyXClient:
@@ -103,6 +117,7 @@ def test_auto_post_multiple_due_posts_oldest_selected() -> None:
 
     assert len(firestore.updates) == 1
     assert firestore.updates[0] == ("podcasts/1/episodes_contents/1/sns_promotions/doc_oldest", "posted")
+    assert [limit for _, limit in firestore.queries] == [DUE_PROMOTIONS_FETCH_LIMIT]
 
 
 def test_auto_post_posting_fails_updates_status_to_failed() -> None:
@@ -144,3 +159,33 @@ def test_auto_post_exception_during_post_updates_status_and_raises() -> None:
 
     assert len(firestore.updates) == 1
     assert firestore.updates[0] == ("podcasts/1/episodes_contents/1/sns_promotions/doc_error", "failed")
+
+
+def test_auto_post_skips_due_promotions_with_invalid_scheduled_time() -> None:
+    """Test a malformed scheduled_time is marked failed and does not block older valid promotions."""
+    past_time = (datetime.now(UTC) - timedelta(hours=1)).isoformat()
+    broken = {
+        "doc_id": "doc_broken",
+        "reference_path": "podcasts/1/episodes_contents/1/sns_promotions/doc_broken",
+        "status": "pending",
+        "scheduled_time": "2000-01-01T25:00:00+00:00",
+        "message": "Broken message",
+    }
+    valid = {
+        "doc_id": "doc_valid",
+        "reference_path": "podcasts/1/episodes_contents/1/sns_promotions/doc_valid",
+        "status": "pending",
+        "scheduled_time": past_time,
+        "message": "Valid message",
+    }
+    firestore = DummyFirestoreManager([valid, broken])
+    x_client = DummyXClient()
+    usecase = AutoPostSnsUsecase(firestore_manager=firestore, x_client=x_client)  # type: ignore[arg-type]
+    usecase.run()
+
+    assert firestore.updates == [
+        ("podcasts/1/episodes_contents/1/sns_promotions/doc_broken", "failed"),
+        ("podcasts/1/episodes_contents/1/sns_promotions/doc_valid", "posted"),
+    ]
+    # failed にした壊れたレコードは次回の取得対象から外れる
+    assert firestore.get_pending_sns_promotions(due_at=datetime.now(UTC)) == []
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+# ruff: noqa: ARG002
+import json
+import logging
+from typing import Any, ClassVar
+
+from domain.models import BatchPredictionRequest, BatchRequestKind
+from infrastructure.batch_prediction import LocalBatchPredictionGateway
+from usecases import BackfillEpisodesInput, BackfillEpisodesUsecase
+
+
+def _source_uri(episode_id: str) -> str:
+    return f"gs://bucket/podcasts/pod/episodes/{episode_id}/source/recording.m4a"
+
+
+class _FirestoreManager:
+    def __init__(self) -> None:
+        self.contents = {"ep-1": {"episode_number": 1}, "ep-2": {"episode_number": 2}, "ep-3": {}}
+        self.transcripts = {"ep-1": "stored transcript 1"}
+        self.updates: dict[str, dict[str, Any]] = {}
+        self.saved_chunks: list[str] = []
+
+    def get_episode_contents(self, *, podcast_id: str, episode_ids: list[str]) -> dict[str, dict[str, Any]]:
+        return {episode_id: self.contents[episode_id] for episode_id in episode_ids if episode_id in self.contents}
+
+    def get_transcript(self, *, podcast_id: str, episode_id: str) -> str:
+        return self.transcripts.get(episode_id, "")
+
+    def save_transcript_chunks(self, *, podcast_id: str, episode_id: str, transcript: str) -> list[str]:
+        self.saved_chunks.append(episode_id)
+        return ["chunk_0001"]
+
+    def update_episode_contents(self, *, podcast_id: str, updates: dict[str, dict[str, Any]]) -> int:
+        self.updates.update(updates)
+        return len(updates)
+
+
+class _ObjectStorage:
+    def __init__(self) -> None:
+        self.uploads: list[str] = []
+
+    def download_file(self, remote_key: str) -> bytes:
+        return b"<rss />"
+
+    def upload_file(self, file_content: bytes, remote_key: str, content_type: str, *, public: bool = True) -> None:
+        self.uploads.append(remote_key)
+
+
+class _FeedManager:
+    updates: ClassVar[dict[str, dict[str, Any]]] = {}
+
+    def __init__(self, *, rss_xml: str) -> None:
+        self._episodes = [
+            {"guid": "guid-1", "itunes_episode_number": "1"},
+            {"guid": "guid-2", "itunes_episode_number": "2"},
+        ]
+
+    def list_episodes(self) -> list[dict[str, Any]]:
+        return self._episodes
+
+    def update_episodes(self, updates: dict[str, dict[str, Any]]) -> None:
+        _FeedManager.updates = updates
+
+    def get_rss_xml(self) -> str:
+        return "<rss />"
+
+
+def _respond(model_id: str, request: BatchPredictionRequest) -> str:
+    if request.kind is BatchRequestKind.TRANSCRIPT:
+        if request.key.endswith("ep-2"):
+            raise TimeoutError("slow")
+        return f"transcript of {request.key}"
+    return "```json\n" + json.dumps({"title": "New title", "description": request.transcript}) + "\n```"
+
+
+def _usecase(firestore_manager: _FirestoreManager, storage: _ObjectStorage) -> BackfillEpisodesUsecase:
+    return BackfillEpisodesUsecase(
+        batch_gateway=LocalBatchPredictionGateway(_respond),
+        firestore_manager=firestore_manager,  # type: ignore[arg-type]
+        object_storage=storage,  # type: ignore[arg-type]
+        rss_manager_factory=_FeedManager,
+        logger=logging.getLogger("test"),
+    )
+
+
+def test_backfill_regenerates_and_writes_in_bulk() -> None:
+    firestore_manager = _FirestoreManager()
+    storage = _ObjectStorage()
+
+    report = _usecase(firestore_manager, storage).run(
+        BackfillEpisodesInput(
+            source_uris=[_source_uri("ep-1"), _source_uri("ep-2"), _source_uri("ep-3"), "gs://bucket/not/an/episode"],
+            ai_model_id="model",
+            r2_key_prefix="prefix",
+        ),
+    )
+
+    assert report.succeeded == ["pod/ep-1"]
+    assert set(report.failed) == {"pod/ep-2", "pod/ep-3", "gs://bucket/not/an/episode"}
+    assert report.failed["pod/ep-2"] == "TimeoutError: slow"
+    assert firestore_manager.saved_chunks == ["ep-1"]
+    assert firestore_manager.updates["ep-1"]["ai_generated_meta"]["title"] == "#1 New title"
+    assert firestore_manager.updates["ep-1"]["transcript_summary"] == "transcript of pod/ep-1"
+    assert _FeedManager.updates == {
+        "guid-1": {
+            "title": "#1 New title",
+            "description": "transcript of pod/ep-1",
+            "itunes_summary": "transcript of pod/ep-1",
+        },
+    }
+    assert storage.uploads == ["prefix/feed.xml"]
+
+
+def test_backfill_can_resummarize_stored_transcripts() -> None:
+    firestore_manager = _FirestoreManager()
+
+    report = _usecase(firestore_manager, _ObjectStorage()).run(
+        BackfillEpisodesInput(
+            source_uris=[_source_uri("ep-1"), _source_uri("ep-2")],
+            ai_model_id="model",
+            r2_key_prefix="prefix",
+            regenerate_transcripts=False,
+        ),
+    )
+
+    assert report.succeeded == ["pod/ep-1"]
+    assert report.failed == {"pod/ep-2": "No stored transcript"}
+    assert firestore_manager.saved_chunks == []
+    assert firestore_manager.updates["ep-1"]["transcript_summary"] == "stored transcript 1"
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+# ruff: noqa: ARG002
+import json
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import pytest
+from google.genai.types import JobState
+
+from domain.models import BatchPredictionRequest, BatchRequestKind
+from infrastructure.batch_prediction import (
+    LocalBatchPredictionGateway,
+    VertexBatchPredictionClient,
+    build_jsonl_line,
+    parse_prediction_line,
+)
+
+
+def _transcript_request() -> BatchPredictionRequest:
+    return BatchPredictionRequest(
+        key="1/42", kind=BatchRequestKind.TRANSCRIPT, source_uri="gs://bucket/podcasts/1/a.m4a"
+    )
+
+
+def _prediction(text: str, request: dict[str, object] | None = None) -> dict[str, object]:
+    return {
+        "request": request or {},
+        "response": {"candidates": [{"content": {"parts": [{"text": text}]}}]},
+        "status": "",
+    }
+
+
+def test_build_jsonl_line_uses_rest_field_names() -> None:
+    transcript_line = build_jsonl_line(_transcript_request())
+    summary_line = build_jsonl_line(
+        BatchPredictionRequest(key="1/43", kind=BatchRequestKind.SUMMARY, transcript="text")
+    )
+
+    parts = transcript_line["request"]["contents"][0]["parts"]
+    assert transcript_line["key"] == "1/42"
+    assert parts[0]["fileData"] == {"fileUri": "gs://bucket/podcasts/1/a.m4a", "mimeType": "audio/m4a"}
+    assert "generationConfig" not in transcript_line["request"]
+    assert summary_line["request"]["generationConfig"]["responseMimeType"] == "application/json"
+    with pytest.raises(ValueError, match="transcript is required"):
+        build_jsonl_line(BatchPredictionRequest(key="x", kind=BatchRequestKind.SUMMARY))
+
+
+def test_parse_prediction_line_matches_key_by_request_when_missing() -> None:
+    request = {"contents": [{"parts": [{"text": "prompt"}]}]}
+    keys = {json.dumps(request, ensure_ascii=False, sort_keys=True): "1/42"}
+
+    assert parse_prediction_line(_prediction("answer", request), keys).text == "answer"  # type: ignore[union-attr]
+    failed = parse_prediction_line({"key": "1/43", "status": "RESOURCE_EXHAUSTED"}, keys)
+    assert failed is not None
+    assert not failed.ok
+    assert failed.error == "RESOURCE_EXHAUSTED"
+    assert parse_prediction_line(_prediction("orphan"), keys) is None
+
+
+@dataclass
+class _FakeBatches:
+    states: list[JobState]
+    created: list[dict[str, object]] = field(default_factory=list)
+
+    def create(self, *, model: str, src: str, config: object) -> SimpleNamespace:
+        self.created.append({"model": model, "src": src, "config": config})
+        return SimpleNamespace(name="projects/p/locations/l/batchPredictionJobs/1")
+
+    def get(self, *, name: str) -> SimpleNamespace:
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        return SimpleNamespace(
+            name=name,
+            state=state,
+            error=None,
+            dest=SimpleNamespace(gcs_uri="gs://staging/batch/job/output"),
+        )
+
+
+class _FakeGcs:
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def upload_blob_from_bytes(
+        self,
+        bucket_name: str,
+        data: bytes,
+        destination_object_name: str,
+        content_type: str | None = None,
+    ) -> None:
+        self.objects[f"{bucket_name}/{destination_object_name}"] = data
+
+    def list_blobs(self, bucket_name: str, prefix: str | None = None) -> list[SimpleNamespace]:
+        return [
+            SimpleNamespace(name=path.split("/", 1)[1])
+            for path in self.objects
+            if path.startswith(f"{bucket_name}/{prefix}")
+        ]
+
+    def download_blob_as_bytes(self, bucket_name: str, object_name: str) -> bytes:
+        return self.objects[f"{bucket_name}/{object_name}"]
+
+
+def test_vertex_client_uploads_input_polls_and_reads_predictions() -> None:
+    batches = _FakeBatches(states=[JobState.JOB_STATE_RUNNING, JobState.JOB_STATE_SUCCEEDED])
+    gcs = _FakeGcs()
+    sleeps: list[float] = []
+    gateway = VertexBatchPredictionClient(
+        client=SimpleNamespace(batches=batches),  # type: ignore[arg-type]
+        gcs_client=gcs,  # type: ignore[arg-type]
+        staging_uri="gs://staging/batch/",
+        poll_interval_seconds=30,
+        sleep=sleeps.append,
+    )
+
+    job_name = gateway.submit([_transcript_request()], model_id="gemini-2.5-flash", display_name="job")
+    gateway.wait(job_name)
+    gcs.objects["staging/batch/job/output/prediction-1/predictions.jsonl"] = (
+        json.dumps({"key": "1/42", **_prediction("transcript")}) + "\n"
+    ).encode()
+    results = gateway.fetch_results(job_name)
+
+    assert batches.created[0]["src"] == "gs://staging/batch/job/input.jsonl"
+    assert json.loads(gcs.objects["staging/batch/job/input.jsonl"])["key"] == "1/42"
+    assert sleeps == [30]
+    assert [(result.key, result.text) for result in results] == [("1/42", "transcript")]
+
+
+def test_vertex_client_raises_when_job_fails() -> None:
+    gateway = VertexBatchPredictionClient(
+        client=SimpleNamespace(batches=_FakeBatches(states=[JobState.JOB_STATE_FAILED])),  # type: ignore[arg-type]
+        gcs_client=_FakeGcs(),  # type: ignore[arg-type]
+        staging_uri="gs://staging/batch",
+    )
+
+    with pytest.raises(RuntimeError, match="JOB_STATE_FAILED"):
+        gateway.wait("job")
+
+
+def test_local_gateway_records_errors_per_request() -> None:
+    def respond(model_id: str, request: BatchPredictionRequest) -> str:
+        if request.key == "bad":
+            raise ValueError("boom")
+        return f"{model_id}:{request.key}"
+
+    gateway = LocalBatchPredictionGateway(respond)
+    job_name = gateway.submit(
+        [_transcript_request(), BatchPredictionRequest(key="bad", kind=BatchRequestKind.SUMMARY, transcript="t")],
+        model_id="model",
+        display_name="job",
+    )
+    gateway.wait(job_name)
+    results = gateway.fetch_results(job_name)
+
+    assert results[0].text == "model:1/42"
+    assert results[1].error == "ValueError: boom"
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+# ruff: noqa: ARG002
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from domain.models import AudioChunk
+from infrastructure.ai_analyzer import (
+    AudioAnalyzer,
+    SegmentTranscript,
+    TranscriptChunking,
+    format_timestamp,
+    stitch_segment_transcripts,
+)
+
+
+class _BlobSource:
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str]] = []
+
+    def download_blob_as_bytes(self, bucket_name: str, blob_name: str) -> bytes:
+        self.requests.append((bucket_name, blob_name))
+        return b"audio"
+
+
+class _Segmenter:
+    def __init__(self, spans: list[tuple[int, int]]) -> None:
+        self._spans = spans
+        self.calls: list[tuple[str, int, int]] = []
+
+    def __call__(self, audio_data: bytes, file_extension: str, *, segment_ms: int, overlap_ms: int) -> list[AudioChunk]:
+        self.calls.append((file_extension, segment_ms, overlap_ms))
+        return [
+            AudioChunk(index=index, start_ms=start, end_ms=end, data=f"segment-{index}".encode())
+            for index, (start, end) in enumerate(self._spans)
+        ]
+
+
+def test_format_timestamp_switches_to_hours() -> None:
+    assert format_timestamp(0) == "0:00"
+    assert format_timestamp(774) == "12:54"
+    assert format_timestamp(3723) == "1:02:03"
+
+
+def test_stitch_shifts_toc_and_drops_overlap_entries() -> None:
+    segments = [
+        SegmentTranscript(
+            start_ms=590_000, end_ms=1_200_000, text="【目次】\n0:05 重複トピック\n1:00 後半\n\n後半の議事録"
+        ),
+        SegmentTranscript(start_ms=0, end_ms=600_000, text="【目次】\n0:00 オープニング\n5:30 前半\n\n前半の議事録"),
+    ]
+
+    stitched = stitch_segment_transcripts(segments)
+
+    assert stitched == "【目次】\n0:00 オープニング\n5:30 前半\n10:50 後半\n\n前半の議事録\n\n後半の議事録"
+
+
+def test_stitch_formats_offsets_beyond_one_hour() -> None:
+    segments = [
+        SegmentTranscript(start_ms=0, end_ms=3_600_000, text="【目次】\n0:00 開始"),
+        SegmentTranscript(start_ms=3_590_000, end_ms=4_000_000, text="## 【目次】\n- 2:03 延長戦\n本文"),
+    ]
+
+    stitched = stitch_segment_transcripts(segments)
+
+    assert stitched.splitlines()[:3] == ["【目次】", "0:00 開始", "- 1:01:53 延長戦"]
+
+
+@patch("infrastructure.ai_analyzer.genai.Client")
+def test_chunked_transcription_runs_segments_concurrently(mock_client: object) -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    texts = {0: "【目次】\n0:00 A\n\n本文A", 1: "【目次】\n0:20 B\n\n本文B"}
+
+    def generate_content(*, model: str, contents: list[object], config: object) -> SimpleNamespace:
+        index = 0 if "パート1/2" in str(contents[1]) else 1
+        barrier.wait()  # 2 セグメントが同時に実行されていなければタイムアウトする
+        return SimpleNamespace(text=texts[index])
+
+    mock_client.return_value.models.generate_content.side_effect = generate_content  # type: ignore[attr-defined]
+    blob_source = _BlobSource()
+    segmenter = _Segmenter([(0, 60_000), (50_000, 100_000)])
+    analyzer = AudioAnalyzer(
+        project_id="project",
+        chunking=TranscriptChunking(segment_seconds=60, overlap_seconds=10, max_workers=2),
+        blob_source=blob_source,
+        audio_segmenter=segmenter,
+    )
+
+    transcript = analyzer.generate_transcript("gs://bucket/podcasts/1/episodes/2/source/a.m4a", model_id="model")
+
+    assert transcript == "【目次】\n0:00 A\n1:10 B\n\n本文A\n\n本文B"
+    assert blob_source.requests == [("bucket", "podcasts/1/episodes/2/source/a.m4a")]
+    assert segmenter.calls == [(".m4a", 60_000, 10_000)]
+    assert analyzer.prompt_version == "v1+chunk60s"
+
+
+@patch("infrastructure.ai_analyzer.genai.Client")
+def test_chunked_transcription_single_segment_uses_uri(mock_client: object) -> None:
+    models = mock_client.return_value.models  # type: ignore[attr-defined]
+    models.generate_content.return_value = SimpleNamespace(text="whole")
+    analyzer = AudioAnalyzer(
+        project_id="project",
+        chunking=TranscriptChunking(segment_seconds=600),
+        blob_source=_BlobSource(),
+        audio_segmenter=_Segmenter([(0, 30_000)]),
+    )
+
+    assert analyzer.generate_transcript("gs://bucket/a.mp3") == "whole"
+    assert models.generate_content.call_count == 1
+
+
+@patch("infrastructure.ai_analyzer.genai.Client")
+def test_chunking_requires_blob_source(mock_client: object) -> None:
+    with pytest.raises(ValueError, match="blob_source and audio_segmenter"):
+        AudioAnalyzer(project_id="project", chunking=TranscriptChunking())
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+from google.genai import errors
+
+from domain.models import Summary
+from infrastructure.ai_analyzer import CACHED_TRANSCRIPT_NOTE, AudioAnalyzer
+from infrastructure.context_cache import ContextCacheRegistry, ContextCaching
+from infrastructure.model_call import ModelCaller, ModelCallPolicy
+
+LONG_TRANSCRIPT = "議事録" * 2000
+SUMMARY_JSON = '{"title": "タイトル", "description": "<p>概要</p>"}'
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _registry(client: MagicMock, clock: _Clock, settings: ContextCaching | None = None) -> ContextCacheRegistry:
+    return ContextCacheRegistry(client, ModelCaller(client), settings or ContextCaching(), clock=clock)
+
+
+def test_registry_reuses_cache_until_close_to_expiry() -> None:
+    client = MagicMock()
+    client.caches.create.side_effect = [SimpleNamespace(name="caches/1"), SimpleNamespace(name="caches/2")]
+    clock = _Clock()
+    registry = _registry(client, clock, ContextCaching(ttl_seconds=3600, min_tokens=10))
+
+    first = registry.get_or_create(model_id="m", text=LONG_TRANSCRIPT, contents=[], display_name="t")
+    second = registry.get_or_create(model_id="m", text=LONG_TRANSCRIPT, contents=[], display_name="t")
+    clock.now = 3400.0
+    renewed = registry.get_or_create(model_id="m", text=LONG_TRANSCRIPT, contents=[], display_name="t")
+
+    assert (first, second, renewed) == ("caches/1", "caches/1", "caches/2")
+    assert client.caches.create.call_args.kwargs["config"].ttl == "3600s"
+
+
+def test_registry_skips_small_payloads_and_remembers_failures() -> None:
+    client = MagicMock()
+    client.caches.create.side_effect = errors.ClientError(
+        400, {"error": {"code": 400, "message": "too small", "status": "INVALID_ARGUMENT"}}
+    )
+    registry = _registry(client, _Clock(), ContextCaching(min_tokens=100))
+
+    assert registry.get_or_create(model_id="m", text="short", contents=[], display_name="t") is None
+    assert registry.get_or_create(model_id="m", text=LONG_TRANSCRIPT, contents=[], display_name="t") is None
+    assert registry.get_or_create(model_id="m", text=LONG_TRANSCRIPT, contents=[], display_name="t") is None
+    assert client.caches.create.call_count == 1
+
+
+def test_registry_does_not_block_other_payloads_while_creating_a_cache() -> None:
+    creating = threading.Event()
+    finish = threading.Event()
+    client = MagicMock()
+
+    def create(*, model: str, config: object) -> SimpleNamespace:
+        if model == "slow":
+            creating.set()
+            assert finish.wait(timeout=5)
+        return SimpleNamespace(name=f"caches/{model}")
+
+    client.caches.create.side_effect = create
+    registry = _registry(client, _Clock(), ContextCaching(min_tokens=10))
+    names: list[str | None] = []
+    slow = threading.Thread(
+        target=lambda: names.append(
+            registry.get_or_create(model_id="slow", text=LONG_TRANSCRIPT, contents=[], display_name="t")
+        )
+    )
+    slow.start()
+    assert creating.wait(timeout=5)
+
+    fast = registry.get_or_create(model_id="fast", text=LONG_TRANSCRIPT, contents=[], display_name="t")
+    finish.set()
+    slow.join(timeout=5)
+
+    assert fast == "caches/fast"
+    assert names == ["caches/slow"]
+
+
+def test_registry_drops_expired_entries_and_releases_a_group() -> None:
+    client = MagicMock()
+    client.caches.create.side_effect = [SimpleNamespace(name="caches/1"), SimpleNamespace(name="caches/2")]
+    clock = _Clock()
+    registry = _registry(client, clock, ContextCaching(ttl_seconds=3600, min_tokens=10))
+
+    registry.get_or_create(model_id="m", text=LONG_TRANSCRIPT, contents=[], display_name="t", group="episode-1")
+    clock.now = 3600.0
+    registry.get_or_create(model_id="m", text=LONG_TRANSCRIPT + "2", contents=[], display_name="t", group="episode-2")
+    registry.release_group("episode-1")
+    registry.release_group("episode-2")
+
+    assert registry._entries == {}
+    # 期限切れのキャッシュはサーバー側でも失効済みのため削除しない
+    client.caches.delete.assert_called_once_with(name="caches/2")
+
+
+@patch("infrastructure.ai_analyzer.genai.Client")
+def test_release_transcript_deletes_the_cache_of_that_transcript_only(mock_client_class: MagicMock) -> None:
+    client = mock_client_class.return_value
+    client.caches.create.side_effect = [SimpleNamespace(name="caches/a"), SimpleNamespace(name="caches/b")]
+    client.models.generate_content.return_value = SimpleNamespace(text=SUMMARY_JSON)
+    analyzer = AudioAnalyzer(project_id="p", context_caching=ContextCaching(min_tokens=100))
+
+    analyzer.summarize_transcript(LONG_TRANSCRIPT, model_id="m")
+    analyzer.summarize_transcript(LONG_TRANSCRIPT + "b", model_id="m")
+    analyzer.release_transcript(LONG_TRANSCRIPT)
+
+    client.caches.delete.assert_called_once_with(name="caches/a")
+
+
+@patch("infrastructure.ai_analyzer.genai.Client")
+def test_summary_and_combined_calls_reference_the_cached_transcript(mock_client_class: MagicMock) -> None:
+    client = mock_client_class.return_value
+    client.caches.create.return_value = SimpleNamespace(name="caches/episode")
+    client.models.generate_content.return_value = SimpleNamespace(text=SUMMARY_JSON)
+    analyzer = AudioAnalyzer(project_id="p", context_caching=ContextCaching(min_tokens=100))
+
+    summary = analyzer.summarize_transcript(LONG_TRANSCRIPT, model_id="m")
+    analyzer.summarize_transcript(LONG_TRANSCRIPT, model_id="m")
+    analyzer.release_context_caches()
+
+    assert summary == Summary(title="タイトル", description="<p>概要</p>")
+    assert client.caches.create.call_count == 1
+    for call in client.models.generate_content.call_args_list:
+        assert call.kwargs["config"].cached_content == "caches/episode"
+        assert LONG_TRANSCRIPT not in call.kwargs["contents"][0]
+        assert CACHED_TRANSCRIPT_NOTE in call.kwargs["contents"][0]
+    client.caches.delete.assert_called_once_with(name="caches/episode")
+
+
+@patch("infrastructure.ai_analyzer.genai.Client")
+def test_summary_resends_transcript_when_cache_is_gone(mock_client_class: MagicMock) -> None:
+    client = mock_client_class.return_value
+    client.caches.create.return_value = SimpleNamespace(name="caches/expired")
+    client.models.generate_content.side_effect = [
+        errors.ClientError(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}}),
+        SimpleNamespace(text=SUMMARY_JSON),
+    ]
+    analyzer = AudioAnalyzer(project_id="p", context_caching=ContextCaching(min_tokens=100))
+
+    analyzer.summarize_transcript(LONG_TRANSCRIPT, model_id="m")
+
+    retry = client.models.generate_content.call_args_list[1]
+    assert retry.kwargs["config"].cached_content is None
+    assert LONG_TRANSCRIPT in retry.kwargs["contents"][0]
+
+
+def test_registry_sends_inline_when_cache_creation_times_out() -> None:
+    client = MagicMock()
+    client.caches.create.side_effect = httpx.ConnectTimeout("timed out")
+    registry = ContextCacheRegistry(
+        client, ModelCaller(client, ModelCallPolicy(max_attempts=1)), ContextCaching(min_tokens=100), clock=_Clock()
+    )
+
+    assert registry.get_or_create(model_id="m", text=LONG_TRANSCRIPT, contents=[], display_name="t") is None
+    assert registry.get_or_create(model_id="m", text=LONG_TRANSCRIPT, contents=[], display_name="t") is None
+    assert client.caches.create.call_count == 1
+
+
+@patch("infrastructure.ai_analyzer.genai.Client")
+def test_streamed_summary_resends_transcript_when_cache_is_gone(mock_client_class: MagicMock) -> None:
+    client = mock_client_class.return_value
+    client.caches.create.return_value = SimpleNamespace(name="caches/expired")
+    client.models.generate_content_stream.side_effect = [
+        errors.ClientError(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}}),
+        iter([SimpleNamespace(text=SUMMARY_JSON)]),
+    ]
+    analyzer = AudioAnalyzer(project_id="p", streaming=True, context_caching=ContextCaching(min_tokens=100))
+
+    summary = analyzer.summarize_transcript(LONG_TRANSCRIPT, model_id="m")
+
+    assert summary == Summary(title="タイトル", description="<p>概要</p>")
+    first, retry = client.models.generate_content_stream.call_args_list
+    assert first.kwargs["config"].cached_content == "caches/expired"
+    assert retry.kwargs["config"].cached_content is None
+    assert LONG_TRANSCRIPT in retry.kwargs["contents"][0]
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import pytest
 
-from entrypoints.agenda_main import AgendaEnvConfig, _fetch_and_reconstruct
-from entrypoints.main import _load_podcast_env
+from entrypoints.agenda_main import AgendaEnvConfig, _fetch_and_reconstruct, _load_agenda_env
+from entrypoints.backfill_main import _load_backfill_env, read_manifest
+from entrypoints.main import load_podcast_env
+from entrypoints.worker_main import _load_worker_env, enqueue_objects
+from infrastructure.work_queue import InMemoryEpisodeWorkQueue
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 def _base_env() -> dict[str, str]:
@@ -23,18 +31,28 @@ def test_load_podcast_env_requires_database_url() -> None:
     del env["DATABASE_URL"]
 
     with pytest.raises(ValueError, match="DATABASE_URL"):
-        _load_podcast_env(env)
+        load_podcast_env(env)
 
 
 def test_load_podcast_env_does_not_require_fixed_podcast_id() -> None:
-    config = _load_podcast_env(_base_env())
+    config = load_podcast_env(_base_env())
 
     assert config.database_url.startswith("postgresql://")
 
 
+def test_load_podcast_env_rejects_chunk_not_longer_than_overlap() -> None:
+    env = _base_env() | {"TRANSCRIPT_CHUNK_SECONDS": "10", "TRANSCRIPT_CHUNK_OVERLAP_SECONDS": "10"}
+
+    with pytest.raises(ValueError, match="TRANSCRIPT_CHUNK_SECONDS"):
+        load_podcast_env(env)
+
+
 class _FakeFirestoreManager:
-    def list_recent_transcript_episodes(self, *, podcast_id: str, limit: int) -> list[dict[str, object]]:
+    def list_recent_transcript_episodes(
+        self, *, podcast_id: str, limit: int, transcript_cache: object = None
+    ) -> list[dict[str, object]]:
         assert podcast_id == "1"
+        assert transcript_cache is None
         assert limit == 5
         return [
             {
@@ -71,3 +89,107 @@ def test_agenda_fetch_prefers_firestore_transcripts(monkeypatch: pytest.MonkeyPa
     assert result is not None
     assert result.analyzed_episodes == 1
     assert result.metadata.source_episode_numbers == [42]
+
+
+def test_load_agenda_env_validates_the_transcript_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert _load_agenda_env().transcript_cache_backend == "none"
+
+    monkeypatch.setenv("AGENDA_TRANSCRIPT_CACHE_BACKEND", "gcs")
+    with pytest.raises(ValueError, match="AGENDA_TRANSCRIPT_CACHE_URI"):
+        _load_agenda_env()
+
+    monkeypatch.setenv("AGENDA_TRANSCRIPT_CACHE_URI", "gs://bucket/agenda/transcripts.sqlite3")
+    assert _load_agenda_env().transcript_cache_uri == "gs://bucket/agenda/transcripts.sqlite3"
+
+    monkeypatch.setenv("AGENDA_TRANSCRIPT_CACHE_BACKEND", "redis")
+    with pytest.raises(ValueError, match="AGENDA_TRANSCRIPT_CACHE_BACKEND"):
+        _load_agenda_env()
+
+
+def test_load_backfill_env_requires_staging_uri_for_vertex() -> None:
+    env = {
+        "PROJECT_ID": "project",
+        "BACKFILL_MANIFEST": "episodes.txt",
+        "R2_BUCKET": "r2",
+        "CLOUDFLARE_ACCESS_KEY_ID": "access",
+        "CLOUDFLARE_SECRET_ACCESS_KEY": "secret",
+    }
+
+    with pytest.raises(ValueError, match="BACKFILL_STAGING_URI"):
+        _load_backfill_env(env)
+    assert _load_backfill_env(env | {"BACKFILL_BATCH_BACKEND": "local"}).regenerate_transcripts
+
+
+def test_read_manifest_skips_comments_and_blank_lines(tmp_path: Path) -> None:
+    manifest = tmp_path / "episodes.txt"
+    manifest.write_text("# archive\ngs://bucket/podcasts/1/episodes/1/source/a.m4a\n\n", encoding="utf-8")
+
+    assert read_manifest(str(manifest)) == ["gs://bucket/podcasts/1/episodes/1/source/a.m4a"]
+
+
+def test_load_podcast_env_context_cache_disabled_by_default() -> None:
+    assert load_podcast_env(_base_env()).ai_context_cache_ttl_seconds == 0
+
+    with pytest.raises(ValueError, match="AI_CONTEXT_CACHE_TTL_SECONDS"):
+        load_podcast_env(_base_env() | {"AI_CONTEXT_CACHE_TTL_SECONDS": "-1"})
+
+
+def test_load_podcast_env_tracing_is_disabled_by_default() -> None:
+    config = load_podcast_env(_base_env())
+    assert (config.workflow_trace_log, config.workflow_trace_file) == (False, None)
+
+    config = load_podcast_env(_base_env() | {"WORKFLOW_TRACE_LOG": "true", "WORKFLOW_TRACE_FILE": "traces.jsonl"})
+    assert (config.workflow_trace_log, config.workflow_trace_file) == (True, "traces.jsonl")
+
+
+def test_load_podcast_env_batch_mode_does_not_require_trigger_object() -> None:
+    env = _base_env()
+    del env["GCS_TRIGGER_OBJECT_NAME"]
+
+    with pytest.raises(ValueError, match="GCS_TRIGGER_OBJECT_NAME"):
+        load_podcast_env(env)
+    config = load_podcast_env(env | {"BATCH_SOURCE_PREFIX": "podcasts/1/episodes/"})
+    assert config.batch_mode
+    assert config.batch_max_parallel_episodes == 2
+    with pytest.raises(ValueError, match="BATCH_MANIFEST"):
+        load_podcast_env(env | {"BATCH_SOURCE_PREFIX": "podcasts/", "BATCH_MANIFEST": "episodes.txt"})
+
+
+def test_load_podcast_env_memory_budget_is_disabled_by_default() -> None:
+    assert load_podcast_env(_base_env()).workflow_memory_budget_mb == 0
+    config = load_podcast_env(_base_env() | {"WORKFLOW_MEMORY_BUDGET_MB": "512", "WORKFLOW_TEMP_DIR": "/scratch"})
+    assert (config.workflow_memory_budget_mb, config.workflow_temp_dir) == (512, "/scratch")
+    with pytest.raises(ValueError, match="WORKFLOW_MEMORY_BUDGET_MB"):
+        load_podcast_env(_base_env() | {"WORKFLOW_MEMORY_BUDGET_MB": "-1"})
+
+
+def test_load_podcast_env_async_firestore_writes_are_opt_in() -> None:
+    assert not load_podcast_env(_base_env()).firestore_async_writes
+    assert load_podcast_env(_base_env() | {"FIRESTORE_ASYNC_WRITES": "true"}).firestore_async_writes
+
+
+def test_worker_env_does_not_require_trigger_object() -> None:
+    env = _base_env()
+    del env["GCS_TRIGGER_OBJECT_NAME"]
+
+    config = load_podcast_env(env, require_trigger_object=False)
+    assert config.gcs_trigger_object_name == ""
+    assert _load_worker_env({}).max_concurrency == 2
+    with pytest.raises(ValueError, match="WORKER_MAX_CONCURRENCY"):
+        _load_worker_env({"WORKER_MAX_CONCURRENCY": "0"})
+
+
+def test_enqueue_objects_accepts_uris_in_the_source_bucket() -> None:
+    queue = InMemoryEpisodeWorkQueue()
+
+    item_ids = enqueue_objects(
+        queue,
+        ["gs://bucket/podcasts/1/episodes/1/source/a.mp3", "podcasts/1/episodes/2/source/b.mp3"],
+        gcs_bucket="bucket",
+    )
+
+    items = queue.claim(worker_id="worker", limit=10, visibility_seconds=60, max_attempts=3)
+    assert [item.item_id for item in items] == item_ids
+    assert items[0].object_name == "podcasts/1/episodes/1/source/a.mp3"
+    with pytest.raises(ValueError, match="GCS_BUCKET"):
+        enqueue_objects(queue, ["gs://other/a.mp3"], gcs_bucket="bucket")
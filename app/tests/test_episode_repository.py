@@ -4,6 +4,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from domain.interfaces import EpisodeLeaseLostError
 from infrastructure.episode_repository import PostgresEpisodeRepository
 
 
@@ -35,7 +36,8 @@ def test_mark_processing_updates_expected_episode() -> None:
 
 
 def test_repository_raises_when_episode_does_not_exist() -> None:
-    connection, _cursor = _connection_with_rowcount(0)
+    connection, cursor = _connection_with_rowcount(0)
+    cursor.fetchone.return_value = None
 
     with (
         patch("infrastructure.episode_repository.psycopg.connect", return_value=connection),
@@ -44,5 +46,109 @@ def test_repository_raises_when_episode_does_not_exist() -> None:
         PostgresEpisodeRepository(database_url="postgresql://example").mark_failed(
             podcast_id=1,
             episode_id=42,
+            owner="run-a",
             error_message="failed",
         )
+
+
+def test_mark_completed_only_updates_while_owner_holds_the_lease() -> None:
+    connection, cursor = _connection_with_rowcount()
+
+    with patch("infrastructure.episode_repository.psycopg.connect", return_value=connection):
+        PostgresEpisodeRepository(database_url="postgresql://example").mark_completed(
+            podcast_id=1,
+            episode_id=42,
+            owner="run-a",
+            title="title",
+            description="description",
+            audio_url="https://podcast.example.com/ep/1/audio.mp3",
+            duration_seconds=60,
+        )
+
+    statement, parameters = cursor.execute.call_args.args
+    assert "AND lease_owner = %s" in statement
+    assert parameters[-3:] == (1, 42, "run-a")
+
+
+def test_mark_failed_raises_lease_lost_when_another_run_took_over() -> None:
+    connection, cursor = _connection_with_rowcount(0)
+    # 条件付き UPDATE は 0 行で、エピソード自体は存在する (別の実行がリースを取得し直した)
+    cursor.fetchone.return_value = (1,)
+
+    with (
+        patch("infrastructure.episode_repository.psycopg.connect", return_value=connection),
+        pytest.raises(EpisodeLeaseLostError, match="podcast_id=1, episode_id=42"),
+    ):
+        PostgresEpisodeRepository(database_url="postgresql://example").mark_failed(
+            podcast_id=1,
+            episode_id=42,
+            owner="run-a",
+            error_message="failed",
+        )
+
+    assert "AND lease_owner = %s" in cursor.execute.call_args_list[0].args[0]
+
+
+def test_claim_processing_reports_a_live_lease_held_by_another_run() -> None:
+    connection, cursor = _connection_with_rowcount()
+    # UPDATE ... RETURNING が 0 行 (リース保持中) で、エピソード自体は存在する
+    cursor.fetchone.side_effect = [None, (1,)]
+
+    with patch("infrastructure.episode_repository.psycopg.connect", return_value=connection):
+        claimed = PostgresEpisodeRepository(database_url="postgresql://example").claim_processing(
+            podcast_id=1,
+            episode_id=42,
+            source_audio_path="podcasts/1/episodes/42/source/audio.mp3",
+            owner="run-b",
+            lease_seconds=900,
+        )
+
+    assert claimed is False
+    claim_statement, parameters = cursor.execute.call_args_list[0].args
+    assert "lease_expires_at < now()" in claim_statement
+    assert "RETURNING" in claim_statement
+    assert parameters == (
+        "podcasts/1/episodes/42/source/audio.mp3",
+        "run-b",
+        900,
+        1,
+        42,
+        "podcasts/1/episodes/42/source/audio.mp3",
+    )
+
+
+def test_claim_processing_refuses_a_completed_episode_with_the_same_source() -> None:
+    connection, cursor = _connection_with_rowcount()
+    # 完了済みのエピソードへの重複配信: UPDATE ... RETURNING は 0 行で、エピソード自体は存在する
+    cursor.fetchone.side_effect = [None, (1,)]
+
+    with patch("infrastructure.episode_repository.psycopg.connect", return_value=connection):
+        claimed = PostgresEpisodeRepository(database_url="postgresql://example").claim_processing(
+            podcast_id=1,
+            episode_id=42,
+            source_audio_path="podcasts/1/episodes/42/source/audio.mp3",
+            owner="run-c",
+            lease_seconds=900,
+        )
+
+    assert claimed is False
+    claim_statement, parameters = cursor.execute.call_args_list[0].args
+    assert "status <> 'completed' OR source_audio_path IS DISTINCT FROM %s" in claim_statement
+    assert parameters[-1] == "podcasts/1/episodes/42/source/audio.mp3"
+
+
+def test_claim_processing_raises_when_episode_does_not_exist() -> None:
+    connection, cursor = _connection_with_rowcount()
+    cursor.fetchone.side_effect = [None, None]
+
+    with (
+        patch("infrastructure.episode_repository.psycopg.connect", return_value=connection),
+        pytest.raises(LookupError, match="podcast_id=1, episode_id=42"),
+    ):
+        PostgresEpisodeRepository(database_url="postgresql://example").claim_processing(
+            podcast_id=1,
+            episode_id=42,
+            source_audio_path="podcasts/1/episodes/42/source/audio.mp3",
+            owner="run-a",
+            lease_seconds=900,
+        )
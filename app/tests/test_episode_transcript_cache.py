@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import shutil
+from typing import TYPE_CHECKING
+
+from google.api_core.exceptions import NotFound
+
+from infrastructure.episode_transcript_cache import GcsEpisodeTranscriptCache, SqliteEpisodeTranscriptCache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class _FakeGcsClient:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.uploads: list[str] = []
+
+    def download_blob(self, bucket_name: str, object_name: str, destination_file_path: str) -> None:
+        source = self.root / bucket_name / object_name
+        if not source.exists():
+            msg = "No such object"
+            raise NotFound(msg)
+        shutil.copyfile(source, destination_file_path)
+
+    def upload_blob(
+        self, bucket_name: str, source_file_path: str, destination_object_name: str, content_type: str | None = None
+    ) -> None:
+        destination = self.root / bucket_name / destination_object_name
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source_file_path, destination)
+        self.uploads.append(f"{destination_object_name} ({content_type})")
+
+
+def test_sqlite_cache_returns_only_entries_with_the_same_updated_at(tmp_path: Path) -> None:
+    cache = SqliteEpisodeTranscriptCache(tmp_path / "cache.sqlite3")
+    cache.put_many("podcast-1", {"ep-1": ("t1", "first"), "ep-2": ("t1", "second")})
+    cache.put_many("podcast-1", {"ep-2": ("t2", "second, edited")})
+
+    reopened = SqliteEpisodeTranscriptCache(tmp_path / "cache.sqlite3")
+
+    assert reopened.get_many("podcast-1", {"ep-1": "t1", "ep-2": "t1", "ep-3": "t1"}) == {"ep-1": "first"}
+    assert reopened.get_many("podcast-1", {"ep-2": "t2"}) == {"ep-2": "second, edited"}
+    assert reopened.get_many("podcast-2", {"ep-1": "t1"}) == {}
+
+
+def test_gcs_cache_starts_empty_and_uploads_only_after_changes(tmp_path: Path) -> None:
+    gcs_client = _FakeGcsClient(tmp_path / "gcs")
+    uri = "gs://bucket/agenda/transcripts.sqlite3"
+
+    first = GcsEpisodeTranscriptCache(gcs_client=gcs_client, gcs_uri=uri, local_dir=tmp_path / "run-1")  # type: ignore[arg-type]
+    assert first.get_many("podcast-1", {"ep-1": "t1"}) == {}
+    assert not first.persist()
+    first.put_many("podcast-1", {"ep-1": ("t1", "first")})
+    assert first.persist()
+    assert not first.persist()
+
+    second = GcsEpisodeTranscriptCache(gcs_client=gcs_client, gcs_uri=uri, local_dir=tmp_path / "run-2")  # type: ignore[arg-type]
+    assert second.get_many("podcast-1", {"ep-1": "t1"}) == {"ep-1": "first"}
+    assert gcs_client.uploads == ["agenda/transcripts.sqlite3 (application/vnd.sqlite3)"]
@@ -1,8 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import threading
+import zlib
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
 
-from services.firestore_manager import FirestoreManager
+from domain.models import SnsPromotionRecord
+from infrastructure.episode_transcript_cache import SqliteEpisodeTranscriptCache
+from services.firestore_manager import AsyncFirestoreManager, FirestoreManager
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
 
 
 @dataclass
@@ -21,6 +34,13 @@ class _FakeDocRef:
         self.set_calls.append((data, merge))
         self.data = data
 
+    def delete(self) -> None:
+        if hasattr(self, "data"):
+            del self.data
+
+    def get(self, field_paths: list[str] | None = None) -> _FakeDocRef:  # noqa: ARG002
+        return self
+
     def collection(self, name: str) -> _FakeCollectionRef:
         return self._collections.setdefault(name, _FakeCollectionRef(f"{self.path}/{name}"))
 
@@ -31,6 +51,10 @@ class _FakeDocRef:
     def reference(self) -> _FakeDocRef:
         return self
 
+    @property
+    def exists(self) -> bool:
+        return hasattr(self, "data")
+
 
 @dataclass
 class _FakeCollectionRef:
@@ -45,24 +69,37 @@ class _FakeCollectionRef:
     def order_by(self, *_args: object, **_kwargs: object) -> _FakeCollectionRef:
         return self
 
+    def select(self, _field_paths: list[str]) -> _FakeCollectionRef:
+        return self
+
     def limit(self, count: int) -> _FakeCollectionRef:
         self._limit = count
         return self
 
     def stream(self) -> list[_FakeDocRef]:
-        docs = list(self.documents.values())
+        docs = [doc for doc in self.documents.values() if doc.exists]
         return docs[: getattr(self, "_limit", len(docs))]
 
 
 class _FakeBatch:
+    """Shared by every batch() call; writes are applied to the fake documents immediately."""
+
     def __init__(self) -> None:
-        self.operations: list[tuple[str, dict[str, object]]] = []
+        self.operations: list[tuple[str, dict[str, object] | None]] = []
+        self.commits = 0
+        self._lock = threading.Lock()
 
-    def set(self, doc_ref: _FakeDocRef, data: dict[str, object]) -> None:
+    def set(self, doc_ref: _FakeDocRef, data: dict[str, object], merge: bool = False) -> None:  # noqa: FBT001, FBT002
         self.operations.append((doc_ref.path, data))
+        doc_ref.data = {**doc_ref.to_dict(), **data} if merge else data
+
+    def delete(self, doc_ref: _FakeDocRef) -> None:
+        self.operations.append((doc_ref.path, None))
+        doc_ref.delete()
 
     def commit(self) -> None:
-        return None
+        with self._lock:
+            self.commits += 1
 
 
 class _FakeClient:
@@ -76,6 +113,9 @@ class _FakeClient:
     def batch(self) -> _FakeBatch:
         return self.batch_instance
 
+    def get_all(self, refs: list[_FakeDocRef], field_paths: list[str] | None = None) -> list[_FakeDocRef]:  # noqa: ARG002
+        return refs
+
 
 def test_save_episode_content_writes_expected_document() -> None:
     client = _FakeClient()
@@ -131,6 +171,87 @@ def test_save_transcript_chunks_writes_batch_documents() -> None:
     )
 
 
+def test_save_transcript_chunks_writes_compressed_full_text_in_the_same_batch() -> None:
+    client = _FakeClient()
+    manager = FirestoreManager(project_id="demo", client=client)
+    transcript = "first paragraph\n\n" + "B" * 1300
+
+    manager.save_transcript_chunks(podcast_id="podcast-1", episode_id="episode-42", transcript=transcript)
+
+    path, blob = client.batch_instance.operations[-1]
+    assert path == "podcasts/podcast-1/episodes_contents/episode-42/transcript_blob/full"
+    assert blob["encoding"] == "zlib"
+    assert zlib.decompress(blob["data"]).decode("utf-8") == transcript
+    assert blob["sha256"] == hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+    assert blob["chunk_count"] == 3
+    assert client.batch_instance.commits == 1
+
+
+def test_transcript_reads_prefer_the_compressed_blob_and_fall_back_to_chunks() -> None:
+    client = _FakeClient()
+    manager = FirestoreManager(project_id="demo", client=client)
+    collection = client.collection("podcasts").document("podcast-1").collection("episodes_contents")
+    for number in (1, 2):
+        episode_doc = collection.document(f"ep-{number}")
+        episode_doc.set({"episode_number": number}, merge=True)
+        manager.save_transcript_chunks(podcast_id="podcast-1", episode_id=f"ep-{number}", transcript=f"blob {number}")
+        # 全文とチャンクが食い違う状態を作り、どちらから読んだかを区別する
+        episode_doc.collection("transcripts").document("chunk_0001").set({"text": f"chunk {number}"}, merge=False)
+    collection.document("ep-2").collection("transcript_blob").document("full").data["sha256"] = "corrupted"
+
+    result = manager.list_recent_transcript_episodes(podcast_id="podcast-1", limit=10)
+
+    # ep-1 は全文ドキュメントから、ハッシュが一致しない ep-2 はチャンクから読む
+    assert [episode["content"] for episode in result] == ["blob 1", "chunk 2"]
+    assert manager.get_transcript(podcast_id="podcast-1", episode_id="ep-1") == "blob 1"
+
+
+def test_save_transcript_chunks_rewrites_only_changed_chunks_and_deletes_stale_ones() -> None:
+    client = _FakeClient()
+    manager = FirestoreManager(project_id="demo", client=client)
+    transcripts = (
+        client.collection("podcasts")
+        .document("podcast-1")
+        .collection("episodes_contents")
+        .document("ep-1")
+        .collection("transcripts")
+    )
+    paragraphs = [f"{letter * 700}" for letter in "ABCD"]
+    manager.save_transcript_chunks(podcast_id="podcast-1", episode_id="ep-1", transcript="\n\n".join(paragraphs))
+    assert sorted(transcripts.documents) == ["chunk_0001", "chunk_0002", "chunk_0003", "chunk_0004"]
+    client.batch_instance.operations.clear()
+
+    # 2 段落目だけ変更し、末尾の段落を削除して再保存する
+    saved_ids = manager.save_transcript_chunks(
+        podcast_id="podcast-1", episode_id="ep-1", transcript="\n\n".join([paragraphs[0], "X" * 700, paragraphs[2]])
+    )
+
+    assert saved_ids == ["chunk_0001", "chunk_0002", "chunk_0003"]
+    written = {
+        path.rsplit("/", 2)[-2] + "/" + path.rsplit("/", 1)[-1]: data for path, data in client.batch_instance.operations
+    }
+    assert written.keys() == {"transcripts/chunk_0002", "transcripts/chunk_0004", "transcript_blob/full"}
+    assert written["transcripts/chunk_0004"] is None
+    assert [doc.id for doc in transcripts.stream()] == ["chunk_0001", "chunk_0002", "chunk_0003"]
+
+
+def test_large_writes_are_split_into_batches_committed_in_parallel() -> None:
+    client = _FakeClient()
+    manager = FirestoreManager(project_id="demo", client=client)
+
+    saved_ids = manager.save_transcript_chunks(
+        podcast_id="podcast-1",
+        episode_id="ep-1",
+        transcript="\n\n".join(f"paragraph {index}" for index in range(1200)),
+        chunk_size=20,
+    )
+
+    # 1,200 チャンク + 全文 1 件 = 1,201 件の書き込みを 500 件ずつ 3 バッチに分ける
+    assert len(saved_ids) == 1200
+    assert len(client.batch_instance.operations) == 1201
+    assert client.batch_instance.commits == 3
+
+
 def test_create_sns_promotion_writes_pending_record() -> None:
     client = _FakeClient()
     manager = FirestoreManager(project_id="demo", client=client)
@@ -157,6 +278,47 @@ def test_create_sns_promotion_writes_pending_record() -> None:
         .document("promotion-1")
     )
     assert doc_ref.set_calls[0][0]["status"] == "pending"
+    assert doc_ref.set_calls[0][0]["scheduled_time"] == "2026-06-16T11:00:00.000000+00:00"
+
+
+def test_get_pending_sns_promotions_filters_orders_and_limits_due_promotions_in_the_query() -> None:
+    client = MagicMock()
+    pending = client.collection_group.return_value.where.return_value
+    projected = pending.select.return_value
+    query = projected.where.return_value.order_by.return_value
+    doc = MagicMock(id="promotion-1")
+    doc.to_dict.return_value = {"scheduled_time": "2026-06-16T11:00:00.000000+00:00", "message": "hello"}
+    doc.reference.path = "podcasts/p/episodes_contents/e/sns_promotions/promotion-1"
+    query.limit.return_value.stream.return_value = [doc]
+    manager = FirestoreManager(project_id="demo", client=client)
+
+    result = manager.get_pending_sns_promotions(
+        due_at=datetime(2026, 6, 16, 21, 0, tzinfo=timezone(timedelta(hours=9))), limit=5
+    )
+
+    client.collection_group.assert_called_once_with("sns_promotions")
+    client.collection_group.return_value.where.assert_called_once_with("status", "==", "pending")
+    pending.select.assert_called_once_with(["scheduled_time", "message", "episode.number", "platform_urls", "hashtags"])
+    projected.where.assert_called_once_with("scheduled_time", "<=", "2026-06-16T12:00:00.000000+00:00")
+    projected.where.return_value.order_by.assert_called_once_with("scheduled_time")
+    query.limit.assert_called_once_with(5)
+    assert [(item["doc_id"], item["reference_path"]) for item in result] == [
+        ("promotion-1", "podcasts/p/episodes_contents/e/sns_promotions/promotion-1")
+    ]
+
+
+def test_read_apis_project_only_the_fields_their_callers_use() -> None:
+    client = MagicMock()
+    client.get_all.return_value = []
+    manager = FirestoreManager(project_id="demo", client=client)
+    episodes = client.collection.return_value.document.return_value.collection.return_value
+
+    manager.get_episode_contents(podcast_id="podcast-1", episode_ids=["ep-1"])
+    manager.get_episode_contents(podcast_id="podcast-1", episode_ids=["ep-1"], fields=None)
+    manager.list_recent_transcript_episodes(podcast_id="podcast-1", limit=10)
+
+    assert [call.kwargs["field_paths"] for call in client.get_all.call_args_list] == [["episode_number"], None]
+    episodes.select.assert_called_once_with(["episode_number", "updated_at", "transcript_summary"])
 
 
 def test_create_topic_proposal_writes_top_level_document() -> None:
@@ -204,3 +366,230 @@ def test_list_recent_transcript_episodes_reads_transcript_chunks() -> None:
             "updated_at": "2026-06-30T00:00:00Z",
         }
     ]
+
+
+def test_list_recent_transcript_episodes_reads_subcollections_concurrently() -> None:
+    client = _FakeClient()
+    manager = FirestoreManager(project_id="demo", client=client)
+    collection = client.collection("podcasts").document("podcast-1").collection("episodes_contents")
+    for number in (3, 1, 2):
+        collection.document(f"ep-{number}").set({"episode_number": number}, merge=True)
+    # 3 件の読み込みが同時に実行されていなければ Barrier がタイムアウトする
+    barrier = threading.Barrier(3, timeout=5)
+
+    def read_transcript(episode_ref: _FakeDocRef) -> str:
+        barrier.wait()
+        return f"text of {episode_ref.id}"
+
+    with patch("services.firestore_manager._read_transcript", side_effect=read_transcript):
+        result = manager.list_recent_transcript_episodes(podcast_id="podcast-1", limit=10, max_parallel_reads=3)
+
+    assert [(episode["episode_id"], episode["content"]) for episode in result] == [
+        ("ep-1", "text of ep-1"),
+        ("ep-2", "text of ep-2"),
+        ("ep-3", "text of ep-3"),
+    ]
+
+
+def test_list_recent_transcript_episodes_reads_only_new_or_updated_episodes_through_the_cache(
+    tmp_path: Path,
+) -> None:
+    client = _FakeClient()
+    manager = FirestoreManager(project_id="demo", client=client)
+    cache = SqliteEpisodeTranscriptCache(tmp_path / "cache.sqlite3")
+    for number in (1, 2):
+        manager.save_episode_content(
+            podcast_id="podcast-1",
+            episode_id=f"ep-{number}",
+            episode_number=number,
+            updated_at="2026-06-01T00:00:00Z",
+            transcript_summary="",
+            ai_generated_meta={},
+            show_notes_summary={},
+            audio_metadata={},
+        )
+        manager.save_transcript_chunks(podcast_id="podcast-1", episode_id=f"ep-{number}", transcript=f"v1 of {number}")
+    manager.list_recent_transcript_episodes(podcast_id="podcast-1", limit=10, transcript_cache=cache)
+
+    manager.update_episode_contents(podcast_id="podcast-1", updates={"ep-2": {"updated_at": "2026-06-08T00:00:00Z"}})
+    manager.save_transcript_chunks(podcast_id="podcast-1", episode_id="ep-2", transcript="v2 of 2")
+    with patch.object(manager, "_read_transcript_blobs", wraps=manager._read_transcript_blobs) as read_blobs:
+        result = manager.list_recent_transcript_episodes(podcast_id="podcast-1", limit=10, transcript_cache=cache)
+
+    read_blobs.assert_called_once_with("podcast-1", ["ep-2"])
+    assert [episode["content"] for episode in result] == ["v1 of 1", "v2 of 2"]
+    assert cache.get_many("podcast-1", {"ep-2": "2026-06-08T00:00:00Z"}) == {"ep-2": "v2 of 2"}
+
+
+def test_list_recent_transcript_episodes_does_not_cache_empty_transcripts(tmp_path: Path) -> None:
+    client = _FakeClient()
+    manager = FirestoreManager(project_id="demo", client=client)
+    cache = SqliteEpisodeTranscriptCache(tmp_path / "cache.sqlite3")
+    manager.save_episode_content(
+        podcast_id="podcast-1",
+        episode_id="ep-1",
+        episode_number=1,
+        updated_at="2026-06-01T00:00:00Z",
+        transcript_summary="",
+        ai_generated_meta={},
+        show_notes_summary={},
+        audio_metadata={},
+    )
+
+    manager.list_recent_transcript_episodes(podcast_id="podcast-1", limit=10, transcript_cache=cache)
+
+    assert cache.get_many("podcast-1", {"ep-1": "2026-06-01T00:00:00Z"}) == {}
+
+
+def test_update_episode_contents_splits_writes_into_batches() -> None:
+    client = _FakeClient()
+    manager = FirestoreManager(project_id="demo", client=client)
+
+    updated = manager.update_episode_contents(
+        podcast_id="podcast-1",
+        updates={f"ep-{index}": {"transcript_summary": str(index)} for index in range(501)},
+    )
+
+    assert updated == 501
+    assert len(client.batch_instance.operations) == 501
+    assert client.batch_instance.commits == 2
+
+
+def test_get_episode_contents_and_transcript() -> None:
+    client = _FakeClient()
+    manager = FirestoreManager(project_id="demo", client=client)
+    episode_doc = client.collection("podcasts").document("podcast-1").collection("episodes_contents").document("ep-1")
+    episode_doc.set({"episode_number": 1}, merge=True)
+    episode_doc.collection("transcripts").document("chunk_0001").set({"text": "part 1"}, merge=False)
+
+    contents = manager.get_episode_contents(podcast_id="podcast-1", episode_ids=["ep-1", "ep-missing"])
+
+    assert contents == {"ep-1": {"episode_number": 1}}
+    assert manager.get_transcript(podcast_id="podcast-1", episode_id="ep-1") == "part 1"
+
+
+class _InFlight:
+    """Counts async writes that are awaiting their round trip at the same time."""
+
+    def __init__(self) -> None:
+        self.current = 0
+        self.peak = 0
+
+    async def round_trip(self) -> None:
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+        await asyncio.sleep(0.01)
+        self.current -= 1
+
+
+class _FakeAsyncDocRef:
+    def __init__(self, ref: _FakeDocRef, in_flight: _InFlight) -> None:
+        self.ref = ref
+        self.id = ref.id
+        self._in_flight = in_flight
+
+    def collection(self, name: str) -> _FakeAsyncCollectionRef:
+        return _FakeAsyncCollectionRef(self.ref.collection(name), self._in_flight)
+
+    async def set(self, data: dict[str, object], merge: bool = False) -> None:  # noqa: FBT001, FBT002
+        await self._in_flight.round_trip()
+        self.ref.data = {**self.ref.to_dict(), **data} if merge else data
+
+    async def get(self, field_paths: list[str] | None = None) -> _FakeDocRef:
+        return self.ref.get(field_paths)
+
+
+class _FakeAsyncCollectionRef:
+    def __init__(self, collection: _FakeCollectionRef, in_flight: _InFlight) -> None:
+        self._collection = collection
+        self._in_flight = in_flight
+
+    def document(self, doc_id: str) -> _FakeAsyncDocRef:
+        return _FakeAsyncDocRef(self._collection.document(doc_id), self._in_flight)
+
+    def select(self, _field_paths: list[str]) -> _FakeAsyncCollectionRef:
+        return self
+
+    async def stream(self) -> AsyncIterator[_FakeDocRef]:
+        for doc in self._collection.stream():
+            yield doc
+
+
+class _FakeAsyncBatch:
+    def __init__(self, batch: _FakeBatch, in_flight: _InFlight) -> None:
+        self._batch = batch
+        self._in_flight = in_flight
+
+    def set(self, doc_ref: _FakeAsyncDocRef, data: dict[str, object], merge: bool = False) -> None:  # noqa: FBT001, FBT002
+        self._batch.set(doc_ref.ref, data, merge=merge)
+
+    def delete(self, doc_ref: _FakeAsyncDocRef) -> None:
+        self._batch.delete(doc_ref.ref)
+
+    async def commit(self) -> None:
+        await self._in_flight.round_trip()
+        self._batch.commit()
+
+
+class _FakeAsyncClient:
+    def __init__(self, client: _FakeClient) -> None:
+        self._client = client
+        self.in_flight = _InFlight()
+        self.closed = False
+
+    def collection(self, name: str) -> _FakeAsyncCollectionRef:
+        return _FakeAsyncCollectionRef(self._client.collection(name), self.in_flight)
+
+    def batch(self) -> _FakeAsyncBatch:
+        return _FakeAsyncBatch(self._client.batch_instance, self.in_flight)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_async_manager_writes_episode_artifacts_concurrently_with_promotions_in_one_batch() -> None:
+    client = _FakeClient()
+    async_client = _FakeAsyncClient(client)
+    manager = AsyncFirestoreManager(project_id="demo", client=async_client)  # type: ignore[arg-type]
+    promotions = [
+        SnsPromotionRecord(
+            promotion_id=f"promotion-{index}",
+            generated_at="2026-06-16T10:00:00Z",
+            scheduled_time=f"2026-06-1{index}T11:00:00+09:00",
+            episode_number=42,
+            message=f"message {index}",
+            hashtags=["#Podcast"],
+        )
+        for index in (6, 7, 8)
+    ]
+
+    manager.run_blocking(
+        manager.save_episode_artifacts(
+            podcast_id="podcast-1",
+            episode_id="ep-1",
+            episode_number=42,
+            updated_at="2026-06-16T10:00:00Z",
+            transcript_summary="summary",
+            ai_generated_meta={},
+            show_notes_summary={},
+            audio_metadata={},
+            transcript="first paragraph\n\nsecond paragraph",
+            promotions=promotions,
+        )
+    )
+    manager.close()
+
+    # エピソード本文の set、文字起こしのバッチ、SNS 投稿文のバッチの 3 つが同時に往復している
+    assert async_client.in_flight.peak == 3
+    assert client.batch_instance.commits == 2
+    assert async_client.closed
+    episode_doc = client.collection("podcasts").document("podcast-1").collection("episodes_contents").document("ep-1")
+    assert episode_doc.to_dict()["episode_number"] == 42
+    sync_manager = FirestoreManager(project_id="demo", client=client)  # type: ignore[arg-type]
+    assert (
+        sync_manager.get_transcript(podcast_id="podcast-1", episode_id="ep-1") == "first paragraph\n\nsecond paragraph"
+    )
+    stored = episode_doc.collection("sns_promotions").document("promotion-6").to_dict()
+    assert stored["scheduled_time"] == "2026-06-16T02:00:00.000000+00:00"
+    assert stored["status"] == "pending"
+    assert sorted(episode_doc.collection("sns_promotions").documents) == ["promotion-6", "promotion-7", "promotion-8"]
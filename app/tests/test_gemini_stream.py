@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from domain.models import Summary
+from infrastructure.ai_analyzer import AudioAnalyzer
+from infrastructure.gemini_stream import StreamAssembler, StreamProgressLogger
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_assembler_records_time_to_first_token() -> None:
+    clock = _Clock()
+    assembler = StreamAssembler(operation="transcript", model_id="model", clock=clock)
+
+    clock.now = 0.5
+    assembler.feed("")
+    clock.now = 1.25
+    assembler.feed("hello ")
+    clock.now = 3.0
+    assembler.feed("world")
+    metrics = assembler.finish()
+
+    assert assembler.text == "hello world"
+    assert metrics.time_to_first_token_seconds == pytest.approx(1.25)
+    assert metrics.total_seconds == pytest.approx(3.0)
+    assert metrics.chunks == 2
+    assert metrics.characters == 11
+
+
+def test_assembler_validates_summary_after_stream() -> None:
+    assembler = StreamAssembler(operation="summary", model_id="model")
+    received: list[str] = []
+
+    assembler.consume(['{"title": "T", ', '"description": "D"}'], on_text=received.append)
+
+    assert assembler.validate(Summary) == Summary(title="T", description="D")
+    assert received == ['{"title": "T", ', '"description": "D"}']
+
+
+def test_assembler_rejects_truncated_json() -> None:
+    assembler = StreamAssembler(operation="summary", model_id="model")
+    assembler.consume(['{"title": "T", "descr'])
+
+    with pytest.raises(ValueError, match="truncated"):
+        assembler.validate(Summary)
+
+
+def test_progress_logger_logs_each_interval(caplog: pytest.LogCaptureFixture) -> None:
+    progress = StreamProgressLogger(interval_chars=10)
+
+    with caplog.at_level("INFO", logger="infrastructure.gemini_stream"):
+        for _ in range(5):
+            progress("transcript", "abcde")
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "Streaming transcript: 10 characters received",
+        "Streaming transcript: 20 characters received",
+    ]
+
+
+@patch("infrastructure.ai_analyzer.genai.Client")
+def test_streaming_analyzer_forwards_deltas(mock_client: object) -> None:
+    models = mock_client.return_value.models  # type: ignore[attr-defined]
+    models.generate_content_stream.side_effect = [
+        iter([SimpleNamespace(text="議事録"), SimpleNamespace(text=None), SimpleNamespace(text="本文")]),
+        iter([SimpleNamespace(text='{"title": "T",'), SimpleNamespace(text=' "description": "D"}')]),
+    ]
+    forwarded: list[tuple[str, str]] = []
+    analyzer = AudioAnalyzer(
+        project_id="project",
+        streaming=True,
+        on_stream_text=lambda operation, text: forwarded.append((operation, text)),
+    )
+
+    transcript = analyzer.generate_transcript("gs://bucket/a.mp3", model_id="model")
+    summary = analyzer.summarize_transcript(transcript or "", model_id="model")
+
+    assert transcript == "議事録本文"
+    assert summary == Summary(title="T", description="D")
+    assert forwarded[:2] == [("transcript", "議事録"), ("transcript", "本文")]
+    models.generate_content.assert_not_called()
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from infrastructure.memory import RssMonitor, current_rss_bytes
+
+
+def test_rss_monitor_records_the_peak_inside_the_block() -> None:
+    monitor = RssMonitor(interval_seconds=0.01)
+    baseline = current_rss_bytes()
+
+    with monitor.track() as window:
+        buffer = bytearray(64 * 2**20)
+        buffer[::4096] = b"x" * len(buffer[::4096])
+
+    assert window.peak_bytes >= baseline + 48 * 2**20
+    del buffer
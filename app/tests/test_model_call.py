@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+# ruff: noqa: ARG005
+import threading
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+from google.genai import errors
+from google.genai.types import GenerateContentConfig
+
+from infrastructure.model_call import ModelCaller, ModelCallMetrics, ModelCallPolicy
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def _server_error(code: int = 503) -> errors.APIError:
+    return errors.ServerError(code, {"error": {"code": code, "message": "busy", "status": "UNAVAILABLE"}})
+
+
+def _caller(policy: ModelCallPolicy, metrics: list[ModelCallMetrics], sleeps: list[float]) -> ModelCaller:
+    return ModelCaller(
+        MagicMock(),
+        policy,
+        metrics_sink=metrics.append,
+        sleep=sleeps.append,
+        jitter=lambda: 1.0,
+    )
+
+
+def test_retries_retryable_errors_with_exponential_backoff() -> None:
+    metrics: list[ModelCallMetrics] = []
+    sleeps: list[float] = []
+    outcomes: list[object] = [_server_error(503), _server_error(429), "ok"]
+
+    def request(timeout_seconds: float) -> object:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    caller = _caller(ModelCallPolicy(initial_backoff_seconds=1.0, max_backoff_seconds=10.0), metrics, sleeps)
+
+    assert caller.call("summary", "model", request) == "ok"
+    assert sleeps == [1.0, 2.0]
+    assert metrics[-1].outcome == "ok"
+    assert metrics[-1].attempts == 3
+
+
+def test_does_not_retry_client_errors() -> None:
+    metrics: list[ModelCallMetrics] = []
+    sleeps: list[float] = []
+    bad_request = errors.ClientError(400, {"error": {"code": 400, "message": "bad", "status": "INVALID_ARGUMENT"}})
+
+    def request(timeout_seconds: float) -> object:
+        raise bad_request
+
+    with pytest.raises(errors.ClientError):
+        _caller(ModelCallPolicy(), metrics, sleeps).call("summary", "model", request)
+
+    assert sleeps == []
+    assert metrics[0].outcome == "error"
+    assert metrics[0].attempts == 1
+
+
+def test_stops_retrying_when_backoff_would_pass_deadline() -> None:
+    metrics: list[ModelCallMetrics] = []
+    sleeps: list[float] = []
+
+    def request(timeout_seconds: float) -> object:
+        raise _server_error()
+
+    policy = ModelCallPolicy(deadline_seconds=3.0, initial_backoff_seconds=2.0, max_attempts=10)
+    with pytest.raises(errors.ServerError):
+        _caller(policy, metrics, sleeps).call("summary", "model", request)
+
+    # 1 回目の待機 2 秒は期限内、2 回目の待機 4 秒は期限を超えるため打ち切る
+    assert sleeps == [2.0]
+    assert metrics[0].attempts == 2
+
+
+def test_generate_content_passes_attempt_timeout_in_http_options() -> None:
+    client = MagicMock()
+    client.models.generate_content.return_value = SimpleNamespace(text="ok")
+    caller = ModelCaller(client, ModelCallPolicy(attempt_timeout_seconds=30.0))
+
+    caller.generate_content(
+        operation="summary",
+        model="model",
+        contents=["prompt"],
+        config=GenerateContentConfig(temperature=0.3),
+    )
+
+    config = client.models.generate_content.call_args.kwargs["config"]
+    assert config.temperature == pytest.approx(0.3)
+    assert config.http_options.timeout == 30_000
+
+
+def test_generate_content_stream_retries_the_whole_stream_under_the_policy() -> None:
+    client = MagicMock()
+    client.models.generate_content_stream.side_effect = [
+        _server_error(503),
+        iter([SimpleNamespace(text="議事録"), SimpleNamespace(text=None), SimpleNamespace(text="本文")]),
+    ]
+    metrics: list[ModelCallMetrics] = []
+    sleeps: list[float] = []
+    received: list[str] = []
+    caller = ModelCaller(
+        client,
+        ModelCallPolicy(attempt_timeout_seconds=30.0, initial_backoff_seconds=1.0),
+        metrics_sink=metrics.append,
+        sleep=sleeps.append,
+        jitter=lambda: 1.0,
+    )
+
+    assembler = caller.generate_content_stream(
+        operation="transcript", model="model", contents=["prompt"], on_text=received.append
+    )
+
+    assert assembler.text == "議事録本文"
+    assert received == ["議事録", "本文"]
+    assert sleeps == [1.0]
+    assert (metrics[-1].outcome, metrics[-1].attempts) == ("ok", 2)
+    assert client.models.generate_content_stream.call_args.kwargs["config"].http_options.timeout == 30_000
+
+
+def test_hedges_slow_request_after_latency_percentile() -> None:
+    release_primary = threading.Event()
+    calls: list[float] = []
+    metrics: list[ModelCallMetrics] = []
+    policy = ModelCallPolicy(hedge_percentile=0.5, hedge_min_samples=2)
+    caller = ModelCaller(MagicMock(), policy, metrics_sink=metrics.append)
+    for _ in range(2):
+        caller.call("summary", "model", lambda timeout_seconds: "warm-up")
+
+    def request(timeout_seconds: float) -> str:
+        calls.append(timeout_seconds)
+        if len(calls) == 1:
+            release_primary.wait(timeout=5)
+            return "primary"
+        return "hedge"
+
+    try:
+        assert caller.call("summary", "model", request) == "hedge"
+    finally:
+        release_primary.set()
+    assert len(calls) == 2
+    assert metrics[-1].hedged is True
+
+
+def test_does_not_hedge_streaming_calls() -> None:
+    client = MagicMock()
+    metrics: list[ModelCallMetrics] = []
+    received: list[str] = []
+    policy = ModelCallPolicy(hedge_percentile=0.5, hedge_min_samples=2)
+    caller = ModelCaller(client, policy, metrics_sink=metrics.append)
+    for _ in range(2):
+        caller.call("summary", "model", lambda timeout_seconds: "warm-up")
+
+    def slow_stream(**_: object) -> Iterator[SimpleNamespace]:
+        time.sleep(0.05)
+        yield SimpleNamespace(text="要約")
+
+    client.models.generate_content_stream.side_effect = slow_stream
+
+    assembler = caller.generate_content_stream(
+        operation="summary", model="model", contents=["prompt"], on_text=received.append
+    )
+
+    assert assembler.text == "要約"
+    assert received == ["要約"]
+    assert client.models.generate_content_stream.call_count == 1
+    assert metrics[-1].hedged is False
+
+
+def test_does_not_hedge_when_the_hedge_pool_is_full() -> None:
+    calls: list[float] = []
+    metrics: list[ModelCallMetrics] = []
+    policy = ModelCallPolicy(hedge_percentile=0.5, hedge_min_samples=2, hedge_max_in_flight=1)
+    caller = ModelCaller(MagicMock(), policy, metrics_sink=metrics.append)
+    for _ in range(2):
+        caller.call("summary", "model", lambda timeout_seconds: "warm-up")
+
+    def request(timeout_seconds: float) -> str:
+        calls.append(timeout_seconds)
+        time.sleep(0.05)
+        return "primary"
+
+    assert caller.call("summary", "model", request) == "primary"
+    assert len(calls) == 1
+    assert metrics[-1].hedged is False
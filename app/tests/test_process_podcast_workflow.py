@@ -1,22 +1,41 @@
 from __future__ import annotations
 
 # ruff: noqa: ARG002, ARG005
+import asyncio
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
 
 import pytest
 
-from domain.models import SnsPromotionContent, SnsPromotionsResponse, Summary
+from domain.models import SnsPromotionContent, SnsPromotionsResponse, Summary, SummaryWithPromotions
+from infrastructure.tracing import SpanRecord, SpanTracer
+from infrastructure.work_queue import InMemoryEpisodeWorkQueue
+from infrastructure.workflow_checkpoint import LocalWorkflowCheckpointStore
+from usecases.episode_worker import EpisodeWorker, EpisodeWorkerSettings
+from usecases.process_podcast_batch import ProcessPodcastBatchInput, ProcessPodcastBatchUsecase
 from usecases.process_podcast_workflow import (
+    EpisodeLeaseLostError,
+    MemoryBudget,
     ProcessPodcastWorkflow,
     ProcessPodcastWorkflowInput,
     _duration_to_seconds,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine, Iterator
+
 
 class _TranscriptProvider:
     def __init__(self, *, transcript: str = "transcript") -> None:
         self.transcript = transcript
+        self.calls: list[str] = []
+        self.released: list[str] = []
 
     def generate_transcript(self, source_uri: str, model_id: str | None = None) -> str:
         return self.transcript
@@ -27,6 +46,7 @@ class _TranscriptProvider:
         prompt: str | None = None,
         model_id: str | None = None,
     ) -> Summary:
+        self.calls.append("summarize_transcript")
         return Summary(title="Generated title", description="Generated description")
 
     def generate_sns_promotions(
@@ -35,6 +55,7 @@ class _TranscriptProvider:
         num_promotions: int = 3,
         model_id: str | None = None,
     ) -> SnsPromotionsResponse:
+        self.calls.append("generate_sns_promotions")
         return SnsPromotionsResponse(
             promotions=[
                 SnsPromotionContent(message=f"Promotion {index}", hashtags=[f"#Tag{index}"])
@@ -42,10 +63,29 @@ class _TranscriptProvider:
             ]
         )
 
+    def generate_summary_and_promotions(
+        self,
+        transcript: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SummaryWithPromotions:
+        self.calls.append("generate_summary_and_promotions")
+        return SummaryWithPromotions(
+            summary=Summary(title="Generated title", description="Generated description"),
+            promotions=[
+                SnsPromotionContent(message=f"Combined {index}", hashtags=[f"#Tag{index}"])
+                for index in range(1, num_promotions + 1)
+            ],
+        )
+
+    def release_transcript(self, transcript: str) -> None:
+        self.released.append(transcript)
+
 
 class _ObjectStorage:
     def __init__(self) -> None:
         self.uploads: list[str] = []
+        self.file_uploads: list[tuple[str, bytes]] = []
 
     def download_file(self, remote_key: str) -> bytes:
         return b"<rss />"
@@ -53,6 +93,9 @@ class _ObjectStorage:
     def upload_file(self, file_content: bytes, remote_key: str, content_type: str, *, public: bool = True) -> None:
         self.uploads.append(remote_key)
 
+    def upload_file_from_path(self, file_path: str, remote_key: str, content_type: str, *, public: bool = True) -> None:
+        self.file_uploads.append((remote_key, Path(file_path).read_bytes()))
+
     def generate_public_url(self, remote_key: str, custom_domain: str | None = None) -> str:
         return f"https://{custom_domain}/{remote_key}"
 
@@ -61,6 +104,9 @@ class _BlobSource:
     def download_blob_as_bytes(self, bucket_name: str, blob_name: str) -> bytes:
         return b"audio"
 
+    def download_blob(self, bucket_name: str, blob_name: str, destination_file_path: str) -> None:
+        Path(destination_file_path).write_bytes(b"audio")
+
 
 class _Notifier:
     def __init__(self) -> None:
@@ -94,10 +140,17 @@ class _EpisodeRepository:
     def mark_processing(self, *, podcast_id: str, episode_id: str, source_audio_path: str) -> None:
         self.processing = (podcast_id, episode_id, source_audio_path)
 
-    def mark_completed(self, **values: object) -> None:
+    def claim_processing(self, *, podcast_id: str, episode_id: str, source_audio_path: str, **_: object) -> bool:
+        self.mark_processing(podcast_id=podcast_id, episode_id=episode_id, source_audio_path=source_audio_path)
+        return True
+
+    def renew_lease(self, **_: object) -> bool:
+        return True
+
+    def mark_completed(self, *, owner: str, **values: object) -> None:
         self.completed = values
 
-    def mark_failed(self, *, podcast_id: str, episode_id: str, error_message: str) -> None:
+    def mark_failed(self, *, podcast_id: str, episode_id: str, owner: str, error_message: str) -> None:
         self.failed = (podcast_id, episode_id, error_message)
 
 
@@ -120,6 +173,17 @@ class _FirestoreManager:
         return f"promotion-{len(self.promotions)}"
 
 
+class _AsyncFirestoreManager:
+    def __init__(self) -> None:
+        self.artifacts: dict[str, object] | None = None
+
+    async def save_episode_artifacts(self, **values: object) -> None:
+        self.artifacts = values
+
+    def run_blocking(self, coroutine: Coroutine[object, object, None]) -> None:
+        asyncio.run(coroutine)
+
+
 def _request(object_path: str = "podcasts/1/episodes/42/source/recording.mp3") -> ProcessPodcastWorkflowInput:
     return ProcessPodcastWorkflowInput(
         project_id="project",
@@ -139,18 +203,32 @@ def _workflow(
     repository: _EpisodeRepository,
     firestore: _FirestoreManager,
     transcript_provider: _TranscriptProvider | None = None,
+    combine_summary_and_promotions: bool = False,
+    audio_converter: Callable[[bytes, str], bytes] | None = None,
+    checkpoint_store: LocalWorkflowCheckpointStore | None = None,
+    tracer: SpanTracer | None = None,
+    lease_seconds: float = 900.0,
+    object_storage: _ObjectStorage | None = None,
+    memory_budget: MemoryBudget | None = None,
+    async_firestore: _AsyncFirestoreManager | None = None,
 ) -> ProcessPodcastWorkflow:
     return ProcessPodcastWorkflow(
         transcript_provider=transcript_provider or _TranscriptProvider(),
-        object_storage=_ObjectStorage(),
+        object_storage=object_storage or _ObjectStorage(),
         blob_source=_BlobSource(),
         notifier=_Notifier(),
         rss_manager_factory=_RssManager,
-        audio_converter=lambda audio, suffix: b"mp3",
+        audio_converter=audio_converter or (lambda audio, suffix: b"mp3"),
         audio_info_reader=lambda file_buffer, audio_format: [3, "01:02:03"],
         firestore_manager=firestore,
         episode_repository=repository,
         logger=logging.getLogger("test-workflow"),
+        combine_summary_and_promotions=combine_summary_and_promotions,
+        checkpoint_store=checkpoint_store,
+        tracer=tracer,
+        lease_seconds=lease_seconds,
+        memory_budget=memory_budget,
+        async_firestore_manager=async_firestore,  # type: ignore[arg-type]
     )
 
 
@@ -183,6 +261,517 @@ def test_workflow_uses_object_path_ids_for_cloud_sql_and_firestore() -> None:
     assert firestore.promotions[1]["message"] == "Promotion 2"
 
 
+def test_workflow_writes_firestore_artifacts_in_one_async_call_when_configured() -> None:
+    firestore = _FirestoreManager()
+    async_firestore = _AsyncFirestoreManager()
+
+    _workflow(repository=_EpisodeRepository(), firestore=firestore, async_firestore=async_firestore).run(_request())
+
+    assert firestore.episode_content is None
+    assert firestore.transcript is None
+    assert firestore.promotions == []
+    assert async_firestore.artifacts is not None
+    assert async_firestore.artifacts["episode_id"] == "42"
+    assert async_firestore.artifacts["episode_number"] == 4
+    assert [promotion.message for promotion in async_firestore.artifacts["promotions"]] == [  # type: ignore[attr-defined]
+        "Promotion 1",
+        "Promotion 2",
+    ]
+
+
+def test_workflow_combined_mode_generates_summary_and_promotions_in_one_call() -> None:
+    repository = _EpisodeRepository()
+    firestore = _FirestoreManager()
+    provider = _TranscriptProvider()
+
+    _workflow(
+        repository=repository,
+        firestore=firestore,
+        transcript_provider=provider,
+        combine_summary_and_promotions=True,
+    ).run(_request())
+
+    assert provider.calls == ["generate_summary_and_promotions"]
+    assert provider.released == ["transcript"]
+    assert repository.completed is not None
+    assert repository.completed["title"] == "#4 Generated title"
+    assert [promotion["message"] for promotion in firestore.promotions] == ["Combined 1", "Combined 2"]
+
+
+def test_workflow_transcribes_and_converts_audio_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    class _BlockingTranscriptProvider(_TranscriptProvider):
+        def generate_transcript(self, source_uri: str, model_id: str | None = None) -> str:
+            barrier.wait()
+            return self.transcript
+
+    def convert(audio: bytes, suffix: str) -> bytes:
+        barrier.wait()
+        return b"mp3"
+
+    repository = _EpisodeRepository()
+    _workflow(
+        repository=repository,
+        firestore=_FirestoreManager(),
+        transcript_provider=_BlockingTranscriptProvider(),
+        audio_converter=convert,
+    ).run(_request())
+
+    assert repository.completed is not None
+    assert repository.completed["audio_url"] == "https://podcast.example.com/dev/ep/4/audio.mp3"
+
+
+def test_workflow_records_nested_step_spans() -> None:
+    records: list[SpanRecord] = []
+
+    class _Exporter:
+        def export(self, record: SpanRecord) -> None:
+            records.append(record)
+
+        def flush(self) -> None:
+            pass
+
+    _workflow(
+        repository=_EpisodeRepository(),
+        firestore=_FirestoreManager(),
+        tracer=SpanTracer([_Exporter()]),
+    ).run(_request())
+
+    spans = {record.name: record for record in records}
+    assert set(spans) == {
+        "workflow",
+        "feed.download",
+        "transcript",
+        "summary",
+        "audio",
+        "audio.download",
+        "audio.convert",
+        "audio.probe",
+        "audio.upload",
+        "rss.publish",
+        "promotions",
+        "firestore.save",
+    }
+    workflow = spans["workflow"]
+    assert workflow.attributes == {"podcast_id": "1", "episode_id": "42", "claimed": True, "skipped_steps": 0}
+    assert spans["transcript"].parent_span_id == workflow.span_id
+    assert spans["audio.convert"].parent_span_id == spans["audio"].span_id
+    assert spans["audio.upload"].bytes == len(b"mp3")
+    assert all(record.outcome == "ok" and record.trace_id == workflow.trace_id for record in records)
+
+
+def test_memory_budget_streams_audio_through_temp_files_and_records_peak_rss(tmp_path: Path) -> None:
+    storage = _ObjectStorage()
+    repository = _EpisodeRepository()
+    converted: list[tuple[str, bytes]] = []
+
+    def convert(source_path: Path, source_suffix: str, destination_path: Path) -> None:
+        converted.append((source_suffix, source_path.read_bytes()))
+        destination_path.write_bytes(b"mp3-file")
+
+    class _Monitor:
+        @contextmanager
+        def track(self) -> Iterator[SimpleNamespace]:
+            yield SimpleNamespace(peak_bytes=64 * 2**20)
+
+    budget = MemoryBudget(
+        limit_bytes=32 * 2**20,
+        audio_file_converter=convert,
+        audio_file_info_reader=lambda file_path: [file_path.stat().st_size, "00:10:00"],
+        memory_monitor=_Monitor(),
+        temp_dir=str(tmp_path),
+    )
+
+    result = _workflow(
+        repository=repository, firestore=_FirestoreManager(), object_storage=storage, memory_budget=budget
+    ).run(_request())
+
+    assert converted == [(".mp3", b"audio")]
+    assert storage.file_uploads == [("dev/ep/4/audio.mp3", b"mp3-file")]
+    assert "dev/ep/4/audio.mp3" not in storage.uploads
+    # ソース音声・MP3 の一時ファイルとディレクトリは実行後に残らない
+    assert list(tmp_path.iterdir()) == []
+    assert set(result.peak_rss_bytes) == set(result.executed_steps)
+    assert repository.completed is not None
+    assert repository.completed["duration_seconds"] == 600
+
+
+def test_workflow_resumes_from_checkpoints_after_late_failure(tmp_path: Path) -> None:
+    class _FlakyRepository(_EpisodeRepository):
+        attempts = 0
+
+        def mark_completed(self, **values: object) -> None:
+            self.attempts += 1
+            if self.attempts == 1:
+                msg = "database unavailable"
+                raise ConnectionError(msg)
+            super().mark_completed(**values)
+
+    repository = _FlakyRepository()
+    firestore = _FirestoreManager()
+    provider = _TranscriptProvider()
+    store = LocalWorkflowCheckpointStore(tmp_path)
+    converted: list[bytes] = []
+
+    def convert(audio: bytes, suffix: str) -> bytes:
+        converted.append(audio)
+        return b"mp3"
+
+    def workflow() -> ProcessPodcastWorkflow:
+        return _workflow(
+            repository=repository,
+            firestore=firestore,
+            transcript_provider=provider,
+            audio_converter=convert,
+            checkpoint_store=store,
+        )
+
+    with pytest.raises(ConnectionError):
+        workflow().run(_request())
+    first_promotion_ids = [promotion["promotion_id"] for promotion in firestore.promotions]
+
+    result = workflow().run(_request())
+
+    assert result.executed_steps == ()
+    assert set(result.skipped_steps) == {
+        "feed",
+        "transcript",
+        "summary",
+        "audio",
+        "upload",
+        "rss",
+        "promotions",
+        "firestore",
+    }
+    assert provider.calls == ["summarize_transcript", "generate_sns_promotions"]
+    assert len(converted) == 1
+    assert len(firestore.promotions) == 2
+    assert [promotion["promotion_id"] for promotion in firestore.promotions] == first_promotion_ids
+    assert repository.completed is not None
+    assert repository.completed["title"] == "#4 Generated title"
+    assert store.load(podcast_id="1", episode_id="42", source_audio_path=_request().gcs_trigger_object_name) == {}
+
+
+def test_batch_publishes_feed_once_and_reports_each_episode() -> None:
+    feed_storage = _ObjectStorage()
+    downloads: list[str] = []
+    feed_storage.download_file = lambda remote_key: downloads.append(remote_key) or b"<rss />"  # type: ignore[method-assign]
+    managers: list[_RssManager] = []
+
+    def rss_manager_factory(*, rss_xml: str) -> _RssManager:
+        managers.append(_RssManager(rss_xml=rss_xml))
+        return managers[-1]
+
+    repository = _EpisodeRepository()
+    firestore = _FirestoreManager()
+    report = ProcessPodcastBatchUsecase(
+        workflow=_workflow(repository=repository, firestore=firestore),
+        object_storage=feed_storage,
+        rss_manager_factory=rss_manager_factory,
+    ).run(
+        ProcessPodcastBatchInput(
+            workflow=_request(),
+            object_names=[
+                "podcasts/1/episodes/42/source/recording.mp3",
+                "podcasts/1/episodes/43/source/recording.m4a",
+                "podcasts/1/episodes/44/source/notes.txt",
+            ],
+            max_parallel_episodes=3,
+        )
+    )
+
+    assert downloads == ["dev/feed.xml"]
+    assert feed_storage.uploads == ["dev/feed.xml"]
+    assert report.feed_published
+    assert [(result.episode_number, result.succeeded) for result in report.results] == [
+        (4, True),
+        (5, True),
+        (0, False),
+    ]
+    assert report.failed[0].object_name.endswith("notes.txt")
+    assert sorted(episode["itunes_episode_number"] for episode in managers[0].episodes) == [4, 5]
+    assert sorted(promotion["episode_number"] for promotion in firestore.promotions) == [4, 4, 5, 5]
+
+
+def test_batch_numbers_only_published_episodes_when_a_middle_episode_fails() -> None:
+    managers: list[_RssManager] = []
+
+    def rss_manager_factory(*, rss_xml: str) -> _RssManager:
+        managers.append(_RssManager(rss_xml=rss_xml))
+        return managers[-1]
+
+    def audio_converter(audio: bytes, suffix: str) -> bytes:
+        if suffix == ".m4a":
+            raise RuntimeError("conversion failed")
+        return b"mp3"
+
+    episode_storage = _ObjectStorage()
+    feed_storage = _ObjectStorage()
+    report = ProcessPodcastBatchUsecase(
+        workflow=_workflow(
+            repository=_EpisodeRepository(),
+            firestore=_FirestoreManager(),
+            audio_converter=audio_converter,
+            object_storage=episode_storage,
+        ),
+        object_storage=feed_storage,
+        rss_manager_factory=rss_manager_factory,
+    ).run(
+        ProcessPodcastBatchInput(
+            workflow=_request(),
+            object_names=[
+                "podcasts/1/episodes/42/source/recording.mp3",
+                "podcasts/1/episodes/43/source/recording.m4a",
+                "podcasts/1/episodes/44/source/recording.mp3",
+            ],
+            max_parallel_episodes=3,
+        )
+    )
+
+    assert [(result.episode_number, result.succeeded) for result in report.results] == [
+        (4, True),
+        (0, False),
+        (5, True),
+    ]
+    assert [episode["itunes_episode_number"] for episode in managers[0].episodes] == [4, 5]
+    assert sorted(episode_storage.uploads) == ["dev/ep/4/audio.mp3", "dev/ep/5/audio.mp3"]
+    assert feed_storage.uploads == ["dev/feed.xml"]
+
+
+def test_batch_drops_the_feed_item_of_an_episode_that_fails_after_the_rss_step() -> None:
+    managers: list[_RssManager] = []
+
+    def rss_manager_factory(*, rss_xml: str) -> _RssManager:
+        managers.append(_RssManager(rss_xml=rss_xml))
+        return managers[-1]
+
+    class _FailingFirestoreManager(_FirestoreManager):
+        def save_episode_content(self, **values: object) -> str:
+            if values["episode_id"] == "43":
+                raise RuntimeError("firestore unavailable")
+            return super().save_episode_content(**values)
+
+    report = ProcessPodcastBatchUsecase(
+        workflow=_workflow(repository=_EpisodeRepository(), firestore=_FailingFirestoreManager()),
+        object_storage=_ObjectStorage(),
+        rss_manager_factory=rss_manager_factory,
+    ).run(
+        ProcessPodcastBatchInput(
+            workflow=_request(),
+            object_names=[
+                "podcasts/1/episodes/42/source/recording.mp3",
+                "podcasts/1/episodes/43/source/recording.mp3",
+                "podcasts/1/episodes/44/source/recording.mp3",
+            ],
+            max_parallel_episodes=3,
+        )
+    )
+
+    assert [(result.episode_number, result.succeeded) for result in report.results] == [
+        (4, True),
+        (0, False),
+        (5, True),
+    ]
+    assert [episode["itunes_episode_number"] for episode in managers[0].episodes] == [4, 5]
+
+
+def test_batch_marks_episodes_completed_only_after_the_feed_is_published() -> None:
+    feed_storage = _ObjectStorage()
+    events: list[str] = []
+
+    def upload_feed(file_content: bytes, remote_key: str, content_type: str, *, public: bool = True) -> None:
+        events.append("publish")
+
+    feed_storage.upload_file = upload_feed  # type: ignore[method-assign]
+
+    class _RecordingRepository(_EpisodeRepository):
+        def mark_completed(self, *, owner: str, **values: object) -> None:
+            events.append("completed")
+            super().mark_completed(owner=owner, **values)
+
+    report = ProcessPodcastBatchUsecase(
+        workflow=_workflow(repository=_RecordingRepository(), firestore=_FirestoreManager()),
+        object_storage=feed_storage,
+        rss_manager_factory=_RssManager,
+    ).run(ProcessPodcastBatchInput(workflow=_request(), object_names=[_request().gcs_trigger_object_name]))
+
+    assert events == ["publish", "completed"]
+    assert report.results[0].succeeded
+
+
+def test_batch_marks_episodes_failed_when_the_feed_cannot_be_published(tmp_path: Path) -> None:
+    feed_storage = _ObjectStorage()
+
+    def upload_feed(file_content: bytes, remote_key: str, content_type: str, *, public: bool = True) -> None:
+        raise RuntimeError("r2 unavailable")
+
+    feed_storage.upload_file = upload_feed  # type: ignore[method-assign]
+    repository = _EpisodeRepository()
+    store = LocalWorkflowCheckpointStore(tmp_path)
+
+    report = ProcessPodcastBatchUsecase(
+        workflow=_workflow(repository=repository, firestore=_FirestoreManager(), checkpoint_store=store),
+        object_storage=feed_storage,
+        rss_manager_factory=_RssManager,
+    ).run(ProcessPodcastBatchInput(workflow=_request(), object_names=[_request().gcs_trigger_object_name]))
+
+    assert not report.feed_published
+    assert [(result.episode_number, result.succeeded) for result in report.results] == [(0, False)]
+    assert repository.completed is None
+    assert repository.failed == ("1", "42", "r2 unavailable")
+    # 再実行で文字起こしをやり直さないよう、チェックポイントは残す
+    assert "transcript" in store.load(
+        podcast_id="1", episode_id="42", source_audio_path=_request().gcs_trigger_object_name
+    )
+
+
+def test_worker_processes_queued_items_and_stops_when_idle() -> None:
+    queue = InMemoryEpisodeWorkQueue()
+    processed = queue.enqueue("podcasts/1/episodes/42/source/recording.mp3")
+    failed = queue.enqueue("podcasts/1/episodes/44/source/notes.txt")
+    repository = _EpisodeRepository()
+    workflow = _workflow(repository=repository, firestore=_FirestoreManager())
+
+    report = EpisodeWorker(
+        queue=queue,
+        workflow=workflow,
+        workflow_input=_request(),
+        settings=EpisodeWorkerSettings(
+            max_concurrency=2, idle_timeout_seconds=0.0, poll_interval_seconds=0.01, max_attempts=2
+        ),
+    ).run()
+
+    # 失敗した項目は max_attempts まで再取得され、その後 failed になる
+    assert (report.processed, report.failed, report.duplicates) == (1, 2, 0)
+    assert queue.status(processed) == "done"
+    assert queue.status(failed) == "failed"
+    assert repository.completed is not None
+
+
+def test_worker_stop_lets_running_items_finish() -> None:
+    queue = InMemoryEpisodeWorkQueue()
+    item_id = queue.enqueue("podcasts/1/episodes/42/source/recording.mp3")
+    worker: EpisodeWorker
+
+    class _StoppingWorkflow:
+        def run(self, request: ProcessPodcastWorkflowInput) -> object:
+            worker.stop()
+            return _workflow(repository=_EpisodeRepository(), firestore=_FirestoreManager()).run(request)
+
+    queue.enqueue("podcasts/1/episodes/43/source/recording.mp3")
+    worker = EpisodeWorker(
+        queue=queue,
+        workflow=_StoppingWorkflow(),  # type: ignore[arg-type]
+        workflow_input=_request(),
+        settings=EpisodeWorkerSettings(max_concurrency=1, idle_timeout_seconds=60.0, poll_interval_seconds=0.01),
+    )
+
+    report = worker.run()
+
+    assert report.processed == 1
+    assert queue.status(item_id) == "done"
+    assert queue.status("2") == "queued"
+
+
+def test_workflow_exits_early_when_another_run_holds_the_lease() -> None:
+    class _ClaimedRepository(_EpisodeRepository):
+        def claim_processing(self, **_: object) -> bool:
+            return False
+
+    repository = _ClaimedRepository()
+    provider = _TranscriptProvider()
+    firestore = _FirestoreManager()
+
+    result = _workflow(repository=repository, firestore=firestore, transcript_provider=provider).run(_request())
+
+    assert not result.claimed
+    assert result.executed_steps == ()
+    assert provider.calls == []
+    assert firestore.episode_content is None
+    assert repository.completed is None
+    assert repository.failed is None
+
+
+def test_workflow_renews_the_lease_while_running() -> None:
+    renewals: list[dict[str, object]] = []
+    renewed = threading.Event()
+
+    class _LeaseRepository(_EpisodeRepository):
+        def renew_lease(self, **values: object) -> bool:
+            renewals.append(values)
+            renewed.set()
+            return True
+
+    def convert(audio: bytes, suffix: str) -> bytes:
+        assert renewed.wait(timeout=5)
+        return b"mp3"
+
+    _workflow(
+        repository=_LeaseRepository(),
+        firestore=_FirestoreManager(),
+        audio_converter=convert,
+        lease_seconds=0.03,
+    ).run(_request())
+
+    assert renewals[0]["podcast_id"] == "1"
+    assert renewals[0]["lease_seconds"] == 0.03  # noqa: PLR2004
+
+
+def test_workflow_aborts_before_publishing_when_the_lease_is_lost() -> None:
+    renewed = threading.Event()
+
+    class _LostLeaseRepository(_EpisodeRepository):
+        def renew_lease(self, **_: object) -> bool:
+            renewed.set()
+            return False
+
+    def convert(audio: bytes, suffix: str) -> bytes:
+        assert renewed.wait(timeout=5)
+        time.sleep(0.05)
+        return b"mp3"
+
+    repository = _LostLeaseRepository()
+    firestore = _FirestoreManager()
+    storage = _ObjectStorage()
+    workflow = _workflow(
+        repository=repository,
+        firestore=firestore,
+        audio_converter=convert,
+        lease_seconds=0.03,
+        object_storage=storage,
+    )
+
+    with pytest.raises(EpisodeLeaseLostError, match=r"aborting before (rss|firestore)"):
+        workflow.run(_request())
+
+    assert "dev/feed.xml" not in storage.uploads
+    assert firestore.episode_content is None
+    assert repository.completed is None
+    assert repository.failed is None
+
+
+def test_workflow_does_not_mark_failed_when_completion_finds_the_lease_taken_over() -> None:
+    owners: list[object] = []
+
+    class _TakenOverRepository(_EpisodeRepository):
+        def claim_processing(self, **values: object) -> bool:
+            owners.append(values["owner"])
+            return True
+
+        def mark_completed(self, *, owner: str, **values: object) -> None:
+            owners.append(owner)
+            raise EpisodeLeaseLostError("another run holds the lease")
+
+    repository = _TakenOverRepository()
+
+    with pytest.raises(EpisodeLeaseLostError):
+        _workflow(repository=repository, firestore=_FirestoreManager()).run(_request())
+
+    assert owners[0] == owners[1]
+    assert repository.failed is None
+
+
 def test_workflow_marks_episode_failed_and_reraises() -> None:
     repository = _EpisodeRepository()
     firestore = _FirestoreManager()
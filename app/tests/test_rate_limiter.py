@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+# ruff: noqa: ARG005
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from infrastructure.model_call import ModelCaller
+from infrastructure.rate_limiter import (
+    ModelRateLimit,
+    RateLimitTimeoutError,
+    TokenBucketRateLimiter,
+    build_rate_limiter,
+    parse_rate_limits,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _SharedBudget:
+    def __init__(self, waits: list[float]) -> None:
+        self.waits = waits
+        self.calls: list[tuple[str, int]] = []
+
+    def try_acquire(self, key: str, requests_per_window: int) -> float:
+        self.calls.append((key, requests_per_window))
+        return self.waits.pop(0) if self.waits else 0.0
+
+
+def test_parse_rate_limits() -> None:
+    limits = parse_rate_limits("gemini-2.5-flash=60/4, gemini-2.5-pro=10//3, *=10")
+
+    assert limits == {
+        "gemini-2.5-flash": ModelRateLimit(requests_per_minute=60, max_concurrent=4),
+        "gemini-2.5-pro": ModelRateLimit(requests_per_minute=10, burst=3),
+        "*": ModelRateLimit(requests_per_minute=10),
+    }
+    assert parse_rate_limits("flash=60/4/5") == {
+        "flash": ModelRateLimit(requests_per_minute=60, burst=5, max_concurrent=4)
+    }
+    assert build_rate_limiter("") is None
+    with pytest.raises(ValueError, match="Invalid rate limit entry"):
+        parse_rate_limits("gemini-2.5-flash")
+    with pytest.raises(ValueError, match="Invalid rate limit entry"):
+        parse_rate_limits("flash=60/4/5/1")
+    with pytest.raises(ValueError, match="burst must be at least 1"):
+        parse_rate_limits("flash=60//0")
+
+
+def test_token_bucket_spaces_requests_per_model_and_location() -> None:
+    clock = _Clock()
+    limiter = TokenBucketRateLimiter({"flash": ModelRateLimit(requests_per_minute=30)}, clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        with limiter.acquire("flash", "us-central1", timeout_seconds=60):
+            pass
+    with limiter.acquire("flash", "asia-northeast1", timeout_seconds=60):
+        pass
+    with limiter.acquire("unlimited", "us-central1", timeout_seconds=60):
+        pass
+
+    assert clock.sleeps == [pytest.approx(2.0), pytest.approx(2.0)]
+
+
+def test_token_bucket_times_out_before_deadline() -> None:
+    clock = _Clock()
+    limiter = TokenBucketRateLimiter({"*": ModelRateLimit(requests_per_minute=1)}, clock=clock, sleep=clock.sleep)
+
+    with limiter.acquire("flash", "us-central1", timeout_seconds=5):
+        pass
+    with pytest.raises(RateLimitTimeoutError), limiter.acquire("flash", "us-central1", timeout_seconds=5):
+        pass
+
+
+def test_concurrency_slot_is_released_after_request() -> None:
+    limiter = TokenBucketRateLimiter({"*": ModelRateLimit(requests_per_minute=6000, burst=10, max_concurrent=1)})
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold() -> None:
+        with limiter.acquire("flash", "us-central1", timeout_seconds=5):
+            entered.set()
+            release.wait(timeout=5)
+
+    worker = threading.Thread(target=hold)
+    worker.start()
+    entered.wait(timeout=5)
+    with pytest.raises(RateLimitTimeoutError), limiter.acquire("flash", "us-central1", timeout_seconds=0.05):
+        pass
+    release.set()
+    worker.join()
+
+    with limiter.acquire("flash", "us-central1", timeout_seconds=1):
+        pass
+
+
+def test_shared_budget_waits_for_next_window() -> None:
+    clock = _Clock()
+    shared = _SharedBudget(waits=[12.0])
+    limiter = TokenBucketRateLimiter(
+        {"flash": ModelRateLimit(requests_per_minute=20, burst=5)},
+        shared_budget=shared,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+    with limiter.acquire("flash", "us-central1", timeout_seconds=60):
+        pass
+
+    assert shared.calls == [("flash|us-central1", 20), ("flash|us-central1", 20)]
+    assert clock.sleeps == [12.0]
+
+
+def test_model_caller_acquires_permit_for_every_attempt() -> None:
+    acquired: list[tuple[str, str]] = []
+
+    class _RecordingLimiter(TokenBucketRateLimiter):
+        def acquire(self, model_id: str, location: str, *, timeout_seconds: float):  # type: ignore[override]  # noqa: ANN202
+            acquired.append((model_id, location))
+            return super().acquire(model_id, location, timeout_seconds=timeout_seconds)
+
+    attempts: list[float] = []
+
+    def request(timeout_seconds: float) -> str:
+        attempts.append(timeout_seconds)
+        if len(attempts) == 1:
+            raise TimeoutError
+        return "ok"
+
+    caller = ModelCaller(MagicMock(), rate_limiter=_RecordingLimiter({}), location="us-central1", sleep=lambda _: None)
+
+    assert caller.call("summary", "flash", request) == "ok"
+    assert acquired == [("flash", "us-central1"), ("flash", "us-central1")]
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import feedparser
+
+from benchmarks.rss_manager import OPERATIONS, build_synthetic_feed, compare_reports, run_suite
+
+
+def test_build_synthetic_feed_generates_unique_items() -> None:
+    feed_xml = build_synthetic_feed(5)
+
+    feed = feedparser.parse(feed_xml)
+    guids = [entry.id for entry in feed.entries]
+    assert len(guids) == 5
+    assert len(set(guids)) == 5
+    assert "<itunes:email>bench@example.com</itunes:email>" in feed_xml
+
+
+def test_run_suite_reports_every_operation() -> None:
+    report = run_suite(sizes=(3,), repeat=1)
+
+    results = report["results"]
+    assert [item["operation"] for item in results] == list(OPERATIONS)
+    assert all(item["size"] == 3 for item in results)
+    assert report["metadata"]["sizes"] == [3]
+
+
+def test_compare_reports_outputs_ratios() -> None:
+    baseline = {
+        "metadata": {"commit": "aaa"},
+        "results": [{"operation": "parse", "size": 10, "median_seconds": 2.0, "peak_memory_bytes": 100}],
+    }
+    current = {
+        "metadata": {"commit": "bbb"},
+        "results": [{"operation": "parse", "size": 10, "median_seconds": 1.0, "peak_memory_bytes": 150}],
+    }
+
+    lines = compare_reports(current, baseline)
+
+    assert lines[0] == "baseline=aaa current=bbb"
+    assert "time x0.50 memory x1.50" in lines[1]
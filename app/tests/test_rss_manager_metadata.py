@@ -5,6 +5,7 @@ import re
 import feedparser
 import pytest
 
+from benchmarks.rss_manager import build_synthetic_feed
 from services import PodcastRssManager
 
 
@@ -472,3 +473,32 @@ class TestDescriptionAndSummaryFormatting:
         # XMLとしてパース可能であることを確認
         feed = feedparser.parse(rss_xml)
         assert not feed.bozo or feed.bozo_exception is None
+
+
+class TestBulkUpdate:
+    """複数エピソードの一括更新テスト."""
+
+    def test_update_episodes_rewrites_only_given_guids(self) -> None:
+        """指定した guid のエピソードだけが更新されること."""
+        rss_manager = PodcastRssManager(rss_xml=build_synthetic_feed(3))
+
+        rss_manager.update_episodes(
+            {
+                "bench-00000000": {"title": "#1 New & title", "description": "new description"},
+                "bench-00000002": {"title": "#3 Another"},
+            },
+        )
+
+        feed = feedparser.parse(rss_manager.get_rss_xml())
+        titles = {entry.id: entry.title for entry in feed.entries}
+        assert titles["bench-00000000"] == "#1 New & title"
+        assert titles["bench-00000001"].startswith("#2 ")
+        assert titles["bench-00000002"] == "#3 Another"
+        assert rss_manager.get_total_episodes() == 3
+
+    def test_update_episodes_rejects_unknown_guid(self) -> None:
+        """存在しない guid を含む場合はフィードを変更せずに ValueError を送出すること."""
+        rss_manager = PodcastRssManager(rss_xml=build_synthetic_feed(1))
+
+        with pytest.raises(ValueError, match="not found"):
+            rss_manager.update_episodes({"missing": {"title": "x"}})
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+# ruff: noqa: ARG005
+import threading
+
+import pytest
+
+from usecases.step_graph import Step, StepGraph
+
+
+def test_independent_steps_run_concurrently_and_join() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(value: str) -> str:
+        # 2 つの系統が同時に実行されていなければ Barrier がタイムアウトする
+        barrier.wait()
+        return value
+
+    graph = StepGraph(
+        [
+            Step("transcript", lambda _: branch("text")),
+            Step("audio", lambda _: branch("mp3")),
+            Step("publish", lambda results: f"{results['transcript']}+{results['audio']}", ("transcript", "audio")),
+        ]
+    )
+
+    results = graph.run(max_workers=2)
+
+    assert results == {"transcript": "text", "audio": "mp3", "publish": "text+mp3"}
+    assert set(graph.durations) == {"transcript", "audio", "publish"}
+
+
+def test_failure_skips_dependents_and_reraises() -> None:
+    ran: list[str] = []
+
+    def fail(_: object) -> None:
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    graph = StepGraph(
+        [
+            Step("transcript", fail),
+            Step("summary", lambda _: ran.append("summary"), ("transcript",)),
+        ]
+    )
+
+    with pytest.raises(RuntimeError, match="boom"):
+        graph.run()
+    assert ran == []
+
+
+def test_rejects_unknown_dependencies_and_cycles() -> None:
+    with pytest.raises(ValueError, match="unknown steps: missing"):
+        StepGraph([Step("a", lambda _: None, ("missing",))])
+    with pytest.raises(ValueError, match="dependency cycle"):
+        StepGraph([Step("a", lambda _: None, ("b",)), Step("b", lambda _: None, ("a",))])
+
+
+def test_restored_results_skip_steps_and_their_unneeded_dependencies() -> None:
+    ran: list[str] = []
+    completed: list[str] = []
+
+    def step(name: str, value: str) -> Step:
+        return Step(name, lambda _: ran.append(name) or value)
+
+    graph = StepGraph(
+        [
+            step("transcript", "text"),
+            step("audio", "mp3"),
+            Step("upload", lambda results: ran.append("upload") or f"url:{results['audio']}", ("audio",)),
+            Step("publish", lambda results: f"{results['transcript']}+{results['upload']}", ("transcript", "upload")),
+        ]
+    )
+
+    results = graph.run(
+        completed={"upload": "url:saved"},
+        on_step_completed=lambda name, _: completed.append(name),
+    )
+
+    assert ran == ["transcript"]
+    assert results["publish"] == "text+url:saved"
+    assert graph.skipped == ["audio", "upload"]
+    assert sorted(completed) == ["publish", "transcript"]
+
+
+def test_released_results_are_dropped_once_their_consumers_finish() -> None:
+    seen_by_upload: list[bytes] = []
+
+    graph = StepGraph(
+        [
+            Step("audio", lambda _: b"mp3", release_after_use=True),
+            Step("upload", lambda results: seen_by_upload.append(results["audio"]) or "url", ("audio",)),
+            Step("feed", lambda _: "feed"),
+        ]
+    )
+
+    results = graph.run(max_workers=1)
+
+    assert seen_by_upload == [b"mp3"]
+    assert results == {"upload": "url", "feed": "feed"}
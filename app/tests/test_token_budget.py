@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from domain.models import Summary
+from infrastructure.ai_analyzer import AudioAnalyzer, SummaryBudget
+from infrastructure.token_budget import estimate_tokens, split_into_sections
+
+
+def test_estimate_tokens_counts_japanese_per_character() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("議事録abc") == 4
+
+
+def test_split_into_sections_respects_budget_and_keeps_text() -> None:
+    text = "".join(f"{index}:00 トピック{index}\n" for index in range(20))
+
+    sections = split_into_sections(text, max_tokens=30)
+
+    assert "".join(sections) == text
+    assert len(sections) > 1
+    assert all(estimate_tokens(section) <= 30 for section in sections)
+
+
+def test_split_into_sections_breaks_long_lines() -> None:
+    sections = split_into_sections("あ" * 25, max_tokens=10)
+
+    assert sections == ["あ" * 10, "あ" * 10, "あ" * 5]
+
+
+@patch("infrastructure.ai_analyzer.genai.Client")
+def test_long_transcript_is_summarized_with_map_reduce(mock_client: object) -> None:
+    prompts: list[str] = []
+
+    def generate_content(*, model: str, contents: list[str], config: object) -> SimpleNamespace:
+        prompts.append(contents[0])
+        if "パート" in contents[0] and "--- 以下が議事録のパート" in contents[0]:
+            return SimpleNamespace(text="要点")
+        return SimpleNamespace(text='{"title": "T", "description": "D"}')
+
+    mock_client.return_value.models.generate_content.side_effect = generate_content  # type: ignore[attr-defined]
+    analyzer = AudioAnalyzer(
+        project_id="project",
+        summary_budget=SummaryBudget(max_input_tokens=50, section_tokens=20, max_workers=2),
+    )
+    transcript = "".join(f"議論{index:02d}の内容です。\n" for index in range(10))
+
+    summary = analyzer.summarize_transcript(transcript, model_id="model")
+
+    assert summary == Summary(title="T", description="D")
+    section_prompts = [prompt for prompt in prompts if "--- 以下が議事録のパート" in prompt]
+    assert len(section_prompts) == len(split_into_sections(transcript, 20))
+    assert "【パート1/" in prompts[-1]
+    assert transcript not in prompts[-1]
+
+
+@patch("infrastructure.ai_analyzer.genai.Client")
+def test_short_transcript_uses_single_call(mock_client: object) -> None:
+    models = mock_client.return_value.models  # type: ignore[attr-defined]
+    models.generate_content.return_value = SimpleNamespace(text='{"title": "T", "description": "D"}')
+    analyzer = AudioAnalyzer(project_id="project", summary_budget=SummaryBudget(max_input_tokens=1000))
+
+    analyzer.summarize_transcript("短い議事録", model_id="model")
+
+    assert models.generate_content.call_count == 1
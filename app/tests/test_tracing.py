@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from infrastructure.tracing import OtlpJsonFileExporter, SpanRecord, SpanTracer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class _CollectingExporter:
+    def __init__(self) -> None:
+        self.records: list[SpanRecord] = []
+
+    def export(self, record: SpanRecord) -> None:
+        self.records.append(record)
+
+    def flush(self) -> None:
+        pass
+
+
+def test_nested_spans_record_parent_bytes_and_outcome() -> None:
+    exporter = _CollectingExporter()
+    tracer = SpanTracer([exporter])
+
+    with tracer.span("workflow", episode_id="42"):
+        with tracer.span("audio.upload") as span:
+            span.add_bytes(1024)
+        with pytest.raises(RuntimeError, match="boom"), tracer.span("rss.publish"):
+            raise RuntimeError("boom")  # noqa: EM101, TRY003
+
+    upload, rss, workflow = exporter.records
+    assert workflow.parent_span_id is None
+    assert workflow.attributes == {"episode_id": "42"}
+    assert {upload.trace_id, rss.trace_id} == {workflow.trace_id}
+    assert upload.parent_span_id == rss.parent_span_id == workflow.span_id
+    assert (upload.outcome, upload.bytes) == ("ok", 1024)
+    assert (rss.outcome, rss.error) == ("error", "RuntimeError: boom")
+    assert workflow.duration_seconds >= upload.duration_seconds
+
+
+def test_spans_opened_in_worker_threads_keep_the_parent_from_the_copied_context() -> None:
+    exporter = _CollectingExporter()
+    tracer = SpanTracer([exporter])
+
+    def work() -> None:
+        with tracer.span("transcript"):
+            pass
+
+    with tracer.span("workflow"):
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run, args=(work,))
+        thread.start()
+        thread.join()
+
+    transcript, workflow = exporter.records
+    assert transcript.parent_span_id == workflow.span_id
+
+
+def test_otlp_file_exporter_appends_one_request_per_flush(tmp_path: Path) -> None:
+    path = tmp_path / "traces" / "workflow.jsonl"
+    tracer = SpanTracer([OtlpJsonFileExporter(path, service_name="automator")])
+
+    with tracer.span("workflow"), tracer.span("feed.download") as span:
+        span.add_bytes(10)
+    tracer.flush()
+    tracer.flush()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    resource_spans = json.loads(lines[0])["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "automator"}}]
+    feed, workflow = resource_spans["scopeSpans"][0]["spans"]
+    assert feed["parentSpanId"] == workflow["spanId"]
+    assert "parentSpanId" not in workflow
+    assert feed["attributes"] == [{"key": "bytes", "value": {"intValue": "10"}}]
+    assert feed["status"] == {"code": 1}
+    assert int(feed["endTimeUnixNano"]) >= int(feed["startTimeUnixNano"])
+
+
+def test_otlp_file_exporter_writes_each_trace_when_its_root_span_ends(tmp_path: Path) -> None:
+    path = tmp_path / "workflow.jsonl"
+    tracer = SpanTracer([OtlpJsonFileExporter(path)])
+
+    with tracer.span("workflow", episode_id="42"), tracer.span("transcript"):
+        pass
+    with tracer.span("workflow", episode_id="43"):
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [len(json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]) for line in lines] == [2, 1]
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+# ruff: noqa: ARG002
+from typing import TYPE_CHECKING
+
+from domain.models import SnsPromotionContent, SnsPromotionsResponse, Summary, SummaryWithPromotions
+from infrastructure import transcript_cache
+from infrastructure.transcript_cache import CachedTranscriptProvider, LocalTranscriptCache, build_cache_key
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+class _CountingProvider:
+    def __init__(self) -> None:
+        self.transcript_calls = 0
+        self.summary_calls = 0
+        self.combined_calls = 0
+        self.released: list[str] = []
+
+    def generate_transcript(self, source_uri: str, model_id: str | None = None) -> str:
+        self.transcript_calls += 1
+        return f"transcript of {source_uri}"
+
+    def summarize_transcript(self, transcript: str, prompt: str | None = None, model_id: str | None = None) -> Summary:
+        self.summary_calls += 1
+        return Summary(title="title", description=transcript)
+
+    def generate_sns_promotions(
+        self,
+        summary_description: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SnsPromotionsResponse:
+        return SnsPromotionsResponse(promotions=[])
+
+    def generate_summary_and_promotions(
+        self,
+        transcript: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SummaryWithPromotions:
+        self.combined_calls += 1
+        return SummaryWithPromotions(
+            summary=Summary(title="title", description=transcript),
+            promotions=[SnsPromotionContent(message="promo", hashtags=[])] * num_promotions,
+        )
+
+    def release_transcript(self, transcript: str) -> None:
+        self.released.append(transcript)
+
+
+def _provider(tmp_path: Path, inner: _CountingProvider, fingerprints: dict[str, str]) -> CachedTranscriptProvider:
+    return CachedTranscriptProvider(
+        inner=inner,
+        cache=LocalTranscriptCache(tmp_path),
+        source_fingerprint=lambda uri: fingerprints[uri],
+        prompt_version="v1",
+    )
+
+
+def test_local_cache_round_trip_and_invalidate(tmp_path: Path) -> None:
+    cache = LocalTranscriptCache(tmp_path)
+    key = build_cache_key(kind="transcript", source_fingerprint="md5:a", model_id="m", prompt_version="v1")
+
+    cache.put(key, "text", source_fingerprint="md5:a")
+
+    assert cache.get(key) == "text"
+    assert cache.invalidate("md5:other") == 0
+    assert cache.invalidate("md5:a") == 1
+    assert cache.get(key) is None
+
+
+def test_retry_reuses_cached_transcript_and_summary(tmp_path: Path) -> None:
+    inner = _CountingProvider()
+    fingerprints = {"gs://bucket/a.mp3": "md5:a"}
+
+    for _ in range(2):
+        provider = _provider(tmp_path, inner, fingerprints)
+        transcript = provider.generate_transcript("gs://bucket/a.mp3", model_id="model")
+        summary = provider.summarize_transcript(transcript, model_id="model")
+
+    assert inner.transcript_calls == 1
+    assert inner.summary_calls == 1
+    assert summary.description == "transcript of gs://bucket/a.mp3"
+
+
+def test_cache_key_changes_with_model_and_source(tmp_path: Path) -> None:
+    inner = _CountingProvider()
+    fingerprints = {"gs://bucket/a.mp3": "md5:a"}
+    provider = _provider(tmp_path, inner, fingerprints)
+
+    provider.generate_transcript("gs://bucket/a.mp3", model_id="model-1")
+    provider.generate_transcript("gs://bucket/a.mp3", model_id="model-2")
+    fingerprints["gs://bucket/a.mp3"] = "md5:b"
+    provider.generate_transcript("gs://bucket/a.mp3", model_id="model-1")
+
+    assert inner.transcript_calls == 3
+
+
+def test_invalidate_drops_transcript_and_summary(tmp_path: Path) -> None:
+    inner = _CountingProvider()
+    provider = _provider(tmp_path, inner, {"gs://bucket/a.mp3": "md5:a"})
+    transcript = provider.generate_transcript("gs://bucket/a.mp3", model_id="model")
+    provider.summarize_transcript(transcript, model_id="model")
+
+    assert provider.invalidate("gs://bucket/a.mp3") == 2
+
+    transcript = provider.generate_transcript("gs://bucket/a.mp3", model_id="model")
+    provider.summarize_transcript(transcript, model_id="model")
+    assert inner.transcript_calls == 2
+    assert inner.summary_calls == 2
+
+
+def test_release_transcript_forgets_its_source(tmp_path: Path) -> None:
+    inner = _CountingProvider()
+    provider = _provider(tmp_path, inner, {"gs://bucket/a.mp3": "md5:a"})
+    transcript = provider.generate_transcript("gs://bucket/a.mp3", model_id="model")
+    provider.summarize_transcript(transcript, model_id="model")
+
+    provider.release_transcript(transcript)
+
+    assert provider._transcript_sources == {}
+    assert inner.released == [transcript]
+
+
+def test_transcript_sources_stay_bounded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(transcript_cache, "MAX_TRACKED_TRANSCRIPTS", 2)
+    uris = [f"gs://bucket/{name}.mp3" for name in ("a", "b", "c")]
+    provider = _provider(tmp_path, _CountingProvider(), {uri: f"md5:{uri}" for uri in uris})
+
+    for uri in uris:
+        provider.generate_transcript(uri, model_id="model")
+
+    assert sorted(provider._transcript_sources.values()) == ["md5:gs://bucket/b.mp3", "md5:gs://bucket/c.mp3"]
+
+
+def test_retry_reuses_cached_summary_and_promotions(tmp_path: Path) -> None:
+    inner = _CountingProvider()
+    fingerprints = {"gs://bucket/a.mp3": "md5:a"}
+
+    for _ in range(2):
+        provider = _provider(tmp_path, inner, fingerprints)
+        transcript = provider.generate_transcript("gs://bucket/a.mp3", model_id="model")
+        result = provider.generate_summary_and_promotions(transcript or "", num_promotions=2, model_id="model")
+
+    assert inner.combined_calls == 1
+    assert len(result.promotions) == 2
+    assert provider.invalidate("gs://bucket/a.mp3") == 2
+
+
+class _FailingCache:
+    def get(self, key: str) -> str | None:
+        raise ConnectionError("cache unavailable")
+
+    def put(self, key: str, value: str, *, source_fingerprint: str) -> None:
+        raise ConnectionError("cache unavailable")
+
+    def invalidate(self, source_fingerprint: str) -> int:
+        raise ConnectionError("cache unavailable")
+
+
+def test_cache_errors_fall_back_to_the_inner_provider() -> None:
+    inner = _CountingProvider()
+    provider = CachedTranscriptProvider(
+        inner=inner,
+        cache=_FailingCache(),
+        source_fingerprint=lambda _uri: "md5:a",
+        prompt_version="v1",
+    )
+
+    transcript = provider.generate_transcript("gs://bucket/a.mp3")
+    summary = provider.summarize_transcript(transcript)
+    combined = provider.generate_summary_and_promotions(transcript, num_promotions=2)
+
+    assert transcript == "transcript of gs://bucket/a.mp3"
+    assert summary.description == transcript
+    assert len(combined.promotions) == 2
+    assert (inner.transcript_calls, inner.summary_calls, inner.combined_calls) == (1, 1, 1)
+
+
+def test_fingerprint_error_generates_without_cache(tmp_path: Path) -> None:
+    inner = _CountingProvider()
+
+    def fingerprint(uri: str) -> str:
+        raise PermissionError(uri)
+
+    provider = CachedTranscriptProvider(
+        inner=inner, cache=LocalTranscriptCache(tmp_path), source_fingerprint=fingerprint, prompt_version="v1"
+    )
+
+    assert provider.generate_transcript("gs://bucket/a.mp3") == "transcript of gs://bucket/a.mp3"
+    assert inner.transcript_calls == 1
+    assert not list(tmp_path.iterdir())
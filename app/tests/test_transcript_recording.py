@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+# ruff: noqa: ARG002
+from typing import TYPE_CHECKING
+
+import pytest
+
+from domain.models import SnsPromotionContent, SnsPromotionsResponse, Summary, SummaryWithPromotions
+from infrastructure.transcript_recording import RecordingTranscriptProvider, ReplayTranscriptProvider, request_hash
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class _Provider:
+    def generate_transcript(self, source_uri: str, model_id: str | None = None) -> str:
+        return f"transcript of {source_uri}"
+
+    def summarize_transcript(self, transcript: str, prompt: str | None = None, model_id: str | None = None) -> Summary:
+        return Summary(title="title", description=transcript)
+
+    def generate_sns_promotions(
+        self,
+        summary_description: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SnsPromotionsResponse:
+        return SnsPromotionsResponse(promotions=[SnsPromotionContent(message="promo", hashtags=["#tag"])])
+
+    def generate_summary_and_promotions(
+        self,
+        transcript: str,
+        num_promotions: int = 3,
+        model_id: str | None = None,
+    ) -> SummaryWithPromotions:
+        return SummaryWithPromotions(summary=Summary(title="title", description=transcript), promotions=[])
+
+
+def _record(tmp_path: Path) -> None:
+    ticks = iter([0.0, 2.0, 10.0, 11.5, 20.0, 20.5, 30.0, 33.0])
+    recorder = RecordingTranscriptProvider(inner=_Provider(), fixture_dir=tmp_path, clock=lambda: next(ticks))
+    transcript = recorder.generate_transcript("gs://bucket/a.m4a", model_id="model") or ""
+    recorder.summarize_transcript(transcript, model_id="model")
+    recorder.generate_sns_promotions("description", model_id="model")
+    recorder.generate_summary_and_promotions(transcript, model_id="model")
+
+
+def test_request_hash_ignores_whitespace_and_width_differences() -> None:
+    assert request_hash("summarize_transcript", {"transcript": "\uff21  b\n c "}) == request_hash(
+        "summarize_transcript",
+        {"transcript": "A b c"},
+    )
+    assert request_hash("summarize_transcript", {"transcript": "a"}) != request_hash(
+        "summarize_transcript", {"transcript": "b"}
+    )
+
+
+def test_replay_returns_recorded_responses_with_recorded_latency(tmp_path: Path) -> None:
+    _record(tmp_path)
+    sleeps: list[float] = []
+    replay = ReplayTranscriptProvider(fixture_dir=tmp_path, latency_scale=0.5, sleep=sleeps.append)
+
+    transcript = replay.generate_transcript("gs://bucket/a.m4a", model_id="model")
+    summary = replay.summarize_transcript(f"  {transcript}\n", model_id="model")
+    promotions = replay.generate_sns_promotions("description", model_id="model")
+    combined = replay.generate_summary_and_promotions(transcript or "", model_id="model")
+
+    assert replay.fixture_count == 4
+    assert transcript == "transcript of gs://bucket/a.m4a"
+    assert summary == Summary(title="title", description=transcript)
+    assert promotions.promotions[0].hashtags == ["#tag"]
+    assert combined.summary.description == transcript
+    assert sleeps == [1.0, 0.75, 0.25, 1.5]
+    assert replay.simulated_latency_seconds == pytest.approx(3.5)
+
+
+def test_replay_missing_fixture(tmp_path: Path) -> None:
+    _record(tmp_path)
+
+    with pytest.raises(KeyError, match="No recorded fixture"):
+        ReplayTranscriptProvider(fixture_dir=tmp_path).generate_transcript("gs://bucket/other.m4a")
+
+    lenient = ReplayTranscriptProvider(fixture_dir=tmp_path, strict=False, latency_seconds=0.0)
+    assert lenient.generate_transcript("gs://bucket/other.m4a") == "transcript of gs://bucket/a.m4a"
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from infrastructure.work_queue import InMemoryEpisodeWorkQueue, PostgresEpisodeWorkQueue
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_in_memory_queue_hides_claimed_items_until_visibility_expires() -> None:
+    clock = _Clock()
+    queue = InMemoryEpisodeWorkQueue(clock=clock)
+    first = queue.enqueue("podcasts/1/episodes/1/source/a.mp3")
+    queue.enqueue("podcasts/1/episodes/2/source/b.mp3")
+
+    claimed = queue.claim(worker_id="worker-a", limit=1, visibility_seconds=60, max_attempts=3)
+    assert [item.item_id for item in claimed] == [first]
+    assert [
+        item.item_id for item in queue.claim(worker_id="worker-b", limit=5, visibility_seconds=60, max_attempts=3)
+    ] == ["2"]
+    assert queue.claim(worker_id="worker-b", limit=5, visibility_seconds=60, max_attempts=3) == []
+
+    # worker-a が完了を報告しないまま可視性タイムアウトを過ぎると再取得される
+    clock.now = 61.0
+    reclaimed = queue.claim(worker_id="worker-b", limit=1, visibility_seconds=60, max_attempts=3)
+    assert [(item.item_id, item.attempts) for item in reclaimed] == [(first, 2)]
+
+
+def test_in_memory_queue_fails_expired_items_that_used_up_their_attempts() -> None:
+    clock = _Clock()
+    queue = InMemoryEpisodeWorkQueue(clock=clock)
+    crashing = queue.enqueue("podcasts/1/episodes/1/source/a.mp3")
+
+    for attempt in range(2):
+        clock.now = attempt * 61.0
+        assert [
+            item.item_id for item in queue.claim(worker_id="w", limit=1, visibility_seconds=60, max_attempts=2)
+        ] == [crashing]
+
+    # 2 回とも完了を報告しないまま期限切れになったので、3 回目は取得されずに failed になる
+    clock.now = 200.0
+    assert queue.claim(worker_id="w", limit=1, visibility_seconds=60, max_attempts=2) == []
+    assert queue.status(crashing) == "failed"
+
+
+def test_in_memory_queue_requeues_failed_items_only_when_retrying() -> None:
+    queue = InMemoryEpisodeWorkQueue()
+    retried = queue.enqueue("a.mp3")
+    given_up = queue.enqueue("b.mp3")
+    queue.claim(worker_id="worker", limit=2, visibility_seconds=60, max_attempts=3)
+
+    queue.fail(retried, error_message="boom", retry=True)
+    queue.fail(given_up, error_message="boom", retry=False)
+
+    assert queue.status(retried) == "queued"
+    assert queue.status(given_up) == "failed"
+    assert [
+        item.item_id for item in queue.claim(worker_id="worker", limit=2, visibility_seconds=60, max_attempts=3)
+    ] == [retried]
+
+
+def test_postgres_queue_claims_with_skip_locked() -> None:
+    cursor = MagicMock()
+    cursor.fetchall.return_value = [(7, "podcasts/1/episodes/1/source/a.mp3", 1)]
+    cursor_context = MagicMock()
+    cursor_context.__enter__.return_value = cursor
+    connection = MagicMock()
+    connection.cursor.return_value = cursor_context
+    connection_context = MagicMock()
+    connection_context.__enter__.return_value = connection
+
+    with patch("infrastructure.work_queue.psycopg.connect", return_value=connection_context):
+        items = PostgresEpisodeWorkQueue(database_url="postgresql://example").claim(
+            worker_id="worker", limit=3, visibility_seconds=600, max_attempts=2
+        )
+
+    (abandon_query, abandon_parameters), (query, parameters) = (call.args for call in cursor.execute.call_args_list)
+    assert "attempts >= %s" in abandon_query
+    assert abandon_parameters[1] == 2
+    assert "FOR UPDATE SKIP LOCKED" in query
+    assert "attempts < %s" in query
+    assert parameters == ("worker", 600, 2, 3)
+    assert [(item.item_id, item.object_name, item.attempts) for item in items] == [
+        ("7", "podcasts/1/episodes/1/source/a.mp3", 1)
+    ]
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from benchmarks.workflow import MODES, run_suite
+
+
+def test_run_suite_replays_every_mode_offline() -> None:
+    report = run_suite(sizes=(2_000,), repeat=1, feed_episodes=3)
+
+    results = report["results"]
+    assert [item["operation"] for item in results] == list(MODES)
+    assert all(item["size"] == 2_000 for item in results)
+    assert all(item["simulated_latency_seconds"] == 0 for item in results)
+    assert report["metadata"]["fixtures"] == "synthetic"
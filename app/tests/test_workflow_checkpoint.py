@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+from infrastructure.episode_repository import PostgresWorkflowCheckpointStore
+from infrastructure.workflow_checkpoint import LocalWorkflowCheckpointStore
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SOURCE = "podcasts/1/episodes/42/source/recording.mp3"
+
+
+def test_local_store_round_trip_and_clear(tmp_path: Path) -> None:
+    store = LocalWorkflowCheckpointStore(tmp_path)
+
+    store.save(podcast_id="1", episode_id="42", source_audio_path=SOURCE, step="transcript", value="議事録")
+    store.save(podcast_id="1", episode_id="42", source_audio_path=SOURCE, step="feed", value={"episode_number": 4})
+
+    assert store.load(podcast_id="1", episode_id="42", source_audio_path=SOURCE) == {
+        "transcript": "議事録",
+        "feed": {"episode_number": 4},
+    }
+    store.clear(podcast_id="1", episode_id="42")
+    assert store.load(podcast_id="1", episode_id="42", source_audio_path=SOURCE) == {}
+
+
+def test_local_store_ignores_checkpoints_of_another_source(tmp_path: Path) -> None:
+    store = LocalWorkflowCheckpointStore(tmp_path)
+    store.save(podcast_id="1", episode_id="42", source_audio_path=SOURCE, step="transcript", value="old")
+
+    reuploaded = "podcasts/1/episodes/42/source/retake.mp3"
+    assert store.load(podcast_id="1", episode_id="42", source_audio_path=reuploaded) == {}
+
+    store.save(podcast_id="1", episode_id="42", source_audio_path=reuploaded, step="feed", value={"episode_number": 5})
+    assert store.load(podcast_id="1", episode_id="42", source_audio_path=reuploaded) == {"feed": {"episode_number": 5}}
+
+
+def test_postgres_store_upserts_step_output() -> None:
+    cursor = MagicMock()
+    connection = MagicMock()
+    connection.__enter__.return_value.cursor.return_value.__enter__.return_value = cursor
+
+    with patch("infrastructure.episode_repository.psycopg.connect", return_value=connection):
+        PostgresWorkflowCheckpointStore(database_url="postgresql://example").save(
+            podcast_id="1",
+            episode_id="42",
+            source_audio_path=SOURCE,
+            step="upload",
+            value={"public_url": "https://example.com/ep/4/audio.mp3"},
+        )
+
+    delete, upsert = cursor.execute.call_args_list
+    assert delete.args[1] == ("1", "42", SOURCE)
+    assert "ON CONFLICT (podcast_id, episode_id, step)" in upsert.args[0]
+    assert upsert.args[1][:4] == ("1", "42", "upload", SOURCE)
+    assert upsert.args[1][4].obj == {"public_url": "https://example.com/ep/4/audio.mp3"}
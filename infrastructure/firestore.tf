@@ -27,4 +27,29 @@ resource "google_firestore_field" "sns_promotions_status" {
   }
 }
 
+# 投稿ジョブの「pending かつ scheduled_time <= now を scheduled_time 順に LIMIT 件」クエリ用
+resource "google_firestore_index" "sns_promotions_status_scheduled_time" {
+  project     = var.project_id
+  database    = "(default)"
+  collection  = "sns_promotions"
+  query_scope = "COLLECTION_GROUP"
+
+  fields {
+    field_path = "status"
+    order      = "ASCENDING"
+  }
+
+  fields {
+    field_path = "scheduled_time"
+    order      = "ASCENDING"
+  }
+}
 
+resource "google_firestore_field" "ai_rate_limits_expire_at" {
+  project    = var.project_id
+  database   = "(default)"
+  collection = "ai_rate_limits"
+  field      = "expire_at"
+
+  ttl_config {}
+}